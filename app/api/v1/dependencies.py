@@ -0,0 +1,301 @@
+"""
+Shared dependencies for the API v1 routers.
+"""
+import os
+import uuid
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, Query, Request, status
+
+from app import crud
+from app.models.post import POST_STATUSES
+from app.utils.export import EXPORT_FORMATS
+from app.utils.pagination import encode_cursor, parse_after
+
+# Default way of computing list totals; see crud.topic.TOTAL_STRATEGIES
+TOPIC_TOTAL_STRATEGY = os.getenv("TOPIC_TOTAL_STRATEGY", "exact")
+
+# Deepest offset a search may page to; ranking cost grows with it
+SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+
+# How single-topic moves are stored and how lists are ordered by default:
+# "position" (dense integers) or "rank" (fractional keys, one-row moves)
+TOPIC_ORDER_MODE = os.getenv("TOPIC_ORDER_MODE", "position")
+
+
+def use_cache(request: Request) -> bool:
+    """
+    Tell whether a request may be served from in-process caches.
+    
+    Clients opt out per request with ``Cache-Control: no-cache`` (or
+    ``no-store``) or ``Pragma: no-cache``.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        bool: False when the client asked for fresh data
+    """
+    cache_control = request.headers.get("cache-control", "").lower()
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return False
+    return "no-cache" not in request.headers.get("pragma", "").lower()
+
+
+class TopicListParams:
+    """
+    Validated query parameters for listing topics.
+    
+    Used as a class dependency by both the sync and async topic routers.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0, description="Number of records to skip"),
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+        order_by: str = Query(
+            TOPIC_ORDER_MODE, description="Field to order by (e.g. position, rank, created_at)"
+        ),
+        order: str = Query("asc", description="Sort order ('asc' or 'desc')"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from a previous page's next_cursor"
+        ),
+        total: str = Query(
+            TOPIC_TOTAL_STRATEGY,
+            description="How to compute total: 'exact', 'estimated', 'cached' or 'none'"
+        ),
+    ):
+        if order.lower() not in ("asc", "desc"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Order must be either 'asc' or 'desc'"
+            )
+        if cursor and skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either 'skip' or 'cursor', not both"
+            )
+        if total not in crud.topic.TOTAL_STRATEGIES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Total must be one of {', '.join(crud.topic.TOTAL_STRATEGIES)}"
+            )
+        
+        self.skip = skip
+        self.limit = limit
+        self.order_by = crud.topic.resolve_order_field(order_by)
+        self.order = order
+        self.total = total
+        try:
+            self.after = parse_after(
+                cursor, self.order_by, order, crud.topic.cursor_type(self.order_by)
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+
+    @property
+    def fetch_limit(self) -> int:
+        """Rows to fetch: one extra to know whether another page follows."""
+        return self.limit + 1
+
+    def page(self, topics: List[Any]) -> Tuple[List[Any], Optional[str]]:
+        """
+        Trim a fetched page and build the cursor for the next one.
+        
+        Args:
+            topics: Up to ``fetch_limit`` rows (models or column mappings),
+                in list order
+            
+        Returns:
+            Tuple of (rows for this page, next_cursor or None on the last page)
+        """
+        if len(topics) <= self.limit:
+            return topics, None
+        topics = topics[:self.limit]
+        last = topics[-1]
+        last_id = last["id"] if isinstance(last, Mapping) else last.id
+        return topics, encode_cursor(
+            self.order_by, self.order, crud.topic.cursor_value(last, self.order_by), last_id
+        )
+
+
+class PostListParams:
+    """
+    Validated query parameters for listing posts.
+    
+    Only keyset (cursor) pagination is offered: every filter combination is
+    served by a composite index read in order, and an offset would undo that.
+    """
+
+    def __init__(
+        self,
+        status_: Optional[str] = Query(
+            None,
+            alias="status",
+            description=f"Only posts in this state ({', '.join(POST_STATUSES)})",
+        ),
+        topic_id: Optional[str] = Query(None, description="Only posts of this topic"),
+        published_after: Optional[datetime] = Query(
+            None, description="Only posts published at or after this time"
+        ),
+        published_before: Optional[datetime] = Query(
+            None, description="Only posts published before this time"
+        ),
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of records to return"),
+        order_by: str = Query(
+            "created_at",
+            description="Field to order by: 'created_at', or 'published_at' (published posts "
+                        "unless a status is given)",
+        ),
+        order: str = Query("desc", description="Sort order ('asc' or 'desc')"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from a previous page's next_cursor"
+        ),
+        include_content: bool = Query(
+            False, description="Include each post's content (omitted by default)"
+        ),
+    ):
+        if order.lower() not in ("asc", "desc"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Order must be either 'asc' or 'desc'"
+            )
+        if status_ is not None and status_ not in POST_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Status must be one of {', '.join(POST_STATUSES)}"
+            )
+        try:
+            self.topic_id = uuid.UUID(topic_id) if topic_id else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid topic_id"
+            )
+        
+        self.order_by = crud.post.resolve_order_field(order_by)
+        # Reason: a publication-date feed always filters on status, so it is
+        # served by a (status, published_at, id) index rather than a sort
+        if self.order_by == "published_at" and status_ is None:
+            status_ = "published"
+        self.status = status_
+        self.published_after = published_after
+        self.published_before = published_before
+        self.limit = limit
+        self.order = order
+        self.include_content = include_content
+        try:
+            self.after = parse_after(
+                cursor, self.order_by, order, crud.post.cursor_type(self.order_by)
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+
+    def filters(self) -> dict:
+        """Keyword arguments for ``crud.post.posts_statement``, fetching one extra row."""
+        return {
+            "status": self.status,
+            "topic_id": self.topic_id,
+            "published_after": self.published_after,
+            "published_before": self.published_before,
+            "order_by": self.order_by,
+            "order": self.order,
+            "limit": self.limit + 1,
+            "after": self.after,
+            "include_content": self.include_content,
+        }
+
+    def page(self, rows: List[Mapping[str, Any]]) -> Tuple[List[Mapping[str, Any]], Optional[str]]:
+        """
+        Trim a fetched page and build the cursor for the next one.
+        
+        Args:
+            rows: Up to ``limit + 1`` column mappings, in list order
+            
+        Returns:
+            Tuple of (rows for this page, next_cursor or None on the last page)
+        """
+        if len(rows) <= self.limit:
+            return rows, None
+        rows = rows[:self.limit]
+        last = rows[-1]
+        return rows, encode_cursor(
+            self.order_by, self.order, crud.post.cursor_value(last, self.order_by), last["id"]
+        )
+
+
+class SearchParams:
+    """
+    Validated query parameters for searching posts and topics.
+    """
+
+    def __init__(
+        self,
+        q: str = Query(
+            ..., min_length=1, max_length=200,
+            description='Search terms; supports "phrases", OR and -exclusions'
+        ),
+        type_: str = Query(
+            "all", alias="type", description="What to search: 'all', 'post' or 'topic'"
+        ),
+        status_: Optional[str] = Query(
+            None, alias="status", description="Only posts in this state (topics unaffected)"
+        ),
+        limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+        offset: int = Query(
+            0, ge=0, le=SEARCH_MAX_OFFSET, description="Number of best results to skip"
+        ),
+        fuzzy: bool = Query(
+            True, description="Match titles by similarity when nothing matches exactly"
+        ),
+    ):
+        if type_ != "all" and type_ not in crud.search.SEARCH_KINDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Type must be one of all, {', '.join(crud.search.SEARCH_KINDS)}"
+            )
+        if status_ is not None and status_ not in POST_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Status must be one of {', '.join(POST_STATUSES)}"
+            )
+        self.q = q.strip()
+        self.kinds = crud.search.SEARCH_KINDS if type_ == "all" else (type_,)
+        self.status = status_
+        self.limit = limit
+        self.offset = offset
+        self.fuzzy = fuzzy
+
+
+class ExportParams:
+    """
+    Validated query parameters for streaming exports.
+    """
+
+    def __init__(
+        self,
+        fmt: str = Query(
+            "ndjson", alias="format", description="Export format: 'ndjson' or 'csv'"
+        ),
+        columns: Optional[str] = Query(
+            None, description="Comma-separated columns to export (default: all)"
+        ),
+        updated_since: Optional[datetime] = Query(
+            None, description="Only export rows updated at or after this time"
+        ),
+    ):
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Format must be one of {', '.join(EXPORT_FORMATS)}"
+            )
+        self.format = fmt
+        self.columns = columns
+        self.updated_since = updated_since
@@ -1,6 +1,8 @@
 """
 API v1 routers package.
 """
-from . import topics
+from . import exports, feeds, generation, images, posts, search, topics, topics_async
 
-__all__ = ["topics"]
+__all__ = [
+    "exports", "feeds", "generation", "images", "posts", "search", "topics", "topics_async"
+]
@@ -0,0 +1,52 @@
+"""
+API endpoints streaming full-table exports (NDJSON / CSV).
+
+Kept apart from the resource routers so ``/topics/export`` and
+``/posts/export`` are matched before any ``/{id}`` route, whichever topic
+router is active.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api.v1.dependencies import ExportParams
+from app.db.routing import get_read_db
+from app.models.post import Post as PostModel
+from app.models.topic import Topic as TopicModel
+from app.utils.export import export_response, parse_columns
+
+router = APIRouter()
+
+
+@router.get("/topics/export", summary="Export all topics as NDJSON or CSV")
+def export_topics(
+    params: ExportParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every topic, optionally only those updated since a given time.
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    ordered by ``updated_at`` then ``id``, so memory use does not grow with
+    the table. Use ``columns`` to pick fields and ``updated_since`` for
+    incremental pulls.
+    """
+    columns = parse_columns(params.columns, crud.export.export_columns(TopicModel))
+    chunks = crud.export.stream_rows(db, TopicModel, columns, params.updated_since)
+    return export_response("topics", params.format, columns, chunks)
+
+
+@router.get("/posts/export", summary="Export all posts as NDJSON or CSV")
+def export_posts(
+    params: ExportParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every post, optionally only those updated since a given time.
+    
+    Works like the topic export; pass ``columns`` without ``content`` to
+    skip post bodies.
+    """
+    columns = parse_columns(params.columns, crud.export.export_columns(PostModel))
+    chunks = crud.export.stream_rows(db, PostModel, columns, params.updated_since)
+    return export_response("posts", params.format, columns, chunks)
@@ -0,0 +1,117 @@
+"""
+Sitemaps, RSS/Atom feeds and topic indexes, served from FEEDS_DIR.
+
+Post and topic endpoints hand each change to the feed generator after the
+response is sent (``schedule_post_change``), so publishing never waits for
+files to be rewritten.
+"""
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.publishing.feeds import FEEDS_DIR, FEEDS_ENABLED, FeedGenerator
+from app.utils import http_cache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Cache-Control sent with feed files: revalidated with the ETag on every use
+FEED_CACHE_CONTROL = os.getenv("FEED_CACHE_CONTROL", "public, max-age=0, s-maxage=60")
+
+# Media types by file name, then by extension
+FEED_MEDIA_TYPES = {
+    "rss.xml": "application/rss+xml",
+    "atom.xml": "application/atom+xml",
+    ".xml": "application/xml",
+    ".json": "application/json",
+}
+
+# Created on first use; loads every published post on its first change
+_feed_generator: Optional[FeedGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_feed_generator() -> Optional[FeedGenerator]:
+    """Get the process-wide feed generator, or None when FEEDS_ENABLED is off."""
+    global _feed_generator
+    if not FEEDS_ENABLED:
+        return None
+    with _generator_lock:
+        if _feed_generator is None:
+            _feed_generator = FeedGenerator()
+        return _feed_generator
+
+def _apply(generator: FeedGenerator, method: str, db: Session, object_id: str) -> None:
+    """Run a generator update, logging rather than raising after the response."""
+    try:
+        getattr(generator, method)(db, object_id)
+    except Exception:
+        logger.exception("Updating feeds for %s failed", object_id)
+
+def schedule_post_change(
+    background_tasks: BackgroundTasks,
+    generator: Optional[FeedGenerator],
+    db: Session,
+    post_id: str,
+) -> None:
+    """Update the feeds for a created, changed or deleted post after the response."""
+    if generator is not None:
+        background_tasks.add_task(_apply, generator, "apply", db, str(post_id))
+
+def schedule_topic_change(
+    background_tasks: BackgroundTasks,
+    generator: Optional[FeedGenerator],
+    db: Any,
+    topic_id: str,
+) -> None:
+    """
+    Update a renamed topic's feeds and index after the response.
+
+    ``db`` may be a ``Session`` or an ``AsyncSession``; the generator then
+    runs on the async session's sync view (``run_sync``).
+    """
+    if generator is None:
+        return
+    if isinstance(db, Session):
+        background_tasks.add_task(_apply, generator, "apply_topic", db, str(topic_id))
+    else:
+        apply = partial(_apply, generator, "apply_topic")
+        background_tasks.add_task(db.run_sync, apply, str(topic_id))
+
+@router.get("/feeds/{path:path}", summary="Get a sitemap, feed or topic index file")
+def read_feed_file(
+    path: str,
+    request: Request,
+    generator: Optional[FeedGenerator] = Depends(get_feed_generator),
+):
+    """
+    Serve a generated file, e.g. ``sitemap.xml``, ``rss.xml``, ``atom.xml``
+    or ``topics/{slug}/page-1.json``.
+
+    The ETag comes from the file's size and modification time, which only
+    change when its bytes do, so clients revalidate with a cheap ``304``.
+    """
+    root = generator.root if generator is not None else os.path.abspath(FEEDS_DIR)
+    full_path = os.path.abspath(os.path.join(root, path))
+    if not full_path.startswith(root + os.sep) or not os.path.isfile(full_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    stat = os.stat(full_path)
+    etag = http_cache.make_etag(stat.st_mtime_ns, stat.st_size)
+    modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+    if http_cache.is_not_modified(request, etag, modified):
+        return http_cache.not_modified(etag, modified, FEED_CACHE_CONTROL)
+    name = os.path.basename(full_path)
+    media_type = FEED_MEDIA_TYPES.get(name) or FEED_MEDIA_TYPES.get(
+        os.path.splitext(name)[1], "application/octet-stream"
+    )
+    with open(full_path, "rb") as handle:
+        response = Response(content=handle.read(), media_type=media_type)
+    http_cache.set_validators(response, etag, modified, FEED_CACHE_CONTROL)
+    return response
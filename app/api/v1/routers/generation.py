@@ -0,0 +1,185 @@
+"""
+API endpoints for AI content generation jobs.
+
+Generation runs on an in-process queue (``app.generation``): the POST
+returns a job at once, and clients poll it or follow its server-sent event
+stream until it finishes.
+"""
+import threading
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api.v1.dependencies import use_cache
+from app.db.database import SessionLocal, get_db
+from app.db.routing import get_read_db
+from app.generation import (
+    POST_CONTENT_TEMPLATE,
+    GenerationQueue,
+    GenerationRequest,
+    QueueFullError,
+    post_prompt_variables,
+)
+from app.utils.serialization import dumps
+
+router = APIRouter()
+
+# Created on first use so apps that never generate start no threads
+_generation_queue: Optional[GenerationQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_generation_queue() -> GenerationQueue:
+    """Get the process-wide generation queue, creating it on first use."""
+    global _generation_queue
+    with _queue_lock:
+        if _generation_queue is None:
+            _generation_queue = crud.generation_job.build_generation_queue(SessionLocal)
+        return _generation_queue
+
+def stop_generation_queue() -> None:
+    """Stop the generation queue's workers, abandoning pending jobs."""
+    global _generation_queue
+    with _queue_lock:
+        queue, _generation_queue = _generation_queue, None
+    if queue is not None:
+        queue.stop()
+
+def _sse(event: dict) -> bytes:
+    """Encode one server-sent event."""
+    return b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+
+@router.post(
+    "/posts/{post_id}/generate",
+    response_model=schemas.GenerationJobCreated,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Generate a post's content"
+)
+def generate_post_content(
+    post_id: str,
+    body: schemas.GenerationCreate,
+    cache: bool = Depends(use_cache),
+    db: Session = Depends(get_db),
+    queue: GenerationQueue = Depends(get_generation_queue)
+):
+    """
+    Queue generation of a post's content from its title, topic, excerpt and
+    SEO keywords.
+
+    Returns at once with a job to poll at ``/generation/jobs/{id}`` or
+    follow at ``/generation/jobs/{id}/stream``. When it succeeds the text
+    replaces the post's content as a new version. Asking again while an
+    identical request for the post is pending returns that job; identical
+    requests for other posts share one provider call (``coalesced``).
+
+    Responses are cached by model, parameters and prompt; a repeat of an
+    earlier request is answered from the cache (``cached``) and its stream
+    replayed. Pass ``use_cache: false`` or ``Cache-Control: no-cache`` to
+    generate afresh.
+    """
+    db_post = crud.post.get_post(db, post_id=post_id)
+    if db_post is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    db_topic = crud.topic.get_topic(db, str(db_post.topic_id)) if db_post.topic_id else None
+    request = GenerationRequest.from_template(
+        POST_CONTENT_TEMPLATE,
+        post_prompt_variables(
+            db_post.title,
+            topic=db_topic.name if db_topic else None,
+            topic_description=db_topic.description if db_topic else None,
+            excerpt=db_post.excerpt,
+            keywords=db_post.seo_keywords,
+            instructions=body.instructions,
+        ),
+        model=body.model,
+        params={"max_tokens": body.max_tokens, "temperature": body.temperature},
+    )
+    try:
+        job, coalesced = queue.submit(
+            request,
+            provider=body.provider,
+            owner=str(db_post.id),
+            use_cache=body.use_cache and cache,
+        )
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown generation provider: {body.provider}"
+        )
+    except QueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "30"},
+        )
+    return {**job.as_dict(), "coalesced": coalesced}
+
+@router.get(
+    "/generation/jobs/{job_id}",
+    response_model=schemas.GenerationJob,
+    summary="Get a generation job"
+)
+def read_generation_job(
+    job_id: str,
+    db: Session = Depends(get_read_db),
+    queue: GenerationQueue = Depends(get_generation_queue)
+):
+    """
+    Get the status of a generation job.
+
+    Jobs of this worker are answered from memory; others from the stored
+    row, which lags the worker by at most one status change.
+    """
+    job = queue.get(job_id)
+    if job is not None:
+        return job.as_dict()
+    db_job = crud.generation_job.get_job(db, job_id)
+    if db_job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation job not found"
+        )
+    return db_job
+
+@router.get("/generation/jobs/{job_id}/stream", summary="Follow a generation job")
+def stream_generation_job(
+    job_id: str,
+    db: Session = Depends(get_read_db),
+    queue: GenerationQueue = Depends(get_generation_queue)
+):
+    """
+    Follow a job as server-sent events until it finishes.
+
+    Events are ``status`` (queued, running, then succeeded or failed),
+    ``token`` (the next piece of generated text) and ``retry`` (the attempt
+    failed and will be retried; drop the text received so far). Everything
+    that already happened is replayed first. Jobs of other workers get their
+    stored status as a single event; poll those instead.
+    """
+    job = queue.get(job_id)
+    if job is not None:
+        async def events() -> AsyncIterator[bytes]:
+            async for event in job.events():
+                yield _sse(event)
+    else:
+        db_job = crud.generation_job.get_job(db, job_id)
+        if db_job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Generation job not found"
+            )
+        stored = {"type": "status", "status": db_job.status, "error": db_job.error}
+
+        async def events() -> AsyncIterator[bytes]:
+            yield _sse(stored)
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,177 @@
+"""
+API endpoints for uploading images and reading their derivatives.
+
+Uploads are the raw request body (``Content-Type: image/...``), streamed to
+a temporary file and hashed on the way. A file stored before is reused; a
+new one is rendered to resized WebP/AVIF derivatives and a blurred
+placeholder on the image pipeline's process pool.
+"""
+import threading
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, schemas
+from app.db.database import get_db
+from app.db.routing import get_read_db
+from app.images import (
+    IMAGE_MAX_UPLOAD_BYTES,
+    ImagePipeline,
+    ImageTooLargeError,
+    InvalidImageError,
+    build_storage,
+    spool_upload,
+)
+
+router = APIRouter()
+
+# Created on first use so apps that never upload start no processes
+_image_pipeline: Optional[ImagePipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """Get the process-wide image pipeline, creating it on first use."""
+    global _image_pipeline
+    with _pipeline_lock:
+        if _image_pipeline is None:
+            _image_pipeline = ImagePipeline(build_storage())
+        return _image_pipeline
+
+def stop_image_pipeline() -> None:
+    """Shut the image pipeline's worker processes down."""
+    global _image_pipeline
+    with _pipeline_lock:
+        pipeline, _image_pipeline = _image_pipeline, None
+    if pipeline is not None:
+        pipeline.close()
+
+def _with_derivatives(db: Session, images) -> List[dict]:
+    """Serialize images with their derivatives, loaded in one query."""
+    derivatives = crud.image.get_derivatives(db, [image.content_hash for image in images])
+    return [
+        {
+            **schemas.Image.from_orm(image).dict(exclude={"derivatives"}),
+            "derivatives": derivatives.get(image.content_hash, []),
+        }
+        for image in images
+    ]
+
+@router.post(
+    "/images",
+    response_model=schemas.ImageUploaded,
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload an image"
+)
+async def upload_image(
+    request: Request,
+    response: Response,
+    post_id: Optional[str] = Query(None, description="Post to attach the image to"),
+    alt_text: Optional[str] = Query(None, max_length=1000),
+    prompt: Optional[str] = Query(None, max_length=4000, description="Prompt it was made from"),
+    is_featured: bool = Query(False, description="Make it the post's featured image"),
+    db: Session = Depends(get_db),
+    pipeline: ImagePipeline = Depends(get_image_pipeline)
+):
+    """
+    Upload an image as the request body and record it with its derivatives.
+
+    The body is streamed to disk, never held in memory, and rejected with
+    413 beyond ``IMAGE_MAX_UPLOAD_BYTES``. Files are deduplicated by
+    sha256: a file already stored reuses its original and derivatives
+    (``deduplicated``), and uploading it again for the same post returns the
+    existing image with 200.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not (content_type.startswith("image/") or content_type == "application/octet-stream"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send the image as the request body with an image/* Content-Type"
+        )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > IMAGE_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Images may be at most {IMAGE_MAX_UPLOAD_BYTES:,} bytes"
+        )
+    post_uuid = None
+    if post_id is not None:
+        db_post = await run_in_threadpool(crud.post.get_post, db, post_id)
+        if db_post is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post not found"
+            )
+        post_uuid = db_post.id
+
+    try:
+        upload = await spool_upload(request.stream())
+    except ImageTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exc)
+        )
+    with upload:
+        existing = await run_in_threadpool(
+            crud.image.find_by_content, db, upload.content_hash, post_uuid
+        )
+        if existing is not None and existing.post_id == post_uuid:
+            response.status_code = status.HTTP_200_OK
+            db_image = existing
+        else:
+            if existing is not None:
+                content, derivatives = crud.image.content_of(existing), []
+            else:
+                try:
+                    processed = await pipeline.process(upload)
+                except InvalidImageError as exc:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail=str(exc)
+                    )
+                content, derivatives = processed["image"], processed["derivatives"]
+            db_image = await run_in_threadpool(
+                crud.image.create_image,
+                db,
+                content,
+                derivatives,
+                post_id=post_uuid,
+                alt_text=alt_text,
+                prompt=prompt,
+                is_featured=is_featured,
+            )
+    body = (await run_in_threadpool(_with_derivatives, db, [db_image]))[0]
+    return {**body, "deduplicated": existing is not None}
+
+@router.get("/images/{image_id}", response_model=schemas.Image, summary="Get an image")
+def read_image(
+    image_id: str,
+    db: Session = Depends(get_read_db)
+):
+    """Get an image with the dimensions, sizes and URLs of its derivatives."""
+    db_image = crud.image.get_image(db, image_id)
+    if db_image is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    return _with_derivatives(db, [db_image])[0]
+
+@router.get(
+    "/posts/{post_id}/images",
+    response_model=List[schemas.Image],
+    summary="List a post's images"
+)
+def read_post_images(
+    post_id: str,
+    db: Session = Depends(get_read_db)
+):
+    """List a post's images, oldest first, each with its derivatives."""
+    if crud.post.get_post(db, post_id=post_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return _with_derivatives(db, crud.image.get_post_images(db, post_id))
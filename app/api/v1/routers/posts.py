@@ -0,0 +1,233 @@
+"""
+API endpoints for managing blog posts.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api.v1.dependencies import PostListParams
+from app.api.v1.routers.feeds import get_feed_generator, schedule_post_change
+from app.db.database import get_db
+from app.db.routing import get_read_db
+from app.utils.serialization import FastJSONResponse, build_items
+
+router = APIRouter()
+
+# Fields of a serialized post list item, in wire order
+POST_SUMMARY_FIELDS = tuple(schemas.PostSummary.__fields__)
+POST_FIELDS = tuple(schemas.Post.__fields__)
+
+
+def _get_post_or_404(db: Session, post_id: str, for_update: bool = False):
+    """Load a post (locked with ``for_update``) or raise a 404."""
+    db_post = crud.post.get_post(db, post_id=post_id, for_update=for_update)
+    if db_post is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return db_post
+
+def _check_topic(db: Session, topic_id) -> None:
+    """Reject a post that references a topic that doesn't exist."""
+    if topic_id and crud.topic.find_missing_topic_ids(db, [topic_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Topic with ID {topic_id} not found"
+        )
+
+@router.get("/", response_model=schemas.PostList, summary="List posts")
+def read_posts(
+    params: PostListParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve a page of posts, optionally filtered by status, topic and
+    publication date range.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page. ``content`` is left out of list items unless
+    ``include_content=true``, so listings don't ship every post body.
+    Ordering by ``published_at`` lists published posts (or those of the
+    given ``status``) that have a publication date.
+    """
+    rows = crud.post.get_post_rows(db, **params.filters())
+    rows, next_cursor = params.page(rows)
+    fields = POST_FIELDS if params.include_content else POST_SUMMARY_FIELDS
+    return FastJSONResponse({
+        "items": build_items(rows, fields),
+        "next_cursor": next_cursor,
+    })
+
+@router.post(
+    "/",
+    response_model=schemas.Post,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new post"
+)
+def create_post(
+    post: schemas.PostCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    feeds=Depends(get_feed_generator)
+):
+    """
+    Create a new post.
+
+    The slug is generated from the title; if it is taken, a numeric suffix
+    is appended. Creating a post as ``published`` stamps ``published_at``.
+    """
+    _check_topic(db, post.topic_id)
+    db_post = crud.post.create_post(db=db, post=post)
+    if db_post.status == "published":
+        schedule_post_change(background_tasks, feeds, db, db_post.id)
+    return db_post
+
+@router.get(
+    "/{post_id}",
+    response_model=schemas.Post,
+    summary="Get a post by ID"
+)
+def read_post(
+    post_id: str,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a specific post by its ID, including its content.
+    """
+    return _get_post_or_404(db, post_id)
+
+@router.put(
+    "/{post_id}",
+    response_model=schemas.Post,
+    summary="Update a post"
+)
+def update_post(
+    post_id: str,
+    post_update: schemas.PostUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    feeds=Depends(get_feed_generator)
+):
+    """
+    Update a post.
+    """
+    db_post = _get_post_or_404(db, post_id, for_update=True)
+    _check_topic(db, post_update.topic_id)
+    schedule_post_change(background_tasks, feeds, db, db_post.id)
+    return crud.post.update_post(db=db, db_post=db_post, post_update=post_update)
+
+@router.post(
+    "/{post_id}/publish",
+    response_model=schemas.Post,
+    summary="Publish a post"
+)
+def publish_post(
+    post_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    feeds=Depends(get_feed_generator)
+):
+    """
+    Publish a post.
+
+    ``published_at`` is set to the current time unless the post already
+    has one.
+    """
+    db_post = _get_post_or_404(db, post_id, for_update=True)
+    schedule_post_change(background_tasks, feeds, db, db_post.id)
+    return crud.post.publish_post(db=db, db_post=db_post)
+
+@router.get(
+    "/{post_id}/versions",
+    response_model=schemas.PostVersionList,
+    summary="List a post's versions"
+)
+def read_post_versions(
+    post_id: str,
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of versions to return"),
+    before: Optional[int] = Query(
+        None, ge=1, description="Only versions older than this one (from next_before)"
+    ),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List the saved versions of a post, newest first.
+
+    Every save that changes the title, content or excerpt adds a version.
+    """
+    db_post = _get_post_or_404(db, post_id)
+    rows = crud.post_version.get_version_rows(db, db_post.id, limit=limit + 1, before=before)
+    next_before = rows[limit - 1]["version_number"] if len(rows) > limit else None
+    return {"items": rows[:limit], "next_before": next_before}
+
+@router.get(
+    "/{post_id}/versions/diff",
+    response_model=schemas.PostVersionDiff,
+    summary="Compare two versions of a post"
+)
+def diff_post_versions(
+    post_id: str,
+    from_version: int = Query(..., alias="from", ge=1, description="Version to compare from"),
+    to_version: Optional[int] = Query(
+        None, alias="to", ge=1, description="Version to compare to (default: the latest)"
+    ),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Show what changed between two versions of a post, as a unified diff per
+    changed field.
+    """
+    db_post = _get_post_or_404(db, post_id)
+    diff = crud.post_version.diff_versions(
+        db, db_post.id, from_version, to_version or db_post.current_version
+    )
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Version not found"
+        )
+    return diff
+
+@router.get(
+    "/{post_id}/versions/{version_number}",
+    response_model=schemas.PostVersion,
+    summary="Get a version of a post"
+)
+def read_post_version(
+    post_id: str,
+    version_number: int,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the title, content and excerpt of a post as of one of its versions.
+    """
+    db_post = _get_post_or_404(db, post_id)
+    version = crud.post_version.get_version(db, db_post.id, version_number)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Version not found"
+        )
+    return version
+
+@router.delete(
+    "/{post_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a post"
+)
+def delete_post(
+    post_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    feeds=Depends(get_feed_generator)
+):
+    """
+    Delete a post.
+    """
+    db_post = _get_post_or_404(db, post_id)
+    schedule_post_change(background_tasks, feeds, db, db_post.id)
+    crud.post.delete_post(db, db_post=db_post)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
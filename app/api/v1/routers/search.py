@@ -0,0 +1,43 @@
+"""
+API endpoint for full-text search over posts and topics.
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.api.v1.dependencies import SearchParams
+from app.db.routing import get_read_db
+
+router = APIRouter()
+
+
+@router.get("/", response_model=schemas.SearchResults, summary="Search posts and topics")
+def search(
+    params: SearchParams = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Search post titles, excerpts, content and SEO keywords, and topic names
+    and descriptions.
+
+    Results are ranked by relevance (titles and names weigh most) and carry
+    a snippet with the matched words wrapped in ``<mark>``. Page with
+    ``offset`` and the returned ``next_offset``. When a query matches
+    nothing, titles are matched by similarity instead so typos still find
+    something; such responses have ``match`` set to ``fuzzy``.
+    """
+    hits, has_more, match = crud.search.search(
+        db,
+        params.q,
+        kinds=params.kinds,
+        status=params.status,
+        limit=params.limit,
+        offset=params.offset,
+        fuzzy=params.fuzzy,
+    )
+    return {
+        "query": params.q,
+        "match": match,
+        "items": hits,
+        "next_offset": params.offset + params.limit if has_more else None,
+    }
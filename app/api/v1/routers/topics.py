@@ -1,40 +1,118 @@
 """
 API endpoints for managing blog topics.
 """
-from typing import List, Optional
+from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+)
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, schemas
+from app.api.v1.dependencies import TOPIC_ORDER_MODE, TopicListParams, use_cache
+from app.api.v1.routers.feeds import get_feed_generator, schedule_topic_change
 from app.db.database import get_db
-from app.utils.slugify import unique_slug
+from app.db.routing import get_read_db
+from app.utils import http_cache
+from app.utils.serialization import FastJSONResponse, build_items
 
 router = APIRouter()
 
-@router.get("/", response_model=schemas.TopicList, summary="List all topics")
-def read_topics(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, le=1000, description="Maximum number of records to return"),
-    order_by: str = Query("position", description="Field to order by"),
-    order: str = Query("asc", description="Sort order ('asc' or 'desc')"),
-    db: Session = Depends(get_db)
+# Fields of a serialized topic, in wire order
+TOPIC_FIELDS = tuple(schemas.Topic.__fields__)
+
+
+def _schedule_rebalance(background_tasks: BackgroundTasks, db: Session, db_topic) -> None:
+    """Respace topic ranks after the response once a rank has grown too long."""
+    if crud.topic_order.needs_rebalance(db_topic):
+        background_tasks.add_task(crud.topic_order.rebalance_topic_ranks, db)
+
+def list_topics_response(
+    db: Session, request: Request, params: TopicListParams, cached: bool
+) -> Response:
+    """
+    Build the ``read_topics`` response: a 304, or the encoded page with its ETag.
+    
+    Shared with the async router, which runs it through ``AsyncSession.run_sync``.
+    """
+    latest, row_count = crud.topic_cache.get_topics_stamp(db, use_cache=cached)
+    etag = http_cache.make_etag(latest, row_count, sorted(request.query_params.multi_items()))
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified(etag)
+    
+    rows = crud.topic_cache.get_topic_rows(
+        db,
+        skip=params.skip,
+        limit=params.fetch_limit,
+        order_by=params.order_by,
+        order=params.order,
+        after=params.after,
+        use_cache=cached,
+    )
+    rows, next_cursor = params.page(rows)
+    if params.total == "exact":
+        count, strategy = row_count, "exact"
+    else:
+        count, strategy = crud.topic.count_topics(db, strategy=params.total)
+    
+    response = FastJSONResponse({
+        "items": build_items(rows, TOPIC_FIELDS),
+        "total": count,
+        "total_strategy": strategy,
+        "next_cursor": next_cursor,
+    })
+    http_cache.set_validators(response, etag)
+    return response
+
+def topic_response(
+    db: Session, request: Request, response: Response, topic_id: str, cached: bool
 ):
     """
-    Retrieve a list of topics with pagination and ordering.
+    Build the ``read_topic`` response: a 304, or the topic with its validators set.
+    
+    Shared with the async router, which runs it through ``AsyncSession.run_sync``.
+    
+    Raises:
+        HTTPException: 404 if the topic doesn't exist
     """
-    if order.lower() not in ("asc", "desc"):
+    db_topic = crud.topic_cache.get_topic(db, topic_id=topic_id, use_cache=cached)
+    if db_topic is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Order must be either 'asc' or 'desc'"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Topic not found"
         )
+    etag = http_cache.make_etag(db_topic.id, db_topic.updated_at)
+    if http_cache.is_not_modified(request, etag, db_topic.updated_at):
+        return http_cache.not_modified(etag, db_topic.updated_at)
+    http_cache.set_validators(response, etag, db_topic.updated_at)
+    return db_topic
+
+@router.get("/", response_model=schemas.TopicList, summary="List all topics")
+def read_topics(
+    request: Request,
+    params: TopicListParams = Depends(),
+    cached: bool = Depends(use_cache),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve a list of topics with pagination and ordering.
     
-    topics = crud.topic.get_topics(
-        db, skip=skip, limit=limit, order_by=order_by, order=order
-    )
-    total = db.query(models.topic.Topic).count()
+    Pass the returned ``next_cursor`` back as ``cursor`` to page by keyset,
+    which stays fast however deep the client goes. ``skip`` is kept for
+    backward compatibility but cannot be combined with a cursor.
+    Pages are served from the in-process topic cache unless the request sends
+    ``Cache-Control: no-cache``.
+    
+    The ETag is derived from the table's newest ``updated_at``, its row count
+    and the query string, so ``If-None-Match`` is answered with a 304 before
+    any rows are loaded. No ``Last-Modified`` is sent: deleting a topic
+    changes the list without moving its newest ``updated_at``.
     
-    return {"items": topics, "total": total}
+    Rows are selected as plain columns and encoded directly (orjson when
+    installed), skipping per-item Pydantic validation; the wire format is
+    that of ``TopicList``.
+    """
+    return list_topics_response(db, request, params, cached)
 
 @router.post(
     "/", 
@@ -44,20 +122,54 @@ def read_topics(
 )
 def create_topic(
     topic: schemas.TopicCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Create a new topic.
+    
+    The slug is generated from the name; if it is taken, a numeric suffix is
+    appended. A name with nothing to slugify is rejected with a 400.
     """
-    # Check if topic with the same name already exists
-    db_topic = crud.topic.get_topic_by_slug(db, slug=unique_slug(db, models.topic.Topic, topic.name))
-    if db_topic:
+    try:
+        db_topic = crud.topic.create_topic(db=db, topic=topic)
+    except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A topic with this name already exists"
+            detail=str(exc)
         )
+    _schedule_rebalance(background_tasks, db, db_topic)
+    return db_topic
+
+@router.post(
+    "/bulk",
+    response_model=schemas.TopicBulkResponse,
+    summary="Create or upsert many topics"
+)
+def bulk_create_topics(
+    payload: schemas.TopicBulkCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create many topics in one request.
     
-    return crud.topic.create_topic(db=db, topic=topic)
+    Slugs are resolved in one batch and rows are written with multi-row
+    inserts. Each item gets its own result, so one bad item doesn't fail the
+    rest.
+    """
+    results = crud.topic_bulk.bulk_create_topics(db, topics=payload.items, mode=payload.mode)
+    counts = {status_: 0 for status_ in ("created", "updated", "skipped", "error")}
+    for result in results:
+        counts[result["status"]] += 1
+    
+    return {
+        "mode": payload.mode,
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "skipped": counts["skipped"],
+        "failed": counts["error"],
+        "results": results,
+    }
 
 @router.get(
     "/{topic_id}", 
@@ -66,18 +178,18 @@ def create_topic(
 )
 def read_topic(
     topic_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    cached: bool = Depends(use_cache),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific topic by its ID.
+    
+    Responses carry an ETag built from the topic's ``id`` and ``updated_at``;
+    a matching ``If-None-Match`` or ``If-Modified-Since`` gets a 304.
     """
-    db_topic = crud.topic.get_topic(db, topic_id=topic_id)
-    if db_topic is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Topic not found"
-        )
-    return db_topic
+    return topic_response(db, request, response, topic_id, cached)
 
 @router.put(
     "/{topic_id}", 
@@ -87,7 +199,9 @@ def read_topic(
 def update_topic(
     topic_id: str,
     topic_update: schemas.TopicUpdate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    feeds=Depends(get_feed_generator)
 ):
     """
     Update a topic.
@@ -99,17 +213,15 @@ def update_topic(
             detail="Topic not found"
         )
     
-    # If name is being updated, check if the new name is already taken
-    if topic_update.name and topic_update.name != db_topic.name:
-        new_slug = unique_slug(db, models.topic.Topic, topic_update.name)
-        existing_topic = crud.topic.get_topic_by_slug(db, slug=new_slug)
-        if existing_topic and existing_topic.id != db_topic.id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A topic with this name already exists"
-            )
-    
-    return crud.topic.update_topic(db=db, db_topic=db_topic, topic_update=topic_update)
+    try:
+        db_topic = crud.topic.update_topic(db=db, db_topic=db_topic, topic_update=topic_update)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    schedule_topic_change(background_tasks, feeds, db, db_topic.id)
+    return db_topic
 
 @router.delete(
     "/{topic_id}",
@@ -131,15 +243,14 @@ def delete_topic(
         )
     
     # Check if the topic has any associated posts
-    post_count = db.query(models.post.Post).filter(models.post.Post.topic_id == topic_id).count()
-    if post_count > 0:
+    if crud.topic.topic_has_posts(db, topic_id=topic_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete a topic that has associated posts"
         )
     
     crud.topic.delete_topic(db, topic_id=topic_id)
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.post(
     "/reorder/",
@@ -159,15 +270,21 @@ def reorder_topics(
             detail="No topic IDs provided"
         )
     
-    # Verify all topic IDs exist
-    for topic_id in topic_ids:
-        if not crud.topic.get_topic(db, topic_id=topic_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Topic with ID {topic_id} not found"
-            )
+    if len(set(topic_ids)) != len(topic_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate topic IDs provided"
+        )
+    
+    # Verify all topic IDs exist (one query for the whole list)
+    missing = crud.topic.find_missing_topic_ids(db, topic_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Topic with ID {missing[0]} not found"
+        )
     
-    success = crud.topic.reorder_topics(db, topic_ids=topic_ids)
+    success = crud.topic_order.reorder_topics(db, topic_ids=topic_ids)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -175,3 +292,56 @@ def reorder_topics(
         )
     
     return {"message": "Topics reordered successfully"}
+
+@router.post(
+    "/{topic_id}/move",
+    response_model=schemas.Topic,
+    summary="Move a topic next to another one"
+)
+def move_topic(
+    topic_id: str,
+    move: schemas.TopicMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Move a single topic after (or before) another topic.
+    
+    In "rank" order mode only the moved row is updated; in "position" mode
+    only the rows between the topic's old and new place are.
+    """
+    if not move.after_id and not move.before_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either 'after_id' or 'before_id' must be provided"
+        )
+    if topic_id in (move.after_id, move.before_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A topic cannot be moved relative to itself"
+        )
+    
+    wanted = [i for i in (topic_id, move.after_id, move.before_id) if i]
+    found = crud.topic.get_topics_by_ids(db, wanted)
+    for wanted_id in wanted:
+        if wanted_id not in found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Topic with ID {wanted_id} not found"
+            )
+    
+    try:
+        db_topic = crud.topic_order.move_topic(
+            db,
+            db_topic=found[topic_id],
+            after=found.get(move.after_id) if move.after_id else None,
+            before=found.get(move.before_id) if move.before_id else None,
+            mode=TOPIC_ORDER_MODE,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    _schedule_rebalance(background_tasks, db, db_topic)
+    return db_topic
@@ -0,0 +1,153 @@
+"""
+Async API endpoints for blog topics.
+
+These handlers await an ``AsyncSession`` instead of occupying a worker
+thread per request. They are mounted ahead of the sync topic router when
+``USE_ASYNC_DB`` is enabled; any route not defined here (bulk, reorder,
+move) keeps being served by the sync router.
+
+Behaviour matches the sync handlers: reads go through ``get_async_read_db``
+(replica routing) and run the sync router's response builders on the
+session's sync view, so the topic cache, ETags and direct JSON encoding are
+shared; writes schedule the same rank rebalance and feed updates.
+"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.api.v1.dependencies import TopicListParams, use_cache
+from app.api.v1.routers.feeds import get_feed_generator, schedule_topic_change
+from app.api.v1.routers.topics import list_topics_response, topic_response
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
+
+router = APIRouter()
+
+
+def _schedule_rebalance(
+    background_tasks: BackgroundTasks, db: AsyncSession, db_topic
+) -> None:
+    """Respace topic ranks after the response once a rank has grown too long."""
+    if crud.topic_order.needs_rebalance(db_topic):
+        background_tasks.add_task(db.run_sync, crud.topic_order.rebalance_topic_ranks)
+
+
+@router.get("/", response_model=schemas.TopicList, summary="List all topics")
+async def read_topics(
+    request: Request,
+    params: TopicListParams = Depends(),
+    cached: bool = Depends(use_cache),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Retrieve a list of topics with pagination and ordering.
+    
+    Same cursors, caching, ETags and encoding as the sync handler.
+    """
+    return await db.run_sync(list_topics_response, request, params, cached)
+
+
+@router.post(
+    "/",
+    response_model=schemas.Topic,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new topic"
+)
+async def create_topic(
+    topic: schemas.TopicCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new topic.
+    """
+    try:
+        db_topic = await crud.topic_async.create_topic(db, topic=topic)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    _schedule_rebalance(background_tasks, db, db_topic)
+    return db_topic
+
+
+@router.get(
+    "/{topic_id}",
+    response_model=schemas.Topic,
+    summary="Get a topic by ID"
+)
+async def read_topic(
+    topic_id: str,
+    request: Request,
+    response: Response,
+    cached: bool = Depends(use_cache),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a specific topic by its ID, with the sync handler's ETag and 304s.
+    """
+    return await db.run_sync(topic_response, request, response, topic_id, cached)
+
+
+@router.put(
+    "/{topic_id}",
+    response_model=schemas.Topic,
+    summary="Update a topic"
+)
+async def update_topic(
+    topic_id: str,
+    topic_update: schemas.TopicUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    feeds=Depends(get_feed_generator)
+):
+    """
+    Update a topic.
+    """
+    db_topic = await crud.topic_async.get_topic(db, topic_id=topic_id)
+    if db_topic is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Topic not found"
+        )
+    try:
+        db_topic = await crud.topic_async.update_topic(
+            db, db_topic=db_topic, topic_update=topic_update
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    schedule_topic_change(background_tasks, feeds, db, db_topic.id)
+    return db_topic
+
+
+@router.delete(
+    "/{topic_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a topic"
+)
+async def delete_topic(
+    topic_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a topic.
+    """
+    db_topic = await crud.topic_async.get_topic(db, topic_id=topic_id)
+    if db_topic is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Topic not found"
+        )
+    
+    if await db.run_sync(crud.topic.topic_has_posts, topic_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete a topic that has associated posts"
+        )
+    
+    await crud.topic_async.delete_topic(db, topic_id=topic_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
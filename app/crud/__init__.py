@@ -0,0 +1,12 @@
+"""
+CRUD operations package.
+"""
+from . import (
+    cache_version, export, generation_job, image, post, post_version, publishing, search, topic,
+    topic_async, topic_bulk, topic_cache, topic_order,
+)
+
+__all__ = [
+    "cache_version", "export", "generation_job", "image", "post", "post_version", "publishing",
+    "search", "topic", "topic_async", "topic_bulk", "topic_cache", "topic_order",
+]
@@ -0,0 +1,109 @@
+"""
+CRUD operations for CacheVersion model.
+"""
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+
+
+def get_cache_version(db: Session, name: str) -> Optional[int]:
+    """
+    Read the current version stamp of a cache.
+    
+    Args:
+        db: Database session
+        name: Cache name (e.g. "topics")
+        
+    Returns:
+        The version, or None if it was never bumped
+    """
+    return db.query(CacheVersion.version).filter(CacheVersion.name == name).scalar()
+
+def bump_cache_version(db: Session, name: str) -> None:
+    """
+    Increment a cache's version stamp and commit.
+    
+    Uses a single ``INSERT ... ON CONFLICT DO UPDATE`` on Postgres and SQLite
+    so the row is created on first use without an extra round trip.
+    
+    Args:
+        db: Database session
+        name: Cache name (e.g. "topics")
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        table = CacheVersion.__table__
+        insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        db.execute(
+            insert.values(name=name, version=1).on_conflict_do_update(
+                index_elements=["name"], set_={"version": table.c.version + 1}
+            )
+        )
+        db.commit()
+        return
+    
+    result = db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.add(CacheVersion(name=name, version=1))
+        try:
+            db.commit()
+            return
+        except IntegrityError:
+            # Reason: another worker created the row first; bump theirs instead
+            db.rollback()
+            return bump_cache_version(db, name)
+    db.commit()
+
+def claim_cache_version(db: Session, name: str) -> int:
+    """
+    Increment a cache's version stamp without committing and return it.
+    
+    The row stays locked until the caller commits or rolls back, so writers
+    that claim the same name run one at a time (on SQLite, the write lock
+    covers the whole database). A claimed version one above the last one a
+    process committed means nobody else wrote in between.
+    
+    Args:
+        db: Database session; the caller commits once its update is done
+        name: Cache name (e.g. "feeds")
+        
+    Returns:
+        The new version
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        table = CacheVersion.__table__
+        insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+        db.execute(
+            insert.values(name=name, version=1).on_conflict_do_update(
+                index_elements=["name"], set_={"version": table.c.version + 1}
+            )
+        )
+        return get_cache_version(db, name)
+    
+    result = db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.add(CacheVersion(name=name, version=1))
+        try:
+            db.flush()
+        except IntegrityError:
+            # Reason: another worker created the row first; bump theirs instead
+            db.rollback()
+            return claim_cache_version(db, name)
+    return get_cache_version(db, name)
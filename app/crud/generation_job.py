@@ -0,0 +1,136 @@
+"""
+CRUD operations for GenerationJob model.
+
+The generation queue keeps jobs in memory; these functions persist their
+progress and apply their output to posts.
+"""
+import uuid
+from typing import Any, Callable, Mapping, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.crud import post as post_crud
+from app.generation.cache import build_response_cache
+from app.generation.jobs import Job
+from app.generation.providers import LLMProvider
+from app.generation.queue import GenerationQueue
+from app.models.generation_job import GenerationJob as GenerationJobModel
+from app.models.post import Post as PostModel
+from app.schemas.post import PostUpdate
+
+# Job fields copied to the row whenever the status changes
+JOB_PROGRESS_FIELDS = ("status", "attempts", "cached", "error", "started_at", "finished_at")
+
+
+def create_job(db: Session, job: Job) -> GenerationJobModel:
+    """
+    Store a newly queued job.
+
+    Args:
+        db: Database session
+        job: Job returned by the queue
+
+    Returns:
+        Created GenerationJobModel instance
+    """
+    db_job = GenerationJobModel(
+        id=uuid.UUID(job.id),
+        post_id=post_crud._parse_uuid(job.owner),
+        provider=job.provider,
+        model=job.request.model,
+        request_key=job.request.key,
+        created_at=job.created_at,
+        **{field: getattr(job, field) for field in JOB_PROGRESS_FIELDS},
+    )
+    db.add(db_job)
+    db.commit()
+    return db_job
+
+def update_job(db: Session, job: Job) -> None:
+    """
+    Copy a job's status, attempts, error and timestamps to its row.
+
+    Args:
+        db: Database session
+        job: Job whose status changed
+    """
+    db.execute(
+        update(GenerationJobModel)
+        .where(GenerationJobModel.id == uuid.UUID(job.id))
+        .values({field: getattr(job, field) for field in JOB_PROGRESS_FIELDS})
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+def get_job(db: Session, job_id: str) -> Optional[GenerationJobModel]:
+    """
+    Get a stored job by ID.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+
+    Returns:
+        GenerationJobModel if found, None otherwise
+    """
+    job_uuid = post_crud._parse_uuid(job_id)
+    if job_uuid is None:
+        return None
+    return db.get(GenerationJobModel, job_uuid)
+
+def apply_generated_content(db: Session, post_id: str, text: str) -> PostModel:
+    """
+    Save generated text as a post's content, recording a new version.
+
+    Args:
+        db: Database session
+        post_id: ID of the post the job was for
+        text: Generated content
+
+    Returns:
+        Updated PostModel instance
+
+    Raises:
+        LookupError: If the post was deleted while the job ran
+    """
+    db_post = post_crud.get_post(db, post_id, for_update=True)
+    if db_post is None:
+        raise LookupError(f"Post {post_id} no longer exists")
+    return post_crud.update_post(db, db_post, PostUpdate(content=text))
+
+def build_generation_queue(
+    session_factory: Callable[[], Session],
+    providers: Optional[Mapping[str, LLMProvider]] = None,
+    **options: Any,
+) -> GenerationQueue:
+    """
+    Create a queue that stores its jobs and writes their output to posts.
+
+    Responses are cached in the database unless GENERATION_CACHE_ENABLED is
+    off or a ``cache`` option is given.
+
+    Args:
+        session_factory: Creates the sessions the hooks run in (one per call,
+            since hooks run on worker threads)
+        providers: Provider instances by name (default: built from the registry)
+        **options: Further GenerationQueue arguments
+
+    Returns:
+        GenerationQueue, started on first submit
+    """
+    def on_status(job: Job) -> None:
+        with session_factory() as db:
+            # Reason: a job joining a running call is first seen as running
+            if not job.stored:
+                create_job(db, job)
+                job.stored = True
+            else:
+                update_job(db, job)
+
+    def on_result(job: Job, text: str) -> None:
+        with session_factory() as db:
+            apply_generated_content(db, job.owner, text)
+
+    options.setdefault("cache", build_response_cache(session_factory))
+    return GenerationQueue(providers, on_status=on_status, on_result=on_result, **options)
@@ -0,0 +1,177 @@
+"""
+CRUD operations for Image and ImageDerivative models.
+
+Files are deduplicated by content hash: an upload whose sha256 is already
+stored reuses that original and its derivatives, and one already attached
+to the same post returns the existing image.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.crud.post import _parse_uuid
+from app.models.image import Image as ImageModel
+from app.models.image import ImageDerivative as ImageDerivativeModel
+
+# Image columns copied from an already stored file with the same content
+CONTENT_FIELDS = (
+    "content_hash", "storage_path", "url", "format", "width", "height", "size", "placeholder"
+)
+
+
+def content_of(image: ImageModel) -> Dict[str, Any]:
+    """Columns describing an image's stored file, to share with a new image."""
+    return {field: getattr(image, field) for field in CONTENT_FIELDS}
+
+def get_image(db: Session, image_id: str) -> Optional[ImageModel]:
+    """
+    Get an image by ID.
+
+    Args:
+        db: Database session
+        image_id: ID of the image
+
+    Returns:
+        ImageModel if found, None otherwise
+    """
+    image_uuid = _parse_uuid(image_id)
+    if image_uuid is None:
+        return None
+    return db.get(ImageModel, image_uuid)
+
+def get_post_images(db: Session, post_id: str) -> List[ImageModel]:
+    """
+    Get a post's images, oldest first.
+
+    Args:
+        db: Database session
+        post_id: ID of the post
+
+    Returns:
+        List of ImageModel instances
+    """
+    return db.execute(
+        select(ImageModel)
+        .where(ImageModel.post_id == _parse_uuid(post_id))
+        .order_by(ImageModel.created_at, ImageModel.id)
+    ).scalars().all()
+
+def find_by_content(
+    db: Session, content_hash: str, post_id: Optional[str] = None
+) -> Optional[ImageModel]:
+    """
+    Find an image whose file has this content, preferring one of ``post_id``.
+
+    Args:
+        db: Database session
+        content_hash: sha256 of the file
+        post_id: Post the new upload is for, if any
+
+    Returns:
+        The image of ``post_id`` with this content if there is one, else any
+        image with this content, else None
+    """
+    post_uuid = _parse_uuid(post_id) if post_id else None
+    stored = (
+        select(ImageModel)
+        .where(ImageModel.content_hash == content_hash, ImageModel.storage_path.isnot(None))
+        .order_by(ImageModel.created_at)
+        .limit(1)
+    )
+    same_post = stored.where(
+        ImageModel.post_id == post_uuid if post_uuid else ImageModel.post_id.is_(None)
+    )
+    return (
+        db.execute(same_post).scalar_one_or_none()
+        or db.execute(stored).scalar_one_or_none()
+    )
+
+def get_derivatives(
+    db: Session, content_hashes: Iterable[str]
+) -> Dict[str, List[ImageDerivativeModel]]:
+    """
+    Get the derivatives of several files in one query.
+
+    Args:
+        db: Database session
+        content_hashes: sha256 of each file
+
+    Returns:
+        dict mapping each hash to its derivatives, widest first
+    """
+    hashes = {content_hash for content_hash in content_hashes if content_hash}
+    derivatives: Dict[str, List[ImageDerivativeModel]] = {key: [] for key in hashes}
+    if not hashes:
+        return derivatives
+    rows = db.execute(
+        select(ImageDerivativeModel)
+        .where(ImageDerivativeModel.content_hash.in_(hashes))
+        .order_by(ImageDerivativeModel.width.desc(), ImageDerivativeModel.format)
+    ).scalars()
+    for row in rows:
+        derivatives[row.content_hash].append(row)
+    return derivatives
+
+def create_image(
+    db: Session,
+    content: Mapping[str, Any],
+    derivatives: Sequence[Mapping[str, Any]] = (),
+    post_id: Optional[str] = None,
+    alt_text: Optional[str] = None,
+    prompt: Optional[str] = None,
+    is_featured: bool = False,
+) -> ImageModel:
+    """
+    Record an image and the derivatives rendered for its file.
+
+    Derivatives already recorded for the same content (e.g. by a concurrent
+    upload of the same file) are kept.
+
+    Args:
+        db: Database session
+        content: Columns describing the stored file (``CONTENT_FIELDS``)
+        derivatives: ImageDerivative rows to record, if the file is new
+        post_id: Post the image belongs to
+        alt_text: Alternative text
+        prompt: Prompt the image was generated from
+        is_featured: Make it the post's featured image
+
+    Returns:
+        Created ImageModel instance
+    """
+    post_uuid = _parse_uuid(post_id) if post_id else None
+    if is_featured and post_uuid is not None:
+        # Reason: mirrors ensure_single_featured_image_trigger, which the
+        # SQLite test database doesn't have
+        db.execute(
+            update(ImageModel)
+            .where(ImageModel.post_id == post_uuid, ImageModel.is_featured.is_(True))
+            .values(is_featured=False)
+            .execution_options(synchronize_session=False)
+        )
+    db_image = ImageModel(
+        post_id=post_uuid,
+        alt_text=alt_text,
+        prompt=prompt,
+        is_featured=is_featured,
+        **{field: content[field] for field in CONTENT_FIELDS},
+    )
+    db.add(db_image)
+    if derivatives:
+        table = ImageDerivativeModel.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+            db.execute(insert.values(list(derivatives)).on_conflict_do_nothing())
+        else:
+            known = get_derivatives(db, [content["content_hash"]])[content["content_hash"]]
+            keys = {(row.format, row.width) for row in known}
+            new = [row for row in derivatives if (row["format"], row["width"]) not in keys]
+            if new:
+                db.execute(table.insert(), new)
+    db.commit()
+    db.refresh(db_image)
+    return db_image
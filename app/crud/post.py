@@ -0,0 +1,300 @@
+"""
+CRUD operations for Post model.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.crud import post_version as version_crud
+from app.models.post import Post as PostModel
+from app.models.topic import _utcnow
+from app.schemas.post import PostCreate, PostUpdate
+from app.utils.slugify import commit_with_unique_slug, slugify
+
+# Fields clients may order post lists by; anything else falls back to created_at.
+# Each one leads (after the filter columns) an index ending in ``id``.
+POST_ORDER_FIELDS = ("created_at", "published_at")
+
+# Columns returned by list endpoints unless the body is asked for
+POST_LIST_COLUMNS = tuple(
+    column for column in PostModel.__table__.columns if column.name != "content"
+)
+
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    """Parse an ID, returning None when it isn't a valid UUID."""
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a timestamp to UTC, reading naive values as UTC already."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def resolve_order_field(order_by: str) -> str:
+    """
+    Map a requested ordering onto a supported post field.
+
+    Args:
+        order_by: Field name requested by the client
+
+    Returns:
+        The field name to order by (defaults to created_at)
+    """
+    return order_by if order_by in POST_ORDER_FIELDS else "created_at"
+
+def cursor_type(order_by: str) -> type:
+    """
+    Get the Python type of the field a post list is ordered by.
+
+    Args:
+        order_by: Field name requested by the client
+
+    Returns:
+        Type a cursor's sort key must have for this ordering
+    """
+    return getattr(PostModel, resolve_order_field(order_by)).type.python_type
+
+def cursor_value(row: Any, order_by: str) -> Any:
+    """
+    Get the sort key of a post for building a pagination cursor.
+
+    Args:
+        row: Post (model or column mapping) at the end of a page
+        order_by: Field the page is ordered by
+
+    Returns:
+        Value of the ordering field on the post
+    """
+    field = resolve_order_field(order_by)
+    if isinstance(row, Mapping):
+        return row[field]
+    return getattr(row, field)
+
+def posts_statement(
+    status: Optional[str] = None,
+    topic_id: Optional[uuid.UUID] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    order_by: str = "created_at",
+    order: str = "desc",
+    limit: int = 100,
+    after: Optional[Tuple[Any, uuid.UUID]] = None,
+    include_content: bool = False,
+) -> Select:
+    """
+    Build the SELECT behind a post list page.
+
+    Filters are equality on ``status`` / ``topic_id`` and a range on
+    ``published_at``, and rows are ordered by the requested field then
+    ``id``, so each list view reads one of the composite indexes on
+    ``posts`` in order. Ordering by ``published_at`` only lists posts that
+    have one, which keeps NULLs out of the keyset; callers pair it with a
+    ``status`` filter so the ``(status, published_at, id)`` index applies.
+
+    Args:
+        status: Only posts in this workflow state
+        topic_id: Only posts of this topic
+        published_after: Only posts published at or after this time
+        published_before: Only posts published before this time
+        order_by: Field to order by (default: created_at)
+        order: Sort order ('asc' or 'desc')
+        limit: Maximum number of records to return
+        after: ``(value, id)`` of the last row already seen; when given, the
+            page starts right after it (keyset pagination)
+        include_content: Also select the post body
+
+    Returns:
+        SQLAlchemy Select statement over plain columns
+    """
+    columns = PostModel.__table__.columns if include_content else POST_LIST_COLUMNS
+    query = select(*columns)
+
+    if status is not None:
+        query = query.where(PostModel.status == status)
+    if topic_id is not None:
+        query = query.where(PostModel.topic_id == topic_id)
+    if published_after is not None:
+        query = query.where(PostModel.published_at >= _to_utc(published_after))
+    if published_before is not None:
+        query = query.where(PostModel.published_at < _to_utc(published_before))
+
+    field_name = resolve_order_field(order_by)
+    order_field = getattr(PostModel, field_name)
+    if field_name == "published_at":
+        query = query.where(PostModel.published_at.isnot(None))
+    descending = order.lower() == "desc"
+
+    if after is not None:
+        value, last_uuid = after
+        # Reason: (field, id) row comparison written out so it works on every backend
+        if descending:
+            query = query.where(or_(
+                order_field < value,
+                and_(order_field == value, PostModel.id < last_uuid),
+            ))
+        else:
+            query = query.where(or_(
+                order_field > value,
+                and_(order_field == value, PostModel.id > last_uuid),
+            ))
+
+    if descending:
+        query = query.order_by(order_field.desc(), PostModel.id.desc())
+    else:
+        query = query.order_by(order_field.asc(), PostModel.id.asc())
+
+    return query.limit(limit)
+
+def get_post_rows(db: Session, **filters: Any) -> List[Mapping[str, Any]]:
+    """
+    Get a page of posts as column mappings.
+
+    Args:
+        db: Database session
+        **filters: Arguments for :func:`posts_statement`
+
+    Returns:
+        List of column name -> value mappings, in list order
+    """
+    return db.execute(posts_statement(**filters)).mappings().all()
+
+def get_post(db: Session, post_id: str, for_update: bool = False) -> Optional[PostModel]:
+    """
+    Get a single post by ID.
+
+    Args:
+        db: Database session
+        post_id: ID of the post to retrieve
+        for_update: Lock the row (``SELECT ... FOR UPDATE``) until the
+            session commits, and re-read it even if the session holds it.
+            Load posts this way before :func:`update_post`, so concurrent
+            saves queue up instead of numbering the same version
+
+    Returns:
+        PostModel if found, None otherwise
+    """
+    post_uuid = _parse_uuid(post_id)
+    if post_uuid is None:
+        return None
+    if not for_update:
+        return db.get(PostModel, post_uuid)
+    return db.get(PostModel, post_uuid, with_for_update=True, populate_existing=True)
+
+def _prepare_values(values: dict, db_post: Optional[PostModel] = None) -> dict:
+    """
+    Convert API field values to column values.
+
+    Parses ``topic_id``, stores timestamps in UTC and stamps
+    ``published_at`` when a post becomes published without one.
+    """
+    if values.get("topic_id") is not None:
+        values["topic_id"] = _parse_uuid(values["topic_id"])
+    if "published_at" in values:
+        values["published_at"] = _to_utc(values["published_at"])
+    already_published = db_post is not None and db_post.published_at is not None
+    if (
+        values.get("status") == "published"
+        and values.get("published_at") is None
+        and not already_published
+    ):
+        values["published_at"] = _utcnow()
+    return values
+
+def create_post(db: Session, post: PostCreate) -> PostModel:
+    """
+    Create a new post.
+
+    The slug is derived from the title and suffixed (``-1``, ``-2``...) when
+    it is already taken. The post's first version is stored as a snapshot.
+
+    Args:
+        db: Database session
+        post: Post data to create
+
+    Returns:
+        Created PostModel instance
+    """
+    db_post = PostModel(id=uuid.uuid4(), **_prepare_values(post.dict()))
+    version = version_crud.build_version(
+        db_post.id, 0, None, version_crud.versioned_values(db_post)
+    )
+    db_post.current_version = version.version_number
+    commit_with_unique_slug(db, db_post, post.title, pending=[version])
+    db.refresh(db_post)
+    return db_post
+
+def update_post(db: Session, db_post: PostModel, post_update: PostUpdate) -> PostModel:
+    """
+    Update an existing post.
+
+    Changing the title regenerates the slug unless the new title slugifies
+    to the slug the post already has. A change to the title, content or
+    excerpt is recorded as a new version in the same commit, numbered and
+    diffed from ``db_post`` as loaded, so load it with
+    ``get_post(..., for_update=True)``.
+
+    Args:
+        db: Database session
+        db_post: Post to update
+        post_update: Updated post data
+
+    Returns:
+        Updated PostModel instance
+    """
+    update_data = _prepare_values(post_update.dict(exclude_unset=True), db_post)
+
+    previous = version_crud.versioned_values(db_post)
+    version = version_crud.build_version(
+        db_post.id, db_post.current_version, previous, {**previous, **update_data}
+    )
+    pending = []
+    if version is not None:
+        update_data["current_version"] = version.version_number
+        pending.append(version)
+
+    new_title = update_data.get("title")
+    if new_title and slugify(new_title) != db_post.slug:
+        commit_with_unique_slug(db, db_post, new_title, values=update_data, pending=pending)
+    else:
+        for field, value in update_data.items():
+            setattr(db_post, field, value)
+        db.add(db_post)
+        db.add_all(pending)
+        db.commit()
+    db.refresh(db_post)
+    return db_post
+
+def publish_post(db: Session, db_post: PostModel) -> PostModel:
+    """
+    Mark a post as published, stamping ``published_at`` if it has none.
+
+    Args:
+        db: Database session
+        db_post: Post to publish
+
+    Returns:
+        Updated PostModel instance
+    """
+    return update_post(db, db_post, PostUpdate(status="published"))
+
+def delete_post(db: Session, db_post: PostModel) -> None:
+    """
+    Delete a post and its version history.
+
+    Args:
+        db: Database session
+        db_post: Post to delete
+    """
+    version_crud.delete_versions(db, db_post.id)
+    db.delete(db_post)
+    db.commit()
@@ -0,0 +1,196 @@
+"""
+Reads feeding the static site export and the feed and sitemap generator,
+and the log of feed updates the generators of several processes share.
+
+Posts are streamed through a server-side cursor with their topic's name;
+each chunk's images are loaded with one more query, so memory and round
+trips grow with the chunk size rather than the number of posts.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.crud.export import EXPORT_CHUNK_SIZE
+from app.crud.post import _parse_uuid
+from app.models.feed_change import FeedChange
+from app.models.image import Image as ImageModel
+from app.models.post import Post as PostModel
+from app.models.topic import Topic as TopicModel
+
+# Post columns the exporter renders from
+EXPORT_POST_FIELDS = (
+    "id", "slug", "title", "excerpt", "content", "status", "published_at", "created_at",
+    "updated_at", "seo_title", "seo_description", "seo_keywords",
+)
+
+
+def stream_export_posts(
+    db: Session,
+    include_drafts: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream the posts to publish, in chunks, with their topic and images.
+
+    Args:
+        db: Database session (must stay open while the iterator is consumed)
+        include_drafts: Also export drafts and posts in review (archived
+            posts never are)
+        chunk_size: Posts fetched per round trip
+
+    Yields:
+        Lists of up to ``chunk_size`` post dicts (``EXPORT_POST_FIELDS`` with
+        ``id`` as a string, plus ``topic_name`` and ``images``, featured
+        image first)
+    """
+    post = PostModel.__table__
+    statuses = ("published", "draft", "in_review") if include_drafts else ("published",)
+    statement = (
+        select(
+            *[post.c[name] for name in EXPORT_POST_FIELDS], TopicModel.name.label("topic_name")
+        )
+        .select_from(post.outerjoin(TopicModel, TopicModel.id == post.c.topic_id))
+        .where(post.c.status.in_(statuses))
+        .order_by(post.c.id)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    for partition in db.execute(statement).partitions(chunk_size):
+        posts = [dict(row._mapping) for row in partition]
+        images = _images_by_post(db, [row["id"] for row in posts])
+        for row in posts:
+            row["images"] = images.get(row["id"], [])
+            row["id"] = str(row["id"])
+        yield posts
+
+
+def _images_by_post(db: Session, post_ids: List[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    """Images of several posts, featured first, then oldest first."""
+    images: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    if not post_ids:
+        return images
+    rows = db.execute(
+        select(
+            ImageModel.post_id, ImageModel.url, ImageModel.alt_text, ImageModel.content_hash,
+            ImageModel.is_featured,
+        )
+        .where(ImageModel.post_id.in_(post_ids))
+        .order_by(ImageModel.post_id, ImageModel.is_featured.desc(), ImageModel.created_at)
+    )
+    for post_id, url, alt_text, content_hash, is_featured in rows:
+        images[post_id].append({
+            "url": url,
+            "alt_text": alt_text,
+            "content_hash": content_hash,
+            "is_featured": bool(is_featured),
+        })
+    return images
+
+
+def _feed_posts_statement():
+    post = PostModel.__table__
+    return (
+        select(
+            post.c.id, post.c.slug, post.c.title, post.c.excerpt,
+            func.coalesce(post.c.published_at, post.c.created_at).label("published_at"),
+            post.c.updated_at, post.c.topic_id,
+            TopicModel.name.label("topic_name"), TopicModel.slug.label("topic_slug"),
+        )
+        .select_from(post.outerjoin(TopicModel, TopicModel.id == post.c.topic_id))
+        .where(post.c.status == "published")
+    )
+
+
+def stream_feed_posts(
+    db: Session, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream every published post's feed and sitemap fields, in chunks.
+
+    Args:
+        db: Database session (must stay open while the iterator is consumed)
+        chunk_size: Posts fetched per round trip
+
+    Yields:
+        Lists of post dicts (``published_at`` falls back to ``created_at``;
+        ``topic_name`` and ``topic_slug`` are None without a topic)
+    """
+    statement = _feed_posts_statement().execution_options(
+        stream_results=True, yield_per=chunk_size
+    )
+    for partition in db.execute(statement).partitions(chunk_size):
+        yield [dict(row._mapping) for row in partition]
+
+
+def get_feed_post(db: Session, post_id: str) -> Optional[Dict[str, Any]]:
+    """
+    One post's feed and sitemap fields.
+
+    Returns:
+        Post dict as yielded by ``stream_feed_posts``, or None when the post
+        doesn't exist or isn't published
+    """
+    post_uuid = _parse_uuid(post_id)
+    if post_uuid is None:
+        return None
+    row = db.execute(
+        _feed_posts_statement().where(PostModel.__table__.c.id == post_uuid)
+    ).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def get_feed_topic(db: Session, topic_id: str) -> Optional[Dict[str, Any]]:
+    """A topic's ``id``, ``name`` and ``slug``, or None if it doesn't exist."""
+    topic_uuid = _parse_uuid(topic_id)
+    if topic_uuid is None:
+        return None
+    row = db.execute(
+        select(TopicModel.id, TopicModel.name, TopicModel.slug).where(TopicModel.id == topic_uuid)
+    ).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def record_feed_change(
+    db: Session, version: int, kind: str, object_id: Optional[str], shards: int
+) -> None:
+    """
+    Log the feed update made under a ``feeds`` stamp, without committing.
+
+    Args:
+        db: Database session; committed with the update itself
+        version: Stamp claimed for the update
+        kind: "post", "topic", or "load" for a full rebuild
+        object_id: ID of the post or topic applied (None for a load)
+        shards: Sitemap shards the generator has after the update
+    """
+    db.add(FeedChange(
+        version=version, kind=kind,
+        object_id=str(object_id) if object_id is not None else None, shards=shards,
+    ))
+    db.flush()
+
+
+def get_feed_changes(db: Session, after: int, before: int) -> List[Dict[str, Any]]:
+    """
+    The logged feed updates with stamps strictly between ``after`` and ``before``.
+
+    Returns:
+        Dicts of ``version``, ``kind``, ``object_id`` and ``shards``, oldest
+        first; fewer than the stamps in between once the log was pruned
+    """
+    rows = db.execute(
+        select(FeedChange.version, FeedChange.kind, FeedChange.object_id, FeedChange.shards)
+        .where(FeedChange.version > after, FeedChange.version < before)
+        .order_by(FeedChange.version)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def prune_feed_changes(db: Session, before: int) -> None:
+    """Delete the logged feed updates with stamps below ``before``, without committing."""
+    db.execute(
+        delete(FeedChange)
+        .where(FeedChange.version < before)
+        .execution_options(synchronize_session=False)
+    )
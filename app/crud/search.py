@@ -0,0 +1,332 @@
+"""
+Full-text search over posts and topics.
+
+On Postgres, queries run against the generated ``search_vector`` columns
+(GIN-indexed) and fall back to trigram title matching when nothing matches.
+Other databases (e.g. SQLite in the test suite) are served from an
+in-process :class:`~app.utils.search_index.InvertedIndex` that is brought up
+to date from the tables before each search.
+"""
+import html
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.post import Post as PostModel
+from app.models.search import SEARCH_CONFIG
+from app.models.topic import Topic as TopicModel
+from app.utils.search_index import (
+    HIGHLIGHT_START, HIGHLIGHT_STOP, SNIPPET_WORDS, WEIGHT_A, WEIGHT_B, WEIGHT_C,
+    InvertedIndex, highlight,
+)
+
+# Kinds of documents that can be searched
+SEARCH_KINDS = ("post", "topic")
+
+# Matches ranked per kind and query on Postgres. Ranking reads each match's
+# tsvector, so very common terms are capped here to keep latency flat; the
+# GIN index still finds the candidates.
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "5000"))
+
+# Characters of plain text shown for fuzzy (title-only) matches
+FUZZY_SNIPPET_CHARS = 200
+
+# Private-use characters ts_headline puts around matches; they become
+# HIGHLIGHT_START/STOP once the rest of the snippet is HTML-escaped
+_MATCH_START, _MATCH_STOP = "\ue000", "\ue001"
+
+_HEADLINE_OPTIONS = (
+    f'StartSel="{_MATCH_START}", StopSel="{_MATCH_STOP}", '
+    f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+)
+_TSQUERY = f"websearch_to_tsquery('{SEARCH_CONFIG}', :q)"
+
+
+def search(
+    db: Session,
+    query: str,
+    kinds: Sequence[str] = SEARCH_KINDS,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    fuzzy: bool = True,
+) -> Tuple[List[Dict[str, Any]], bool, str]:
+    """
+    Search posts and topics, best match first.
+
+    Args:
+        db: Database session
+        query: Web-search style query (words, ``"phrases"``, ``OR``, ``-word``)
+        kinds: Which of SEARCH_KINDS to search
+        status: Only posts in this workflow state (topics are unaffected)
+        limit: Maximum number of hits to return
+        offset: Number of best hits to skip
+        fuzzy: On a first page without full-text matches, match titles by
+            trigram similarity instead
+
+    Returns:
+        Tuple of (hits, whether more hits follow, "fulltext" or "fuzzy").
+        Each hit has type, id, title, slug, snippet, rank, status, topic_id
+        and published_at.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        backend = _search_postgres, _fuzzy_postgres
+    else:
+        backend = _search_memory, _fuzzy_memory
+
+    hits, has_more = backend[0](db, query, kinds, status, limit, offset)
+    if hits or not fuzzy or offset:
+        return hits, has_more, "fulltext"
+    return backend[1](db, query, kinds, status, limit), False, "fuzzy"
+
+def _hit(row: Any) -> Dict[str, Any]:
+    """Shape a result row into a hit."""
+    return {
+        "type": row["type"],
+        "id": str(row["id"]),
+        "title": row["title"],
+        "slug": row["slug"],
+        "snippet": row["snippet"],
+        "rank": float(row["rank"]),
+        "status": row["status"],
+        "topic_id": str(row["topic_id"]) if row["topic_id"] is not None else None,
+        "published_at": row["published_at"],
+    }
+
+def _escape_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a Postgres snippet, then mark the matches ts_headline delimited."""
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_STOP, HIGHLIGHT_STOP)
+
+def _pg_hit(row: Any) -> Dict[str, Any]:
+    """Shape a Postgres result row into a hit with an escaped snippet."""
+    return _hit({**row, "snippet": _escape_snippet(row["snippet"])})
+
+def _pg_branches(kinds: Sequence[str], status: Optional[str], fuzzy: bool) -> List[str]:
+    """One SELECT per searched table, with columns lined up for UNION ALL."""
+    status_clause = " AND status = :status" if status is not None else ""
+    branches = []
+    if "post" in kinds:
+        if fuzzy:
+            branches.append(
+                "(SELECT 'post' AS type, id, title, slug, status, topic_id, published_at,"
+                " word_similarity(:q, title) AS rank,"
+                f" left(coalesce(excerpt, content), {FUZZY_SNIPPET_CHARS}) AS snippet"
+                f" FROM posts WHERE :q <% title{status_clause}"
+                " ORDER BY rank DESC, id LIMIT :limit)"
+            )
+        else:
+            branches.append(
+                "(SELECT 'post' AS type, c.id, c.title, c.slug, c.status, c.topic_id,"
+                f" c.published_at, ts_rank_cd(c.search_vector, {_TSQUERY}, 32) AS rank"
+                " FROM (SELECT id, title, slug, status, topic_id, published_at, search_vector"
+                f" FROM posts WHERE search_vector @@ {_TSQUERY}{status_clause}"
+                " LIMIT :candidates) AS c"
+                " ORDER BY rank DESC, c.id LIMIT :window)"
+            )
+    if "topic" in kinds:
+        if fuzzy:
+            branches.append(
+                "(SELECT 'topic' AS type, id, name AS title, slug, NULL::text AS status,"
+                " NULL::uuid AS topic_id, NULL::timestamptz AS published_at,"
+                " word_similarity(:q, name) AS rank,"
+                f" left(description, {FUZZY_SNIPPET_CHARS}) AS snippet"
+                " FROM topics WHERE :q <% name"
+                " ORDER BY rank DESC, id LIMIT :limit)"
+            )
+        else:
+            branches.append(
+                "(SELECT 'topic' AS type, c.id, c.name AS title, c.slug, NULL::text AS status,"
+                " NULL::uuid AS topic_id, NULL::timestamptz AS published_at,"
+                f" ts_rank_cd(c.search_vector, {_TSQUERY}, 32) AS rank"
+                " FROM (SELECT id, name, slug, search_vector"
+                f" FROM topics WHERE search_vector @@ {_TSQUERY} LIMIT :candidates) AS c"
+                " ORDER BY rank DESC, c.id LIMIT :window)"
+            )
+    return branches
+
+def _search_postgres(
+    db: Session, query: str, kinds: Sequence[str], status: Optional[str], limit: int, offset: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked full-text search on the GIN-indexed tsvector columns."""
+    branches = _pg_branches(kinds, status, fuzzy=False)
+    if not branches:
+        return [], False
+    # Reason: ts_headline re-parses the source text, so it only runs for the
+    # rows of the page, after ranking and LIMIT
+    statement = text(
+        f"WITH hits AS ({' UNION ALL '.join(branches)}) "
+        "SELECT h.*, ts_headline("
+        f"'{SEARCH_CONFIG}', coalesce(p.content, p.excerpt, t.description, h.title),"
+        f" {_TSQUERY}, :headline) AS snippet "
+        "FROM (SELECT * FROM hits ORDER BY rank DESC, type, id LIMIT :fetch OFFSET :offset) AS h "
+        "LEFT JOIN posts p ON h.type = 'post' AND p.id = h.id "
+        "LEFT JOIN topics t ON h.type = 'topic' AND t.id = h.id "
+        "ORDER BY h.rank DESC, h.type, h.id"
+    )
+    params = {
+        "q": query,
+        "status": status,
+        "candidates": SEARCH_MAX_CANDIDATES,
+        "window": offset + limit + 1,
+        "fetch": limit + 1,
+        "offset": offset,
+        "headline": _HEADLINE_OPTIONS,
+    }
+    rows = db.execute(statement, params).mappings().all()
+    return [_pg_hit(row) for row in rows[:limit]], len(rows) > limit
+
+def _fuzzy_postgres(
+    db: Session, query: str, kinds: Sequence[str], status: Optional[str], limit: int
+) -> List[Dict[str, Any]]:
+    """Typo-tolerant title matching on the trigram indexes."""
+    branches = _pg_branches(kinds, status, fuzzy=True)
+    if not branches:
+        return []
+    statement = text(
+        f"{' UNION ALL '.join(branches)} ORDER BY rank DESC, type, id LIMIT :limit"
+    )
+    rows = db.execute(statement, {"q": query, "status": status, "limit": limit})
+    return [_pg_hit(row) for row in rows.mappings().all()]
+
+
+class _MemorySearch:
+    """
+    Inverted index over posts and topics, synced from the tables on use.
+
+    Before each search one statement reads every table's newest
+    ``updated_at`` and row count. Rows changed since the last sync are
+    re-indexed; if the indexed count then disagrees with the table, rows were
+    deleted and that kind is rebuilt from scratch.
+    """
+
+    # kind -> (model, columns to load)
+    SOURCES = {
+        "post": (PostModel, (
+            "id", "title", "slug", "status", "topic_id", "published_at",
+            "excerpt", "content", "seo_keywords", "updated_at",
+        )),
+        "topic": (TopicModel, ("id", "name", "slug", "description", "updated_at")),
+    }
+
+    def __init__(self):
+        self.index = InvertedIndex()
+        self.lock = threading.Lock()
+        self._stamps: Dict[str, Tuple[Any, int]] = {}
+
+    def reset(self) -> None:
+        """Forget everything; the next search rebuilds the index."""
+        with self.lock:
+            self.index = InvertedIndex()
+            self._stamps = {}
+
+    def sync(self, db: Session) -> None:
+        """Bring the index up to date with the tables (call with ``lock`` held)."""
+        stamp_columns = []
+        for model, _ in self.SOURCES.values():
+            stamp_columns.append(select(func.max(model.updated_at)).scalar_subquery())
+            stamp_columns.append(select(func.count()).select_from(model).scalar_subquery())
+        values = db.execute(select(*stamp_columns)).one()
+
+        for i, (kind, (model, columns)) in enumerate(self.SOURCES.items()):
+            stamp = (values[2 * i], values[2 * i + 1])
+            known = self._stamps.get(kind)
+            if known == stamp:
+                continue
+            statement = select(*[getattr(model, name) for name in columns])
+            if known is not None and known[0] is not None:
+                statement = statement.where(model.updated_at >= known[0])
+            for row in db.execute(statement).mappings():
+                self._add(kind, row)
+            if self.index.kind_counts[kind] != stamp[1]:
+                self.index.clear(kind)
+                for row in db.execute(select(*[getattr(model, n) for n in columns])).mappings():
+                    self._add(kind, row)
+            self._stamps[kind] = stamp
+
+    def _add(self, kind: str, row: Any) -> None:
+        """Index one post or topic row."""
+        if kind == "post":
+            keywords = " ".join(row["seo_keywords"] or ())
+            self.index.add(
+                (kind, str(row["id"])),
+                [(row["title"], WEIGHT_A), (keywords, WEIGHT_B),
+                 (row["excerpt"], WEIGHT_B), (row["content"], WEIGHT_C)],
+                title=row["title"],
+                payload={
+                    "title": row["title"], "slug": row["slug"], "status": row["status"],
+                    "topic_id": row["topic_id"], "published_at": row["published_at"],
+                    "text": row["content"] or row["excerpt"] or row["title"],
+                    "preview": row["excerpt"] or row["content"],
+                },
+            )
+        else:
+            self.index.add(
+                (kind, str(row["id"])),
+                [(row["name"], WEIGHT_A), (row["description"], WEIGHT_B)],
+                title=row["name"],
+                payload={
+                    "title": row["name"], "slug": row["slug"], "status": None,
+                    "topic_id": None, "published_at": None,
+                    "text": row["description"] or row["name"],
+                    "preview": row["description"],
+                },
+            )
+
+
+_memory = _MemorySearch()
+
+
+def reset_search_index() -> None:
+    """Drop the in-process fallback index (it is rebuilt on the next search)."""
+    _memory.reset()
+
+def _memory_predicate(kinds: Sequence[str], status: Optional[str]):
+    """Filter for fallback hits matching the requested kinds and post status."""
+    def predicate(key, payload) -> bool:
+        if key[0] not in kinds:
+            return False
+        return status is None or key[0] != "post" or payload["status"] == status
+    return predicate
+
+def _memory_hit(key, score: float, snippet: Optional[str], payload: Dict[str, Any]) -> Dict:
+    """Shape a fallback index hit like a Postgres result row."""
+    return _hit({
+        "type": key[0], "id": key[1], "rank": score, "snippet": snippet,
+        **{name: payload[name] for name in
+           ("title", "slug", "status", "topic_id", "published_at")},
+    })
+
+def _search_memory(
+    db: Session, query: str, kinds: Sequence[str], status: Optional[str], limit: int, offset: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked search on the in-process fallback index."""
+    with _memory.lock:
+        _memory.sync(db)
+        index = _memory.index
+        ranked, has_more = index.search(query, limit, offset, _memory_predicate(kinds, status))
+        terms = index.terms(query)
+        return [
+            _memory_hit(key, score, highlight(index.payloads[key]["text"], terms),
+                        index.payloads[key])
+            for score, key in ranked
+        ], has_more
+
+def _fuzzy_memory(
+    db: Session, query: str, kinds: Sequence[str], status: Optional[str], limit: int
+) -> List[Dict[str, Any]]:
+    """Typo-tolerant title matching on the in-process fallback index."""
+    with _memory.lock:
+        _memory.sync(db)
+        index = _memory.index
+        hits = []
+        for score, key in index.fuzzy(query, limit, _memory_predicate(kinds, status)):
+            preview = index.payloads[key]["preview"]
+            snippet = html.escape(preview[:FUZZY_SNIPPET_CHARS]) if preview else None
+            hits.append(_memory_hit(key, score, snippet, index.payloads[key]))
+        return hits
@@ -1,13 +1,55 @@
 """
 CRUD operations for Topic model.
 """
+import os
+import threading
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+from sqlalchemy import and_, func, or_, select, text
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from app.crud.cache_version import bump_cache_version
+from app.models.post import Post as PostModel
 from app.models.topic import Topic as TopicModel
 from app.schemas.topic import TopicCreate, TopicUpdate
+from app.utils.cache import LRUCache, VersionedCache
+from app.utils.ranking import rank_between
+from app.utils.slugify import commit_with_unique_slug, slugify
+
+# Fields clients may order topic lists by; anything else falls back to position.
+TOPIC_ORDER_FIELDS = ("position", "rank", "name", "created_at", "updated_at")
+
+# Error for names with nothing to slugify, shared by single and bulk creates
+INVALID_NAME_DETAIL = "Name does not produce a valid slug"
+
+# Ways of producing the ``total`` of a topic list
+TOTAL_STRATEGIES = ("exact", "estimated", "cached", "none")
+
+# In-process row count used by the "cached" total strategy
+_cached_total: Optional[int] = None
+_cached_total_lock = threading.Lock()
+
+# In-process cache of topic reads (see app.crud.topic_cache)
+TOPIC_CACHE_ENABLED = os.getenv("TOPIC_CACHE_ENABLED", "true").lower() == "true"
+TOPIC_CACHE_TTL = float(os.getenv("TOPIC_CACHE_TTL", "60"))
+TOPIC_CACHE_MAX_SIZE = int(os.getenv("TOPIC_CACHE_MAX_SIZE", "10000"))
+TOPIC_CACHE_VERSION_CHECK_SECONDS = float(os.getenv("TOPIC_CACHE_VERSION_CHECK_SECONDS", "1"))
+TOPIC_CACHE_NAME = "topics"
+
+topic_cache = VersionedCache(
+    LRUCache(max_size=TOPIC_CACHE_MAX_SIZE, ttl=TOPIC_CACHE_TTL),
+    check_interval=TOPIC_CACHE_VERSION_CHECK_SECONDS,
+)
+topic_cache.enabled = TOPIC_CACHE_ENABLED
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    """Parse a topic ID, returning None when it isn't a valid UUID."""
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except (ValueError, AttributeError, TypeError):
+        return None
 
 def get_topic(db: Session, topic_id: str) -> Optional[TopicModel]:
     """
@@ -39,12 +81,154 @@ def get_topic_by_slug(db: Session, slug: str) -> Optional[TopicModel]:
     """
     return db.query(TopicModel).filter(TopicModel.slug == slug).first()
 
+def get_topics_by_ids(db: Session, topic_ids: Iterable[str]) -> Dict[str, TopicModel]:
+    """
+    Get several topics by ID in a single query.
+    
+    Args:
+        db: Database session
+        topic_ids: IDs of the topics to retrieve
+        
+    Returns:
+        Mapping of each given ID that exists to its TopicModel; invalid or
+        unknown IDs are left out
+    """
+    parsed = {topic_id: _parse_uuid(topic_id) for topic_id in topic_ids}
+    uuids = {u for u in parsed.values() if u is not None}
+    if not uuids:
+        return {}
+    by_uuid = {
+        t.id: t for t in db.query(TopicModel).filter(TopicModel.id.in_(uuids)).all()
+    }
+    return {
+        topic_id: by_uuid[u] for topic_id, u in parsed.items() if u in by_uuid
+    }
+
+def find_missing_topic_ids(db: Session, topic_ids: Iterable[str]) -> List[str]:
+    """
+    Check which of the given topic IDs don't exist, with one query.
+    
+    Args:
+        db: Database session
+        topic_ids: IDs to check
+        
+    Returns:
+        The IDs (as given) that are invalid or have no matching topic
+    """
+    topic_ids = list(topic_ids)
+    parsed = {topic_id: _parse_uuid(topic_id) for topic_id in topic_ids}
+    wanted = {u for u in parsed.values() if u is not None}
+    found = set()
+    if wanted:
+        found = {
+            row[0] for row in
+            db.query(TopicModel.id).filter(TopicModel.id.in_(wanted)).all()
+        }
+    return [t for t in topic_ids if parsed[t] is None or parsed[t] not in found]
+
+def resolve_order_field(order_by: str) -> str:
+    """
+    Map a requested ordering onto a supported topic field.
+    
+    Args:
+        order_by: Field name requested by the client
+        
+    Returns:
+        The field name to order by (defaults to position)
+    """
+    return order_by if order_by in TOPIC_ORDER_FIELDS else "position"
+
+def cursor_type(order_by: str) -> type:
+    """
+    Get the Python type of the field a topic list is ordered by.
+    
+    Args:
+        order_by: Field name requested by the client
+        
+    Returns:
+        Type a cursor's sort key must have for this ordering
+    """
+    column_type = getattr(TopicModel, resolve_order_field(order_by)).type
+    # Reason: dialect variants (rank) only know their python_type through impl
+    return getattr(column_type, "impl", column_type).python_type
+
+def cursor_value(db_topic: Any, order_by: str) -> Any:
+    """
+    Get the sort key of a topic for building a pagination cursor.
+    
+    Args:
+        db_topic: Topic (model or column mapping) at the end of a page
+        order_by: Field the page is ordered by
+        
+    Returns:
+        Value of the ordering field on the topic
+    """
+    field = resolve_order_field(order_by)
+    if isinstance(db_topic, Mapping):
+        return db_topic[field]
+    return getattr(db_topic, field)
+
+def topics_statement(
+    skip: int = 0,
+    limit: int = 100,
+    order_by: str = "position",
+    order: str = "asc",
+    after: Optional[Tuple[Any, uuid.UUID]] = None,
+    columns: Optional[Sequence[Any]] = None
+) -> Select:
+    """
+    Build the SELECT behind a topic list page.
+    
+    Shared by the sync and async CRUD so both page the same way. Results are
+    always ordered by ``id`` after the requested field so pages are stable and
+    can be served from the ``(position, id)`` / ``(created_at, id)`` indexes.
+    
+    Args:
+        skip: Number of records to skip (for pagination)
+        limit: Maximum number of records to return
+        order_by: Field to order by (default: position)
+        order: Sort order ('asc' or 'desc')
+        after: ``(value, id)`` of the last row already seen; when given, the
+            page starts right after it (keyset pagination)
+        columns: Columns to select instead of whole Topic entities
+        
+    Returns:
+        SQLAlchemy Select statement
+    """
+    query = select(*columns) if columns else select(TopicModel)
+    
+    # Apply ordering
+    order_field = getattr(TopicModel, resolve_order_field(order_by))
+    descending = order.lower() == "desc"
+    
+    if after is not None:
+        value, last_uuid = after
+        # Reason: (field, id) row comparison written out so it works on every backend
+        if descending:
+            query = query.where(or_(
+                order_field < value,
+                and_(order_field == value, TopicModel.id < last_uuid),
+            ))
+        else:
+            query = query.where(or_(
+                order_field > value,
+                and_(order_field == value, TopicModel.id > last_uuid),
+            ))
+    
+    if descending:
+        query = query.order_by(order_field.desc(), TopicModel.id.desc())
+    else:
+        query = query.order_by(order_field.asc(), TopicModel.id.asc())
+    
+    return query.offset(skip).limit(limit)
+
 def get_topics(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
     order_by: str = "position",
-    order: str = "asc"
+    order: str = "asc",
+    after: Optional[Tuple[Any, uuid.UUID]] = None
 ) -> List[TopicModel]:
     """
     Get a list of topics with pagination and ordering.
@@ -55,45 +239,121 @@ def get_topics(
         limit: Maximum number of records to return
         order_by: Field to order by (default: position)
         order: Sort order ('asc' or 'desc')
+        after: ``(value, id)`` of the last row already seen (keyset pagination)
         
     Returns:
         List of TopicModel instances
     """
-    query = db.query(TopicModel)
+    statement = topics_statement(skip, limit, order_by, order, after)
+    return db.execute(statement).scalars().all()
+
+def invalidate_topic_count() -> None:
+    """
+    Drop the cached topic count so the next "cached" total recounts.
+    """
+    global _cached_total
+    with _cached_total_lock:
+        _cached_total = None
+
+def topics_changed(db: Session) -> None:
+    """
+    Invalidate every cached view of the topics table after a committed write.
     
-    # Apply ordering
-    order_field = getattr(TopicModel, order_by, TopicModel.position)
-    if order.lower() == "desc":
-        query = query.order_by(order_field.desc())
-    else:
-        query = query.order_by(order_field.asc())
+    Clears this process's cache and topic count, then bumps the shared
+    version stamp so other workers drop theirs on their next version check.
+    
+    Args:
+        db: Database session the write was committed on
+    """
+    invalidate_topic_count()
+    topic_cache.invalidate()
+    bump_cache_version(db, TOPIC_CACHE_NAME)
+
+def count_topics(db: Session, strategy: str = "exact") -> Tuple[Optional[int], str]:
+    """
+    Count topics using the requested strategy.
+    
+    ``estimated`` reads the planner's row estimate from ``pg_class.reltuples``
+    and ``cached`` serves an in-process count that create/delete invalidate.
+    Either falls back to an exact count when it can't answer (e.g. on SQLite or
+    before the table has been analyzed).
+    
+    Args:
+        db: Database session
+        strategy: One of TOTAL_STRATEGIES
+        
+    Returns:
+        Tuple of (total or None, strategy that actually produced it)
+    """
+    global _cached_total
+    if strategy == "none":
+        return None, "none"
+    
+    if strategy == "estimated" and db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": TopicModel.__tablename__},
+        ).scalar()
+        # Reason: reltuples is -1 (or missing) until the table is first vacuumed/analyzed
+        if estimate is not None and estimate >= 0:
+            return int(estimate), "estimated"
+    
+    if strategy == "cached":
+        with _cached_total_lock:
+            if _cached_total is not None:
+                return _cached_total, "cached"
+        total = db.query(TopicModel).count()
+        with _cached_total_lock:
+            _cached_total = total
+        return total, "cached"
+    
+    return db.query(TopicModel).count(), "exact"
+
+def check_name(name: str) -> str:
+    """
+    Check that a topic name produces a slug.
     
-    return query.offset(skip).limit(limit).all()
+    Args:
+        name: Topic name
+        
+    Returns:
+        The name's base slug
+        
+    Raises:
+        ValueError: If the name has nothing to slugify (e.g. only punctuation)
+    """
+    slug = slugify(name)
+    if not slug:
+        raise ValueError(INVALID_NAME_DETAIL)
+    return slug
 
 def create_topic(db: Session, topic: TopicCreate) -> TopicModel:
     """
     Create a new topic.
     
+    The slug is derived from the name and suffixed (``-1``, ``-2``...) when it
+    is already taken. The topic is ranked after every existing topic.
+    
     Args:
         db: Database session
         topic: Topic data to create
         
     Returns:
         Created TopicModel instance
+        
+    Raises:
+        ValueError: If the name does not produce a valid slug
     """
-    # In a real app, you might want to generate a slug from the name
-    # For now, we'll use a simple slugify function
-    from app.utils.slugify import slugify
-    
+    check_name(topic.name)
     db_topic = TopicModel(
         name=topic.name,
-        slug=slugify(topic.name),
         description=topic.description,
-        position=topic.position
+        position=topic.position,
+        rank=rank_between(db.query(func.max(TopicModel.rank)).scalar(), None)
     )
     
-    db.add(db_topic)
-    db.commit()
+    commit_with_unique_slug(db, db_topic, topic.name)
+    topics_changed(db)
     db.refresh(db_topic)
     return db_topic
 
@@ -105,6 +365,9 @@ def update_topic(
     """
     Update an existing topic.
     
+    Renaming a topic regenerates its slug unless the new name slugifies to the
+    slug it already has.
+    
     Args:
         db: Database session
         db_topic: Topic to update
@@ -112,14 +375,21 @@ def update_topic(
         
     Returns:
         Updated TopicModel instance
+        
+    Raises:
+        ValueError: If the new name does not produce a valid slug
     """
     update_data = topic_update.dict(exclude_unset=True)
     
-    for field, value in update_data.items():
-        setattr(db_topic, field, value)
-    
-    db.add(db_topic)
-    db.commit()
+    new_name = update_data.get("name")
+    if new_name and check_name(new_name) != db_topic.slug:
+        commit_with_unique_slug(db, db_topic, new_name, values=update_data)
+    else:
+        for field, value in update_data.items():
+            setattr(db_topic, field, value)
+        db.add(db_topic)
+        db.commit()
+    topics_changed(db)
     db.refresh(db_topic)
     return db_topic
 
@@ -136,38 +406,33 @@ def delete_topic(db: Session, topic_id: str) -> bool:
     """
     try:
         topic_uuid = uuid.UUID(topic_id)
-        db_topic = db.query(TopicModel).filter(TopicModel.id == topic_uuid).first()
+        # Reason: Session.get checks the identity map first, so a topic the
+        # caller already loaded (e.g. for a 404 check) isn't fetched again
+        db_topic = db.get(TopicModel, topic_uuid)
         if not db_topic:
             return False
             
         db.delete(db_topic)
         db.commit()
+        topics_changed(db)
         return True
     except (ValueError, AttributeError):
         return False
 
-def reorder_topics(db: Session, topic_ids: List[str]) -> bool:
+def topic_has_posts(db: Session, topic_id: str) -> bool:
     """
-    Reorder topics based on the provided list of IDs.
+    Check whether any post belongs to a topic.
     
     Args:
         db: Database session
-        topic_ids: List of topic IDs in the new order
+        topic_id: ID of the topic
         
     Returns:
-        bool: True if reordering was successful, False otherwise
+        bool: True if at least one post references the topic
     """
-    try:
-        # Start a transaction
-        db.begin()
-        
-        # Update position for each topic
-        for position, topic_id in enumerate(topic_ids, 1):
-            db.query(TopicModel).filter(TopicModel.id == uuid.UUID(topic_id))\
-                .update({"position": position})
-        
-        db.commit()
-        return True
-    except Exception:
-        db.rollback()
+    topic_uuid = _parse_uuid(topic_id)
+    if topic_uuid is None:
         return False
+    # Reason: LIMIT 1 on the topic_id-leading posts index stops at the first match
+    statement = select(PostModel.id).where(PostModel.topic_id == topic_uuid).limit(1)
+    return db.execute(statement).first() is not None
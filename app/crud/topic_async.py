@@ -0,0 +1,138 @@
+"""
+Async CRUD operations for Topic model.
+
+Reads are issued natively on the ``AsyncSession``. Writes run the sync CRUD
+functions through ``AsyncSession.run_sync`` so the slug retry and cache
+invalidation logic lives in one place.
+"""
+import uuid
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import topic as topic_crud
+from app.models.topic import Topic as TopicModel
+from app.schemas.topic import TopicCreate, TopicUpdate
+
+
+async def get_topic(db: AsyncSession, topic_id: str) -> Optional[TopicModel]:
+    """
+    Get a single topic by ID.
+    
+    Args:
+        db: Async database session
+        topic_id: ID of the topic to retrieve
+        
+    Returns:
+        TopicModel if found, None otherwise
+    """
+    try:
+        topic_uuid = uuid.UUID(topic_id)
+    except (ValueError, AttributeError):
+        return None
+    result = await db.execute(select(TopicModel).where(TopicModel.id == topic_uuid))
+    return result.scalars().first()
+
+
+async def get_topic_by_slug(db: AsyncSession, slug: str) -> Optional[TopicModel]:
+    """
+    Get a single topic by slug.
+    
+    Args:
+        db: Async database session
+        slug: Slug of the topic to retrieve
+        
+    Returns:
+        TopicModel if found, None otherwise
+    """
+    result = await db.execute(select(TopicModel).where(TopicModel.slug == slug))
+    return result.scalars().first()
+
+
+async def get_topics(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: str = "position",
+    order: str = "asc",
+    after: Optional[Tuple[Any, uuid.UUID]] = None
+) -> List[TopicModel]:
+    """
+    Get a list of topics with pagination and ordering.
+    
+    Args:
+        db: Async database session
+        skip: Number of records to skip (for pagination)
+        limit: Maximum number of records to return
+        order_by: Field to order by (default: position)
+        order: Sort order ('asc' or 'desc')
+        after: ``(value, id)`` of the last row already seen (keyset pagination)
+        
+    Returns:
+        List of TopicModel instances
+    """
+    statement = topic_crud.topics_statement(skip, limit, order_by, order, after)
+    result = await db.execute(statement)
+    return result.scalars().all()
+
+
+async def count_topics(db: AsyncSession, strategy: str = "exact") -> Tuple[Optional[int], str]:
+    """
+    Count topics using the requested strategy (see ``crud.topic.count_topics``).
+    
+    Args:
+        db: Async database session
+        strategy: One of crud.topic.TOTAL_STRATEGIES
+        
+    Returns:
+        Tuple of (total or None, strategy that actually produced it)
+    """
+    return await db.run_sync(topic_crud.count_topics, strategy)
+
+
+async def create_topic(db: AsyncSession, topic: TopicCreate) -> TopicModel:
+    """
+    Create a new topic.
+    
+    Args:
+        db: Async database session
+        topic: Topic data to create
+        
+    Returns:
+        Created TopicModel instance
+    """
+    return await db.run_sync(topic_crud.create_topic, topic)
+
+
+async def update_topic(
+    db: AsyncSession,
+    db_topic: TopicModel,
+    topic_update: TopicUpdate
+) -> TopicModel:
+    """
+    Update an existing topic.
+    
+    Args:
+        db: Async database session
+        db_topic: Topic to update (loaded through ``db``)
+        topic_update: Updated topic data
+        
+    Returns:
+        Updated TopicModel instance
+    """
+    return await db.run_sync(topic_crud.update_topic, db_topic, topic_update)
+
+
+async def delete_topic(db: AsyncSession, topic_id: str) -> bool:
+    """
+    Delete a topic.
+    
+    Args:
+        db: Async database session
+        topic_id: ID of the topic to delete
+        
+    Returns:
+        bool: True if the topic was deleted, False otherwise
+    """
+    return await db.run_sync(topic_crud.delete_topic, topic_id)
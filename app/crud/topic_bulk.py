@@ -0,0 +1,178 @@
+"""
+Bulk CRUD operations for Topic model.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.crud.topic import INVALID_NAME_DETAIL, topics_changed
+from app.models.topic import Topic as TopicModel
+from app.schemas.topic import TopicCreate
+from app.utils.ranking import ranks_between
+from app.utils.slugify import slugify, unique_slugs
+
+# How a bulk request treats topics whose slug already exists
+BULK_MODES = ("insert", "upsert", "skip-existing")
+
+# Rows per multi-row INSERT statement (keeps well under bind parameter limits)
+BULK_CHUNK_SIZE = 500
+
+
+def _result(index: int, status: str, slug: Optional[str] = None,
+            topic_id: Optional[str] = None, detail: Optional[str] = None) -> dict:
+    """Build the per-item result reported back to the client."""
+    return {"index": index, "status": status, "id": topic_id, "slug": slug, "detail": detail}
+
+
+def _insert_rows(db: Session, rows: List[dict], mode: str) -> Dict[str, str]:
+    """
+    Insert rows with multi-row ``INSERT ... ON CONFLICT (slug)`` statements.
+    
+    Args:
+        db: Database session
+        rows: Column values for each topic
+        mode: One of BULK_MODES; "upsert" updates conflicting rows, the others
+            leave them untouched
+        
+    Returns:
+        Mapping of slug -> id for every row that was inserted or updated
+    """
+    table = TopicModel.__table__
+    dialect = db.get_bind().dialect.name
+    written: Dict[str, str] = {}
+    
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_CHUNK_SIZE]
+        if dialect in ("postgresql", "sqlite"):
+            insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table).values(chunk)
+            if mode == "upsert":
+                insert = insert.on_conflict_do_update(
+                    index_elements=["slug"],
+                    set_={
+                        "name": insert.excluded.name,
+                        "description": insert.excluded.description,
+                        "position": insert.excluded.position,
+                        "updated_at": insert.excluded.updated_at,
+                    },
+                )
+            else:
+                insert = insert.on_conflict_do_nothing(index_elements=["slug"])
+        else:
+            insert = table.insert().values(chunk)
+        
+        if dialect == "postgresql":
+            result = db.execute(insert.returning(table.c.id, table.c.slug))
+            written.update((row.slug, str(row.id)) for row in result)
+        else:
+            # Reason: no RETURNING here, so read back the ids behind our slugs
+            db.execute(insert)
+            slugs = [row["slug"] for row in chunk]
+            written.update(
+                (row.slug, str(row.id)) for row in
+                db.query(TopicModel.id, TopicModel.slug).filter(TopicModel.slug.in_(slugs))
+            )
+    return written
+
+
+def bulk_create_topics(
+    db: Session,
+    topics: List[TopicCreate],
+    mode: str = "insert"
+) -> List[dict]:
+    """
+    Create many topics with batched slug resolution and multi-row inserts.
+    
+    - ``insert`` gives every item a new topic, suffixing slugs that are taken
+      (like single creates).
+    - ``skip-existing`` leaves topics whose slug already exists untouched.
+    - ``upsert`` updates the name, description and position of existing topics.
+    
+    Args:
+        db: Database session
+        topics: Topics to create
+        mode: One of BULK_MODES
+        
+    Returns:
+        One result dict per item, in request order, with ``index``, ``status``
+        ("created", "updated", "skipped" or "error"), ``id``, ``slug`` and ``detail``
+        
+    Raises:
+        ValueError: If ``mode`` is not supported
+    """
+    if mode not in BULK_MODES:
+        raise ValueError(f"Mode must be one of {', '.join(BULK_MODES)}")
+    
+    results: List[Optional[dict]] = [None] * len(topics)
+    pending = []  # (index, topic, slug)
+    bases = [slugify(t.name) for t in topics]
+    for index, base in enumerate(bases):
+        if not base:
+            results[index] = _result(index, "error", detail=INVALID_NAME_DETAIL)
+    valid = [i for i in range(len(topics)) if results[i] is None]
+    
+    existing: Dict[str, str] = {}
+    if mode == "insert":
+        slugs = unique_slugs(db, TopicModel, [topics[i].name for i in valid])
+        pending = [(i, topics[i], slug) for i, slug in zip(valid, slugs)]
+    elif valid:
+        existing = {
+            row.slug: str(row.id) for row in
+            db.query(TopicModel.id, TopicModel.slug)
+            .filter(TopicModel.slug.in_({bases[i] for i in valid}))
+        }
+        first_seen: Dict[str, int] = {}
+        for i in valid:
+            slug = bases[i]
+            if slug in first_seen:
+                results[i] = _result(i, "error", slug, detail=f"Duplicate of item {first_seen[slug]}")
+                continue
+            first_seen[slug] = i
+            if mode == "skip-existing" and slug in existing:
+                results[i] = _result(i, "skipped", slug, existing[slug])
+            else:
+                pending.append((i, topics[i], slug))
+    
+    rows = []
+    new_ids: Dict[str, str] = {}
+    last_rank = db.query(func.max(TopicModel.rank)).scalar() if pending else None
+    ranks = ranks_between(last_rank, None, len(pending))
+    now = datetime.now(timezone.utc)
+    for (index, topic, slug), rank in zip(pending, ranks):
+        topic_id = uuid.uuid4()
+        new_ids[slug] = str(topic_id)
+        rows.append({
+            "id": topic_id,
+            "name": topic.name,
+            "slug": slug,
+            "description": topic.description,
+            "position": topic.position,
+            "rank": rank,
+            "created_at": now,
+            "updated_at": now,
+        })
+    
+    written = _insert_rows(db, rows, mode) if rows else {}
+    db.commit()
+    
+    created = False
+    for index, topic, slug in pending:
+        topic_id = written.get(slug)
+        if topic_id is not None and topic_id == new_ids[slug]:
+            results[index] = _result(index, "created", slug, topic_id)
+            created = True
+        elif mode == "upsert" and topic_id is not None:
+            results[index] = _result(index, "updated", slug, topic_id)
+        elif mode == "skip-existing":
+            results[index] = _result(index, "skipped", slug, topic_id or existing.get(slug))
+        else:
+            results[index] = _result(
+                index, "error", slug, detail="Slug was taken by a concurrent request"
+            )
+    if rows:
+        topics_changed(db)
+    return results
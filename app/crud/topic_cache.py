@@ -0,0 +1,173 @@
+"""
+Cached topic reads.
+
+Topics change rarely but are read on nearly every page render, so the read
+endpoints go through these wrappers instead of ``app.crud.topic`` directly.
+Entries are plain column dicts (never session-bound ORM objects) and are
+returned as detached ``Topic`` instances.
+
+Writes in ``app.crud`` call ``topics_changed``, which clears this process's
+entries and bumps the ``topics`` row in ``cache_versions``; other workers
+compare that stamp at most every ``TOPIC_CACHE_VERSION_CHECK_SECONDS`` and
+drop their entries when it moved.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.crud import topic as topic_crud
+from app.crud.cache_version import get_cache_version
+from app.models.topic import Topic as TopicModel
+
+_COLUMNS = tuple(column.name for column in TopicModel.__table__.columns)
+
+
+def _to_row(db_topic: Optional[TopicModel]) -> Optional[dict]:
+    """Snapshot a topic's column values."""
+    if db_topic is None:
+        return None
+    return {name: getattr(db_topic, name) for name in _COLUMNS}
+
+def _from_row(row: Optional[dict]) -> Optional[TopicModel]:
+    """Build a detached topic from a cached snapshot."""
+    return None if row is None else TopicModel(**row)
+
+def _prepare(db: Session, use_cache: bool) -> bool:
+    """Check the shared version stamp; tell whether the cache may be used."""
+    cache = topic_crud.topic_cache
+    if not (use_cache and cache.enabled):
+        return False
+    cache.ensure_fresh(lambda: get_cache_version(db, topic_crud.TOPIC_CACHE_NAME))
+    return True
+
+def get_topic(db: Session, topic_id: str, use_cache: bool = True) -> Optional[TopicModel]:
+    """
+    Get a single topic by ID, from the cache when possible.
+    
+    Args:
+        db: Database session
+        topic_id: ID of the topic to retrieve
+        use_cache: Set to False to bypass the cache for this call
+        
+    Returns:
+        Detached TopicModel if found, None otherwise
+    """
+    if not _prepare(db, use_cache):
+        return topic_crud.get_topic(db, topic_id)
+    row = topic_crud.topic_cache.get_or_load(
+        ("id", topic_id), lambda: _to_row(topic_crud.get_topic(db, topic_id))
+    )
+    return _from_row(row)
+
+def get_topic_by_slug(db: Session, slug: str, use_cache: bool = True) -> Optional[TopicModel]:
+    """
+    Get a single topic by slug, from the cache when possible.
+    
+    Args:
+        db: Database session
+        slug: Slug of the topic to retrieve
+        use_cache: Set to False to bypass the cache for this call
+        
+    Returns:
+        Detached TopicModel if found, None otherwise
+    """
+    if not _prepare(db, use_cache):
+        return topic_crud.get_topic_by_slug(db, slug)
+    row = topic_crud.topic_cache.get_or_load(
+        ("slug", slug), lambda: _to_row(topic_crud.get_topic_by_slug(db, slug))
+    )
+    return _from_row(row)
+
+def get_topic_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: str = "position",
+    order: str = "asc",
+    after: Optional[Tuple[Any, uuid.UUID]] = None,
+    use_cache: bool = True
+) -> List[dict]:
+    """
+    Get a page of topics as plain column dicts, from the cache when possible.
+    
+    Misses select only the table's columns, so no ORM objects are built;
+    pages are keyed by their ordering and position (offset or cursor), so a
+    write invalidates them all at once. Callers must not mutate the dicts.
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip (for pagination)
+        limit: Maximum number of records to return
+        order_by: Field to order by (default: position)
+        order: Sort order ('asc' or 'desc')
+        after: ``(value, id)`` of the last row already seen (keyset pagination)
+        use_cache: Set to False to bypass the cache for this call
+        
+    Returns:
+        List of column name -> value dicts
+    """
+    def load() -> List[dict]:
+        statement = topic_crud.topics_statement(
+            skip, limit, order_by, order, after, columns=TopicModel.__table__.columns
+        )
+        return [dict(row) for row in db.execute(statement).mappings()]
+    
+    if not _prepare(db, use_cache):
+        return load()
+    return topic_crud.topic_cache.get_or_load(
+        ("list", order_by, order, skip, limit, after), load
+    )
+
+def get_topics(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: str = "position",
+    order: str = "asc",
+    after: Optional[Tuple[Any, uuid.UUID]] = None,
+    use_cache: bool = True
+) -> List[TopicModel]:
+    """
+    Get a page of topics as detached models, from the cache when possible.
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip (for pagination)
+        limit: Maximum number of records to return
+        order_by: Field to order by (default: position)
+        order: Sort order ('asc' or 'desc')
+        after: ``(value, id)`` of the last row already seen (keyset pagination)
+        use_cache: Set to False to bypass the cache for this call
+        
+    Returns:
+        List of detached TopicModel instances
+    """
+    rows = get_topic_rows(db, skip, limit, order_by, order, after, use_cache)
+    return [_from_row(row) for row in rows]
+
+def get_topics_stamp(db: Session, use_cache: bool = True) -> Tuple[Optional[datetime], int]:
+    """
+    Get the newest ``updated_at`` and the row count of the topics table.
+    
+    Together they change whenever any topic is created, updated or deleted,
+    so list endpoints can build an ETag without loading a page of rows.
+    
+    Args:
+        db: Database session
+        use_cache: Set to False to bypass the cache for this call
+        
+    Returns:
+        Tuple of (max updated_at or None when empty, row count)
+    """
+    def load() -> Tuple[Optional[datetime], int]:
+        latest, count = db.query(
+            func.max(TopicModel.updated_at), func.count(TopicModel.id)
+        ).one()
+        return latest, count
+    
+    if not _prepare(db, use_cache):
+        return load()
+    return topic_crud.topic_cache.get_or_load(("stamp",), load)
@@ -0,0 +1,294 @@
+"""
+CRUD operations for ordering topics.
+
+Topics carry two ordering keys: the dense integer ``position`` and a
+fractional ``rank`` (see ``app.utils.ranking``). Moving a topic by rank
+rewrites a single row; moving it by position shifts the rows in between.
+"""
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, or_, text, update
+from sqlalchemy.orm import Session
+
+from app.crud.topic import topics_changed
+from app.models.topic import Topic as TopicModel
+from app.utils.ranking import MAX_RANK_LENGTH, rank_between, spread_ranks
+
+# How a single-topic move is applied: shift "position" values or set one "rank"
+ORDER_MODES = ("position", "rank")
+
+# Postgres array types used to unnest bulk column updates
+_PG_ARRAY_TYPES = {"position": "integer[]", "rank": "text[]"}
+
+
+def _bulk_set(db: Session, ids: Sequence[uuid.UUID], values: Dict[str, list]) -> None:
+    """
+    Write per-row values for several topics with a single UPDATE.
+    
+    Uses ``UPDATE ... FROM unnest(...)`` on Postgres and a ``CASE`` per column
+    on other backends.
+    
+    Args:
+        db: Database session
+        ids: Topic IDs to update
+        values: Column name -> list of values, aligned with ``ids``
+    """
+    if not ids:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        columns = list(values)
+        arrays = ", ".join(
+            f"CAST(:{c} AS {_PG_ARRAY_TYPES[c]})" for c in columns
+        )
+        assignments = ", ".join(f"{c} = v.{c}" for c in columns)
+        db.execute(
+            text(
+                f"UPDATE topics AS t SET {assignments} "
+                f"FROM unnest(CAST(:ids AS uuid[]), {arrays}) "
+                f"AS v(id, {', '.join(columns)}) WHERE t.id = v.id"
+            ),
+            {"ids": [str(u) for u in ids], **values},
+        )
+    else:
+        db.execute(
+            update(TopicModel.__table__)
+            .where(TopicModel.id.in_(ids))
+            .values({
+                column: case(*[(TopicModel.id == u, v) for u, v in zip(ids, column_values)])
+                for column, column_values in values.items()
+            })
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _reordered_ranks(
+    db: Session, uuids: Sequence[uuid.UUID]
+) -> Optional[Tuple[List[uuid.UUID], List[str]]]:
+    """
+    Ranks putting ``uuids`` in order while every other topic keeps its place.
+    
+    The listed topics swap the rank slots they already hold, so a partial
+    list never interleaves with the topics left out. A full list, or one
+    where ranks are tied (the slots can't be told apart), respaces every
+    topic's rank in the new order instead.
+    
+    Returns:
+        ``(ids, ranks)`` to write, or None if some of ``uuids`` don't exist
+    """
+    rows = db.query(TopicModel.id, TopicModel.rank).order_by(
+        TopicModel.rank, TopicModel.id
+    ).all()
+    wanted = set(uuids)
+    slots = [rank for topic_id, rank in rows if topic_id in wanted]
+    if len(slots) != len(uuids):
+        return None
+    if len(slots) < len(rows) and len({rank for _, rank in rows}) == len(rows):
+        return list(uuids), slots
+    listed = iter(uuids)
+    merged = [next(listed) if topic_id in wanted else topic_id for topic_id, _ in rows]
+    return merged, spread_ranks(len(merged))
+
+
+def reorder_topics(db: Session, topic_ids: List[str]) -> bool:
+    """
+    Reorder topics based on the provided list of IDs.
+    
+    The listed topics get positions 1..N and take, in the new order, the
+    ranks they held between them (see ``_reordered_ranks``). Topics left out
+    of the list keep their rank order. Ranks are read with one query and
+    written with one set-based ``UPDATE`` (two when every rank is respaced).
+    
+    Args:
+        db: Database session
+        topic_ids: List of topic IDs in the new order
+        
+    Returns:
+        bool: True if reordering was successful, False otherwise
+    """
+    try:
+        uuids = [uuid.UUID(str(topic_id)) for topic_id in topic_ids]
+        ranked = _reordered_ranks(db, uuids)
+        if ranked is None:
+            return False
+        rank_ids, ranks = ranked
+        positions = list(range(1, len(uuids) + 1))
+        if rank_ids == uuids:
+            _bulk_set(db, uuids, {"position": positions, "rank": ranks})
+        else:
+            _bulk_set(db, uuids, {"position": positions})
+            _bulk_set(db, rank_ids, {"rank": ranks})
+        db.commit()
+        topics_changed(db)
+        return True
+    except Exception:
+        db.rollback()
+        return False
+
+
+def rebalance_topic_ranks(db: Session) -> int:
+    """
+    Rewrite every topic's rank as short, evenly spaced keys, keeping the order.
+    
+    Needed only once ranks grow past ``MAX_RANK_LENGTH`` (or collide), so it
+    normally runs as a background task after a move.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        Number of topics rebalanced
+    """
+    ids = [
+        row[0] for row in
+        db.query(TopicModel.id).order_by(TopicModel.rank, TopicModel.id).all()
+    ]
+    _bulk_set(db, ids, {"rank": spread_ranks(len(ids))})
+    db.commit()
+    topics_changed(db)
+    return len(ids)
+
+
+def needs_rebalance(db_topic: TopicModel) -> bool:
+    """
+    Tell whether a topic's rank has grown long enough to rebalance the list.
+    
+    Args:
+        db_topic: Topic that was just created or moved
+        
+    Returns:
+        True if the ranks should be rebalanced
+    """
+    return db_topic.rank is not None and len(db_topic.rank) > MAX_RANK_LENGTH
+
+
+def _neighbour_rank(
+    db: Session, anchor: TopicModel, moving: TopicModel, following: bool
+) -> Optional[str]:
+    """Rank of the topic right after (or before) ``anchor``, ignoring ``moving``."""
+    query = db.query(TopicModel.rank).filter(TopicModel.id != moving.id)
+    if following:
+        query = query.filter(or_(
+            TopicModel.rank > anchor.rank,
+            and_(TopicModel.rank == anchor.rank, TopicModel.id > anchor.id),
+        )).order_by(TopicModel.rank.asc(), TopicModel.id.asc())
+    else:
+        query = query.filter(or_(
+            TopicModel.rank < anchor.rank,
+            and_(TopicModel.rank == anchor.rank, TopicModel.id < anchor.id),
+        )).order_by(TopicModel.rank.desc(), TopicModel.id.desc())
+    row = query.first()
+    return row[0] if row else None
+
+
+def _rank_for_move(
+    db: Session,
+    db_topic: TopicModel,
+    after: Optional[TopicModel],
+    before: Optional[TopicModel]
+) -> str:
+    """Pick the new rank for a topic placed between ``after`` and ``before``."""
+    low = after.rank if after is not None else _neighbour_rank(db, before, db_topic, False)
+    high = before.rank if before is not None else _neighbour_rank(db, after, db_topic, True)
+    return rank_between(low, high)
+
+
+def _shift_positions(db: Session, low: int, high: int, delta: int, exclude: uuid.UUID) -> None:
+    """Shift the positions in ``[low, high]`` by ``delta`` with one UPDATE."""
+    if low > high:
+        return
+    db.execute(
+        update(TopicModel.__table__)
+        .where(
+            TopicModel.position >= low,
+            TopicModel.position <= high,
+            TopicModel.id != exclude,
+        )
+        .values(position=TopicModel.position + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _move_by_position(
+    db: Session,
+    db_topic: TopicModel,
+    after: Optional[TopicModel],
+    before: Optional[TopicModel]
+) -> None:
+    """Move a topic by shifting the positions between its old and new place."""
+    current = db_topic.position
+    if after is not None:
+        moving_up = after.position < current
+        target = after.position + 1 if moving_up else after.position
+    else:
+        moving_up = before.position <= current
+        target = before.position if moving_up else before.position - 1
+    
+    if target != current:
+        if moving_up:
+            _shift_positions(db, target, current - 1, 1, db_topic.id)
+        else:
+            _shift_positions(db, current + 1, target, -1, db_topic.id)
+        db_topic.position = target
+        db.add(db_topic)
+
+
+def move_topic(
+    db: Session,
+    db_topic: TopicModel,
+    after: Optional[TopicModel] = None,
+    before: Optional[TopicModel] = None,
+    mode: str = "position"
+) -> TopicModel:
+    """
+    Move one topic next to another without renumbering the whole list.
+    
+    The topic is placed right after ``after`` (or, if only ``before`` is
+    given, right before ``before``).
+    
+    In ``rank`` mode the topic gets a rank between its new neighbours, so the
+    move is a one-row UPDATE. If the neighbours' ranks leave no room (they
+    are equal), the ranks are rebalanced first.
+    
+    In ``position`` mode only the rows between the old and new place are
+    shifted. Positions are expected to be distinct, as ``reorder_topics``
+    leaves them.
+    
+    Args:
+        db: Database session
+        db_topic: Topic to move
+        after: Topic the moved topic should follow
+        before: Topic the moved topic should precede
+        mode: One of ORDER_MODES
+        
+    Returns:
+        The moved TopicModel instance
+        
+    Raises:
+        ValueError: If neither neighbour is given, or they are out of order
+    """
+    if after is None and before is None:
+        raise ValueError("Either 'after' or 'before' must be given")
+    if after is not None and before is not None and (
+        after.rank > before.rank if mode == "rank" else after.position >= before.position
+    ):
+        raise ValueError("'after' must come before 'before'")
+    
+    if mode == "rank":
+        try:
+            db_topic.rank = _rank_for_move(db, db_topic, after, before)
+        except ValueError:
+            # Reason: equal neighbour ranks leave no gap; respace them and try again
+            rebalance_topic_ranks(db)
+            for topic in (db_topic, after, before):
+                if topic is not None:
+                    db.refresh(topic)
+            db_topic.rank = _rank_for_move(db, db_topic, after, before)
+        db.add(db_topic)
+    else:
+        _move_by_position(db, db_topic, after, before)
+    
+    db.commit()
+    topics_changed(db)
+    db.refresh(db_topic)
+    return db_topic
@@ -0,0 +1,193 @@
+"""
+Connection pool configuration and instrumentation.
+
+Every setting comes from an environment variable so pool sizing, timeouts and
+external-pooler support (e.g. PgBouncer/Supavisor in transaction mode) can be
+changed per deployment without code changes.
+"""
+import os
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.utils.metrics import (
+    Histogram, prometheus_header, prometheus_histogram, prometheus_sample
+)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable."""
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+# Pool sizing and lifetime (see SQLAlchemy QueuePool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# Server-side statement_timeout in milliseconds (0 disables it)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Set when connecting through an external pooler in transaction mode: the app
+# keeps no pool of its own and disables server-side prepared statements
+DB_EXTERNAL_POOLER = _env_bool("DB_EXTERNAL_POOLER", False)
+
+
+class PoolMetrics:
+    """
+    Process-wide counters for connection checkouts.
+    """
+
+    def __init__(self):
+        self.wait_seconds = Histogram()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+
+    def record_wait(self, seconds: float) -> None:
+        """Record a successful checkout and how long it waited."""
+        self.wait_seconds.observe(seconds)
+        with self._lock:
+            self.checkouts += 1
+
+    def record_failure(self) -> None:
+        """Record a checkout that failed (timeout or connect error)."""
+        with self._lock:
+            self.checkout_failures += 1
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self.wait_seconds.reset()
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+
+    def prometheus_lines(self) -> List[str]:
+        """Render the counters in the Prometheus text exposition format."""
+        lines = prometheus_header(
+            "db_pool_checkouts_total", "counter", "Successful connection checkouts."
+        )
+        lines.append(prometheus_sample("db_pool_checkouts_total", self.checkouts))
+        lines += prometheus_header(
+            "db_pool_checkout_failures_total", "counter", "Failed connection checkouts."
+        )
+        lines.append(prometheus_sample("db_pool_checkout_failures_total", self.checkout_failures))
+        lines += prometheus_header(
+            "db_pool_wait_seconds", "histogram", "Time spent waiting for a connection."
+        )
+        lines += prometheus_histogram("db_pool_wait_seconds", self.wait_seconds.snapshot())
+        return lines
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waits and which ones fail.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record_failure()
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(url: str) -> Dict:
+    """
+    Build ``create_engine`` keyword arguments from the pool settings.
+    
+    Args:
+        url: Sync database URL
+        
+    Returns:
+        dict of keyword arguments for ``create_engine``
+    """
+    if url.startswith("sqlite"):
+        # Reason: SQLite has no server to pool against; keep SQLAlchemy's defaults
+        return {"connect_args": {"check_same_thread": False}}
+    
+    options: Dict = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if DB_EXTERNAL_POOLER:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def async_engine_options(url: str) -> Dict:
+    """
+    Build ``create_async_engine`` keyword arguments from the pool settings.
+    
+    Args:
+        url: Async database URL
+        
+    Returns:
+        dict of keyword arguments for ``create_async_engine``
+    """
+    if url.startswith("sqlite"):
+        return {}
+    
+    options: Dict = {"pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args: Dict = {}
+    if DB_EXTERNAL_POOLER:
+        options["poolclass"] = NullPool
+        # Reason: transaction-mode poolers can hand each statement a different
+        # backend, so prepared statements from one connection don't exist on the next
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    else:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_status(engine) -> Dict:
+    """
+    Report live pool state for an engine alongside the checkout metrics.
+    
+    Args:
+        engine: SQLAlchemy Engine (or AsyncEngine's ``sync_engine``)
+        
+    Returns:
+        dict of pool gauges and counters
+    """
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "checkouts": pool_metrics.checkouts,
+        "checkout_failures": pool_metrics.checkout_failures,
+        "wait_seconds": pool_metrics.wait_seconds.snapshot(),
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
@@ -0,0 +1,118 @@
+"""
+Per-request SQL statement counting.
+
+Engine events record every statement executed while a ``track_queries()``
+block is active in the current context. The HTTP instrumentation opens one
+block per request; tests use it to catch N+1 query loops.
+
+Tracking state lives in a ``ContextVar``, which Starlette copies into the
+threadpool running sync endpoints, so statements issued there are counted
+against the request that triggered them.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """
+    Statements executed within one tracking block.
+    
+    Args:
+        capture: Also keep each statement and its parameters (for debugging)
+        parent: Enclosing block, which is credited with the same statements
+    """
+
+    def __init__(self, capture: bool = False, parent: Optional["QueryStats"] = None):
+        self.capture = capture
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: List[Tuple[str, Any]] = []
+
+    def record(self, statement: str, parameters: Any, seconds: float) -> None:
+        """Account for one executed statement, here and in enclosing blocks."""
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            if stats.capture:
+                stats.statements.append((statement, parameters))
+            stats = stats.parent
+
+    def dump(self) -> str:
+        """
+        Describe the captured statements, one numbered entry each.
+        
+        Returns:
+            Multi-line string (empty when nothing was captured)
+        """
+        lines = []
+        for number, (statement, parameters) in enumerate(self.statements, start=1):
+            lines.append(f"{number:>3}. {' '.join(statement.split())}")
+            if parameters:
+                lines.append(f"     parameters: {parameters!r}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(capture: bool = False) -> Iterator[QueryStats]:
+    """
+    Count the SQL statements executed inside the block.
+    
+    Blocks nest: statements count towards every enclosing block, so a test
+    can wrap a request that the instrumentation middleware also tracks.
+    
+    Args:
+        capture: Also keep the text and parameters of each statement
+        
+    Yields:
+        QueryStats filled in as statements run
+    """
+    stats = QueryStats(capture=capture, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Return the stats of the innermost active tracking block, if any."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    stats.record(statement, parameters, elapsed)
+
+
+def install_query_tracking(target: Any = Engine) -> None:
+    """
+    Hook statement tracking into SQLAlchemy engine events.
+    
+    Listening on the ``Engine`` class (the default) covers every engine:
+    the primary, read replicas and the async engine's ``sync_engine``.
+    Installing twice is a no-op.
+    
+    Args:
+        target: Engine class or instance to listen on
+    """
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
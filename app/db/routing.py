@@ -0,0 +1,236 @@
+"""
+Read-replica routing for read-only request dependencies.
+
+Writes always go through ``get_db`` (the primary). Read-only endpoints depend
+on ``get_read_db``, which hands out a session bound to one of the replicas in
+``DATABASE_REPLICA_URLS`` (round-robin), skipping replicas that recently
+failed and falling back to the primary when none is healthy.
+
+Replicas lag behind the primary, so a client that just wrote data can ask to
+read its own writes: mutating requests set a short-lived cookie (see
+``app.main``), and the ``X-Read-Your-Writes`` header forces the primary too.
+
+``get_async_read_db`` does the same for ``AsyncSession`` handlers, over async
+engines for the same replicas, created on first use.
+"""
+import itertools
+import os
+import threading
+import time
+from typing import AsyncGenerator, Generator, Iterator, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.database import get_async_db, get_db, to_async_url
+from app.db.pool import async_engine_options, engine_options
+
+# Comma-separated replica URLs; empty means every read goes to the primary
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+# How long a replica that failed its health check is skipped
+REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+# How long after a write the same client keeps reading from the primary
+READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+# Cookie and header that pin reads to the primary
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection over replica engines with simple failover.
+    """
+
+    def __init__(self, engines: List[Engine], retry_seconds: float = REPLICA_RETRY_SECONDS):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._sessionmakers = [self._sessionmaker(e) for e in engines]
+        self._down_until = [0.0] * len(engines)
+        self._cycle = itertools.cycle(range(len(engines)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_urls(cls, urls: List[str]) -> "ReplicaRouter":
+        """
+        Build a router with one engine per replica URL.
+        
+        Args:
+            urls: Replica database URLs
+            
+        Returns:
+            ReplicaRouter instance
+        """
+        return cls([create_engine(url, **engine_options(url)) for url in urls])
+
+    def _sessionmaker(self, engine: Engine) -> sessionmaker:
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def _candidates(self) -> Iterator[int]:
+        """Indexes of the replicas outside their retry window, in round-robin turn."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+            if self._down_until[index] <= time.monotonic():
+                yield index
+
+    def mark_down(self, index: int) -> None:
+        """Skip a replica until its retry window has passed."""
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def replica_session(self) -> Optional[Session]:
+        """
+        Open a session on the next healthy replica.
+        
+        The session's connection is checked out up front (with the pool's
+        pre-ping), so an unreachable replica is detected here rather than
+        halfway through the request.
+        
+        Returns:
+            Session bound to a replica, or None if no replica is usable
+        """
+        for index in self._candidates():
+            session = self._sessionmakers[index]()
+            try:
+                session.connection()
+                return session
+            except DBAPIError:
+                session.close()
+                self.mark_down(index)
+        return None
+
+
+class AsyncReplicaRouter(ReplicaRouter):
+    """
+    ``ReplicaRouter`` over async engines, handing out ``AsyncSession`` objects.
+    """
+
+    def _sessionmaker(self, engine) -> sessionmaker:
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        return sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    @classmethod
+    def from_urls(cls, urls: List[str]) -> "AsyncReplicaRouter":
+        """
+        Build a router with one async engine per replica URL.
+        
+        Args:
+            urls: Replica database URLs (sync drivers are mapped to async ones)
+            
+        Returns:
+            AsyncReplicaRouter instance
+        """
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        async_urls = [to_async_url(url) for url in urls]
+        return cls([create_async_engine(url, **async_engine_options(url)) for url in async_urls])
+
+    async def replica_session(self):
+        """
+        Open an ``AsyncSession`` on the next healthy replica.
+        
+        Returns:
+            AsyncSession bound to a replica, or None if no replica is usable
+        """
+        for index in self._candidates():
+            session = self._sessionmakers[index]()
+            try:
+                await session.connection()
+                return session
+            except DBAPIError:
+                await session.close()
+                self.mark_down(index)
+        return None
+
+
+replica_router = ReplicaRouter.from_urls(DATABASE_REPLICA_URLS)
+
+# Created on first use so the async drivers are only needed by apps that opt in
+_async_replica_router: Optional[AsyncReplicaRouter] = None
+
+
+def get_async_replica_router() -> AsyncReplicaRouter:
+    """Get the async replica router, creating its engines on first use."""
+    global _async_replica_router
+    if _async_replica_router is None:
+        _async_replica_router = AsyncReplicaRouter.from_urls(DATABASE_REPLICA_URLS)
+    return _async_replica_router
+
+
+async def dispose_async_replicas() -> None:
+    """Close the async replica engines' pooled connections, if they were ever created."""
+    global _async_replica_router
+    if _async_replica_router is not None:
+        for engine in _async_replica_router.engines:
+            await engine.dispose()
+        _async_replica_router = None
+
+
+def wants_primary(request: Request) -> bool:
+    """
+    Tell whether a request must read from the primary.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        True if the client asked to read its own writes, or wrote recently
+    """
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        until = float(request.cookies.get(READ_YOUR_WRITES_COOKIE, "0"))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)) -> Generator:
+    """
+    Dependency function to get a session for read-only work.
+    
+    The primary session is only used (and only connects) when no replica is
+    configured or healthy, or when the client needs to read its own writes.
+    
+    Yields:
+        Session: Database session bound to a replica or the primary
+    """
+    session = None if wants_primary(request) else replica_router.replica_session()
+    if session is None:
+        yield primary
+        return
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_async_read_db(
+    request: Request, primary=Depends(get_async_db)
+) -> AsyncGenerator:
+    """
+    Dependency function to get an async session for read-only work.
+    
+    Same routing as ``get_read_db``, over the async replica engines.
+    
+    Yields:
+        AsyncSession: Async database session bound to a replica or the primary
+    """
+    session = None
+    if not wants_primary(request):
+        session = await get_async_replica_router().replica_session()
+    if session is None:
+        yield primary
+        return
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,35 @@
+"""
+AI content generation: providers, rate limiting and the job queue.
+"""
+from .prompts import POST_CONTENT_TEMPLATE, post_prompt_variables, render_post_prompt
+from .providers import (
+    PROVIDERS,
+    FakeProvider,
+    GenerationError,
+    GenerationRequest,
+    LLMProvider,
+    OpenAIProvider,
+    RetryableGenerationError,
+    register_provider,
+)
+from .jobs import Job
+from .queue import GenerationQueue, QueueFullError
+from .rate_limit import RateLimiter
+
+__all__ = [
+    "POST_CONTENT_TEMPLATE",
+    "PROVIDERS",
+    "FakeProvider",
+    "GenerationError",
+    "GenerationQueue",
+    "GenerationRequest",
+    "Job",
+    "LLMProvider",
+    "OpenAIProvider",
+    "QueueFullError",
+    "RateLimiter",
+    "RetryableGenerationError",
+    "post_prompt_variables",
+    "register_provider",
+    "render_post_prompt",
+]
@@ -0,0 +1,218 @@
+"""
+Database-backed cache of generated responses.
+
+Entries are keyed by a hash of the provider, model, sampling parameters and
+normalized prompt template plus variables (see ``GenerationRequest.key``),
+and hold the chunks the response was streamed in so a hit can be replayed
+as a stream. The table is shared by every API worker and survives
+restarts, which matters for responses that took a minute and cost money to
+produce.
+"""
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.generation_cache import GenerationCacheEntry
+from app.models.topic import _utcnow
+from app.utils.cache import MISSING, CacheBackend
+
+# Use the response cache at all
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE_ENABLED", "true").lower() in (
+    "1", "true", "yes"
+)
+# Seconds a response stays valid (0 keeps responses until they are evicted)
+GENERATION_CACHE_TTL_SECONDS = float(os.getenv("GENERATION_CACHE_TTL_SECONDS", "604800"))
+# Total response text kept; least recently used entries go first beyond it
+GENERATION_CACHE_MAX_BYTES = int(os.getenv("GENERATION_CACHE_MAX_BYTES", "104857600"))
+# Writes between eviction passes
+GENERATION_CACHE_EVICT_EVERY = int(os.getenv("GENERATION_CACHE_EVICT_EVERY", "100"))
+
+# Keys deleted per statement during eviction
+_EVICT_BATCH = 500
+
+
+def cache_key(provider: str, request_key: str) -> str:
+    """
+    Key of a cached response.
+
+    Args:
+        provider: Provider name (model defaults differ between providers)
+        request_key: ``GenerationRequest.key``
+
+    Returns:
+        64-character hex digest
+    """
+    return hashlib.sha256(f"{provider}:{request_key}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache(CacheBackend):
+    """
+    Generated responses in the ``generation_cache`` table.
+
+    Values are lists of streamed chunks. Reads refresh an entry's
+    ``last_used_at``; every ``evict_every`` writes, expired entries are
+    deleted and then the least recently used ones until the total size is
+    under ``max_bytes``. Each call opens its own session, so the cache can
+    be used from any thread.
+
+    Args:
+        session_factory: Creates database sessions
+        ttl: Seconds an entry stays valid (0: no expiry)
+        max_bytes: Total response size kept
+        evict_every: Writes between eviction passes
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ttl: float = GENERATION_CACHE_TTL_SECONDS,
+        max_bytes: int = GENERATION_CACHE_MAX_BYTES,
+        evict_every: int = GENERATION_CACHE_EVICT_EVERY,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key: Hashable) -> Any:
+        table = GenerationCacheEntry.__table__
+        now = _utcnow()
+        with self.session_factory() as db:
+            row = db.execute(
+                select(table.c.chunks, table.c.expires_at).where(table.c.key == key)
+            ).first()
+            if row is None:
+                self._count("misses")
+                return MISSING
+            chunks, expires_at = row
+            if expires_at is not None and _aware(expires_at) <= now:
+                db.execute(delete(table).where(table.c.key == key))
+                db.commit()
+                self._count("expirations")
+                self._count("misses")
+                return MISSING
+            db.execute(
+                update(table)
+                .where(table.c.key == key)
+                .values(hits=table.c.hits + 1, last_used_at=now)
+            )
+            db.commit()
+        self._count("hits")
+        return chunks
+
+    def set(self, key: Hashable, value: List[str]) -> None:
+        now = _utcnow()
+        values = {
+            "key": key,
+            "chunks": list(value),
+            "size_bytes": sum(len(chunk.encode("utf-8")) for chunk in value),
+            "hits": 0,
+            "created_at": now,
+            "last_used_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl) if self.ttl else None,
+        }
+        table = GenerationCacheEntry.__table__
+        with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(table)
+                db.execute(insert.values(**values).on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={name: values[name] for name in values if name != "key"},
+                ))
+            else:
+                db.execute(delete(table).where(table.c.key == key))
+                db.execute(table.insert().values(**values))
+            db.commit()
+        with self._lock:
+            self.stores += 1
+            self._writes_since_evict += 1
+            due = self._writes_since_evict >= self.evict_every
+            if due:
+                self._writes_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete expired entries, then least recently used ones over max_bytes.
+
+        Returns:
+            Number of entries deleted
+        """
+        table = GenerationCacheEntry.__table__
+        with self.session_factory() as db:
+            expired = db.execute(
+                delete(table).where(table.c.expires_at <= _utcnow())
+            ).rowcount or 0
+            total = db.execute(select(func.sum(table.c.size_bytes))).scalar() or 0
+            excess = total - self.max_bytes
+            victims: List[str] = []
+            if excess > 0:
+                # Reason: stream oldest-first and stop as soon as enough
+                # bytes are found, instead of loading the whole index
+                rows = db.execute(
+                    select(table.c.key, table.c.size_bytes)
+                    .order_by(table.c.last_used_at, table.c.key)
+                    .execution_options(stream_results=True, yield_per=_EVICT_BATCH)
+                )
+                for key, size in rows:
+                    if excess <= 0:
+                        break
+                    victims.append(key)
+                    excess -= size
+                rows.close()
+            for start in range(0, len(victims), _EVICT_BATCH):
+                batch = victims[start:start + _EVICT_BATCH]
+                db.execute(delete(table).where(table.c.key.in_(batch)))
+            db.commit()
+        self._count("expirations", expired)
+        self._count("evictions", len(victims))
+        return expired + len(victims)
+
+    def clear(self) -> None:
+        with self.session_factory() as db:
+            db.execute(delete(GenerationCacheEntry.__table__))
+            db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+
+def _aware(value: datetime) -> datetime:
+    """Read naive timestamps (SQLite) as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def build_response_cache(session_factory: Callable[[], Session]) -> Optional[ResponseCache]:
+    """Create the response cache, or None when GENERATION_CACHE_ENABLED is off."""
+    return ResponseCache(session_factory) if GENERATION_CACHE_ENABLED else None
@@ -0,0 +1,105 @@
+"""
+Generation jobs: one caller's request, its progress and its event stream.
+"""
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+
+from app.generation.providers import GenerationRequest
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+FINAL_STATUSES = ("succeeded", "failed")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Job:
+    """
+    One caller's generation request and its progress.
+
+    ``events()`` replays everything that happened to the job (status
+    changes, streamed text, retries) and then follows it live, from any
+    event loop. A ``retry`` event means text streamed so far is void.
+    """
+
+    def __init__(self, job_id: str, request: GenerationRequest, provider: str, owner: Hashable):
+        self.id = job_id
+        self.request = request
+        self.provider = provider
+        self.owner = owner
+        self.status = "queued"
+        self.attempts = 0
+        # Answered from the response cache without calling a provider
+        self.cached = False
+        self.error: Optional[str] = None
+        self.text: Optional[str] = None
+        self.created_at = _utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # Set by an on_status hook once the job has been persisted
+        self.stored = False
+        # Held while on_status runs, so a job's notifications never overlap
+        self.status_lock = threading.Lock()
+        self.done = threading.Event()
+        self._events: List[Dict[str, Any]] = []
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Job fields as returned by the API."""
+        return {
+            "id": self.id,
+            "post_id": self.owner,
+            "status": self.status,
+            "provider": self.provider,
+            "model": self.request.model,
+            "attempts": self.attempts,
+            "cached": self.cached,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Record an event and wake every subscriber (thread-safe)."""
+        with self._lock:
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+        for loop, wakeup in subscribers:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                pass
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job's events from the start until it finishes."""
+        wakeup = asyncio.Event()
+        subscriber = (asyncio.get_running_loop(), wakeup)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        position = 0
+        try:
+            while True:
+                with self._lock:
+                    # Reason: clear before reading, so an event recorded after
+                    # the read always finds the flag cleared and sets it
+                    wakeup.clear()
+                    batch = self._events[position:]
+                    position += len(batch)
+                for event in batch:
+                    yield event
+                    if event["type"] == "status" and event["status"] in FINAL_STATUSES:
+                        return
+                await wakeup.wait()
+        finally:
+            with self._lock:
+                self._subscribers.remove(subscriber)
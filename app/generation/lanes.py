@@ -0,0 +1,67 @@
+"""
+Building blocks of the generation queue: flights and provider lanes.
+
+A flight is one distinct request on its way to a provider, carrying every
+job waiting on it. A lane holds one provider's pending flights, rate limit
+and worker coroutines.
+"""
+import asyncio
+from collections import deque
+from typing import Deque, List, Tuple
+
+from app.generation.jobs import Job
+from app.generation.providers import GenerationRequest, LLMProvider
+from app.generation.rate_limit import RateLimiter
+
+
+class Flight:
+    """One distinct request on its way to a provider, shared by its jobs."""
+
+    def __init__(self, key: str, request: GenerationRequest, provider: str, use_cache: bool):
+        self.key = key
+        self.request = request
+        self.provider = provider
+        self.use_cache = use_cache
+        self.jobs: List[Job] = []
+        self.chunks: List[str] = []
+        self.attempts = 0
+        self.running = False
+        self.cached = False
+
+    def batch_key(self) -> Tuple:
+        return self.request.model, self.request.params
+
+
+class Lane:
+    """Pending requests, rate limit and workers of one provider."""
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.limiter = RateLimiter.per_minute(provider.requests_per_minute)
+        self.pending: Deque[Flight] = deque()
+        self.ready = asyncio.Event()
+        self.workers: List[asyncio.Task] = []
+
+    def put(self, flight: Flight) -> None:
+        self.pending.append(flight)
+        self.ready.set()
+
+    async def take(self, window: float) -> List[Flight]:
+        """Wait for a request, then gather a batch of compatible ones."""
+        while not self.pending:
+            self.ready.clear()
+            await self.ready.wait()
+        first = self.pending.popleft()
+        size = self.provider.max_batch_size
+        if size <= 1:
+            return [first]
+        if window and len(self.pending) < size - 1:
+            await asyncio.sleep(window)
+        batch = [first]
+        for flight in list(self.pending):
+            if len(batch) >= size:
+                break
+            if flight.batch_key() == first.batch_key():
+                self.pending.remove(flight)
+                batch.append(flight)
+        return batch
@@ -0,0 +1,68 @@
+"""
+Prompt templates for content generation.
+
+Templates are ``str.format`` strings. Requests are built from a template
+and its variables (``GenerationRequest.from_template``) so cache keys and
+coalescing follow what was asked rather than how the prompt was laid out.
+"""
+from typing import Dict, Iterable, Optional
+
+# Markdown body for a post, from its title and whatever else is known about it
+POST_CONTENT_TEMPLATE = """Write the body of a blog post in Markdown.
+
+Title: {title}
+{context}
+Write engaging, well-structured content with headings where they help. Do not
+repeat the title as a heading.
+{instructions}"""
+
+
+def post_prompt_variables(
+    title: str,
+    topic: Optional[str] = None,
+    topic_description: Optional[str] = None,
+    excerpt: Optional[str] = None,
+    keywords: Optional[Iterable[str]] = None,
+    instructions: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Variables for POST_CONTENT_TEMPLATE.
+
+    Args:
+        title: Post title
+        topic: Name of the post's topic
+        topic_description: Description of the topic
+        excerpt: Summary the content should match
+        keywords: SEO keywords to work in
+        instructions: Extra instructions from the editor
+
+    Returns:
+        Template variables
+    """
+    context = []
+    if topic:
+        context.append(f"Topic: {topic}" + (f" ({topic_description})" if topic_description else ""))
+    if excerpt:
+        context.append(f"Summary: {excerpt}")
+    if keywords:
+        context.append(f"Keywords: {', '.join(keywords)}")
+    if instructions:
+        instructions = f"\nAdditional instructions: {instructions.strip()}\n"
+    return {
+        "title": title,
+        "context": "\n".join(context) + ("\n" if context else ""),
+        "instructions": instructions or "",
+    }
+
+def render_post_prompt(title: str, **context) -> str:
+    """
+    Build the prompt generating a post's content.
+
+    Args:
+        title: Post title
+        **context: Further arguments for :func:`post_prompt_variables`
+
+    Returns:
+        Prompt text
+    """
+    return POST_CONTENT_TEMPLATE.format(**post_prompt_variables(title, **context))
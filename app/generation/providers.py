@@ -0,0 +1,309 @@
+"""
+Pluggable LLM providers for content generation.
+
+A provider turns a ``GenerationRequest`` into text, either streamed token by
+token or, for providers that accept several prompts per call, in batches.
+``FakeProvider`` is deterministic and runs locally, for tests and
+benchmarks; ``OpenAIProvider`` talks to any OpenAI-compatible chat
+completions endpoint. Register others with :func:`register_provider`.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import unicodedata
+from typing import AsyncIterator, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
+
+# Provider used when a request doesn't name one
+GENERATION_PROVIDER = os.getenv("GENERATION_PROVIDER", "fake")
+
+# OpenAI-compatible endpoint settings
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "60"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+
+_BLANKS = re.compile(r"[ \t]+")
+
+
+class GenerationError(Exception):
+    """A generation request failed and should not be retried."""
+
+
+class RetryableGenerationError(GenerationError):
+    """
+    A generation request failed in a way worth retrying (rate limited,
+    overloaded, timed out).
+
+    Attributes:
+        retry_after: Seconds the provider asked us to wait, if it said
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of prompt text for hashing.
+
+    Unicode is NFC-normalized, line endings become ``\\n``, runs of spaces
+    and tabs collapse to one space, and trailing spaces and leading/trailing
+    blank lines go, so prompts differing only in layout hash the same.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_BLANKS.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(lines).strip("\n")
+
+
+class GenerationRequest:
+    """
+    What to generate: a prompt plus the model and sampling parameters.
+
+    Requests with the same :attr:`key` produce interchangeable output, which
+    is what lets the queue coalesce duplicates and cache responses. Build
+    requests from templates with :meth:`from_template` so the key covers the
+    template and its variables rather than the rendered text.
+    """
+
+    def __init__(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        params: Optional[Mapping[str, object]] = None,
+        template: Optional[str] = None,
+        variables: Optional[Mapping[str, object]] = None,
+    ):
+        self.prompt = prompt
+        self.model = model
+        self.params: Tuple[Tuple[str, object], ...] = tuple(sorted((params or {}).items()))
+        self.template = template
+        self.variables: Tuple[Tuple[str, object], ...] = tuple(sorted((variables or {}).items()))
+        self._key: Optional[str] = None
+
+    @classmethod
+    def from_template(
+        cls,
+        template: str,
+        variables: Mapping[str, object],
+        model: Optional[str] = None,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> "GenerationRequest":
+        """Render a ``str.format`` template into a request that remembers both."""
+        return cls(template.format(**variables), model, params, template, variables)
+
+    @property
+    def key(self) -> str:
+        """Hash identifying the model, parameters and normalized prompt."""
+        if self._key is not None:
+            return self._key
+        if self.template is not None:
+            prompt = [
+                normalize_text(self.template),
+                [[name, normalize_text(str(value))] for name, value in self.variables],
+            ]
+        else:
+            prompt = normalize_text(self.prompt)
+        payload = json.dumps([self.model, self.params, prompt], sort_keys=True, default=str)
+        self._key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._key
+
+    def param(self, name: str, default=None):
+        """Look up one sampling parameter."""
+        return dict(self.params).get(name, default)
+
+
+class LLMProvider:
+    """
+    Interface for LLM providers.
+
+    Attributes:
+        name: Registry name of the provider
+        requests_per_minute: Calls the provider allows (one batch is one call)
+        max_concurrency: Calls the queue may have in flight at once
+        max_batch_size: Prompts per call; above 1 the queue batches requests
+            with the same model and parameters through :meth:`generate_batch`
+    """
+
+    name = "base"
+    requests_per_minute = 60.0
+    max_concurrency = 4
+    max_batch_size = 1
+
+    def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """Yield the generated text in chunks as the provider produces it."""
+        raise NotImplementedError
+
+    async def generate_batch(self, requests: Sequence[GenerationRequest]) -> List[str]:
+        """Generate several requests in one call (default: one stream each)."""
+        async def collect(request: GenerationRequest) -> str:
+            return "".join([chunk async for chunk in self.stream(request)])
+        return list(await asyncio.gather(*(collect(request) for request in requests)))
+
+    async def close(self) -> None:
+        """Release connections held by the provider."""
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic local provider.
+
+    The text depends only on the request key, so repeated runs and
+    coalesced requests agree. Latency and failures can be simulated.
+
+    Args:
+        latency: Seconds before the first chunk of each call
+        token_delay: Seconds between chunks
+        fail_first: Fail this many calls per request key with a retryable
+            error before succeeding
+        requests_per_minute: Rate limit the queue applies
+        max_concurrency: Calls in flight at once
+        max_batch_size: Prompts per call
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_delay: float = 0.0,
+        fail_first: int = 0,
+        requests_per_minute: float = 6000.0,
+        max_concurrency: int = 8,
+        max_batch_size: int = 8,
+    ):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_batch_size = max_batch_size
+        self.calls = 0
+        self.batch_sizes: List[int] = []
+        self._failures: Dict[str, int] = {}
+
+    @staticmethod
+    def text_for(request: GenerationRequest) -> str:
+        """The text generated for a request."""
+        rng = random.Random(request.key)
+        words = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+            for _ in range(int(request.param("max_tokens", 200)))
+        ]
+        sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+        return "\n\n".join(" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5))
+
+    async def _call(self, requests: Sequence[GenerationRequest]) -> None:
+        """Account for one call and simulate its latency and failures."""
+        self.calls += 1
+        self.batch_sizes.append(len(requests))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for request in requests:
+            failed = self._failures.get(request.key, 0)
+            if failed < self.fail_first:
+                self._failures[request.key] = failed + 1
+                raise RetryableGenerationError("Simulated provider overload", retry_after=0)
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        await self._call([request])
+        for i, chunk in enumerate(self.text_for(request).split(" ")):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield chunk if i == 0 else " " + chunk
+
+    async def generate_batch(self, requests: Sequence[GenerationRequest]) -> List[str]:
+        await self._call(requests)
+        return [self.text_for(request) for request in requests]
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    Provider for OpenAI-compatible ``/chat/completions`` endpoints.
+
+    Streams with server-sent events. 429 and 5xx responses are retryable,
+    honouring ``Retry-After``.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: str = OPENAI_API_KEY,
+        base_url: str = OPENAI_BASE_URL,
+        model: str = OPENAI_MODEL,
+        requests_per_minute: float = OPENAI_REQUESTS_PER_MINUTE,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        timeout: float = OPENAI_TIMEOUT_SECONDS,
+    ):
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+        )
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        body = {
+            "model": request.model or self.model,
+            "messages": [{"role": "user", "content": request.prompt}],
+            "stream": True,
+            **dict(request.params),
+        }
+        try:
+            async with self._client.stream("POST", "/chat/completions", json=body) as response:
+                if response.status_code == 429 or response.status_code >= 500:
+                    retry_after = response.headers.get("retry-after")
+                    raise RetryableGenerationError(
+                        f"Provider returned {response.status_code}",
+                        retry_after=float(retry_after) if retry_after else None,
+                    )
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise GenerationError(
+                        f"Provider returned {response.status_code}: {response.text[:200]}"
+                    )
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    chunk = (choices[0].get("delta") or {}).get("content")
+                    if chunk:
+                        yield chunk
+        except httpx.TimeoutException as exc:
+            raise RetryableGenerationError(f"Provider timed out: {exc}") from exc
+        except httpx.TransportError as exc:
+            raise RetryableGenerationError(f"Provider unreachable: {exc}") from exc
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# name -> factory building a provider with its default settings
+PROVIDERS: Dict[str, Callable[[], LLMProvider]] = {
+    FakeProvider.name: FakeProvider,
+    OpenAIProvider.name: OpenAIProvider,
+}
+
+
+def register_provider(name: str, factory: Callable[[], LLMProvider]) -> None:
+    """
+    Make a provider available to the generation queue by name.
+
+    Args:
+        name: Name requests refer to the provider by
+        factory: Callable returning a configured provider
+    """
+    PROVIDERS[name] = factory
@@ -0,0 +1,487 @@
+"""
+In-process job queue running LLM generation off the request path.
+
+``GenerationQueue.submit`` returns a ``Job`` immediately. The work runs on an
+event loop in a background thread, so a slow provider ties up a coroutine
+rather than a worker thread, and thousands of calls can wait at once.
+
+- Each provider gets a lane: ``max_concurrency`` worker coroutines sharing
+  a token-bucket rate limit.
+- Workers batch queued requests with the same model and parameters when
+  the provider accepts several prompts per call.
+- Retryable failures are re-queued with exponential backoff and jitter, or
+  after the delay the provider asked for.
+- A request identical to one already queued or running (same provider,
+  model, parameters and prompt) is not sent twice. The new job rides along
+  with the existing call, and a repeat from the same owner returns the
+  existing job.
+- With a response cache, a request answered before is replayed from the
+  cache without reaching a provider, chunk by chunk as it was streamed.
+
+Jobs live in this process; ``on_status`` and ``on_result`` hooks persist
+them and apply their output. The hooks run in a thread pool because they
+do blocking database work.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from app.generation.cache import cache_key
+from app.generation.jobs import Job, _utcnow
+from app.generation.lanes import Flight, Lane
+from app.generation.providers import (
+    GENERATION_PROVIDER, PROVIDERS, GenerationRequest, LLMProvider, RetryableGenerationError
+)
+from app.utils.cache import MISSING, CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Flights (distinct requests) allowed to wait or run at once before submit refuses
+GENERATION_MAX_QUEUED = int(os.getenv("GENERATION_MAX_QUEUED", "1000"))
+# Attempts per request, the first included
+GENERATION_MAX_ATTEMPTS = int(os.getenv("GENERATION_MAX_ATTEMPTS", "4"))
+# Backoff before retry n is about BASE * 2**(n-1) seconds, capped at MAX
+GENERATION_RETRY_BASE_SECONDS = float(os.getenv("GENERATION_RETRY_BASE_SECONDS", "1"))
+GENERATION_RETRY_MAX_SECONDS = float(os.getenv("GENERATION_RETRY_MAX_SECONDS", "60"))
+# How long a worker waits for more requests to fill a batch
+GENERATION_BATCH_WINDOW_MS = float(os.getenv("GENERATION_BATCH_WINDOW_MS", "20"))
+# Finished jobs kept in memory for polling and streaming
+GENERATION_JOB_RETENTION = int(os.getenv("GENERATION_JOB_RETENTION", "1000"))
+# Threads running the persistence hooks
+GENERATION_HOOK_THREADS = int(os.getenv("GENERATION_HOOK_THREADS", "4"))
+
+
+class QueueFullError(Exception):
+    """Raised by ``submit`` when GENERATION_MAX_QUEUED requests are pending."""
+
+
+class GenerationQueue:
+    """
+    Bounded, rate-limited, batching and coalescing generation queue.
+
+    Args:
+        providers: Provider instances by name; others are built from
+            ``PROVIDERS`` when first used
+        default_provider: Provider for requests that don't name one
+        on_status: Called with a job whenever its status changes, one call at
+            a time per job. The first call is made inside ``submit`` before any
+            other, the rest from a hook thread; a job joining a running call is
+            already ``running`` on its first call, so use ``Job.stored`` rather
+            than the status to tell a new job from a known one
+        on_result: Called with a job and its text before it is marked
+            succeeded; raising marks the job failed instead
+        cache: Backend storing responses as lists of chunks (e.g.
+            ``ResponseCache``); None disables caching
+        max_queued: Distinct requests allowed to be pending at once
+        max_attempts: Attempts per request, the first included
+        retry_base: Seconds of backoff before the first retry
+        retry_max: Cap on the backoff
+        batch_window: Seconds a worker waits for a batch to fill
+        retention: Finished jobs kept in memory
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Mapping[str, LLMProvider]] = None,
+        default_provider: str = GENERATION_PROVIDER,
+        on_status: Optional[Callable[[Job], None]] = None,
+        on_result: Optional[Callable[[Job, str], None]] = None,
+        cache: Optional[CacheBackend] = None,
+        max_queued: int = GENERATION_MAX_QUEUED,
+        max_attempts: int = GENERATION_MAX_ATTEMPTS,
+        retry_base: float = GENERATION_RETRY_BASE_SECONDS,
+        retry_max: float = GENERATION_RETRY_MAX_SECONDS,
+        batch_window: float = GENERATION_BATCH_WINDOW_MS / 1000,
+        retention: int = GENERATION_JOB_RETENTION,
+    ):
+        self._providers: Dict[str, LLMProvider] = dict(providers or {})
+        self.default_provider = default_provider
+        self.on_status = on_status
+        self.on_result = on_result
+        self.cache = cache
+        self.max_queued = max_queued
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.batch_window = batch_window
+        self.retention = retention
+
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._owner_jobs: Dict[Tuple[Hashable, str], Job] = {}
+        self._inflight: Dict[str, Flight] = {}
+        self._lanes: Dict[str, Lane] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._hooks = ThreadPoolExecutor(
+            max_workers=GENERATION_HOOK_THREADS, thread_name_prefix="generation-hook"
+        )
+        self.counters = {
+            "submitted": 0, "coalesced": 0, "succeeded": 0, "failed": 0,
+            "retries": 0, "provider_calls": 0, "batched_requests": 0, "cache_bypassed": 0,
+        }
+
+    def provider(self, name: Optional[str] = None) -> LLMProvider:
+        """
+        Get a provider by name, building it on first use.
+
+        Raises:
+            KeyError: If no provider is registered under that name
+        """
+        name = name or self.default_provider
+        with self._lock:
+            if name not in self._providers:
+                if name not in PROVIDERS:
+                    raise KeyError(name)
+                self._providers[name] = PROVIDERS[name]()
+            return self._providers[name]
+
+    def start(self) -> None:
+        """Start the background event loop (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="generation-queue", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the workers and the loop. Pending jobs are abandoned.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        self._hooks.shutdown(wait=True)
+
+    async def _shutdown(self) -> None:
+        workers = [task for lane in self._lanes.values() for task in lane.workers]
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._lanes.clear()
+        for provider in self._providers.values():
+            await provider.close()
+
+    def submit(
+        self,
+        request: GenerationRequest,
+        provider: Optional[str] = None,
+        owner: Hashable = None,
+        use_cache: bool = True,
+    ) -> Tuple[Job, bool]:
+        """
+        Queue a request, coalescing it with an identical pending one.
+
+        Args:
+            request: What to generate
+            provider: Provider name (default: ``default_provider``)
+            owner: What the job is for (e.g. a post ID); a repeat request
+                from the same owner returns the pending job
+            use_cache: Answer from the response cache when possible; False
+                always calls the provider (and refreshes the cached response)
+
+        Returns:
+            Tuple of (job, whether it was coalesced with a pending request)
+
+        Raises:
+            KeyError: If the provider is unknown
+            QueueFullError: If max_queued distinct requests are pending
+        """
+        name = provider or self.default_provider
+        self.provider(name)
+        self.start()
+        use_cache = use_cache and self.cache is not None
+        # Reason: a request bypassing the cache must not join one that may
+        # be answered from it
+        key = f"{name}:{request.key}" + ("" if use_cache else ":fresh")
+        new_flight = None
+        with self._lock:
+            existing = self._owner_jobs.get((owner, key)) if owner is not None else None
+            if existing is not None and not existing.finished:
+                self.counters["coalesced"] += 1
+                return existing, True
+            flight = self._inflight.get(key)
+            if flight is None and len(self._inflight) >= self.max_queued:
+                raise QueueFullError(f"{self.max_queued} generation requests already pending")
+
+            job = Job(str(uuid.uuid4()), request, name, owner)
+            # Reason: held until the job's first notification is done, so the
+            # loop can't report it running or finished before it was created
+            job.status_lock.acquire()
+            self._jobs[job.id] = job
+            if owner is not None:
+                self._owner_jobs[(owner, key)] = job
+            self.counters["submitted"] += 1
+            if self.cache is not None and not use_cache:
+                self.counters["cache_bypassed"] += 1
+            if flight is None:
+                new_flight = flight = self._inflight[key] = Flight(key, request, name, use_cache)
+            else:
+                self.counters["coalesced"] += 1
+            flight.jobs.append(job)
+            # Reason: a job joining a running call starts from what was
+            # already streamed
+            if flight.running:
+                job.status, job.started_at, job.attempts = "running", _utcnow(), flight.attempts
+                replay = list(flight.chunks)
+            else:
+                replay = None
+
+        try:
+            self._run_status_hook(job)
+        finally:
+            job.status_lock.release()
+        job.emit({"type": "status", "status": "queued"})
+        if replay is not None:
+            job.emit({"type": "status", "status": "running", "attempt": job.attempts})
+            for chunk in replay:
+                job.emit({"type": "token", "text": chunk})
+        if new_flight is not None:
+            self._loop.call_soon_threadsafe(self._enqueue, new_flight)
+        return job, new_flight is None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job still held in memory."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Job:
+        """
+        Block until a job finishes.
+
+        Raises:
+            KeyError: If the job is unknown
+            TimeoutError: If it is still running after ``timeout`` seconds
+        """
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if not job.done.wait(timeout):
+            raise TimeoutError(f"Job {job_id} still {job.status}")
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth, per-provider waits included."""
+        with self._lock:
+            pending = len(self._inflight)
+            running = sum(1 for flight in self._inflight.values() if flight.running)
+        return {
+            **self.counters,
+            "pending": pending,
+            "running": running,
+            "rate_limit_wait_seconds": {
+                name: round(lane.limiter.waited, 3) for name, lane in list(self._lanes.items())
+            },
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def _notify(self, job: Job) -> None:
+        """Run the on_status hook, after any call for the same job still running."""
+        with job.status_lock:
+            self._run_status_hook(job)
+
+    def _run_status_hook(self, job: Job) -> None:
+        """Run the on_status hook, logging failures (``job.status_lock`` held)."""
+        if self.on_status is None:
+            return
+        try:
+            self.on_status(job)
+        except Exception:
+            logger.exception("Generation status hook failed for job %s", job.id)
+
+    # Everything below runs on the queue's event loop
+
+    def _enqueue(self, flight: Flight) -> None:
+        lane = self._lanes.get(flight.provider)
+        if lane is None:
+            lane = self._lanes[flight.provider] = Lane(self.provider(flight.provider))
+            lane.workers = [
+                asyncio.ensure_future(self._work(lane))
+                for _ in range(max(1, lane.provider.max_concurrency))
+            ]
+        if flight.use_cache:
+            asyncio.ensure_future(self._admit(lane, flight))
+        else:
+            lane.put(flight)
+
+    def _lookup(self, flight: Flight) -> Any:
+        """Read a flight's cached response (hook thread)."""
+        try:
+            return self.cache.get(cache_key(flight.provider, flight.request.key))
+        except Exception:
+            logger.exception("Generation cache lookup failed")
+            return MISSING
+
+    def _store(self, flight: Flight) -> None:
+        """Cache a flight's response (hook thread)."""
+        try:
+            self.cache.set(cache_key(flight.provider, flight.request.key), list(flight.chunks))
+        except Exception:
+            logger.exception("Generation cache write failed")
+
+    async def _admit(self, lane: Lane, flight: Flight) -> None:
+        """Replay a cached response, or queue the flight for a provider."""
+        # Reason: looked up before the lane so hits never wait behind
+        # provider calls or count against the rate limit
+        chunks = await asyncio.get_running_loop().run_in_executor(
+            self._hooks, self._lookup, flight
+        )
+        if chunks is MISSING:
+            lane.put(flight)
+            return
+        with self._lock:
+            flight.cached = flight.running = True
+            flight.chunks = list(chunks)
+            jobs = list(flight.jobs)
+        for job in jobs:
+            for chunk in chunks:
+                job.emit({"type": "token", "text": chunk})
+        await self._finish(flight, text="".join(chunks))
+
+    async def _work(self, lane: Lane) -> None:
+        while True:
+            flights = await lane.take(self.batch_window)
+            try:
+                await self._run(lane, flights)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Generation worker failed")
+                await asyncio.gather(*(self._finish(f, error=str(exc)) for f in flights))
+
+    async def _set_running(self, flight: Flight) -> None:
+        with self._lock:
+            flight.attempts += 1
+            flight.running = True
+            flight.chunks = []
+            jobs = list(flight.jobs)
+        loop = asyncio.get_running_loop()
+        for job in jobs:
+            job.status, job.attempts = "running", flight.attempts
+            job.started_at = job.started_at or _utcnow()
+            job.emit({"type": "status", "status": "running", "attempt": flight.attempts})
+            await loop.run_in_executor(self._hooks, self._notify, job)
+
+    def _emit_chunk(self, flight: Flight, chunk: str) -> None:
+        with self._lock:
+            flight.chunks.append(chunk)
+            jobs = list(flight.jobs)
+        for job in jobs:
+            job.emit({"type": "token", "text": chunk})
+
+    async def _run(self, lane: Lane, flights: List[Flight]) -> None:
+        """Call the provider once for a batch of flights and settle them."""
+        for flight in flights:
+            await self._set_running(flight)
+        await lane.limiter.acquire()
+        self.counters["provider_calls"] += 1
+        if len(flights) > 1:
+            self.counters["batched_requests"] += len(flights)
+        try:
+            if len(flights) == 1:
+                async for chunk in lane.provider.stream(flights[0].request):
+                    self._emit_chunk(flights[0], chunk)
+                texts = ["".join(flights[0].chunks)]
+            else:
+                texts = await lane.provider.generate_batch([f.request for f in flights])
+                for flight, text in zip(flights, texts):
+                    self._emit_chunk(flight, text)
+        except RetryableGenerationError as exc:
+            for flight in flights:
+                await self._retry(lane, flight, exc)
+            return
+        except Exception as exc:
+            await asyncio.gather(*(self._finish(flight, error=str(exc)) for flight in flights))
+            return
+        await asyncio.gather(*(
+            self._finish(flight, text=text) for flight, text in zip(flights, texts)
+        ))
+
+    async def _retry(self, lane: Lane, flight: Flight, exc: RetryableGenerationError) -> None:
+        """Re-queue a flight after a backoff, or fail it when out of attempts."""
+        if flight.attempts >= self.max_attempts:
+            await self._finish(flight, error=f"{exc} (after {flight.attempts} attempts)")
+            return
+        if exc.retry_after is not None:
+            delay = exc.retry_after
+        else:
+            backoff = min(self.retry_max, self.retry_base * 2 ** (flight.attempts - 1))
+            # Reason: jitter keeps requests that failed together from
+            # retrying in lockstep
+            delay = backoff * random.uniform(0.5, 1.0)
+        with self._lock:
+            flight.running = False
+            jobs = list(flight.jobs)
+        self.counters["retries"] += 1
+        for job in jobs:
+            job.emit({
+                "type": "retry", "attempt": flight.attempts, "delay": delay, "error": str(exc),
+            })
+        asyncio.get_running_loop().call_later(delay, lane.put, flight)
+
+    async def _finish(
+        self, flight: Flight, text: Optional[str] = None, error: Optional[str] = None
+    ) -> None:
+        """Complete every job of a flight; no job can join it afterwards."""
+        with self._lock:
+            self._inflight.pop(flight.key, None)
+            flight.running = False
+            jobs = list(flight.jobs)
+        loop = asyncio.get_running_loop()
+        # Reason: cached before any job is done, so a repeat asked for as
+        # soon as a job finishes is answered from the cache
+        if self.cache is not None and error is None and not flight.cached:
+            await asyncio.shield(loop.run_in_executor(self._hooks, self._store, flight))
+        tasks = [
+            loop.run_in_executor(self._hooks, self._complete, flight, job, text, error)
+            for job in jobs
+        ]
+        # Reason: stop() cancels the workers; shielded, hooks already
+        # queued still run before the hook pool shuts down
+        await asyncio.shield(asyncio.gather(*tasks))
+
+    def _complete(
+        self, flight: Flight, job: Job, text: Optional[str], error: Optional[str]
+    ) -> None:
+        """Apply a job's result and record its final status (hook thread)."""
+        if error is None and self.on_result is not None:
+            try:
+                self.on_result(job, text)
+            except Exception as exc:
+                logger.exception("Generation result hook failed for job %s", job.id)
+                error = str(exc) or type(exc).__name__
+        job.status = "failed" if error is not None else "succeeded"
+        job.cached = flight.cached
+        job.error = error
+        job.text = text if error is None else None
+        job.finished_at = _utcnow()
+        self._notify(job)
+        with self._lock:
+            self.counters[job.status] += 1
+            self._jobs.move_to_end(job.id)
+            if self._owner_jobs.get((job.owner, flight.key)) is job:
+                del self._owner_jobs[(job.owner, flight.key)]
+            self._prune()
+        job.emit({"type": "status", "status": job.status, "error": error})
+        job.done.set()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond ``retention`` (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.retention)]:
+            del self._jobs[job_id]
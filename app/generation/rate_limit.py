@@ -0,0 +1,53 @@
+"""
+Async token-bucket rate limiting for provider calls.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` calls per second with bursts of ``burst``.
+
+    Only for use from the event loop that calls :meth:`acquire`. Waiters are
+    served in arrival order.
+
+    Args:
+        rate: Calls per second
+        burst: Calls allowed back to back after a quiet period (default: one
+            second's worth, at least 1)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    @classmethod
+    def per_minute(cls, calls: float) -> "RateLimiter":
+        """Build a limiter from a calls-per-minute budget."""
+        return cls(calls / 60.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a call is allowed, then take its token."""
+        # Reason: the lock makes waiters queue in order instead of all waking
+        # on the same refill and overdrawing the bucket
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,54 @@
+"""
+Image processing: upload spooling, derivative rendering and storage.
+"""
+from .derivatives import (
+    IMAGE_DERIVATIVE_FORMATS,
+    IMAGE_DERIVATIVE_WIDTHS,
+    InvalidImageError,
+    RenderedDerivative,
+    RenderedImage,
+    render_image,
+    supported_formats,
+    target_widths,
+)
+from .pipeline import (
+    IMAGE_MAX_UPLOAD_BYTES,
+    ImagePipeline,
+    ImageTooLargeError,
+    SpooledUpload,
+    derivative_path,
+    original_path,
+    spool_upload,
+)
+from .storage import (
+    STORAGE_BACKENDS,
+    LocalStorage,
+    StorageBackend,
+    StorageError,
+    SupabaseStorage,
+    build_storage,
+)
+
+__all__ = [
+    "IMAGE_DERIVATIVE_FORMATS",
+    "IMAGE_DERIVATIVE_WIDTHS",
+    "IMAGE_MAX_UPLOAD_BYTES",
+    "STORAGE_BACKENDS",
+    "ImagePipeline",
+    "ImageTooLargeError",
+    "InvalidImageError",
+    "LocalStorage",
+    "RenderedDerivative",
+    "RenderedImage",
+    "SpooledUpload",
+    "StorageBackend",
+    "StorageError",
+    "SupabaseStorage",
+    "build_storage",
+    "derivative_path",
+    "original_path",
+    "render_image",
+    "spool_upload",
+    "supported_formats",
+    "target_widths",
+]
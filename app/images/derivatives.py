@@ -0,0 +1,169 @@
+"""
+Rendering of web-sized image derivatives.
+
+Everything here runs in the image pipeline's worker processes: functions
+take a file path and plain arguments and return picklable results, so the
+API process only ships paths one way and encoded bytes back.
+"""
+import base64
+import io
+import os
+from typing import List, Sequence
+
+from PIL import Image, ImageFilter, ImageOps, UnidentifiedImageError, features
+
+# Widths generated for every image (never wider than the original)
+IMAGE_DERIVATIVE_WIDTHS = tuple(
+    int(width) for width in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,640,1280").split(",")
+    if width.strip()
+)
+# Encodings generated at each width; ones this Pillow build lacks are skipped
+IMAGE_DERIVATIVE_FORMATS = tuple(
+    name.strip().lower() for name in os.getenv("IMAGE_DERIVATIVE_FORMATS", "webp,avif").split(",")
+    if name.strip()
+)
+# Encoder quality per format (0-100)
+IMAGE_WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+IMAGE_AVIF_QUALITY = int(os.getenv("IMAGE_AVIF_QUALITY", "60"))
+# Width of the blurred placeholder inlined as a data URI
+IMAGE_PLACEHOLDER_WIDTH = int(os.getenv("IMAGE_PLACEHOLDER_WIDTH", "16"))
+# Largest image accepted, in pixels (guards against decompression bombs)
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "50000000"))
+
+# Pillow format name and encoder options per derivative format
+_ENCODERS = {
+    "webp": ("WEBP", {"quality": IMAGE_WEBP_QUALITY, "method": 4}),
+    "avif": ("AVIF", {"quality": IMAGE_AVIF_QUALITY, "speed": 8}),
+}
+
+
+class InvalidImageError(ValueError):
+    """Raised when an upload is not an image Pillow can read, or is too large."""
+
+
+class RenderedDerivative:
+    """One encoded derivative: format, pixel size and the encoded bytes."""
+
+    def __init__(self, format: str, width: int, height: int, data: bytes):
+        self.format = format
+        self.width = width
+        self.height = height
+        self.data = data
+
+
+class RenderedImage:
+    """
+    What the pipeline learned about an original and produced from it.
+
+    Args:
+        format: Original's format as Pillow names it (e.g. "PNG")
+        width: Original's width, after applying its EXIF orientation
+        height: Original's height, likewise
+        placeholder: Blurred thumbnail as a ``data:image/webp`` URI
+        derivatives: Encoded derivatives, widest first
+    """
+
+    def __init__(
+        self,
+        format: str,
+        width: int,
+        height: int,
+        placeholder: str,
+        derivatives: List[RenderedDerivative],
+    ):
+        self.format = format
+        self.width = width
+        self.height = height
+        self.placeholder = placeholder
+        self.derivatives = derivatives
+
+
+def supported_formats(formats: Sequence[str] = IMAGE_DERIVATIVE_FORMATS) -> List[str]:
+    """Formats from ``formats`` that this Pillow build can encode."""
+    return [name for name in formats if name in _ENCODERS and features.check(name)]
+
+
+def target_widths(width: int, widths: Sequence[int] = IMAGE_DERIVATIVE_WIDTHS) -> List[int]:
+    """
+    Derivative widths for an original ``width`` pixels wide, widest first.
+
+    Widths at or above the original are dropped, so nothing is upscaled;
+    the original width itself is kept when it is under the widest target.
+    """
+    kept = sorted({target for target in widths if 0 < target < width}, reverse=True)
+    if widths and width <= max(widths):
+        kept.insert(0, width)
+    return kept
+
+
+def render_image(
+    path: str,
+    widths: Sequence[int] = IMAGE_DERIVATIVE_WIDTHS,
+    formats: Sequence[str] = IMAGE_DERIVATIVE_FORMATS,
+    placeholder_width: int = IMAGE_PLACEHOLDER_WIDTH,
+    max_pixels: int = IMAGE_MAX_PIXELS,
+) -> RenderedImage:
+    """
+    Decode an image once and encode every derivative of it.
+
+    Args:
+        path: File holding the original
+        widths: Target widths (see ``target_widths``)
+        formats: Derivative formats
+        placeholder_width: Width of the blurred placeholder
+        max_pixels: Largest image accepted
+
+    Returns:
+        RenderedImage
+
+    Raises:
+        InvalidImageError: If the file is not a readable image, or too large
+    """
+    try:
+        with Image.open(path) as original:
+            if original.width * original.height > max_pixels:
+                raise InvalidImageError(
+                    f"Image is {original.width}x{original.height}; at most "
+                    f"{max_pixels:,} pixels are allowed"
+                )
+            source_format = original.format
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise InvalidImageError(f"Not a readable image: {exc}") from exc
+
+    # Reason: AVIF/WebP encode RGB(A); palette and 16-bit modes would be
+    # converted per encode otherwise
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    width, height = image.size
+
+    derivatives: List[RenderedDerivative] = []
+    current = image
+    for target in target_widths(width, widths):
+        target_height = max(1, round(height * target / width))
+        if target != current.width:
+            # Reason: each size is reduced from the previous (larger) one,
+            # which is cheaper than resampling the original every time
+            current = current.resize((target, target_height), Image.LANCZOS)
+        for name in supported_formats(formats):
+            pil_format, options = _ENCODERS[name]
+            buffer = io.BytesIO()
+            current.save(buffer, pil_format, **options)
+            derivatives.append(
+                RenderedDerivative(name, target, target_height, buffer.getvalue())
+            )
+
+    return RenderedImage(
+        source_format, width, height, _placeholder(current, placeholder_width), derivatives
+    )
+
+
+def _placeholder(image: Image.Image, width: int) -> str:
+    """Tiny blurred WebP of ``image`` as a data URI, shown while it loads."""
+    height = max(1, round(image.height * width / image.width))
+    thumb = image.resize((width, height), Image.BILINEAR)
+    thumb = thumb.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    thumb.save(buffer, "WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
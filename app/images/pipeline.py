@@ -0,0 +1,214 @@
+"""
+Upload spooling and the process pool producing image derivatives.
+
+An upload is streamed to a temporary file and hashed on the way, so no
+request holds a whole image in memory. Decoding, resizing and encoding are
+CPU-bound and hold the GIL, so they run in worker processes, one image per
+task; the API process only stores the results.
+"""
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+
+from PIL import Image
+
+from app.images.derivatives import (
+    IMAGE_DERIVATIVE_FORMATS, IMAGE_DERIVATIVE_WIDTHS, RenderedImage, render_image
+)
+from app.images.storage import StorageBackend
+
+# Largest upload accepted, in bytes
+IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+# Worker processes rendering derivatives (0: one per CPU)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "0"))
+# Where uploads are spooled (default: the system temp directory)
+IMAGE_UPLOAD_DIR = os.getenv("IMAGE_UPLOAD_DIR") or None
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload exceeds IMAGE_MAX_UPLOAD_BYTES."""
+
+
+class SpooledUpload:
+    """
+    An upload written to a temporary file, with its SHA-256 and size.
+
+    Use as a context manager, or call ``close`` to delete the file.
+    """
+
+    def __init__(self, path: str, content_hash: str, size: int):
+        self.path = path
+        self.content_hash = content_hash
+        self.size = size
+
+    def close(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+async def spool_upload(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int = IMAGE_MAX_UPLOAD_BYTES,
+    directory: Optional[str] = IMAGE_UPLOAD_DIR,
+) -> SpooledUpload:
+    """
+    Stream an upload to a temporary file, hashing it as it arrives.
+
+    Args:
+        chunks: Body chunks (e.g. ``request.stream()``)
+        max_bytes: Size at which the upload is abandoned
+        directory: Directory for the temporary file
+
+    Returns:
+        SpooledUpload; the caller deletes it
+
+    Raises:
+        ImageTooLargeError: If the body is larger than ``max_bytes``
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLargeError(f"Images may be at most {max_bytes:,} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledUpload(path, digest.hexdigest(), size)
+
+
+def original_path(content_hash: str, format: str) -> str:
+    """Storage path of an original, e.g. ``originals/ab/ab12....png``."""
+    extension = "jpg" if format.upper() == "JPEG" else format.lower()
+    return f"originals/{content_hash[:2]}/{content_hash}.{extension}"
+
+
+def derivative_path(content_hash: str, width: int, format: str) -> str:
+    """Storage path of a derivative, e.g. ``derivatives/ab/ab12.../640.webp``."""
+    return f"derivatives/{content_hash[:2]}/{content_hash}/{width}.{format}"
+
+
+class ImagePipeline:
+    """
+    Renders and stores the derivatives of uploaded images.
+
+    The process pool is started on first use.
+
+    Args:
+        storage: Where originals and derivatives are written
+        workers: Worker processes (0: one per CPU)
+        widths: Derivative widths
+        formats: Derivative formats
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        workers: int = IMAGE_WORKERS,
+        widths: Sequence[int] = IMAGE_DERIVATIVE_WIDTHS,
+        formats: Sequence[str] = IMAGE_DERIVATIVE_FORMATS,
+    ):
+        self.storage = storage
+        self.workers = workers or os.cpu_count() or 1
+        self.widths = tuple(widths)
+        self.formats = tuple(formats)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Reason: the API process runs threads (generation queue, DB
+            # pools); forking it could copy a lock held by one of them
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def render(self, path: str) -> RenderedImage:
+        """
+        Render an image's derivatives in a worker process.
+
+        Raises:
+            InvalidImageError: If the file is not an acceptable image
+        """
+        future = self._pool().submit(render_image, path, self.widths, self.formats)
+        return await asyncio.wrap_future(future)
+
+    async def process(self, upload: SpooledUpload) -> Dict[str, Any]:
+        """
+        Render an upload's derivatives and store it and them.
+
+        Args:
+            upload: Spooled upload
+
+        Returns:
+            dict with the ``image`` columns learned from the file and the
+            ``derivatives`` rows to record
+
+        Raises:
+            InvalidImageError: If the file is not an acceptable image
+        """
+        rendered = await self.render(upload.path)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.store, upload, rendered
+        )
+
+    def store(self, upload: SpooledUpload, rendered: RenderedImage) -> Dict[str, Any]:
+        """Write an original and its rendered derivatives to storage (blocking)."""
+        path = original_path(upload.content_hash, rendered.format)
+        mime_type = Image.MIME.get(rendered.format, "application/octet-stream")
+        with open(upload.path, "rb") as source:
+            self.storage.put(path, source, mime_type)
+        derivatives = []
+        for derivative in rendered.derivatives:
+            derivative_key = derivative_path(
+                upload.content_hash, derivative.width, derivative.format
+            )
+            mime = f"image/{derivative.format}"
+            self.storage.put(derivative_key, io.BytesIO(derivative.data), mime)
+            derivatives.append({
+                "content_hash": upload.content_hash,
+                "format": mime,
+                "width": derivative.width,
+                "height": derivative.height,
+                "size": len(derivative.data),
+                "storage_path": derivative_key,
+                "url": self.storage.url(derivative_key),
+            })
+        return {
+            "image": {
+                "content_hash": upload.content_hash,
+                "storage_path": path,
+                "url": self.storage.url(path),
+                "format": mime_type,
+                "width": rendered.width,
+                "height": rendered.height,
+                "size": upload.size,
+                "placeholder": rendered.placeholder,
+            },
+            "derivatives": derivatives,
+        }
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
@@ -0,0 +1,172 @@
+"""
+Pluggable object storage for image files.
+
+Objects are addressed by relative paths such as
+``originals/ab/<sha256>.png``. ``supabase`` writes to a Supabase Storage
+bucket over its REST API; ``local`` keeps files in a directory and stands
+in for it in development and tests.
+"""
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+
+import httpx
+
+# Backend images are stored in: "local" or "supabase"
+IMAGE_STORAGE = os.getenv("IMAGE_STORAGE", "local")
+# Directory and public URL prefix of the local backend
+IMAGE_STORAGE_DIR = os.getenv("IMAGE_STORAGE_DIR", "media")
+IMAGE_STORAGE_BASE_URL = os.getenv("IMAGE_STORAGE_BASE_URL", "/media")
+# Supabase project, service key and bucket of the supabase backend
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
+IMAGE_BUCKET = os.getenv("IMAGE_BUCKET", "blog-images")
+
+# Bytes read per chunk when copying or uploading files
+_CHUNK_SIZE = 1024 * 1024
+
+
+class StorageError(Exception):
+    """Raised when a storage backend rejects a request."""
+
+
+class StorageBackend:
+    """
+    Interface of an image store.
+
+    Paths are relative, use forward slashes and are content-addressed by
+    the callers, so writing an existing path again stores the same bytes.
+    """
+
+    def put(self, path: str, source: BinaryIO, content_type: str) -> None:
+        """
+        Store a file, replacing any object at ``path``.
+
+        Args:
+            path: Object path
+            source: Binary file positioned at the start; read in chunks
+            content_type: MIME type served with the object
+        """
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        """Tell whether an object is stored at ``path``."""
+        raise NotImplementedError
+
+    def url(self, path: str) -> str:
+        """Public URL of the object at ``path``."""
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """
+    Files under a local directory, served from ``base_url``.
+
+    Args:
+        root: Directory holding the objects
+        base_url: URL prefix the directory is served at
+    """
+
+    def __init__(self, root: str = IMAGE_STORAGE_DIR, base_url: str = IMAGE_STORAGE_BASE_URL):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _resolve(self, path: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full]) != self.root:
+            raise StorageError(f"Path escapes the storage root: {path}")
+        return full
+
+    def put(self, path: str, source: BinaryIO, content_type: str) -> None:
+        target = self._resolve(path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Reason: write beside the target and rename, so readers never see
+        # a partial file and concurrent writers of one path don't interleave
+        fd, partial = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(source, out, _CHUNK_SIZE)
+            os.replace(partial, target)
+        except BaseException:
+            os.unlink(partial)
+            raise
+
+    def exists(self, path: str) -> bool:
+        return os.path.isfile(self._resolve(path))
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path}"
+
+
+class SupabaseStorage(StorageBackend):
+    """
+    Objects in a Supabase Storage bucket (public, like ``blog-images``).
+
+    Args:
+        url: Project URL, e.g. ``https://<ref>.supabase.co``
+        key: Service role key (uploads bypass row level security)
+        bucket: Bucket name
+        timeout: Seconds per request
+    """
+
+    def __init__(
+        self,
+        url: str = SUPABASE_URL,
+        key: str = SUPABASE_SERVICE_KEY,
+        bucket: str = IMAGE_BUCKET,
+        timeout: float = 60.0,
+    ):
+        if not url or not key:
+            raise StorageError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+        self.base_url = url.rstrip("/") + "/storage/v1"
+        self.bucket = bucket
+        self._client = httpx.Client(
+            headers={"Authorization": f"Bearer {key}", "apikey": key}, timeout=timeout
+        )
+
+    def put(self, path: str, source: BinaryIO, content_type: str) -> None:
+        def chunks() -> Iterator[bytes]:
+            while True:
+                chunk = source.read(_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+        response = self._client.post(
+            f"{self.base_url}/object/{self.bucket}/{path}",
+            content=chunks(),
+            headers={"Content-Type": content_type, "x-upsert": "true"},
+        )
+        if response.status_code >= 400:
+            raise StorageError(f"Upload of {path} failed: {response.status_code} {response.text}")
+
+    def exists(self, path: str) -> bool:
+        response = self._client.head(self.url(path))
+        return response.status_code == 200
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/object/public/{self.bucket}/{path}"
+
+
+# Backends by IMAGE_STORAGE name
+STORAGE_BACKENDS: Dict[str, Callable[[], StorageBackend]] = {
+    "local": LocalStorage,
+    "supabase": SupabaseStorage,
+}
+
+
+def build_storage(name: Optional[str] = None) -> StorageBackend:
+    """
+    Create the configured storage backend.
+
+    Args:
+        name: Backend name (default: IMAGE_STORAGE)
+
+    Returns:
+        StorageBackend
+
+    Raises:
+        KeyError: If no backend has that name
+    """
+    return STORAGE_BACKENDS[name or IMAGE_STORAGE]()
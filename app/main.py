@@ -1,10 +1,28 @@
 """
 Main FastAPI application module.
 """
-from fastapi import FastAPI
+import os
+import time
+from typing import Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app import crud
+from app.api.v1.routers import (
+    exports, feeds, generation, images, posts, search, topics, topics_async
+)
+from app.db import routing
+from app.db.database import dispose_async_engine, engine
+from app.db.pool import pool_metrics, pool_status
+from app.generation import GenerationQueue
+from app.publishing import GitPublisher, get_git_publisher, stop_git_publisher
+from app.utils.instrumentation import instrument_request, request_metrics
+from app.utils.metrics import prometheus_header, prometheus_sample
 
-from app.api.v1.routers import topics
+# Serve topic reads/writes from the async handlers (AsyncSession over asyncpg)
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
 
 # Create FastAPI application
 app = FastAPI(
@@ -25,14 +43,115 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """
+    Pin a client's reads to the primary for a moment after it writes.
+    
+    Replicas may not have caught up with a write yet; the cookie set here
+    makes ``get_read_db`` use the primary for the client's next reads.
+    """
+    response = await call_next(request)
+    if (
+        routing.replica_router.engines
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            routing.READ_YOUR_WRITES_COOKIE,
+            str(time.time() + routing.READ_YOUR_WRITES_SECONDS),
+            max_age=routing.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+        )
+    return response
+
+# Latency histograms, SQL counts, Server-Timing and opt-in profiling
+app.middleware("http")(instrument_request)
+
 # Include API routers
+app.include_router(exports.router, prefix="/api/v1", tags=["exports"])
+app.include_router(feeds.router, prefix="/api/v1", tags=["feeds"])
+app.include_router(generation.router, prefix="/api/v1", tags=["generation"])
+app.include_router(images.router, prefix="/api/v1", tags=["images"])
+if USE_ASYNC_DB:
+    # Registered first so its routes win; the sync router still serves the rest
+    app.include_router(
+        topics_async.router,
+        prefix="/api/v1/topics",
+        tags=["topics"]
+    )
 app.include_router(
     topics.router,
     prefix="/api/v1/topics",
     tags=["topics"]
 )
+app.include_router(
+    posts.router,
+    prefix="/api/v1/posts",
+    tags=["posts"]
+)
+app.include_router(
+    search.router,
+    prefix="/api/v1/search",
+    tags=["search"]
+)
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Stop the generation queue, image workers and git publisher; release async connections."""
+    generation.stop_generation_queue()
+    images.stop_image_pipeline()
+    stop_git_publisher()
+    await dispose_async_engine()
+    await routing.dispose_async_replicas()
 
 @app.get("/api/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
+
+@app.get("/api/health/db-pool", tags=["health"])
+async def db_pool_health():
+    """Connection pool gauges, checkout wait times and checkout failures."""
+    return pool_status(engine)
+
+@app.get("/api/health/topic-cache", tags=["health"])
+async def topic_cache_health():
+    """Topic cache size and hit/miss/eviction/invalidation counters."""
+    return crud.topic.topic_cache.stats()
+
+@app.get("/api/health/generation", tags=["health"])
+async def generation_health(
+    queue: GenerationQueue = Depends(generation.get_generation_queue)
+):
+    """Generation queue depth, job/retry/provider-call counters and rate-limit waits."""
+    return queue.stats()
+
+@app.get("/api/health/git-publisher", tags=["health"])
+async def git_publisher_health(
+    publisher: Optional[GitPublisher] = Depends(get_git_publisher)
+):
+    """Git publisher queue depth, commit/push counters and batch histograms."""
+    if publisher is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No git publisher configured"
+        )
+    return publisher.stats()
+
+@app.get("/api/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics(publisher: Optional[GitPublisher] = Depends(get_git_publisher)):
+    """Request, SQL, pool, cache and (when configured) git publisher metrics, for Prometheus."""
+    lines = request_metrics.prometheus_lines() + pool_metrics.prometheus_lines()
+    for name, value in crud.topic.topic_cache.stats().items():
+        if isinstance(value, bool) or name == "max_size":
+            continue
+        metric = f"topic_cache_{name}" + ("" if name == "size" else "_total")
+        lines += prometheus_header(
+            metric, "gauge" if name == "size" else "counter", f"Topic cache {name}."
+        )
+        lines.append(prometheus_sample(metric, value))
+    if publisher is not None:
+        lines += publisher.prometheus_lines()
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,12 @@
+"""
+SQLAlchemy models package.
+"""
+from . import (
+    cache_version, feed_change, generation_cache, generation_job, image, post, post_version,
+    search, topic,
+)
+
+__all__ = [
+    "cache_version", "feed_change", "generation_cache", "generation_job", "image", "post",
+    "post_version", "search", "topic",
+]
@@ -0,0 +1,22 @@
+"""
+SQLAlchemy model for shared cache version stamps.
+"""
+from sqlalchemy import BigInteger, Column, Integer, String
+
+from app.db.database import Base
+
+
+class CacheVersion(Base):
+    """
+    Version counter bumped whenever cached data of a given name changes.
+
+    Processes that keep an in-memory cache compare this stamp to notice
+    writes made by other workers.
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger().with_variant(Integer, "sqlite"), nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CacheVersion(name='{self.name}', version={self.version})>"
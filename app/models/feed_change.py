@@ -0,0 +1,27 @@
+"""
+SQLAlchemy model for the log of feed updates.
+"""
+from sqlalchemy import BigInteger, Column, Integer, String
+
+from app.db.database import Base
+
+
+class FeedChange(Base):
+    """
+    One update of the feed files, keyed by the ``feeds`` stamp it claimed.
+
+    A process whose last update is a few stamps behind replays the posts and
+    topics logged in between instead of reloading every post.
+    """
+    __tablename__ = "feed_changes"
+
+    version = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True,
+                     autoincrement=False)
+    # "post", "topic", or "load" for a full rebuild (nothing to replay)
+    kind = Column(String(10), nullable=False)
+    object_id = Column(String(36), nullable=True)
+    # Sitemap shards the writer had afterwards, so others keep the same layout
+    shards = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<FeedChange(version={self.version}, kind='{self.kind}', id={self.object_id})>"
@@ -0,0 +1,46 @@
+"""
+SQLAlchemy model for cached LLM responses.
+"""
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.database import Base
+from app.models.topic import _utcnow
+
+
+class GenerationCacheEntry(Base):
+    """
+    A generated response, stored as the chunks it was streamed in so a
+    cache hit can be replayed as a stream.
+    """
+    __tablename__ = "generation_cache"
+
+    # sha256 of the provider and the request key (model, parameters,
+    # normalized prompt template and variables)
+    key = Column(String(64), primary_key=True)
+    chunks = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    # UTF-8 size of the text, for size-based eviction
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_used_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Least recently used entries are evicted first
+        Index("idx_generation_cache_last_used_at", last_used_at),
+        Index("idx_generation_cache_expires_at", expires_at),
+    )
+
+    def __repr__(self) -> str:
+        return f"<GenerationCacheEntry(key={self.key}, size={self.size_bytes})>"
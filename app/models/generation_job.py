@@ -0,0 +1,68 @@
+"""
+SQLAlchemy model for AI content generation jobs.
+"""
+import uuid
+
+from sqlalchemy import (
+    Boolean, CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, Text, false,
+    func,
+)
+
+from app.db.database import Base
+from app.db.types import GUID
+from app.models.topic import _utcnow
+
+# Lifecycle of a job (mirrors the CHECK constraint in the migration)
+GENERATION_JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class GenerationJob(Base):
+    """
+    A request to generate a post's content, as last reported by the worker
+    process that ran it.
+
+    The queue itself lives in that process; this row is what other workers
+    and later requests see once it has forgotten the job.
+    """
+    __tablename__ = "generation_jobs"
+
+    id = Column(
+        GUID(),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    post_id = Column(
+        GUID(),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status = Column(String(20), default="queued", server_default="queued", nullable=False)
+    provider = Column(String(50), nullable=False)
+    model = Column(Text, nullable=True)
+    # Hash of the model, parameters and prompt (GenerationRequest.key)
+    request_key = Column(String(64), nullable=False)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    # Answered from the response cache without calling the provider
+    cached = Column(Boolean, default=False, server_default=false(), nullable=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'running', 'succeeded', 'failed')",
+            name="generation_jobs_status_check",
+        ),
+        Index("idx_generation_jobs_post_id_created_at", post_id, created_at),
+    )
+
+    def __repr__(self) -> str:
+        return f"<GenerationJob(id={self.id}, post_id={self.post_id}, status={self.status})>"
@@ -0,0 +1,111 @@
+"""
+SQLAlchemy models for images and their web-sized derivatives.
+"""
+import uuid
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Text,
+    false, func,
+)
+
+from app.db.database import Base
+from app.db.types import GUID
+from app.models.topic import _utcnow
+
+
+class Image(Base):
+    """
+    An image attached to a post (or to none yet).
+
+    Files are content-addressed: images with the same ``content_hash``
+    share one stored original and one set of derivatives, whichever post
+    they belong to.
+    """
+    __tablename__ = "images"
+
+    id = Column(
+        GUID(),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    post_id = Column(
+        GUID(),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    url = Column(Text, nullable=False)
+    alt_text = Column(Text, nullable=True)
+    prompt = Column(Text, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    # MIME type of the original, e.g. image/png
+    format = Column(Text, nullable=True)
+    # Bytes in the original
+    size = Column(Integer, nullable=True)
+    is_featured = Column(Boolean, default=False, server_default=false(), nullable=True)
+    # sha256 of the original (null for rows the storage trigger created)
+    content_hash = Column(String(64), nullable=True)
+    storage_path = Column(Text, nullable=True)
+    # Blurred thumbnail as a data: URI, shown while the image loads
+    placeholder = Column(Text, nullable=True)
+    # References auth.users on Supabase, which is not mapped here
+    created_by = Column(GUID(), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=True,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        onupdate=_utcnow,
+        nullable=True,
+    )
+
+    __table_args__ = (
+        Index("idx_images_post_id", post_id),
+        Index("idx_images_is_featured", is_featured),
+        Index("idx_images_content_hash", content_hash),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Image(id={self.id}, post_id={self.post_id}, url={self.url})>"
+
+
+class ImageDerivative(Base):
+    """
+    A resized, re-encoded copy of an original, shared by every image with
+    its content hash.
+    """
+    __tablename__ = "image_derivatives"
+
+    content_hash = Column(String(64), nullable=False)
+    # MIME type, e.g. image/webp or image/avif
+    format = Column(String(32), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    # Bytes in the encoded file
+    size = Column(Integer, nullable=False)
+    storage_path = Column(Text, nullable=False)
+    url = Column(Text, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Also serves the lookup of an image's derivatives by hash
+        PrimaryKeyConstraint(content_hash, format, width, name="image_derivatives_pkey"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ImageDerivative(content_hash={self.content_hash}, format={self.format},"
+            f" width={self.width})>"
+        )
@@ -0,0 +1,84 @@
+"""
+SQLAlchemy model for the Post entity.
+"""
+import uuid
+
+from sqlalchemy import (
+    JSON, CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.db.database import Base
+from app.db.types import GUID
+from app.models.topic import _utcnow
+
+# Workflow states a post can be in (mirrors the CHECK constraint in the migration)
+POST_STATUSES = ("draft", "in_review", "published", "archived")
+
+
+class Post(Base):
+    """
+    SQLAlchemy model representing a blog post.
+    """
+    __tablename__ = "posts"
+
+    id = Column(
+        GUID(),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    topic_id = Column(
+        GUID(),
+        ForeignKey("topics.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    title = Column(Text, nullable=False)
+    slug = Column(Text, unique=True, nullable=False, index=True)
+    excerpt = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+    status = Column(String(20), default="draft", server_default="draft", nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    seo_title = Column(Text, nullable=True)
+    seo_description = Column(Text, nullable=True)
+    # TEXT[] on Postgres; a JSON list elsewhere (e.g. the SQLite test database)
+    seo_keywords = Column(JSON().with_variant(ARRAY(Text), "postgresql"), nullable=True)
+    # Number of the latest row in post_versions (0 until the first save is
+    # recorded); bumped with each revision instead of querying MAX()
+    current_version = Column(Integer, default=0, server_default="0", nullable=False)
+    # References auth.users on Supabase, which is not mapped here
+    created_by = Column(GUID(), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        onupdate=_utcnow,
+        nullable=False,
+    )
+
+    # Declared after the columns so the index can use published_at.desc()
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('draft', 'in_review', 'published', 'archived')",
+            name="posts_status_check",
+        ),
+        # Back keyset pagination: filter on the leading columns, then read
+        # rows already in (published_at, id) order instead of sorting them
+        Index("idx_posts_status_published_at_id", status, published_at.desc(), id.desc()),
+        Index("idx_posts_topic_status_published_at_id", topic_id, status, published_at, id),
+        Index("idx_posts_status_created_at_id", status, created_at, id),
+        Index("idx_posts_topic_created_at_id", topic_id, created_at, id),
+        Index("idx_posts_created_at_id", created_at, id),
+        # Incremental exports: updated_since filter, (updated_at, id) order
+        Index("idx_posts_updated_at_id", updated_at, id),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Post(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -0,0 +1,65 @@
+"""
+SQLAlchemy model for stored post revisions.
+"""
+import uuid
+
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, ForeignKey, Integer, Text, UniqueConstraint, func, true
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.database import Base
+from app.db.types import GUID
+from app.models.topic import _utcnow
+
+
+class PostVersion(Base):
+    """
+    One saved revision of a post's title, content and excerpt.
+
+    Snapshot rows hold the full texts. Every other row holds only ``delta``:
+    per changed field, the operations (see ``app.utils.delta``) turning the
+    previous version's text into this one's, or null when the field was
+    cleared. A version is rebuilt from the nearest snapshot at or before it.
+    """
+    __tablename__ = "post_versions"
+
+    id = Column(
+        GUID(),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    post_id = Column(
+        GUID(),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    version_number = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=True, server_default=true())
+    title = Column(Text, nullable=True)
+    content = Column(Text, nullable=True)
+    excerpt = Column(Text, nullable=True)
+    delta = Column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+    # References auth.users on Supabase, which is not mapped here
+    updated_by = Column(GUID(), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Also serves every per-post lookup: ranges of versions, latest
+        # snapshot at or before a version
+        UniqueConstraint("post_id", "version_number", name="unique_post_version"),
+    )
+
+    def __repr__(self) -> str:
+        kind = "snapshot" if self.is_snapshot else "delta"
+        return f"<PostVersion(post_id={self.post_id}, version={self.version_number}, {kind})>"
@@ -0,0 +1,60 @@
+"""
+Full-text search columns and indexes on Postgres.
+
+``search_vector`` is a stored generated ``tsvector`` column on ``posts`` and
+``topics``; it is left out of the ORM models because it only exists on
+Postgres. The DDL below runs after ``create_all`` creates either table on
+Postgres, and matches the ``add_full_text_search`` migration.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.post import Post
+from app.models.topic import Topic
+
+# Text search configuration baked into the generated columns
+SEARCH_CONFIG = "english"
+
+# Weights: A = title/name, B = keywords/excerpt/description, C = body
+POST_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+    f"coalesce(immutable_array_to_string(seo_keywords), '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(excerpt, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
+TOPIC_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Reason: array_to_string is only STABLE, and generated columns need
+    # IMMUTABLE expressions
+    "CREATE OR REPLACE FUNCTION immutable_array_to_string(text[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, ' ') $$",
+]
+
+
+def _table_ddl(table: str, vector: str, title: str) -> list:
+    """Statements adding the search column and its indexes to one table."""
+    return _SETUP + [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_search_vector "
+        f"ON {table} USING GIN (search_vector)",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{title}_trgm "
+        f"ON {table} USING GIN ({title} gin_trgm_ops)",
+    ]
+
+
+for _model, _vector, _title in (
+    (Post, POST_SEARCH_VECTOR, "title"),
+    (Topic, TOPIC_SEARCH_VECTOR, "name"),
+):
+    for _statement in _table_ddl(_model.__tablename__, _vector, _title):
+        event.listen(
+            _model.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect="postgresql"),
+        )
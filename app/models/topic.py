@@ -2,23 +2,38 @@
 SQLAlchemy model for the Topic entity.
 """
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.orm import declarative_base
 
 from app.db.database import Base
+from app.db.types import GUID
+from app.utils.ranking import DEFAULT_RANK
+
+
+def _utcnow() -> datetime:
+    """Timestamp default with sub-second precision on every backend."""
+    return datetime.now(timezone.utc)
+
 
 class Topic(Base):
     """
     SQLAlchemy model representing a topic in the blog.
     """
     __tablename__ = "topics"
+    __table_args__ = (
+        # Back keyset pagination: ORDER BY <field>, id with a (field, id) > (...) filter
+        Index("idx_topics_position_id", "position", "id"),
+        Index("idx_topics_created_at_id", "created_at", "id"),
+        Index("idx_topics_rank_id", "rank", "id"),
+        # max(updated_at) behind list ETags
+        Index("idx_topics_updated_at", "updated_at"),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -28,13 +43,24 @@ class Topic(Base):
     slug = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     position = Column(Integer, default=0, nullable=False)
+    # Fractional ordering key; compared bytewise, hence the "C" collation on Postgres
+    rank = Column(
+        String(64).with_variant(String(64, collation="C"), "postgresql"),
+        default=DEFAULT_RANK,
+        server_default=DEFAULT_RANK,
+        nullable=False,
+    )
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=_utcnow,
         nullable=False,
     )
 
@@ -54,6 +80,7 @@ class Topic(Base):
             "slug": self.slug,
             "description": self.description,
             "position": self.position,
+            "rank": self.rank,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
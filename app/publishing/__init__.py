@@ -0,0 +1,40 @@
+"""
+Publishing: incremental export of posts to a Hugo site, batched git
+commits and pushes of the result, and incrementally maintained sitemaps,
+feeds and topic indexes.
+"""
+from .feed_index import FeedEntry, FeedIndex
+from .feeds import FEEDS_DIR, FeedGenerator
+from .git import GitError, GitPublisher, PublishEvent, get_git_publisher, stop_git_publisher
+from .hugo import (
+    HUGO_EXPORT_DIR,
+    MANIFEST_NAME,
+    ExportManifest,
+    ExportStats,
+    HugoExporter,
+    source_hash,
+)
+from .render import RENDER_VERSION, post_path, render_post, write_atomic, write_posts
+
+__all__ = [
+    "FEEDS_DIR",
+    "HUGO_EXPORT_DIR",
+    "MANIFEST_NAME",
+    "RENDER_VERSION",
+    "ExportManifest",
+    "ExportStats",
+    "FeedEntry",
+    "FeedGenerator",
+    "FeedIndex",
+    "GitError",
+    "GitPublisher",
+    "HugoExporter",
+    "PublishEvent",
+    "get_git_publisher",
+    "post_path",
+    "render_post",
+    "source_hash",
+    "stop_git_publisher",
+    "write_atomic",
+    "write_posts",
+]
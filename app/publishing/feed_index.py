@@ -0,0 +1,134 @@
+"""
+In-memory indexes of published posts behind the feeds and sitemaps.
+
+Posts are kept sorted by ``(published_at, id)``, once site-wide and once
+per topic, in plain lists maintained with ``bisect``: a change moves one
+key instead of re-sorting. Sitemap shards are chosen by a hash of the post
+ID, so a post stays in the same shard whatever else is published.
+"""
+import bisect
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+# Sort key of a post: oldest first, ties broken by ID
+FeedKey = Tuple[datetime, str]
+
+
+class FeedEntry:
+    """What feeds and sitemaps show of one published post."""
+
+    __slots__ = ("id", "slug", "title", "excerpt", "published_at", "updated_at", "topic_id")
+
+    def __init__(self, row: Mapping[str, Any]):
+        self.id = str(row["id"])
+        self.slug = row["slug"]
+        self.title = row["title"]
+        self.excerpt = row["excerpt"]
+        self.published_at = row["published_at"]
+        self.updated_at = row["updated_at"]
+        self.topic_id = str(row["topic_id"]) if row["topic_id"] is not None else None
+
+    @property
+    def key(self) -> FeedKey:
+        return (self.published_at, self.id)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FeedEntry) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+class FeedIndex:
+    """
+    Published posts by ID, sorted site-wide and per topic, and by shard.
+
+    Args:
+        shard_count: Sitemap shards to spread posts over
+    """
+
+    def __init__(self, shard_count: int = 1):
+        self.entries: Dict[str, FeedEntry] = {}
+        self.ordered: List[FeedKey] = []
+        self.by_topic: Dict[str, List[FeedKey]] = {}
+        self.shards: List[Set[str]] = [set() for _ in range(max(1, shard_count))]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def shard_of(self, post_id: str) -> int:
+        return zlib.crc32(post_id.encode("utf-8")) % len(self.shards)
+
+    def reshard(self, shard_count: int) -> None:
+        """Spread the posts over a new number of shards."""
+        self.shards = [set() for _ in range(max(1, shard_count))]
+        for post_id in self.entries:
+            self.shards[self.shard_of(post_id)].add(post_id)
+
+    def load(self, entries: List[FeedEntry]) -> None:
+        """Replace the contents with ``entries``, sorting once."""
+        self.entries = {entry.id: entry for entry in entries}
+        self.ordered = sorted(entry.key for entry in entries)
+        self.by_topic = {}
+        for key in self.ordered:
+            topic_id = self.entries[key[1]].topic_id
+            if topic_id is not None:
+                self.by_topic.setdefault(topic_id, []).append(key)
+        self.reshard(len(self.shards))
+
+    def put(self, entry: FeedEntry) -> Optional[FeedEntry]:
+        """Add or replace a post; returns the entry it replaced."""
+        previous = self.remove(entry.id)
+        self.entries[entry.id] = entry
+        bisect.insort(self.ordered, entry.key)
+        if entry.topic_id is not None:
+            bisect.insort(self.by_topic.setdefault(entry.topic_id, []), entry.key)
+        self.shards[self.shard_of(entry.id)].add(entry.id)
+        return previous
+
+    def remove(self, post_id: str) -> Optional[FeedEntry]:
+        """Drop a post; returns its entry, or None if it wasn't indexed."""
+        entry = self.entries.pop(post_id, None)
+        if entry is None:
+            return None
+        _discard(self.ordered, entry.key)
+        if entry.topic_id is not None:
+            keys = self.by_topic[entry.topic_id]
+            _discard(keys, entry.key)
+            if not keys:
+                del self.by_topic[entry.topic_id]
+        self.shards[self.shard_of(post_id)].discard(post_id)
+        return entry
+
+    def keys(self, topic_id: Optional[str] = None) -> List[FeedKey]:
+        """Sorted keys, site-wide or of one topic."""
+        return self.ordered if topic_id is None else self.by_topic.get(topic_id, [])
+
+    def position(self, entry: FeedEntry) -> int:
+        """Where the entry's key sorts among its topic's keys (topic posts only)."""
+        return bisect.bisect_left(self.keys(entry.topic_id), entry.key)
+
+    def is_recent(self, entry: FeedEntry, size: int, topic_id: Optional[str] = None) -> bool:
+        """Whether the entry sorts among the newest ``size`` keys of a list."""
+        keys = self.keys(topic_id)
+        return len(keys) - bisect.bisect_left(keys, entry.key) <= size
+
+    def latest(self, size: int, topic_id: Optional[str] = None) -> List[FeedEntry]:
+        """The newest ``size`` posts, newest first."""
+        keys = self.keys(topic_id)
+        return [self.entries[post_id] for _, post_id in reversed(keys[-size:])]
+
+    def page(self, topic_id: str, number: int, size: int) -> List[FeedEntry]:
+        """
+        Page ``number`` (from 1) of a topic's posts, counted from the oldest
+        so publishing new posts only ever changes the last page; newest first
+        within the page.
+        """
+        keys = self.by_topic.get(topic_id, [])[(number - 1) * size:number * size]
+        return [self.entries[post_id] for _, post_id in reversed(keys)]
+
+
+def _discard(keys: List[FeedKey], key: FeedKey) -> None:
+    index = bisect.bisect_left(keys, key)
+    if index < len(keys) and keys[index] == key:
+        del keys[index]
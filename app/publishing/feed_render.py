@@ -0,0 +1,112 @@
+"""
+Rendering of sitemaps and RSS/Atom feeds from feed index entries.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable, List, Tuple
+from xml.sax.saxutils import escape
+
+from app.publishing.feed_index import FeedEntry
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
+
+def utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def w3c(value: datetime) -> str:
+    """Format a timestamp as a W3C/RFC 3339 date-time in UTC."""
+    return utc(value).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def post_url(site_url: str, entry: FeedEntry) -> str:
+    return f"{site_url}/posts/{entry.slug}/"
+
+
+def _document(lines: List[str]) -> bytes:
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def render_url(site_url: str, entry: FeedEntry) -> str:
+    """A post's ``<url>`` element in a sitemap."""
+    return (
+        f"<url><loc>{escape(post_url(site_url, entry))}</loc>"
+        f"<lastmod>{w3c(entry.updated_at)}</lastmod></url>"
+    )
+
+
+def render_urlset(urls: Iterable[str]) -> bytes:
+    """A sitemap of ``<url>`` elements from ``render_url``, in the order given."""
+    return _document([_XML_DECLARATION, f'<urlset xmlns="{SITEMAP_NS}">', *urls, "</urlset>"])
+
+
+def render_sitemap_index(sitemaps: Iterable[Tuple[str, datetime]]) -> bytes:
+    """A sitemap index of ``(URL, last modified)`` pairs."""
+    lines = [_XML_DECLARATION, f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    lines += [
+        f"<sitemap><loc>{escape(url)}</loc><lastmod>{w3c(updated)}</lastmod></sitemap>"
+        for url, updated in sitemaps
+    ]
+    lines.append("</sitemapindex>")
+    return _document(lines)
+
+
+def render_rss(
+    title: str, link: str, self_url: str, site_url: str, entries: List[FeedEntry]
+) -> bytes:
+    """An RSS 2.0 feed of the entries, newest first as given."""
+    lines = [
+        _XML_DECLARATION,
+        f'<rss version="2.0" xmlns:atom="{ATOM_NS}"><channel>',
+        f"<title>{escape(title)}</title>",
+        f"<link>{escape(link)}</link>",
+        f"<description>{escape(title)}</description>",
+        f'<atom:link href="{escape(self_url)}" rel="self" type="application/rss+xml"/>',
+    ]
+    if entries:
+        updated = format_datetime(utc(entries[0].published_at), usegmt=True)
+        lines.append(f"<lastBuildDate>{updated}</lastBuildDate>")
+    for entry in entries:
+        url = escape(post_url(site_url, entry))
+        lines.append(
+            f"<item><title>{escape(entry.title)}</title><link>{url}</link>"
+            f'<guid isPermaLink="true">{url}</guid>'
+            f"<pubDate>{format_datetime(utc(entry.published_at), usegmt=True)}</pubDate>"
+            + (f"<description>{escape(entry.excerpt)}</description>" if entry.excerpt else "")
+            + "</item>"
+        )
+    lines.append("</channel></rss>")
+    return _document(lines)
+
+
+def render_atom(
+    title: str, link: str, self_url: str, site_url: str, entries: List[FeedEntry]
+) -> bytes:
+    """An Atom feed of the entries, newest first as given."""
+    updated = max((entry.updated_at for entry in entries), default=None, key=utc)
+    lines = [
+        _XML_DECLARATION,
+        f'<feed xmlns="{ATOM_NS}">',
+        f"<id>{escape(link)}</id>",
+        f"<title>{escape(title)}</title>",
+        f'<link href="{escape(link)}"/>',
+        f'<link href="{escape(self_url)}" rel="self"/>',
+        f"<updated>{w3c(updated) if updated else '1970-01-01T00:00:00Z'}</updated>",
+    ]
+    for entry in entries:
+        url = escape(post_url(site_url, entry))
+        lines.append(
+            f"<entry><id>{url}</id><title>{escape(entry.title)}</title>"
+            f'<link href="{url}"/><published>{w3c(entry.published_at)}</published>'
+            f"<updated>{w3c(entry.updated_at)}</updated>"
+            + (f"<summary>{escape(entry.excerpt)}</summary>" if entry.excerpt else "")
+            + "</entry>"
+        )
+    lines.append("</feed>")
+    return _document(lines)
@@ -0,0 +1,499 @@
+"""
+Incremental sitemaps, RSS/Atom feeds and topic indexes.
+
+``FeedGenerator.load`` builds everything once from one streamed query.
+After that, ``apply`` takes a single changed post (published, edited,
+unpublished or deleted), moves it in the sorted indexes and rewrites only
+the files it affects:
+
+- its sitemap shard (posts are spread over ``sitemap-<n>.xml`` files by a
+  hash of their ID, each kept under ``SITEMAP_MAX_URLS``) and the small
+  ``sitemap.xml`` index
+- the site-wide and topic feeds, if the post is or was among the newest
+  ``FEED_SIZE``
+- its topic's ``index.json`` and pages. Pages count from the oldest post,
+  so a new post only changes the last page
+
+Files are written atomically and only when their bytes change, so their
+ETags stay stable. The generator owns ``FEEDS_DIR``: a full load deletes
+anything there it didn't write.
+
+Every API process keeps its own generator, all writing the same directory.
+Each update claims the next ``feeds`` stamp in ``cache_versions`` (holding
+its row lock until the update commits, so writers take turns) and logs the
+post or topic it applied in ``feed_changes``. A process whose claim isn't
+one above its own last update replays the changes logged in between first,
+and only reloads everything once the log no longer reaches that far back.
+
+Rebuild everything with ``python -m app.publishing.feeds``.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.publishing.feed_index import FeedEntry, FeedIndex
+from app.publishing.feed_render import (
+    post_url, render_atom, render_rss, render_sitemap_index, render_url, render_urlset, utc,
+    w3c,
+)
+from app.publishing.render import write_atomic
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Public URL of the Hugo site; posts live at <SITE_URL>/posts/<slug>/
+SITE_URL = os.getenv("SITE_URL", "http://localhost:1313").rstrip("/")
+SITE_TITLE = os.getenv("SITE_TITLE", "AI Publish Workflow")
+# Directory the feeds, sitemaps and topic indexes are written to
+FEEDS_DIR = os.getenv("FEEDS_DIR", "feeds")
+# URL FEEDS_DIR is served at (feeds and the sitemap index link to it)
+FEEDS_BASE_URL = os.getenv("FEEDS_BASE_URL", "http://localhost:8000/api/v1/feeds").rstrip("/")
+# Update the files as posts are published, edited, unpublished and deleted
+FEEDS_ENABLED = os.getenv("FEEDS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Posts per RSS/Atom feed
+FEED_SIZE = int(os.getenv("FEED_SIZE", "50"))
+# Posts per topic index page
+TOPIC_PAGE_SIZE = int(os.getenv("TOPIC_PAGE_SIZE", "100"))
+# URLs per sitemap file allowed by the sitemap protocol
+SITEMAP_MAX_URLS = int(os.getenv("SITEMAP_MAX_URLS", "50000"))
+# URLs per shard aimed for when choosing the shard count, leaving room for
+# uneven hashing and growth before a shard hits the limit
+SITEMAP_SHARD_TARGET = int(os.getenv("SITEMAP_SHARD_TARGET", "40000"))
+# cache_versions row claimed by every update of the files
+FEEDS_VERSION_NAME = "feeds"
+# Updates kept in feed_changes for processes to catch up from without a reload
+FEED_CHANGE_LOG_SIZE = int(os.getenv("FEED_CHANGE_LOG_SIZE", "1000"))
+
+# Outputs affected by a change: ("sitemap", shard), ("feed", topic or None),
+# ("page", topic, page), ("pages_from", topic, page), ("topic", topic)
+Output = Tuple[Any, ...]
+
+
+def _safe_slug(slug: str) -> bool:
+    return bool(slug) and "/" not in slug and "\\" not in slug and not slug.startswith(".")
+
+
+class FeedGenerator:
+    """
+    Keeps ``root`` in sync with the published posts, one change at a time.
+
+    Args:
+        root: Directory written to
+        site_url: Public URL of the site the posts are on
+        base_url: URL ``root`` is served at
+        title: Site title used in the feeds
+        feed_size: Posts per feed
+        page_size: Posts per topic index page
+        shard_target: URLs per sitemap shard aimed for
+        max_urls: URLs a sitemap shard may never exceed
+    """
+
+    def __init__(
+        self,
+        root: str = FEEDS_DIR,
+        site_url: str = SITE_URL,
+        base_url: str = FEEDS_BASE_URL,
+        title: str = SITE_TITLE,
+        feed_size: int = FEED_SIZE,
+        page_size: int = TOPIC_PAGE_SIZE,
+        shard_target: int = SITEMAP_SHARD_TARGET,
+        max_urls: int = SITEMAP_MAX_URLS,
+    ):
+        self.root = os.path.abspath(root)
+        self.site_url = site_url.rstrip("/")
+        self.base_url = base_url.rstrip("/")
+        self.title = title
+        self.feed_size = feed_size
+        self.page_size = page_size
+        self.shard_target = min(shard_target, max_urls)
+        self.max_urls = max_urls
+
+        self.index = FeedIndex()
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+        # FEEDS_VERSION_NAME stamp of this generator's last update, None to reload
+        self._version: Optional[int] = None
+        self._appliers = {"post": self._apply, "topic": self._apply_topic}
+        self._digests: Dict[str, bytes] = {}
+        self._shard_updated: List[datetime] = []
+        self._page_counts: Dict[str, int] = {}
+        # Rendered <url> element per post, kept while its entry is unchanged
+        self._urls: Dict[str, Tuple[FeedEntry, str]] = {}
+        self.counters = {
+            "loads": 0, "changes": 0, "replayed": 0, "files_written": 0, "files_deleted": 0,
+        }
+
+    def load(self, db: Session) -> Dict[str, Any]:
+        """
+        Rebuild the indexes from the database and bring every file up to date.
+
+        Returns:
+            ``written`` and ``deleted`` paths (relative to ``root``) and
+            ``duration_seconds``
+        """
+        return self._update(db, "load", None)
+
+    def apply(self, db: Session, post_id: str) -> Dict[str, Any]:
+        """
+        Apply one post's change: re-read it and rewrite the files it affects.
+
+        The first call loads everything instead. After other processes
+        updated the files, their logged changes are replayed first.
+
+        Args:
+            db: Database session; the update commits it
+            post_id: ID of a post that was created, changed or deleted
+
+        Returns:
+            Same as ``load``
+        """
+        return self._update(db, "post", post_id)
+
+    def apply_topic(self, db: Session, topic_id: str) -> Dict[str, Any]:
+        """Rewrite a topic's files after it was renamed; returns the same as ``load``."""
+        return self._update(db, "topic", topic_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the number of posts, topics and sitemap shards indexed."""
+        return {
+            **self.counters,
+            "posts": len(self.index),
+            "topics": len(self.index.by_topic),
+            "sitemap_shards": len(self.index.shards),
+        }
+
+    def _update(self, db: Session, kind: str, object_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Claim the next feeds stamp, catch up, then apply ``kind`` ("post" or
+        "topic") ``object_id`` and log it; a "load", or failing to catch up,
+        loads everything instead.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            written: List[str] = []
+            deleted: List[str] = []
+            version = crud.cache_version.claim_cache_version(db, FEEDS_VERSION_NAME)
+            try:
+                if kind == "load" or not self._catch_up(db, version, written, deleted):
+                    kind, object_id = "load", None
+                    self._load(db, written, deleted)
+                else:
+                    self._appliers[kind](db, object_id, written, deleted)
+                crud.publishing.record_feed_change(
+                    db, version, kind, object_id, len(self.index.shards)
+                )
+                if version % FEED_CHANGE_LOG_SIZE == 0:
+                    crud.publishing.prune_feed_changes(db, version - FEED_CHANGE_LOG_SIZE)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Reason: the files may be half updated; rebuild them next time
+                self._version = None
+                raise
+            self._version = version
+            return self._result(started, written, deleted)
+
+    def _catch_up(
+        self, db: Session, version: int, written: List[str], deleted: List[str]
+    ) -> bool:
+        """Replay the changes logged since the last update; False if a load is needed."""
+        if self._version is None:
+            return False
+        missed = version - self._version - 1
+        changes = crud.publishing.get_feed_changes(db, self._version, version) if missed else []
+        if missed < 0 or len(changes) != missed:
+            return False
+        # Reason: a replay re-reads the current row, so once per object is enough
+        replays = {(c["kind"], c["object_id"]): None for c in changes if c["kind"] != "load"}
+        for kind, object_id in replays:
+            self._appliers[kind](db, object_id, written, deleted)
+        self.counters["replayed"] += len(replays)
+        if changes and changes[-1]["shards"] != len(self.index.shards):
+            self._adopt_shards(changes[-1]["shards"], written, deleted)
+        return True
+
+    def _adopt_shards(self, count: int, written: List[str], deleted: List[str]) -> None:
+        """Take on the shard count another process logged; every shard is rewritten."""
+        self.index.reshard(count)
+        self._shard_updated = [datetime.now(timezone.utc)] * count
+        # Reason: the other process rewrote (or removed) every shard file since
+        self._digests = {p: d for p, d in self._digests.items() if not p.startswith("sitemap-")}
+        self._write_outputs({("sitemap", n) for n in range(count)}, written, deleted)
+
+    def _apply(self, db: Session, post_id: str, written: List[str], deleted: List[str]) -> None:
+        row = crud.publishing.get_feed_post(db, post_id)
+        new = FeedEntry(row) if row is not None else None
+        old = self.index.entries.get(str(post_id))
+        if new is not None and new.topic_id is not None:
+            self._refresh_topic(
+                {"id": new.topic_id, "name": row["topic_name"], "slug": row["topic_slug"]},
+                written, deleted,
+            )
+        if old != new:
+            self.counters["changes"] += 1
+            outputs = self._affected(old, new)
+            if new is None:
+                self.index.remove(str(post_id))
+                self._urls.pop(str(post_id), None)
+            else:
+                self.index.put(new)
+                if len(self.index.shards[self.index.shard_of(new.id)]) > self.max_urls:
+                    outputs |= self._reshard()
+            outputs |= self._affected(new, old)
+            self._write_outputs(outputs, written, deleted)
+
+    def _apply_topic(
+        self, db: Session, topic_id: str, written: List[str], deleted: List[str]
+    ) -> None:
+        topic = crud.publishing.get_feed_topic(db, topic_id)
+        if topic is not None:
+            self._refresh_topic(
+                {"id": str(topic["id"]), "name": topic["name"], "slug": topic["slug"]},
+                written, deleted,
+            )
+
+    def _load(self, db: Session, written: List[str], deleted: List[str]) -> None:
+        self.loaded = False
+        entries: List[FeedEntry] = []
+        topics: Dict[str, Dict[str, Any]] = {}
+        for chunk in crud.publishing.stream_feed_posts(db):
+            for row in chunk:
+                entry = FeedEntry(row)
+                entries.append(entry)
+                if entry.topic_id is not None:
+                    topics[entry.topic_id] = {
+                        "id": entry.topic_id, "name": row["topic_name"], "slug": row["topic_slug"]
+                    }
+        self.index = FeedIndex(self._shard_count(len(entries)))
+        self.index.load(entries)
+        self.topics = topics
+        self._shard_updated = [
+            max((self.index.entries[post_id].updated_at for post_id in shard),
+                default=datetime.now(timezone.utc), key=utc)
+            for shard in self.index.shards
+        ]
+        self._page_counts = {}
+        self._urls = {}
+        self._digests = dict(self._existing_digests())
+
+        outputs: Set[Output] = {("sitemap", n) for n in range(len(self.index.shards))}
+        outputs.add(("feed", None))
+        for topic_id in self.index.by_topic:
+            outputs |= {("feed", topic_id), ("pages_from", topic_id, 1), ("topic", topic_id)}
+        produced = self._write_outputs(outputs, written, deleted)
+        for path in sorted(set(self._digests) - produced):
+            self._delete(path, deleted)
+        self.loaded = True
+        self.counters["loads"] += 1
+
+    def _existing_digests(self) -> Iterable[Tuple[str, bytes]]:
+        """Digests of the files already in ``root``, so unchanged ones aren't rewritten."""
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                with open(path, "rb") as handle:
+                    digest = hashlib.sha1(handle.read()).digest()
+                yield os.path.relpath(path, self.root).replace(os.sep, "/"), digest
+
+    def _shard_count(self, posts: int) -> int:
+        return max(1, math.ceil(posts / self.shard_target))
+
+    def _reshard(self) -> Set[Output]:
+        """Spread the posts over more shards once one is full; every shard is rewritten."""
+        count = self._shard_count(len(self.index))
+        while True:
+            count = max(count, len(self.index.shards) + 1)
+            self.index.reshard(count)
+            if max(len(shard) for shard in self.index.shards) <= self.max_urls:
+                break
+        self._shard_updated = [datetime.now(timezone.utc)] * count
+        return {("sitemap", n) for n in range(count)}
+
+    def _affected(self, entry: Optional[FeedEntry], other: Optional[FeedEntry]) -> Set[Output]:
+        """
+        Outputs showing ``entry`` where it sorts now; ``other`` is its state
+        on the other side of the change.
+        """
+        if entry is None:
+            return set()
+        outputs: Set[Output] = {("sitemap", self.index.shard_of(entry.id))}
+        if self.index.is_recent(entry, self.feed_size):
+            outputs.add(("feed", None))
+        topic_id = entry.topic_id
+        if topic_id is not None:
+            outputs.add(("topic", topic_id))
+            if self.index.is_recent(entry, self.feed_size, topic_id):
+                outputs.add(("feed", topic_id))
+            page = self.index.position(entry) // self.page_size + 1
+            # Reason: an edit that keeps the post's place shifts no other post
+            moved = other is None or other.key != entry.key or other.topic_id != topic_id
+            outputs.add(("pages_from" if moved else "page", topic_id, page))
+        return outputs
+
+    def _refresh_topic(
+        self, topic: Dict[str, Any], written: List[str], deleted: List[str]
+    ) -> None:
+        """Record a topic's name and slug, rewriting its files if they changed."""
+        known = self.topics.get(topic["id"])
+        self.topics[topic["id"]] = topic
+        if known is None or known == topic or topic["id"] not in self.index.by_topic:
+            return
+        if known["slug"] != topic["slug"]:
+            prefix = f"topics/{known['slug']}/"
+            for path in [path for path in self._digests if path.startswith(prefix)]:
+                self._delete(path, deleted)
+            self._page_counts.pop(topic["id"], None)
+        outputs = {("feed", topic["id"]), ("pages_from", topic["id"], 1), ("topic", topic["id"])}
+        self._write_outputs(outputs, written, deleted)
+
+    def _write_outputs(
+        self, outputs: Set[Output], written: List[str], deleted: List[str]
+    ) -> Set[str]:
+        """Render and write the outputs; returns every path they cover."""
+        produced: Set[str] = set()
+        shards_written = False
+        for output in sorted(outputs, key=repr):
+            for path, data in self._render(output, deleted):
+                produced.add(path)
+                if self._write(path, data, written) and output[0] == "sitemap":
+                    self._shard_updated[output[1]] = datetime.now(timezone.utc)
+                    shards_written = True
+        if shards_written or not self.loaded:
+            path = "sitemap.xml"
+            produced.add(path)
+            sitemaps = [(f"{self.base_url}/sitemap-{n + 1}.xml", updated)
+                        for n, updated in enumerate(self._shard_updated)]
+            self._write(path, render_sitemap_index(sitemaps), written)
+        return produced
+
+    def _render(self, output: Output, deleted: List[str]) -> List[Tuple[str, bytes]]:
+        kind = output[0]
+        if kind == "sitemap":
+            shard = output[1]
+            # Reason: ordered by ID, which sorts much faster than by date and
+            # is just as stable; sitemaps don't need any particular order
+            urls = [self._url(post_id) for post_id in sorted(self.index.shards[shard])]
+            return [(f"sitemap-{shard + 1}.xml", render_urlset(urls))]
+        if kind == "feed":
+            topic_id = output[1]
+            topic = self.topics.get(topic_id) if topic_id is not None else None
+            if topic_id is not None and (topic is None or not _safe_slug(topic["slug"])):
+                return []
+            prefix = f"topics/{topic['slug']}/" if topic is not None else ""
+            if topic_id is not None and topic_id not in self.index.by_topic:
+                self._delete(f"{prefix}rss.xml", deleted)
+                self._delete(f"{prefix}atom.xml", deleted)
+                return []
+            entries = self.index.latest(self.feed_size, topic_id)
+            if topic is None:
+                title, link = self.title, f"{self.site_url}/"
+            else:
+                title = f"{self.title}: {topic['name']}"
+                link = f"{self.site_url}/categories/{topic['slug']}/"
+            rss, atom = f"{prefix}rss.xml", f"{prefix}atom.xml"
+            return [
+                (rss, render_rss(title, link, f"{self.base_url}/{rss}", self.site_url, entries)),
+                (atom, render_atom(title, link, f"{self.base_url}/{atom}", self.site_url, entries)),
+            ]
+        topic_id = output[1]
+        topic = self.topics.get(topic_id)
+        if topic is None or not _safe_slug(topic["slug"]):
+            return []
+        prefix = f"topics/{topic['slug']}/"
+        count = len(self.index.by_topic.get(topic_id, []))
+        pages = math.ceil(count / self.page_size)
+        if kind == "topic":
+            if not count:
+                self._delete(f"{prefix}index.json", deleted)
+                return []
+            return [(f"{prefix}index.json", dumps({
+                "topic": topic, "posts": count, "pages": pages, "page_size": self.page_size,
+            }))]
+        first = output[2] if pages else 1
+        last = output[2] if kind == "page" else pages
+        for stale in range(pages + 1, self._page_counts.get(topic_id, 0) + 1):
+            self._delete(f"{prefix}page-{stale}.json", deleted)
+        self._page_counts[topic_id] = pages
+        return [
+            (f"{prefix}page-{page}.json", dumps({
+                "topic": topic["slug"], "page": page,
+                "posts": [self._summary(entry)
+                          for entry in self.index.page(topic_id, page, self.page_size)],
+            }))
+            for page in range(first, min(last, pages) + 1)
+        ]
+
+    def _url(self, post_id: str) -> str:
+        """A post's sitemap element, rendered again only after the post changed."""
+        entry = self.index.entries[post_id]
+        cached = self._urls.get(post_id)
+        if cached is None or cached[0] is not entry:
+            cached = self._urls[post_id] = (entry, render_url(self.site_url, entry))
+        return cached[1]
+
+    def _summary(self, entry: FeedEntry) -> Dict[str, Any]:
+        return {
+            "id": entry.id, "title": entry.title, "slug": entry.slug,
+            "url": post_url(self.site_url, entry), "excerpt": entry.excerpt,
+            "published_at": w3c(entry.published_at),
+        }
+
+    def _write(self, path: str, data: bytes, written: List[str]) -> bool:
+        """Write a file unless it already holds these bytes."""
+        digest = hashlib.sha1(data).digest()
+        if self._digests.get(path) == digest:
+            return False
+        write_atomic(os.path.join(self.root, path), data)
+        self._digests[path] = digest
+        self.counters["files_written"] += 1
+        written.append(path)
+        return True
+
+    def _delete(self, path: str, deleted: List[str]) -> None:
+        try:
+            os.unlink(os.path.join(self.root, path))
+        except FileNotFoundError:
+            pass
+        if self._digests.pop(path, None) is not None:
+            self.counters["files_deleted"] += 1
+            deleted.append(path)
+
+    def _result(self, started: float, written: List[str], deleted: List[str]) -> Dict[str, Any]:
+        result = {
+            "written": written,
+            "deleted": deleted,
+            "duration_seconds": round(time.perf_counter() - started, 4),
+        }
+        logger.debug("Feeds updated: %s", result)
+        return result
+
+
+def main(argv=None) -> int:
+    """Rebuild every feed, sitemap and topic index from the configured database."""
+    from app.db.database import SessionLocal
+
+    generator = FeedGenerator()
+    with SessionLocal() as db:
+        result = generator.load(db)
+    print(json.dumps({
+        **generator.stats(),
+        "written": len(result["written"]),
+        "deleted": len(result["deleted"]),
+        "duration_seconds": result["duration_seconds"],
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+Batched git commit and push of published files.
+
+Publish events (files written and deleted under a repository) are queued
+and committed by one background thread, so concurrent publishes never
+contend for git's locks. The thread gathers events for up to
+``GIT_BATCH_WINDOW_MS`` after the first one, or until a batch touches
+``GIT_BATCH_MAX_FILES`` paths, then makes one commit of all of them and
+one push:
+
+- The tree is built with plumbing in a private index: every file is hashed
+  by a single ``git hash-object``, the index is updated in one call and
+  written with ``write-tree``, whatever the batch size.
+- The branch moves with a compare-and-swap ``update-ref``.
+- A push rejected because the remote moved (non-fast-forward) fetches the
+  remote branch, rebuilds the same changes on its tip and pushes again, up
+  to ``GIT_PUSH_RETRIES`` times.
+"""
+import logging
+import os
+import queue
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.utils.metrics import (
+    Histogram, prometheus_header, prometheus_histogram, prometheus_sample
+)
+
+logger = logging.getLogger(__name__)
+
+# Working tree the API's shared publisher commits; unset means none is created
+GIT_PUBLISH_REPO = os.getenv("GIT_PUBLISH_REPO", "")
+# Remote and branch published commits are pushed to
+GIT_PUBLISH_REMOTE = os.getenv("GIT_PUBLISH_REMOTE", "origin")
+GIT_PUBLISH_BRANCH = os.getenv("GIT_PUBLISH_BRANCH", "main")
+# How long a batch stays open for more events after its first one
+GIT_BATCH_WINDOW_MS = float(os.getenv("GIT_BATCH_WINDOW_MS", "2000"))
+# Paths after which a batch is committed without waiting out the window
+GIT_BATCH_MAX_FILES = int(os.getenv("GIT_BATCH_MAX_FILES", "10000"))
+# Pushes retried after a non-fast-forward rejection, per batch
+GIT_PUSH_RETRIES = int(os.getenv("GIT_PUSH_RETRIES", "5"))
+# Author of published commits (GIT_AUTHOR_* / GIT_COMMITTER_* take precedence)
+GIT_PUBLISH_AUTHOR_NAME = os.getenv("GIT_PUBLISH_AUTHOR_NAME", "AI Publish Workflow")
+GIT_PUBLISH_AUTHOR_EMAIL = os.getenv("GIT_PUBLISH_AUTHOR_EMAIL", "publish@localhost")
+
+# Object name git uses for "no object"
+_NULL_SHA = "0" * 40
+# Push output meaning the remote branch moved on and a rebuild may succeed
+_REJECTED_MARKERS = ("[rejected]", "non-fast-forward", "fetch first", "cannot lock ref")
+# Buckets for events and paths per batch
+BATCH_EVENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+BATCH_FILE_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+# Messages of single events listed in a batch's commit message
+_MAX_MESSAGE_LINES = 50
+
+# Created on first use when GIT_PUBLISH_REPO is set
+_git_publisher: Optional["GitPublisher"] = None
+_publisher_lock = threading.Lock()
+
+
+class GitError(Exception):
+    """A git command failed."""
+
+    def __init__(self, args: Sequence[str], returncode: int, output: str):
+        super().__init__(f"git {' '.join(args)} exited with {returncode}: {output}")
+        self.output = output
+
+    @property
+    def rejected(self) -> bool:
+        """Whether this was a push refused because the remote branch moved."""
+        return any(marker in self.output for marker in _REJECTED_MARKERS)
+
+
+class PublishEvent:
+    """Paths one publish wrote and deleted, and the Future its caller waits on."""
+
+    def __init__(self, written: Iterable[str], deleted: Iterable[str], message: str):
+        self.written = [_repo_path(path) for path in written]
+        self.deleted = [_repo_path(path) for path in deleted]
+        self.message = message
+        self.future: Future = Future()
+        self.submitted = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.written) + len(self.deleted)
+
+
+def _repo_path(path: str) -> str:
+    """Normalize a path relative to the repository root, refusing escapes."""
+    normalized = os.path.normpath(path).replace(os.sep, "/")
+    if os.path.isabs(path) or normalized.startswith("../") or normalized in (".", ".."):
+        raise ValueError(f"Path must be inside the repository: {path!r}")
+    if normalized.split("/", 1)[0] == ".git" or "\n" in normalized:
+        raise ValueError(f"Path can't be published: {path!r}")
+    return normalized
+
+
+class GitPublisher:
+    """
+    Serialized, batching committer for one working tree.
+
+    Args:
+        repo: Root of a non-bare repository holding the files
+        remote: Remote to push to
+        branch: Branch committed to, locally and on the remote
+        batch_window: Seconds a batch stays open after its first event
+        max_batch_files: Paths that close a batch early
+        push_retries: Rebuild-and-push attempts after a rejected push
+    """
+
+    def __init__(
+        self,
+        repo: str,
+        remote: str = GIT_PUBLISH_REMOTE,
+        branch: str = GIT_PUBLISH_BRANCH,
+        batch_window: float = GIT_BATCH_WINDOW_MS / 1000,
+        max_batch_files: int = GIT_BATCH_MAX_FILES,
+        push_retries: int = GIT_PUSH_RETRIES,
+    ):
+        self.repo = os.path.abspath(repo)
+        self.remote = remote
+        self.branch = branch
+        self.batch_window = batch_window
+        self.max_batch_files = max_batch_files
+        self.push_retries = push_retries
+
+        self._env = dict(os.environ)
+        for role in ("AUTHOR", "COMMITTER"):
+            self._env.setdefault(f"GIT_{role}_NAME", GIT_PUBLISH_AUTHOR_NAME)
+            self._env.setdefault(f"GIT_{role}_EMAIL", GIT_PUBLISH_AUTHOR_EMAIL)
+        self._queue: "queue.Queue[Optional[PublishEvent]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.batch_events = Histogram(BATCH_EVENT_BUCKETS)
+        self.batch_files = Histogram(BATCH_FILE_BUCKETS)
+        self.latency = Histogram()
+        self.counters = {
+            "events": 0, "batches": 0, "commits": 0, "pushes": 0, "push_retries": 0,
+            "failed_batches": 0,
+        }
+        self.last_commit: Optional[str] = None
+
+    def start(self) -> None:
+        """Start the committer thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="git-publisher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Commit and push what is queued, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def submit(
+        self, written: Iterable[str] = (), deleted: Iterable[str] = (), message: str = "Publish"
+    ) -> Future:
+        """
+        Queue a publish event.
+
+        Args:
+            written: Paths, relative to the repository root, created or changed
+            deleted: Paths removed
+            message: Commit message, or its line in a batch's message
+
+        Returns:
+            Future resolving to the pushed commit's SHA (None when nothing
+            was ever committed), or raising GitError
+
+        Raises:
+            ValueError: If a path is outside the repository
+        """
+        event = PublishEvent(written, deleted, message)
+        self.start()
+        with self._lock:
+            self.counters["events"] += 1
+        self._queue.put(event)
+        return event.future
+
+    def publish(
+        self,
+        written: Iterable[str] = (),
+        deleted: Iterable[str] = (),
+        message: str = "Publish",
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """Submit an event and wait until its batch is pushed; returns the commit SHA."""
+        return self.submit(written, deleted, message).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, queue depth, and batch size and latency histograms."""
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "pending": self._queue.qsize(),
+            "last_commit": self.last_commit,
+            "batch_events": self.batch_events.snapshot(),
+            "batch_files": self.batch_files.snapshot(),
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        """Render the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self.counters)
+        lines: List[str] = []
+        for name, value in counters.items():
+            metric = f"git_publish_{name}_total"
+            lines += prometheus_header(metric, "counter", f"Git publisher {name}.")
+            lines.append(prometheus_sample(metric, value))
+        for metric, histogram, help_text in (
+            ("git_publish_batch_events", self.batch_events, "Publish events per commit."),
+            ("git_publish_batch_files", self.batch_files, "Paths changed per commit."),
+            ("git_publish_latency_seconds", self.latency, "Time from submit to push."),
+        ):
+            lines += prometheus_header(metric, "histogram", help_text)
+            lines += prometheus_histogram(metric, histogram.snapshot())
+        return lines
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            event = self._queue.get()
+            if event is None:
+                return
+            batch = [event]
+            size = event.size
+            deadline = time.monotonic() + self.batch_window
+            while size < self.max_batch_files:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+                size += event.size
+            self._publish_batch(batch)
+
+    def _publish_batch(self, batch: List[PublishEvent]) -> None:
+        """Commit and push one batch, settling its events' futures."""
+        # Reason: a path touched by several events ends up as the last one left it
+        changes: Dict[str, bool] = {}
+        for event in batch:
+            changes.update((path, True) for path in event.written)
+            changes.update((path, False) for path in event.deleted)
+        with self._lock:
+            self.counters["batches"] += 1
+        self.batch_events.observe(len(batch))
+        self.batch_files.observe(len(changes))
+        try:
+            commit = self._commit_and_push(changes, _batch_message(batch))
+        except Exception as exc:
+            logger.exception("Publishing a batch of %d events failed", len(batch))
+            with self._lock:
+                self.counters["failed_batches"] += 1
+            for event in batch:
+                event.future.set_exception(exc)
+            return
+        self.last_commit = commit
+        finished = time.monotonic()
+        for event in batch:
+            self.latency.observe(finished - event.submitted)
+            event.future.set_result(commit)
+
+    def _commit_and_push(self, changes: Dict[str, bool], message: str) -> Optional[str]:
+        ref = f"refs/heads/{self.branch}"
+        parent = self._rev_parse(ref)
+        entries = self._index_entries(changes)
+        attempt = 0
+        while True:
+            commit = self._commit(parent, entries, message)
+            if commit is None:
+                commit = parent
+            else:
+                self._git("update-ref", ref, commit, parent or _NULL_SHA)
+                with self._lock:
+                    self.counters["commits"] += 1
+                self._sync_index(entries)
+            if commit is None:
+                return None
+            try:
+                self._git("push", "--porcelain", self.remote, f"{commit}:{ref}")
+                with self._lock:
+                    self.counters["pushes"] += 1
+                return commit
+            except GitError as exc:
+                if not exc.rejected or attempt >= self.push_retries:
+                    raise
+            # Reason: the remote moved on; drop the rejected commit and rebuild
+            # the same changes on the remote's tip
+            attempt += 1
+            with self._lock:
+                self.counters["push_retries"] += 1
+            tracking = f"refs/remotes/{self.remote}/{self.branch}"
+            self._git("fetch", "--quiet", self.remote, f"+{ref}:{tracking}")
+            remote_tip = self._rev_parse(tracking)
+            self._git("update-ref", ref, remote_tip, commit)
+            parent = remote_tip
+            time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+
+    def _index_entries(self, changes: Dict[str, bool]) -> bytes:
+        """``update-index -z --index-info`` input for the changes, blobs written."""
+        written = [path for path, exists in changes.items()
+                   if exists and os.path.isfile(os.path.join(self.repo, path))]
+        shas: List[str] = []
+        if written:
+            shas = self._git(
+                "hash-object", "-w", "--stdin-paths", input="\n".join(written) + "\n"
+            ).split("\n")
+        records = []
+        for path, sha in zip(written, shas):
+            executable = os.access(os.path.join(self.repo, path), os.X_OK)
+            records.append(f"{'100755' if executable else '100644'} {sha}\t{path}")
+        present = set(written)
+        records += [f"0 {_NULL_SHA}\t{path}" for path in changes if path not in present]
+        return "".join(record + "\0" for record in records).encode("utf-8")
+
+    def _commit(self, parent: Optional[str], entries: bytes, message: str) -> Optional[str]:
+        """Commit the entries on top of parent; None if the tree didn't change."""
+        with tempfile.TemporaryDirectory(prefix="git-publish-") as workdir:
+            env = {**self._env, "GIT_INDEX_FILE": os.path.join(workdir, "index")}
+            if parent is not None:
+                self._git("read-tree", parent, env=env)
+            if entries:
+                self._git("update-index", "-z", "--index-info", input=entries, env=env)
+            tree = self._git("write-tree", env=env)
+        if parent is not None and tree == self._rev_parse(f"{parent}^{{tree}}"):
+            return None
+        args = ["commit-tree", tree, "-m", message]
+        if parent is not None:
+            args += ["-p", parent]
+        return self._git(*args)
+
+    def _sync_index(self, entries: bytes) -> None:
+        """Record the changes in the working tree's index, so ``git status`` stays clean."""
+        if entries and self._git("symbolic-ref", "-q", "HEAD", check=False) == (
+            f"refs/heads/{self.branch}"
+        ):
+            self._git("update-index", "-z", "--index-info", input=entries)
+
+    def _rev_parse(self, name: str) -> Optional[str]:
+        sha = self._git("rev-parse", "-q", "--verify", name, check=False)
+        return sha or None
+
+    def _git(self, *args: str, input: Any = None, env: Optional[Dict[str, str]] = None,
+             check: bool = True) -> str:
+        if isinstance(input, str):
+            input = input.encode("utf-8")
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo, input=input, capture_output=True,
+            env=env or self._env,
+        )
+        output = (result.stdout + result.stderr).decode("utf-8", "replace")
+        if check and result.returncode != 0:
+            raise GitError(args, result.returncode, output.strip())
+        return result.stdout.decode("utf-8").strip()
+
+
+def _batch_message(batch: List[PublishEvent]) -> str:
+    if len(batch) == 1:
+        return batch[0].message
+    lines = [f"Publish {len(batch)} changes", ""]
+    lines += [f"- {event.message}" for event in batch[:_MAX_MESSAGE_LINES]]
+    if len(batch) > _MAX_MESSAGE_LINES:
+        lines.append(f"- ... and {len(batch) - _MAX_MESSAGE_LINES} more")
+    return "\n".join(lines)
+
+
+def get_git_publisher() -> Optional[GitPublisher]:
+    """Get the process-wide publisher of GIT_PUBLISH_REPO, or None when it is unset."""
+    global _git_publisher
+    if not GIT_PUBLISH_REPO:
+        return None
+    with _publisher_lock:
+        if _git_publisher is None:
+            _git_publisher = GitPublisher(GIT_PUBLISH_REPO)
+        return _git_publisher
+
+
+def stop_git_publisher() -> None:
+    """Push what the process-wide publisher has queued and stop its thread."""
+    global _git_publisher
+    with _publisher_lock:
+        publisher, _git_publisher = _git_publisher, None
+    if publisher is not None:
+        publisher.stop()
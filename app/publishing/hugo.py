@@ -0,0 +1,304 @@
+"""
+Incremental, parallel export of posts to a Hugo site.
+
+Each run streams the posts to publish from the database in chunks and
+compares them with the manifest the previous run left in the site root:
+per post, the file written, the post's ``updated_at`` and a hash of
+everything rendered from it (fields, topic name, images). Only posts whose
+``updated_at`` or hash changed are rendered, in batches on a process pool,
+each file written atomically. Files of posts that were deleted, unpublished
+or renamed are removed.
+
+Run it with ``python -m app.publishing.hugo``.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.export import EXPORT_CHUNK_SIZE
+from app.publishing.render import RENDER_VERSION, write_atomic, write_posts
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Site root the content is written under
+HUGO_EXPORT_DIR = os.getenv("HUGO_EXPORT_DIR", "site")
+# Worker processes rendering posts (0: one per CPU)
+HUGO_EXPORT_WORKERS = int(os.getenv("HUGO_EXPORT_WORKERS", "0"))
+# Posts per worker task
+HUGO_EXPORT_BATCH_SIZE = int(os.getenv("HUGO_EXPORT_BATCH_SIZE", "200"))
+# Export drafts and posts in review too, marked draft = true
+HUGO_EXPORT_INCLUDE_DRAFTS = os.getenv("HUGO_EXPORT_INCLUDE_DRAFTS", "false").lower() in (
+    "1", "true", "yes"
+)
+
+# Manifest file, in the site root
+MANIFEST_NAME = ".export-manifest.json"
+# Errors kept in the stats of a run
+_MAX_ERRORS = 20
+
+
+def source_hash(post: Dict[str, Any]) -> str:
+    """
+    Hash of everything a post's file is rendered from, except ``updated_at``.
+
+    Args:
+        post: Post dict from ``crud.publishing.stream_export_posts``
+
+    Returns:
+        64-character hex digest
+    """
+    content = {key: value for key, value in post.items() if key != "updated_at"}
+    return hashlib.sha256(dumps([RENDER_VERSION, content])).hexdigest()
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class ExportManifest:
+    """
+    What a run wrote: per post ID, its ``path``, ``updated_at`` and ``hash``.
+
+    A manifest from another ``RENDER_VERSION`` loads empty, so the next run
+    renders everything again.
+    """
+
+    def __init__(self, posts: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.posts = posts or {}
+
+    @classmethod
+    def load(cls, path: str) -> "ExportManifest":
+        try:
+            with open(path, "rb") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return cls()
+        except ValueError:
+            logger.warning("Ignoring unreadable export manifest %s", path)
+            return cls()
+        if data.get("render_version") != RENDER_VERSION:
+            return cls()
+        return cls(data.get("posts"))
+
+    def save(self, path: str) -> None:
+        write_atomic(path, dumps({"render_version": RENDER_VERSION, "posts": self.posts}))
+
+
+class ExportStats:
+    """
+    Counters of one export run, plus the paths it wrote and removed
+    (relative to the site root, e.g. to commit them).
+    """
+
+    def __init__(self):
+        self.posts = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.failed = 0
+        self.duration_seconds = 0.0
+        self.errors: List[str] = []
+        self.written: List[str] = []
+        self.removed: List[str] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "posts": self.posts,
+            "rendered": self.rendered,
+            "skipped": self.skipped,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "errors": self.errors,
+        }
+
+
+class HugoExporter:
+    """
+    Writes posts as Markdown files under ``<root>/content/posts``.
+
+    Args:
+        root: Site root
+        workers: Worker processes (0: one per CPU); started only when there
+            is something to render
+        batch_size: Posts per worker task
+        chunk_size: Posts fetched from the database per round trip
+        include_drafts: Also export drafts and posts in review
+    """
+
+    def __init__(
+        self,
+        root: str = HUGO_EXPORT_DIR,
+        workers: int = HUGO_EXPORT_WORKERS,
+        batch_size: int = HUGO_EXPORT_BATCH_SIZE,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        include_drafts: bool = HUGO_EXPORT_INCLUDE_DRAFTS,
+    ):
+        self.root = os.path.abspath(root)
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.include_drafts = include_drafts
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def export(self, db: Session, full: bool = False) -> ExportStats:
+        """
+        Bring the site up to date with the database.
+
+        Args:
+            db: Database session
+            full: Ignore the manifest and render every post
+
+        Returns:
+            ExportStats of the run
+        """
+        started = time.perf_counter()
+        stats = ExportStats()
+        previous = ExportManifest.load(self.manifest_path).posts
+        current: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        futures: Dict[Future, List[str]] = {}
+        pool: Optional[ProcessPoolExecutor] = None
+
+        def collect(done: Iterable[Future]) -> None:
+            for future in done:
+                batch = futures.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    results = [(post_id, None, f"Worker failed: {exc}") for post_id in batch]
+                for post_id, path, error in results:
+                    entry = pending.pop(post_id)
+                    if error is None:
+                        current[post_id] = {**entry, "path": path}
+                        stats.written.append(path)
+                        stats.rendered += 1
+                        continue
+                    stats.failed += 1
+                    if len(stats.errors) < _MAX_ERRORS:
+                        stats.errors.append(f"{post_id}: {error}")
+                    # Reason: keep the old file and entry; the stale hash
+                    # makes the next run try again
+                    if post_id in previous:
+                        current[post_id] = previous[post_id]
+
+        def submit(batch: List[Dict[str, Any]]) -> None:
+            nonlocal pool
+            if pool is None:
+                # Reason: spawned, not forked, as the API process runs threads
+                pool = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            futures[pool.submit(write_posts, self.root, batch)] = [post["id"] for post in batch]
+            # Reason: bound the batches in flight so memory stays flat while
+            # the database keeps streaming
+            while len(futures) >= self.workers * 2:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        try:
+            batch: List[Dict[str, Any]] = []
+            chunks = crud.publishing.stream_export_posts(
+                db, include_drafts=self.include_drafts, chunk_size=self.chunk_size
+            )
+            for chunk in chunks:
+                for post in chunk:
+                    stats.posts += 1
+                    entry = {"updated_at": _timestamp(post["updated_at"]),
+                             "hash": source_hash(post)}
+                    old = previous.get(post["id"])
+                    if (
+                        not full and old is not None
+                        and old["hash"] == entry["hash"]
+                        and old["updated_at"] == entry["updated_at"]
+                        and os.path.exists(os.path.join(self.root, old["path"]))
+                    ):
+                        current[post["id"]] = old
+                        stats.skipped += 1
+                        continue
+                    pending[post["id"]] = entry
+                    batch.append(post)
+                    if len(batch) >= self.batch_size:
+                        submit(batch)
+                        batch = []
+            if batch:
+                submit(batch)
+            done, _ = wait(futures)
+            collect(done)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        stats.removed = self._delete_orphans(previous, current)
+        stats.deleted = len(stats.removed)
+        ExportManifest(current).save(self.manifest_path)
+        stats.written.append(MANIFEST_NAME)
+        stats.duration_seconds = time.perf_counter() - started
+        logger.info("Hugo export: %s", stats.as_dict())
+        return stats
+
+    def _delete_orphans(
+        self, previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """Delete files the last run wrote that no current post owns; returns their paths."""
+        live = {entry["path"] for entry in current.values()}
+        deleted = []
+        for path in {entry["path"] for entry in previous.values()} - live:
+            try:
+                os.unlink(os.path.join(self.root, path))
+            except FileNotFoundError:
+                pass
+            deleted.append(path)
+        return sorted(deleted)
+
+
+def main(argv=None) -> int:
+    """Export the configured database to a Hugo site and print the run's stats."""
+    parser = argparse.ArgumentParser(description="Export posts to a Hugo site")
+    parser.add_argument("--output", default=HUGO_EXPORT_DIR, help="Site root")
+    parser.add_argument("--full", action="store_true", help="Render every post again")
+    parser.add_argument("--include-drafts", action="store_true",
+                        default=HUGO_EXPORT_INCLUDE_DRAFTS)
+    parser.add_argument("--workers", type=int, default=HUGO_EXPORT_WORKERS)
+    parser.add_argument("--push", action="store_true",
+                        help="Commit the changed files and push them (the site must be a git repo)")
+    args = parser.parse_args(argv)
+
+    from app.db.database import SessionLocal
+    from app.publishing.git import GitPublisher
+
+    exporter = HugoExporter(args.output, workers=args.workers,
+                            include_drafts=args.include_drafts)
+    with SessionLocal() as db:
+        stats = exporter.export(db, full=args.full)
+    result = stats.as_dict()
+    if args.push and (stats.rendered or stats.deleted):
+        publisher = GitPublisher(args.output, batch_window=0)
+        try:
+            result["commit"] = publisher.publish(
+                stats.written, stats.removed,
+                f"Export {stats.rendered} posts, remove {stats.deleted}",
+            )
+        finally:
+            publisher.stop()
+    print(json.dumps(result, indent=2))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Rendering of posts as Hugo content files.
+
+Runs in the exporter's worker processes, so it imports nothing heavier than
+the standard library: posts arrive as plain dicts and leave as files.
+"""
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Bumped whenever the output format changes, so the next run re-renders all
+RENDER_VERSION = 1
+
+# TOML escapes for characters that can't appear raw in a basic string
+_TOML_ESCAPES = {
+    "\\": "\\\\", '"': '\\"', "\b": "\\b", "\t": "\\t", "\n": "\\n", "\f": "\\f", "\r": "\\r",
+}
+
+
+def post_path(slug: str) -> str:
+    """
+    Path of a post's content file, relative to the site root.
+
+    Raises:
+        ValueError: If the slug could name a file outside ``content/posts``
+    """
+    if not slug or "/" in slug or "\\" in slug or slug.startswith("."):
+        raise ValueError(f"Unsafe slug for a file name: {slug!r}")
+    return f"content/posts/{slug}.md"
+
+
+def _toml_string(value: str) -> str:
+    escaped = []
+    for char in value:
+        if char in _TOML_ESCAPES:
+            escaped.append(_TOML_ESCAPES[char])
+        elif ord(char) < 0x20 or ord(char) == 0x7F:
+            escaped.append(f"\\u{ord(char):04X}")
+        else:
+            escaped.append(char)
+    return '"' + "".join(escaped) + '"'
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_toml_value(item) for item in value) + "]"
+    return _toml_string(str(value))
+
+
+def render_post(post: Dict[str, Any]) -> str:
+    """
+    Render a post as Markdown with TOML front matter.
+
+    Args:
+        post: Fields from ``crud.publishing.stream_export_posts``
+
+    Returns:
+        File contents
+    """
+    front_matter = {
+        "title": post["title"],
+        "slug": post["slug"],
+        "date": post["published_at"] or post["created_at"],
+        "lastmod": post["updated_at"],
+        "draft": post["status"] != "published",
+        "summary": post["excerpt"],
+        "description": post["seo_description"] or post["excerpt"],
+        "seoTitle": post["seo_title"],
+        "keywords": post["seo_keywords"] or None,
+        "categories": [post["topic_name"]] if post["topic_name"] else None,
+        "images": [image["url"] for image in post["images"]] or None,
+    }
+    lines = ["+++"]
+    lines += [
+        f"{key} = {_toml_value(value)}" for key, value in front_matter.items() if value is not None
+    ]
+    lines += ["+++", ""]
+    body = (post["content"] or "").rstrip("\n")
+    return "\n".join(lines) + "\n" + (body + "\n" if body else "")
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a file via a temporary sibling and a rename, so readers never see half of it."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=directory, prefix=".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(partial, path)
+    except BaseException:
+        os.unlink(partial)
+        raise
+
+
+def write_posts(
+    root: str, posts: Sequence[Dict[str, Any]]
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Render and write a batch of posts (one worker task).
+
+    A post that fails doesn't stop the others.
+
+    Args:
+        root: Site root directory
+        posts: Posts to render
+
+    Returns:
+        ``(post id, path, error)`` per post; error is None on success (and
+        path None when the slug was unusable)
+    """
+    results = []
+    for post in posts:
+        path = None
+        try:
+            path = post_path(post["slug"])
+            write_atomic(os.path.join(root, path), render_post(post).encode("utf-8"))
+            results.append((post["id"], path, None))
+        except Exception as exc:
+            results.append((post["id"], path, f"{type(exc).__name__}: {exc}"))
+    return results
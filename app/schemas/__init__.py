@@ -0,0 +1,46 @@
+"""
+Pydantic schemas package.
+"""
+from .generation import GenerationCreate, GenerationJob, GenerationJobCreated
+from .image import Image, ImageDerivative, ImageUploaded
+from .post import Post, PostCreate, PostList, PostSummary, PostUpdate
+from .post_version import PostVersion, PostVersionDiff, PostVersionList, PostVersionSummary
+from .search import SearchHit, SearchResults
+from .topic import (
+    Topic,
+    TopicBulkCreate,
+    TopicBulkResponse,
+    TopicBulkResult,
+    TopicCreate,
+    TopicList,
+    TopicMove,
+    TopicUpdate,
+)
+
+__all__ = [
+    "GenerationCreate",
+    "GenerationJob",
+    "GenerationJobCreated",
+    "Image",
+    "ImageDerivative",
+    "ImageUploaded",
+    "Post",
+    "PostCreate",
+    "PostList",
+    "PostSummary",
+    "PostUpdate",
+    "PostVersion",
+    "PostVersionDiff",
+    "PostVersionList",
+    "PostVersionSummary",
+    "SearchHit",
+    "SearchResults",
+    "Topic",
+    "TopicBulkCreate",
+    "TopicBulkResponse",
+    "TopicBulkResult",
+    "TopicCreate",
+    "TopicList",
+    "TopicMove",
+    "TopicUpdate",
+]
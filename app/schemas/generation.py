@@ -0,0 +1,58 @@
+"""
+Pydantic models for AI content generation jobs.
+"""
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, validator
+
+# Lifecycle of a generation job
+GenerationJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class GenerationCreate(BaseModel):
+    """Schema for asking for a post's content to be generated."""
+    instructions: Optional[str] = Field(
+        None, max_length=2000, description="Extra instructions added to the prompt"
+    )
+    provider: Optional[str] = Field(
+        None, description="LLM provider to use (default: GENERATION_PROVIDER)"
+    )
+    model: Optional[str] = Field(None, description="Model name (default: the provider's)")
+    max_tokens: int = Field(1200, ge=1, le=8000, description="Upper bound on generated tokens")
+    temperature: float = Field(0.7, ge=0, le=2, description="Sampling temperature")
+    use_cache: bool = Field(
+        True,
+        description="Reuse a cached response to an identical request; false always calls "
+                    "the provider and refreshes the cache",
+    )
+
+
+class GenerationJob(BaseModel):
+    """Schema for the state of a generation job."""
+    id: str
+    post_id: str
+    status: GenerationJobStatus
+    provider: str
+    model: Optional[str] = None
+    attempts: int = Field(0, description="Provider calls made so far")
+    cached: bool = Field(False, description="Answered from the response cache")
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @validator("id", "post_id", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the database."""
+        return str(value) if value is not None else value
+
+    class Config:
+        orm_mode = True
+
+
+class GenerationJobCreated(GenerationJob):
+    """Schema returned when a generation job is queued."""
+    coalesced: bool = Field(
+        False,
+        description="An identical request was already pending; its result is shared",
+    )
@@ -0,0 +1,61 @@
+"""
+Pydantic models for images and their derivatives.
+"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, validator
+
+
+class ImageDerivative(BaseModel):
+    """Schema for a resized, re-encoded copy of an image."""
+    format: str = Field(..., description="MIME type, e.g. image/webp or image/avif")
+    width: int
+    height: int
+    size: int = Field(..., description="Bytes in the encoded file")
+    url: str
+
+    class Config:
+        orm_mode = True
+
+
+class Image(BaseModel):
+    """Schema for an image with its derivatives."""
+    id: str
+    post_id: Optional[str] = None
+    url: str = Field(..., description="URL of the original")
+    alt_text: Optional[str] = None
+    prompt: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = Field(None, description="MIME type of the original")
+    size: Optional[int] = Field(None, description="Bytes in the original")
+    is_featured: bool = False
+    content_hash: Optional[str] = Field(None, description="sha256 of the original")
+    placeholder: Optional[str] = Field(
+        None, description="Blurred thumbnail as a data: URI, to show while the image loads"
+    )
+    created_at: Optional[datetime] = None
+    derivatives: List[ImageDerivative] = Field(
+        default_factory=list, description="Web-sized copies, widest first"
+    )
+
+    @validator("id", "post_id", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the database."""
+        return str(value) if value is not None else value
+
+    @validator("is_featured", pre=True)
+    def _null_is_false(cls, value):
+        """Rows created outside the API may leave is_featured null."""
+        return bool(value)
+
+    class Config:
+        orm_mode = True
+
+
+class ImageUploaded(Image):
+    """Schema returned for an upload."""
+    deduplicated: bool = Field(
+        False,
+        description="The file was stored already; its original and derivatives were reused",
+    )
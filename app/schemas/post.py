@@ -0,0 +1,80 @@
+"""
+Pydantic models for Post data validation and serialization.
+"""
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, validator
+
+# Workflow states a post can be in
+PostStatus = Literal["draft", "in_review", "published", "archived"]
+
+
+class PostBase(BaseModel):
+    """Base schema for Post with common attributes."""
+    title: str = Field(..., min_length=1, max_length=300, description="Title of the post")
+    topic_id: Optional[str] = Field(None, description="ID of the topic the post belongs to")
+    excerpt: Optional[str] = Field(None, description="Short summary shown in listings")
+    status: PostStatus = Field("draft", description="Workflow state of the post")
+    published_at: Optional[datetime] = Field(
+        None, description="Publication time; set automatically when a post is published"
+    )
+    seo_title: Optional[str] = Field(None, max_length=300, description="Title for search engines")
+    seo_description: Optional[str] = Field(
+        None, max_length=500, description="Meta description for search engines"
+    )
+    seo_keywords: Optional[List[str]] = Field(None, description="Meta keywords")
+
+
+class PostCreate(PostBase):
+    """Schema for creating a new post."""
+    content: Optional[str] = Field(None, description="Body of the post (Markdown)")
+
+
+class PostUpdate(BaseModel):
+    """Schema for updating an existing post."""
+    title: Optional[str] = Field(
+        None, min_length=1, max_length=300, description="Updated title of the post"
+    )
+    topic_id: Optional[str] = Field(None, description="Updated topic ID")
+    excerpt: Optional[str] = Field(None, description="Updated excerpt")
+    content: Optional[str] = Field(None, description="Updated body of the post")
+    status: Optional[PostStatus] = Field(None, description="Updated workflow state")
+    published_at: Optional[datetime] = Field(None, description="Updated publication time")
+    seo_title: Optional[str] = Field(None, max_length=300, description="Updated SEO title")
+    seo_description: Optional[str] = Field(
+        None, max_length=500, description="Updated meta description"
+    )
+    seo_keywords: Optional[List[str]] = Field(None, description="Updated meta keywords")
+
+
+class PostSummary(PostBase):
+    """Schema for a post in list responses (everything but ``content``)."""
+    id: str
+    slug: str
+    current_version: int = Field(0, description="Number of the latest saved version")
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    @validator("id", "topic_id", "created_by", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the ORM."""
+        return str(value) if value is not None else value
+
+    class Config:
+        orm_mode = True
+
+
+class Post(PostSummary):
+    """Schema for returning a single post, including its content."""
+    content: Optional[str] = None
+
+
+class PostList(BaseModel):
+    """Schema for returning a page of posts."""
+    items: List[PostSummary] = Field(
+        ..., description="Posts on this page; ``content`` is only included on request"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
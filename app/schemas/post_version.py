@@ -0,0 +1,54 @@
+"""
+Pydantic models for post version history.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, validator
+
+
+class PostVersionSummary(BaseModel):
+    """A version in a post's history, without its texts."""
+    version_number: int
+    is_snapshot: bool = Field(
+        ..., description="Stored in full rather than as a delta from the previous version"
+    )
+    updated_by: Optional[str] = None
+    updated_at: datetime
+
+    @validator("updated_by", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the database."""
+        return str(value) if value is not None else value
+
+
+class PostVersion(BaseModel):
+    """A version of a post, rebuilt from its snapshot and deltas."""
+    post_id: str
+    version_number: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    excerpt: Optional[str] = None
+    updated_by: Optional[str] = None
+    updated_at: datetime
+
+    @validator("post_id", "updated_by", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the database."""
+        return str(value) if value is not None else value
+
+
+class PostVersionList(BaseModel):
+    """Schema for returning a page of a post's versions, newest first."""
+    items: List[PostVersionSummary]
+    next_before: Optional[int] = Field(
+        None, description="Pass as ``before`` to fetch older versions, or null on the last page"
+    )
+
+
+class PostVersionDiff(BaseModel):
+    """Schema for the differences between two versions of a post."""
+    from_version: int
+    to_version: int
+    changes: Dict[str, str] = Field(
+        ..., description="Unified diff per changed field (title, content, excerpt)"
+    )
@@ -0,0 +1,34 @@
+"""
+Pydantic models for search results.
+"""
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class SearchHit(BaseModel):
+    """A post or topic matching a search."""
+    type: Literal["post", "topic"]
+    id: str
+    title: str
+    slug: str
+    snippet: Optional[str] = Field(
+        None,
+        description="Best matching passage as escaped HTML, matched words wrapped in <mark>",
+    )
+    rank: float = Field(..., description="Relevance; higher is better")
+    status: Optional[str] = Field(None, description="Workflow state (posts only)")
+    topic_id: Optional[str] = Field(None, description="Topic of the post (posts only)")
+    published_at: Optional[datetime] = Field(None, description="Publication time (posts only)")
+
+
+class SearchResults(BaseModel):
+    """Schema for returning a page of search results."""
+    query: str
+    match: Literal["fulltext", "fuzzy"] = Field(
+        ..., description="'fuzzy' when nothing matched and titles were matched by similarity"
+    )
+    items: List[SearchHit]
+    next_offset: Optional[int] = Field(
+        None, description="Offset of the next page, or null on the last page"
+    )
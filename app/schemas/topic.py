@@ -2,9 +2,11 @@
 Pydantic models for Topic data validation and serialization.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, validator
 
+from app.utils.ranking import MAX_RANK_LENGTH, is_valid_rank
+
 
 class TopicBase(BaseModel):
     """Base schema for Topic with common attributes."""
@@ -33,15 +35,43 @@ class TopicUpdate(BaseModel):
     position: Optional[int] = Field(
         None, ge=0, description="Updated position for ordering"
     )
+    rank: Optional[str] = Field(
+        None,
+        max_length=MAX_RANK_LENGTH,
+        description="Updated fractional ordering key (base-62 digits, not ending in '0')"
+    )
+
+    @validator("rank")
+    def _check_rank(cls, value):
+        """Reject ranks that would break fractional ordering."""
+        if value is not None and not is_valid_rank(value):
+            raise ValueError("rank must use base-62 digits and not end in '0'")
+        return value
+
+
+class TopicMove(BaseModel):
+    """Schema for moving a topic next to another one."""
+    after_id: Optional[str] = Field(
+        None, description="ID of the topic the moved topic should follow"
+    )
+    before_id: Optional[str] = Field(
+        None, description="ID of the topic the moved topic should precede"
+    )
 
 
 class TopicInDBBase(TopicBase):
     """Base schema for Topic in database."""
     id: str
     slug: str
+    rank: str
     created_at: datetime
     updated_at: datetime
 
+    @validator("id", pre=True)
+    def _id_to_str(cls, value):
+        """Accept UUID instances coming from the ORM."""
+        return str(value) if value is not None else value
+
     class Config:
         orm_mode = True
 
@@ -54,4 +84,45 @@ class Topic(TopicInDBBase):
 class TopicList(BaseModel):
     """Schema for returning a list of topics."""
     items: List[Topic]
-    total: int
+    total: Optional[int] = Field(
+        None, description="Number of topics, or null when the count was skipped"
+    )
+    total_strategy: str = Field(
+        "exact", description="How total was computed: exact, estimated, cached or none"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
+class TopicBulkCreate(BaseModel):
+    """Schema for creating many topics in one request."""
+    mode: Literal["insert", "upsert", "skip-existing"] = Field(
+        "insert",
+        description=(
+            "'insert' suffixes taken slugs, 'upsert' updates existing topics, "
+            "'skip-existing' leaves them untouched"
+        )
+    )
+    items: List[TopicCreate] = Field(
+        ..., min_items=1, max_items=5000, description="Topics to create"
+    )
+
+
+class TopicBulkResult(BaseModel):
+    """Outcome of a single item in a bulk request."""
+    index: int
+    status: Literal["created", "updated", "skipped", "error"]
+    id: Optional[str] = None
+    slug: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class TopicBulkResponse(BaseModel):
+    """Schema for returning the results of a bulk request."""
+    mode: str
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    results: List[TopicBulkResult]
@@ -0,0 +1,174 @@
+"""
+In-process caching primitives.
+
+``LRUCache`` is the default backend: bounded by size and TTL, thread-safe,
+with hit/miss/eviction counters. Anything implementing ``CacheBackend`` (for
+example a Redis-backed class shared by several uvicorn workers) can be used
+instead.
+
+``VersionedCache`` adds cross-process invalidation without a shared backend:
+it compares a version stamp kept in the database and drops its local entries
+when another process has bumped it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+# Marker for cache misses, so that None can be cached
+MISSING = object()
+
+
+class CacheBackend:
+    """
+    Interface for cache backends.
+    """
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters describing cache usage."""
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe least-recently-used cache with a per-entry time to live.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class VersionedCache:
+    """
+    Cache whose entries are dropped when a shared version stamp changes.
+    
+    Args:
+        backend: Where entries are stored
+        check_interval: Seconds between version checks; 0 checks on every
+            read, a negative value disables checks (single-process setups)
+    """
+
+    def __init__(self, backend: CacheBackend, check_interval: float = 1.0):
+        self.backend = backend
+        self.check_interval = check_interval
+        self.enabled = True
+        self._version: Any = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def ensure_fresh(self, load_version: Callable[[], Any]) -> None:
+        """
+        Drop local entries if the shared version moved since the last check.
+        
+        Args:
+            load_version: Callable returning the current version stamp
+        """
+        if self.check_interval < 0:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        version = load_version()
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                self._version = version
+                self.backend.clear()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+        return self.backend.get(key) if self.enabled else MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value (no-op while the cache is disabled)."""
+        if self.enabled:
+            self.backend.set(key, value)
+
+    def invalidate(self) -> None:
+        """Drop every local entry after a write."""
+        self.backend.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend counters plus invalidation count."""
+        return {
+            **self.backend.stats(),
+            "enabled": self.enabled,
+            "invalidations": self.invalidations,
+        }
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, loading and storing it on a miss.
+        
+        Args:
+            key: Cache key
+            load: Callable producing the value on a miss
+            
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is MISSING:
+            value = load()
+            self.set(key, value)
+        return value
@@ -0,0 +1,99 @@
+"""
+Line-based deltas between two versions of a text.
+
+A delta is a list of operations replayed over the lines of the base text:
+a positive int copies that many lines, a negative int skips that many, and
+a list of strings inserts those lines. ``[40, -1, ["new line"], 12]`` keeps
+40 lines, replaces the next one and keeps 12 more, so a small edit to a long
+post costs a few bytes instead of a full copy.
+
+Lines are split on ``"\\n"`` with an empty text having no lines, which is
+what Postgres' ``string_to_array(text, E'\\n')`` does too, so the
+conversion migration can build the same format in SQL.
+"""
+import difflib
+from typing import List, Optional, Union
+
+Delta = List[Union[int, List[str]]]
+
+
+def split_lines(text: Optional[str]) -> List[str]:
+    """Split text into lines; None and ``""`` have none."""
+    return text.split("\n") if text else []
+
+def make_delta(old: Optional[str], new: Optional[str]) -> Delta:
+    """
+    Compute the operations turning ``old`` into ``new``.
+
+    Args:
+        old: Base text (None is treated as empty)
+        new: Target text (None is treated as empty)
+
+    Returns:
+        Delta for :func:`apply_delta`; ``[]`` when both have no lines
+    """
+    old_lines, new_lines = split_lines(old), split_lines(new)
+    delta: Delta = []
+    # Reason: autojunk would treat frequent lines (blank lines in Markdown)
+    # as noise and turn small edits into large replacements
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(new_lines[j1:j2])
+    return delta
+
+def apply_delta(base: Optional[str], delta: Delta) -> str:
+    """
+    Replay a delta over a base text.
+
+    Args:
+        base: Text the delta was computed against
+        delta: Operations from :func:`make_delta`
+
+    Returns:
+        The target text
+
+    Raises:
+        ValueError: If the delta reads past the end of the base, or leaves
+            base lines unaccounted for (i.e. it belongs to another base)
+    """
+    lines = split_lines(base)
+    out: List[str] = []
+    position = 0
+    for op in delta:
+        if isinstance(op, list):
+            out.extend(op)
+            continue
+        end = position + abs(op)
+        if end > len(lines):
+            raise ValueError("Delta does not match its base text")
+        if op > 0:
+            out.extend(lines[position:end])
+        position = end
+    if position != len(lines):
+        raise ValueError("Delta does not match its base text")
+    return "\n".join(out)
+
+def unified_diff(
+    old: Optional[str], new: Optional[str], from_label: str, to_label: str
+) -> str:
+    """
+    Render the change between two texts as a unified diff.
+
+    Args:
+        old: Earlier text
+        new: Later text
+        from_label: Header name for the earlier text
+        to_label: Header name for the later text
+
+    Returns:
+        Unified diff, or ``""`` when the texts have the same lines
+    """
+    return "\n".join(difflib.unified_diff(
+        split_lines(old), split_lines(new), from_label, to_label, lineterm=""
+    ))
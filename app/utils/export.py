@@ -0,0 +1,111 @@
+"""
+Encoders and response helpers for streaming exports (NDJSON and CSV).
+"""
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.utils.serialization import dumps
+
+# Supported export formats and their media types
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def parse_columns(requested: Optional[str], available: Sequence[str]) -> List[str]:
+    """
+    Validate a comma-separated column selection.
+    
+    Args:
+        requested: Column names from the query string, or None for all
+        available: Columns that may be exported
+        
+    Returns:
+        Selected column names, in the requested order
+        
+    Raises:
+        HTTPException: If a column is unknown or the selection is empty
+    """
+    if not requested:
+        return list(available)
+    columns = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in columns if name not in available]
+    if unknown or not columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Columns must be chosen from {', '.join(available)}"
+        )
+    return list(dict.fromkeys(columns))
+
+def _csv_value(value: Any) -> Any:
+    """Render a value the way the JSON API does (ISO dates, empty for None)."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return dumps(value).decode("utf-8")
+    return value
+
+def ndjson_chunks(columns: Sequence[str], chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """
+    Encode row chunks as newline-delimited JSON objects.
+    
+    Args:
+        columns: Column names, in row order
+        chunks: Lists of row tuples
+        
+    Yields:
+        One encoded block per chunk
+    """
+    for rows in chunks:
+        yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+def csv_chunks(columns: Sequence[str], chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """
+    Encode row chunks as CSV, preceded by a header row.
+    
+    Args:
+        columns: Column names, in row order
+        chunks: Lists of row tuples
+        
+    Yields:
+        The header, then one encoded block per chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode("utf-8")
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+def export_response(
+    name: str, fmt: str, columns: Sequence[str], chunks: Iterable[List[tuple]]
+) -> StreamingResponse:
+    """
+    Wrap streamed row chunks in a downloadable response.
+    
+    Args:
+        name: Base file name (e.g. "topics")
+        fmt: One of EXPORT_FORMATS
+        columns: Column names, in row order
+        chunks: Lists of row tuples
+        
+    Returns:
+        StreamingResponse with a Content-Disposition attachment header
+    """
+    encode = csv_chunks if fmt == "csv" else ndjson_chunks
+    return StreamingResponse(
+        encode(columns, chunks),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
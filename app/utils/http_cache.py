@@ -0,0 +1,131 @@
+"""
+Helpers for HTTP conditional requests.
+
+Read endpoints compute an ``ETag`` and ``Last-Modified`` from cheap row
+metadata (``id`` / ``updated_at``) and answer ``304 Not Modified`` when the
+client's ``If-None-Match`` / ``If-Modified-Since`` still match, skipping
+serialization entirely.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Cache-Control sent with cacheable topic reads. Browsers revalidate every
+# time (cheap with ETags); a CDN may serve its copy for s-maxage seconds.
+TOPIC_CACHE_CONTROL = os.getenv(
+    "TOPIC_CACHE_CONTROL", "public, max-age=0, s-maxage=10, stale-while-revalidate=30"
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the given parts.
+    
+    Args:
+        *parts: Values identifying a representation (timestamps, ids, counts...)
+        
+    Returns:
+        Quoted weak ETag, e.g. ``W/"3f2a..."``
+    """
+    raw = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+def format_http_date(value: datetime) -> str:
+    """Format a timestamp as an HTTP date (second precision, GMT)."""
+    return format_datetime(_as_utc(value).astimezone(timezone.utc), usegmt=True)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Tell whether the client's cached copy is still current.
+    
+    ``If-None-Match`` wins over ``If-Modified-Since`` when both are sent, as
+    required by RFC 7232.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the representation
+        last_modified: Current modification time, if known
+        
+    Returns:
+        bool: True if a 304 should be returned
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # Reason: HTTP dates have one-second precision
+    modified = _as_utc(last_modified).replace(microsecond=0)
+    return modified <= _as_utc(since)
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = TOPIC_CACHE_CONTROL,
+) -> None:
+    """
+    Attach ETag, Last-Modified and Cache-Control headers to a response.
+    
+    Args:
+        response: Response to decorate
+        etag: ETag of the representation
+        last_modified: Modification time of the representation, if known
+        cache_control: Cache-Control header value
+    """
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+
+def not_modified(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = TOPIC_CACHE_CONTROL,
+) -> Response:
+    """
+    Build an empty 304 response carrying the current validators.
+    
+    Args:
+        etag: ETag of the representation
+        last_modified: Modification time of the representation, if known
+        cache_control: Cache-Control header value
+        
+    Returns:
+        304 Response
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified, cache_control)
+    return response
@@ -0,0 +1,212 @@
+"""
+Per-request instrumentation: latency histograms, SQL counts, Server-Timing
+headers and opt-in profiling.
+
+``instrument_request`` is registered as HTTP middleware in ``app.main``.
+Metrics are labelled by route template (``/api/v1/topics/{topic_id}``), never
+by raw path, so label cardinality stays bounded.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from fastapi import Request, Response
+
+from app.db.query_stats import track_queries
+from app.utils.metrics import (
+    Histogram, prometheus_header, prometheus_histogram, prometheus_sample
+)
+from app.utils.profiling import StackSampler, profile_path
+
+logger = logging.getLogger(__name__)
+
+# Add a Server-Timing header (total, SQL count and time) to every response
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# Profile every Nth request (0 disables sampling by count)
+PROFILE_EVERY_N = int(os.getenv("PROFILE_EVERY_N", "0"))
+
+# Let clients ask for a profile with the X-Profile header (keep off in production)
+PROFILE_HEADER_ENABLED = os.getenv("PROFILE_HEADER_ENABLED", "false").lower() == "true"
+PROFILE_HEADER = "X-Profile"
+
+# Buckets for the number of SQL statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Label used for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetrics:
+    """
+    Process-wide request metrics, labelled by method and route template.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.query_seconds: Dict[Tuple[str, str], float] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+
+    def record(
+        self, method: str, route: str, status_code: int,
+        seconds: float, query_count: int, query_seconds: float
+    ) -> None:
+        """Record one finished request."""
+        key = (method, route)
+        with self._lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram()
+                self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.query_seconds[key] = 0.0
+            latency, queries = self.latency[key], self.queries[key]
+            self.query_seconds[key] += query_seconds
+            status_key = (method, route, status_code)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+        latency.observe(seconds)
+        queries.observe(query_count)
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self.latency.clear()
+            self.queries.clear()
+            self.query_seconds.clear()
+            self.responses.clear()
+
+    def prometheus_lines(self) -> List[str]:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Exposition lines
+        """
+        with self._lock:
+            latency = dict(self.latency)
+            queries = dict(self.queries)
+            query_seconds = dict(self.query_seconds)
+            responses = dict(self.responses)
+        
+        lines = prometheus_header(
+            "http_requests_total", "counter", "Requests handled, by route and status."
+        )
+        for (method, route, code), count in sorted(responses.items()):
+            lines.append(prometheus_sample(
+                "http_requests_total", count,
+                {"method": method, "route": route, "status": str(code)},
+            ))
+        lines += prometheus_header(
+            "http_request_duration_seconds", "histogram", "Time to produce a response."
+        )
+        for (method, route), histogram in sorted(latency.items()):
+            lines += prometheus_histogram(
+                "http_request_duration_seconds", histogram.snapshot(),
+                {"method": method, "route": route},
+            )
+        lines += prometheus_header(
+            "db_queries_per_request", "histogram", "SQL statements executed per request."
+        )
+        for (method, route), histogram in sorted(queries.items()):
+            lines += prometheus_histogram(
+                "db_queries_per_request", histogram.snapshot(),
+                {"method": method, "route": route},
+            )
+        lines += prometheus_header(
+            "db_query_seconds_total", "counter", "Time spent executing SQL, by route."
+        )
+        for (method, route), seconds in sorted(query_seconds.items()):
+            lines.append(prometheus_sample(
+                "db_query_seconds_total", seconds, {"method": method, "route": route}
+            ))
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+_request_counter = itertools.count(1)
+
+
+def route_template(request: Request) -> str:
+    """
+    Find the template of the route that handled a request.
+    
+    Args:
+        request: Request after routing
+        
+    Returns:
+        Route path (e.g. ``/api/v1/topics/{topic_id}``) or UNMATCHED_ROUTE
+    """
+    endpoint = request.scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    for route in request.app.routes:
+        if getattr(route, "endpoint", None) is endpoint:
+            return route.path
+    return UNMATCHED_ROUTE
+
+def _should_profile(request: Request) -> bool:
+    """Decide whether this request is profiled."""
+    if PROFILE_HEADER_ENABLED and request.headers.get(PROFILE_HEADER):
+        return True
+    return PROFILE_EVERY_N > 0 and next(_request_counter) % PROFILE_EVERY_N == 0
+
+def server_timing(total_seconds: float, query_count: int, query_seconds: float) -> str:
+    """
+    Build a Server-Timing header value.
+    
+    Args:
+        total_seconds: Time spent producing the response
+        query_count: SQL statements executed
+        query_seconds: Time spent in those statements
+        
+    Returns:
+        Header value, durations in milliseconds
+    """
+    return (
+        f"app;dur={total_seconds * 1000:.2f}, "
+        f'db;dur={query_seconds * 1000:.2f};desc="{query_count} queries"'
+    )
+
+async def instrument_request(request: Request, call_next) -> Response:
+    """
+    HTTP middleware timing the request and counting its SQL statements.
+    
+    Durations cover producing the response (until headers are ready); a
+    streamed body keeps running afterwards and is not included.
+    
+    Args:
+        request: Incoming request
+        call_next: Next ASGI handler
+        
+    Returns:
+        The response, with a Server-Timing header when enabled
+    """
+    sampler = StackSampler().start() if _should_profile(request) else None
+    start = time.perf_counter()
+    status_code = 500
+    with track_queries() as stats:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_template(request)
+            request_metrics.record(
+                request.method, route, status_code, elapsed, stats.count, stats.seconds
+            )
+            if sampler is not None:
+                sampler.stop()
+                # Reason: writing the file is blocking I/O; keep it off the event loop
+                path = await asyncio.get_event_loop().run_in_executor(
+                    None, sampler.write, profile_path(request.method, route)
+                )
+                logger.info("Wrote request profile to %s", path)
+    
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing(elapsed, stats.count, stats.seconds)
+    return response
@@ -0,0 +1,125 @@
+"""
+Minimal thread-safe metric primitives shared by the instrumentation code.
+"""
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, Prometheus style.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value (e.g. seconds)
+        """
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    return
+            self._counts[-1] += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current state of the histogram.
+
+        Returns:
+            dict with ``count``, ``sum`` and cumulative ``buckets``
+            (upper bound as string -> count), including ``+Inf``
+        """
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, count in zip(self.buckets + [float("inf")], self._counts):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+            return {"count": self._count, "sum": self._sum, "buckets": cumulative}
+
+    def reset(self) -> None:
+        """Clear all observations."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a Prometheus label set, escaping values."""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def prometheus_header(name: str, metric_type: str, help_text: str) -> List[str]:
+    """
+    Build the ``# HELP`` / ``# TYPE`` lines of a metric family.
+
+    Args:
+        name: Metric name
+        metric_type: "counter", "gauge" or "histogram"
+        help_text: One-line description
+
+    Returns:
+        The two header lines
+    """
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def prometheus_sample(name: str, value: float, labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Render one sample in the Prometheus text exposition format.
+
+    Args:
+        name: Metric name
+        value: Sample value
+        labels: Label name -> value
+
+    Returns:
+        A single exposition line
+    """
+    return f"{name}{_format_labels(labels or {})} {value}"
+
+
+def prometheus_histogram(
+    name: str, snapshot: Dict, labels: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    Render a ``Histogram.snapshot()`` as ``_bucket``/``_sum``/``_count`` samples.
+
+    Args:
+        name: Metric name
+        snapshot: Result of ``Histogram.snapshot()``
+        labels: Label name -> value shared by every sample
+
+    Returns:
+        Exposition lines
+    """
+    labels = labels or {}
+    lines = [
+        prometheus_sample(f"{name}_bucket", count, {**labels, "le": bound})
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(prometheus_sample(f"{name}_sum", snapshot["sum"], labels))
+    lines.append(prometheus_sample(f"{name}_count", snapshot["count"], labels))
+    return lines
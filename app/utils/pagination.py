@@ -0,0 +1,103 @@
+"""
+Helpers for opaque keyset (cursor) pagination.
+
+A cursor records the sort key of the last row on a page plus its ``id`` as a
+tiebreaker, so the next page can be fetched with a ``WHERE (key, id) > (...)``
+predicate instead of an ``OFFSET`` that scans and discards every skipped row.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+def encode_cursor(order_by: str, order: str, value: Any, last_id: Any) -> str:
+    """
+    Build an opaque cursor pointing just past a row.
+
+    Args:
+        order_by: Name of the field the page is ordered by
+        order: Sort order ('asc' or 'desc')
+        value: Value of the sort field on the last row of the page
+        last_id: ID of the last row of the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"o": order_by, "d": order.lower(), "k": value, "id": str(last_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Opaque cursor string supplied by the client
+
+    Returns:
+        dict with ``order_by``, ``order``, ``value`` and ``id`` keys
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {
+            "order_by": payload["o"],
+            "order": payload["d"],
+            "value": payload["k"],
+            "id": payload["id"],
+        }
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _coerce_value(value: Any, value_type: Optional[type]) -> Any:
+    """Check a cursor's sort key against the type of the field it orders by."""
+    if value_type is None:
+        return value
+    if value_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(value)
+    # Reason: bool is an int subclass, but never a valid integer sort key
+    if not isinstance(value, value_type) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def parse_after(
+    cursor: Optional[str], order_by: str, order: str, value_type: Optional[type] = None
+) -> Optional[Tuple[Any, uuid.UUID]]:
+    """
+    Turn a client cursor into the ``(value, id)`` keyset position.
+
+    Args:
+        cursor: Opaque cursor string, or None for the first page
+        order_by: Field the current request is ordered by
+        order: Sort order of the current request
+        value_type: Python type of the ``order_by`` column (``datetime``,
+            ``int`` or ``str``); the cursor's value must match it
+
+    Returns:
+        ``(value, id)`` tuple with the value coerced to ``value_type`` and the
+        ID parsed as a UUID, or None when no cursor was given
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a different ordering
+    """
+    if not cursor:
+        return None
+    data = decode_cursor(cursor)
+    if data["order_by"] != order_by or data["order"] != order.lower():
+        raise ValueError("Cursor does not match the requested ordering")
+    try:
+        return _coerce_value(data["value"], value_type), uuid.UUID(str(data["id"]))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
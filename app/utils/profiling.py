@@ -0,0 +1,109 @@
+"""
+Opt-in sampling profiler for individual requests.
+
+While a request is profiled, a background thread snapshots the Python stack
+of every thread (``sys._current_frames``) at a fixed interval. Sampling all
+threads matters because sync endpoints run in Starlette's threadpool rather
+than on the event loop thread; a plain ``cProfile`` started in middleware
+would miss them. Other requests running at the same time show up in the
+samples too, so profile under light load.
+
+Profiles are written in the "collapsed stack" format understood by
+flamegraph.pl and speedscope: one ``frame;frame;frame count`` line per
+distinct stack.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+# Seconds between stack samples
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+
+# Directory profiles are written to
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+
+def _stack_key(frame) -> str:
+    """Collapse a frame chain into ``outer;...;inner``."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Background thread sampling the stacks of all other threads.
+    
+    Args:
+        interval: Seconds between samples
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.samples[_stack_key(frame)] += 1
+
+    def start(self) -> "StackSampler":
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        """
+        Stop sampling.
+        
+        Returns:
+            Counter of collapsed stack -> number of samples
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def write(self, path: str) -> str:
+        """
+        Write the samples as collapsed stacks.
+        
+        Args:
+            path: Output file
+            
+        Returns:
+            The path written
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in self.samples.most_common():
+                handle.write(f"{stack} {count}\n")
+        return path
+
+
+def profile_path(method: str, route: str, directory: Optional[str] = None) -> str:
+    """
+    Build a unique file name for a request profile.
+    
+    Args:
+        method: HTTP method
+        route: Route template
+        directory: Directory to write into (default: PROFILE_DIR)
+        
+    Returns:
+        Path ending in ``.collapsed``
+    """
+    slug = "".join(c if c.isalnum() else "_" for c in route).strip("_") or "root"
+    stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}"
+    return os.path.join(directory or PROFILE_DIR, f"{stamp}-{method}-{slug}.collapsed")
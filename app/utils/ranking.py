@@ -0,0 +1,125 @@
+"""
+Fractional (lexicographic) ranking keys for ordered lists.
+
+A rank is a string of base-62 digits read as a fraction in (0, 1). Because
+there is always another string between any two ranks, an item can be moved by
+rewriting only its own rank. Keys never end in ``0`` so that there is always
+room below them.
+"""
+import math
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Rank given to rows created without one; sits in the middle of the key space
+DEFAULT_RANK = DIGITS[BASE // 2]
+
+# Longest rank worth keeping before the list should be rebalanced
+MAX_RANK_LENGTH = 32
+
+
+def is_valid_rank(rank: str) -> bool:
+    """
+    Check that a string is a well-formed rank.
+
+    Args:
+        rank: Candidate rank
+
+    Returns:
+        True if ``rank`` only uses base-62 digits and doesn't end in ``0``
+    """
+    return bool(rank) and rank[-1] != DIGITS[0] and all(c in DIGITS for c in rank)
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Digits strictly between ``low`` and ``high`` (None = no upper bound)."""
+    if high is not None:
+        # Reason: skip the shared prefix, padding low with zeros as a fraction would
+        n = 0
+        while n < len(high) and (low[n] if n < len(low) else DIGITS[0]) == high[n]:
+            n += 1
+        if n > 0:
+            return high[:n] + _midpoint(low[n:], high[n:])
+
+    digit_low = DIGITS.index(low[0]) if low else 0
+    digit_high = DIGITS.index(high[0]) if high is not None else BASE
+    if digit_high - digit_low > 1:
+        return DIGITS[(digit_low + digit_high + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[digit_low] + _midpoint(low[1:], None)
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Generate a rank that sorts strictly between two ranks.
+
+    Args:
+        before: Rank of the preceding item, or None for the start of the list
+        after: Rank of the following item, or None for the end of the list
+
+    Returns:
+        A new rank
+
+    Raises:
+        ValueError: If ``before`` doesn't sort strictly before ``after``
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} must sort before {after!r}")
+    return _midpoint(before or "", after)
+
+
+def ranks_between(before: Optional[str], after: Optional[str], count: int) -> List[str]:
+    """
+    Generate ``count`` ascending ranks between two ranks.
+
+    Keys are produced by recursive bisection, so their length grows with the
+    logarithm of ``count`` rather than linearly as repeated appends would.
+
+    Args:
+        before: Rank of the preceding item, or None for the start of the list
+        after: Rank of the following item, or None for the end of the list
+        count: Number of ranks to generate
+
+    Returns:
+        List of ranks, in ascending order
+    """
+    if count <= 0:
+        return []
+    left = count // 2
+    middle = rank_between(before, after)
+    return (
+        ranks_between(before, middle, left)
+        + [middle]
+        + ranks_between(middle, after, count - left - 1)
+    )
+
+
+def spread_ranks(count: int) -> List[str]:
+    """
+    Generate ``count`` short, evenly spaced ranks, in ascending order.
+
+    Used when rebalancing a list whose ranks have grown too long.
+
+    Args:
+        count: Number of ranks to generate
+
+    Returns:
+        List of ranks
+    """
+    if count <= 0:
+        return []
+    width = max(1, math.ceil(math.log(count + 1, BASE)))
+    if BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+    ranks = []
+    for i in range(1, count + 1):
+        value = step * i
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return ranks
@@ -0,0 +1,393 @@
+"""
+Pure-Python full-text index used when Postgres search is unavailable.
+
+Mirrors the Postgres search closely enough for the API to behave the same on
+SQLite: text is split into lower-cased, lightly stemmed words minus English
+stopwords; each field carries a weight like ``setweight`` (A = 1.0,
+B = 0.4, C = 0.2); queries follow ``websearch_to_tsquery`` (words are
+ANDed, ``OR`` offers alternatives, ``-word`` excludes); snippets are
+HTML-escaped with matches wrapped in ``<mark>``, like Postgres snippets; and title
+matching by trigram similarity stands in for ``pg_trgm``.
+"""
+import heapq
+import html
+import math
+import re
+from collections import Counter
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+)
+
+# Field weights, as used by ts_rank for setweight labels A, B and C
+WEIGHT_A = 1.0
+WEIGHT_B = 0.4
+WEIGHT_C = 0.2
+
+# Markers around matched words in snippets
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+# Words per snippet
+SNIPPET_WORDS = 30
+
+# Minimum word similarity for a fuzzy title match (pg_trgm's default)
+FUZZY_THRESHOLD = 0.6
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can did do does doing down during each
+few for from further had has have having he her here hers herself him himself
+his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what
+when where which while who whom why will with you your yours yourself
+yourselves
+""".split())
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def stem(word: str) -> str:
+    """
+    Strip common English inflections so related forms share a term.
+
+    Much lighter than the Snowball stemmer Postgres uses, but applied to
+    documents and queries alike, which is all matching needs.
+    """
+    if len(word) > 4:
+        if word.endswith("ies"):
+            return word[:-3] + "y"
+        if word.endswith("ing"):
+            return word[:-3]
+        if word.endswith("ed"):
+            return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def analyze(text: Optional[str]) -> List[str]:
+    """
+    Turn text into index terms.
+
+    Args:
+        text: Text to analyze (None is treated as empty)
+
+    Returns:
+        Stemmed, lower-cased words in order, stopwords removed
+    """
+    if not text:
+        return []
+    return [
+        stem(word) for word in (m.group().lower() for m in _WORD.finditer(text))
+        if word not in STOPWORDS
+    ]
+
+def parse_query(query: str) -> Tuple[List[Set[str]], Set[str]]:
+    """
+    Parse a web-search style query.
+
+    ``python OR rust tutorial -video`` becomes groups
+    ``[{"python", "rust"}, {"tutorial"}]`` (every group must match, any term
+    within a group will do) and excluded terms ``{"video"}``. Quotes are
+    ignored, so a phrase matches as its words in any order.
+
+    Args:
+        query: Query as typed by a user
+
+    Returns:
+        Tuple of (required groups, excluded terms)
+    """
+    groups: List[Set[str]] = []
+    excluded: Set[str] = set()
+    join_next = False
+    for raw in query.replace('"', " ").split():
+        if raw.upper() == "OR":
+            join_next = bool(groups)
+            continue
+        negate = raw.startswith("-")
+        terms = analyze(raw[1:] if negate else raw)
+        if not terms:
+            continue
+        if negate:
+            excluded.update(terms)
+        elif join_next:
+            groups[-1].update(terms)
+        else:
+            groups.extend({term} for term in terms)
+        join_next = False
+    return groups, excluded
+
+def trigrams(word: str) -> List[str]:
+    """Trigrams of a word in order, padded the way pg_trgm pads it."""
+    padded = f"  {word.lower()} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def word_similarity(wanted: Set[str], target: List[str]) -> float:
+    """
+    Greatest similarity between a trigram set and any run of ``target``.
+
+    Same definition as pg_trgm's ``word_similarity``: shared trigrams over
+    the union, for the best contiguous extent of the target's trigrams, so a
+    query word scores well against a longer word it is a prefix of.
+    """
+    best = 0.0
+    for start in range(len(target)):
+        extent: Set[str] = set()
+        for gram in target[start:]:
+            extent.add(gram)
+            best = max(best, len(wanted & extent) / len(wanted | extent))
+    return best
+
+def highlight(
+    text: Optional[str], terms: Set[str], words: int = SNIPPET_WORDS
+) -> Optional[str]:
+    """
+    Cut the passage of ``text`` with the most matches and mark them.
+
+    Args:
+        text: Source text
+        terms: Analyzed query terms to mark
+        words: Length of the passage, in words
+
+    Returns:
+        HTML-escaped passage with matched words wrapped in
+        HIGHLIGHT_START/STOP, or None when there is no text
+    """
+    if not text:
+        return None
+    matches = list(_WORD.finditer(text))
+    if not matches:
+        return None
+    hits = [stem(m.group().lower()) in terms for m in matches]
+
+    # Reason: sliding window over hit flags finds the densest passage in O(n)
+    best_start, best_hits, window_hits = 0, -1, 0
+    for i, hit in enumerate(hits):
+        window_hits += hit
+        if i >= words:
+            window_hits -= hits[i - words]
+        start = max(0, i - words + 1)
+        if window_hits > best_hits:
+            best_start, best_hits = start, window_hits
+    passage = matches[best_start:best_start + words]
+
+    parts, position = [], passage[0].start()
+    for match, hit in zip(passage, hits[best_start:best_start + words]):
+        parts.append(html.escape(text[position:match.start()]))
+        word = html.escape(match.group())
+        parts.append(f"{HIGHLIGHT_START}{word}{HIGHLIGHT_STOP}" if hit else word)
+        position = match.end()
+    return "".join(parts).strip()
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index with weighted fields.
+
+    Documents are keyed by ``(kind, id)`` tuples so per-kind counts can be
+    kept; each document stores a payload returned with its hits. Not
+    thread-safe: callers serialize access.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._titles: Dict[Hashable, List[str]] = {}
+        # Reason: trigram -> title words -> documents lets fuzzy() score only
+        # titles sharing enough trigrams with the query instead of all of them
+        self._title_grams: Dict[str, Set[str]] = {}
+        self._title_words: Dict[str, Set[Hashable]] = {}
+        self._word_trigrams: Dict[str, List[str]] = {}
+        self.payloads: Dict[Hashable, Dict[str, Any]] = {}
+        self.kind_counts: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_terms
+
+    def add(
+        self,
+        key: Tuple[str, Any],
+        fields: Iterable[Tuple[Optional[str], float]],
+        title: str,
+        payload: Mapping[str, Any],
+    ) -> None:
+        """
+        Index a document, replacing any previous version with the same key.
+
+        Args:
+            key: ``(kind, id)`` of the document
+            fields: ``(text, weight)`` pairs to index
+            title: Text matched by :meth:`fuzzy`
+            payload: Values to hand back with hits
+        """
+        self.remove(key)
+        weights: Dict[str, float] = {}
+        for text, weight in fields:
+            for term in analyze(text):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[key] = weight
+        self._doc_terms[key] = tuple(weights)
+        words = [word.lower() for word in _WORD.findall(title or "")]
+        self._titles[key] = words
+        for word in words:
+            if word not in self._title_words:
+                self._title_words[word] = set()
+                self._word_trigrams[word] = trigrams(word)
+                for gram in self._word_trigrams[word]:
+                    self._title_grams.setdefault(gram, set()).add(word)
+            self._title_words[word].add(key)
+        self.payloads[key] = dict(payload)
+        self.kind_counts[key[0]] += 1
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a document from the index; unknown keys are ignored."""
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        for word in set(self._titles.pop(key, ())):
+            keys = self._title_words[word]
+            keys.discard(key)
+            if not keys:
+                del self._title_words[word]
+                for gram in self._word_trigrams.pop(word):
+                    words = self._title_grams.get(gram)
+                    if words is not None:
+                        words.discard(word)
+                        if not words:
+                            del self._title_grams[gram]
+        self.payloads.pop(key, None)
+        self.kind_counts[key[0]] -= 1
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        """Drop every document, or only those of one kind."""
+        for key in [k for k in self._doc_terms if kind is None or k[0] == kind]:
+            self.remove(key)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        predicate: Optional[Callable[[Hashable, Mapping[str, Any]], bool]] = None,
+    ) -> Tuple[List[Tuple[float, Hashable]], bool]:
+        """
+        Find documents matching a query, best first.
+
+        Scores sum ``weight * idf`` over matched terms and are squashed into
+        ``[0, 1)`` like ``ts_rank`` normalization 32. Ties are broken by key.
+
+        Args:
+            query: Web-search style query (see :func:`parse_query`)
+            limit: Maximum number of hits to return
+            offset: Number of best hits to skip
+            predicate: Filter called with ``(key, payload)``
+
+        Returns:
+            Tuple of (list of ``(score, key)``, whether more hits follow)
+        """
+        groups, excluded = parse_query(query)
+        if not groups:
+            return [], False
+
+        total = len(self._doc_terms) or 1
+        candidates: Optional[Set[Hashable]] = None
+        scores: Dict[Hashable, float] = {}
+        # Reason: intersect the rarest group first so later sets stay small
+        for group in sorted(groups, key=lambda g: sum(len(self._postings.get(t, ())) for t in g)):
+            matched: Set[Hashable] = set()
+            for term in group:
+                postings = self._postings.get(term, {})
+                idf = math.log(1 + total / (1 + len(postings)))
+                for key, weight in postings.items():
+                    if candidates is None or key in candidates:
+                        matched.add(key)
+                        scores[key] = scores.get(key, 0.0) + weight * idf
+            candidates = matched
+            if not candidates:
+                return [], False
+
+        for term in excluded:
+            candidates.difference_update(self._postings.get(term, ()))
+        if predicate is not None:
+            candidates = {k for k in candidates if predicate(k, self.payloads[k])}
+
+        # Reason: only the requested page needs ordering, not every match
+        ranked = heapq.nsmallest(
+            offset + limit,
+            ((scores[k] / (scores[k] + 1), k) for k in candidates),
+            key=lambda hit: (-hit[0], str(hit[1])),
+        )
+        return ranked[offset:], len(candidates) > offset + limit
+
+    def fuzzy(
+        self,
+        query: str,
+        limit: int,
+        predicate: Optional[Callable[[Hashable, Mapping[str, Any]], bool]] = None,
+        threshold: float = FUZZY_THRESHOLD,
+    ) -> List[Tuple[float, Hashable]]:
+        """
+        Find documents whose title resembles the query, tolerating typos.
+
+        Each query word is scored against its closest title word with
+        :func:`word_similarity` and the scores are averaged.
+
+        Args:
+            query: Text as typed by a user
+            limit: Maximum number of hits
+            predicate: Filter called with ``(key, payload)``
+            threshold: Minimum similarity for a hit
+
+        Returns:
+            List of ``(similarity, key)``, best first
+        """
+        wanted = [set(trigrams(word)) for word in _WORD.findall(query)]
+        if not wanted:
+            return []
+        hits = []
+        for key in self._fuzzy_candidates(wanted, threshold):
+            title_words = [self._word_trigrams[word] for word in self._titles[key]]
+            score = sum(
+                max(word_similarity(word, title_word) for title_word in title_words)
+                for word in wanted
+            ) / len(wanted)
+            if score >= threshold and (predicate is None or predicate(key, self.payloads[key])):
+                hits.append((score, key))
+        hits.sort(key=lambda hit: (-hit[0], str(hit[1])))
+        return hits[:limit]
+
+    def _fuzzy_candidates(self, wanted: List[Set[str]], threshold: float) -> Set[Hashable]:
+        """
+        Documents that could reach ``threshold`` in :meth:`fuzzy`.
+
+        An average of per-word scores only reaches the threshold if some
+        query word does, and a word's similarity is at most its shared
+        trigrams over the query word's trigrams, so titles without such a
+        word are skipped without scoring.
+        """
+        keys: Set[Hashable] = set()
+        for grams in wanted:
+            shared: Counter = Counter()
+            for gram in grams:
+                shared.update(self._title_grams.get(gram, ()))
+            needed = threshold * len(grams)
+            for word, count in shared.items():
+                if count >= needed:
+                    keys.update(self._title_words[word])
+        return keys
+
+    def terms(self, query: str) -> Set[str]:
+        """Analyzed terms of a query, for highlighting."""
+        groups, _ = parse_query(query)
+        return set().union(*groups) if groups else set()
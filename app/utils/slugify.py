@@ -3,7 +3,13 @@ Utility functions for string manipulation, particularly for generating URL-frien
 """
 import re
 import unicodedata
-from typing import Optional
+from typing import Any, Iterable, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+# How many times to pick a new slug when a concurrent writer takes ours first
+SLUG_RETRY_ATTEMPTS = 5
 
 def slugify(text: str, separator: str = '-', max_length: int = 100) -> str:
     """
@@ -42,10 +48,51 @@ def slugify(text: str, separator: str = '-', max_length: int = 100) -> str:
     
     return text
 
+def _escape_like(value: str, escape: str = "\\") -> str:
+    """Escape LIKE wildcards so a slug is matched literally."""
+    return (
+        value.replace(escape, escape * 2)
+        .replace("%", f"{escape}%")
+        .replace("_", f"{escape}_")
+    )
+
+def next_free_slug(slug: str, taken: Iterable[str], separator: str = '-') -> str:
+    """
+    Pick the first free slug given the colliding slugs already in use.
+    
+    Args:
+        slug: The base slug
+        taken: Existing slugs equal to ``slug`` or of the form ``slug<sep><n>``
+        separator: Separator between slug and number (default: '-')
+        
+    Returns:
+        ``slug`` if it is free, otherwise ``slug<sep><n>`` with the lowest free n >= 1
+    """
+    if not isinstance(taken, (set, frozenset)):
+        taken = set(taken)
+    if slug not in taken:
+        return slug
+    
+    suffix = re.compile(rf"^{re.escape(slug)}{re.escape(separator)}([1-9][0-9]*)$")
+    used = set()
+    for existing in taken:
+        match = suffix.match(existing)
+        if match:
+            used.add(int(match.group(1)))
+    
+    i = 1
+    while i in used:
+        i += 1
+    return f"{slug}{separator}{i}"
+
 def unique_slug(db_session, model, slug: str, field: str = 'slug', separator: str = '-') -> str:
     """
     Generate a unique slug by appending a number if the slug already exists.
     
+    All colliding slugs are fetched with a single prefix query (served by the
+    slug index) and the next free suffix is chosen in memory, so the cost is one
+    round trip however many ``slug-N`` variants already exist.
+    
     Args:
         db_session: Database session
         model: SQLAlchemy model class to check for existing slugs
@@ -62,18 +109,97 @@ def unique_slug(db_session, model, slug: str, field: str = 'slug', separator: st
     # Make sure the slug is URL-friendly
     slug = slugify(slug, separator=separator)
     
-    # Check if the slug already exists
-    query = {field: slug}
-    existing = db_session.query(model).filter_by(**query).first()
+    column = getattr(model, field)
+    pattern = f"{_escape_like(slug + separator)}%"
+    rows = db_session.query(column).filter(
+        or_(column == slug, column.like(pattern, escape="\\"))
+    ).all()
     
-    if not existing:
-        return slug
+    return next_free_slug(slug, (row[0] for row in rows), separator=separator)
+
+def unique_slugs(db_session, model, texts: Iterable[str], field: str = 'slug', separator: str = '-') -> List[str]:
+    """
+    Generate unique slugs for a batch of texts with at most two queries.
     
-    # If it exists, append a number and try again
-    i = 1
-    while True:
-        new_slug = f"{slug}{separator}{i}"
-        query[field] = new_slug
-        if not db_session.query(model).filter_by(**query).first():
-            return new_slug
-        i += 1
+    The first query finds which base slugs are taken; a second one fetches the
+    suffixed variants of only those bases. Slugs are also kept unique within
+    the batch itself.
+    
+    Args:
+        db_session: Database session
+        model: SQLAlchemy model class to check for existing slugs
+        texts: Texts (e.g. names) to derive slugs from
+        field: The field name to check for uniqueness (default: 'slug')
+        separator: Separator to use between slug and number (default: '-')
+        
+    Returns:
+        One unique slug per text, in the same order
+        
+    Raises:
+        ValueError: If a text produces an empty slug
+    """
+    bases = [slugify(text, separator=separator) for text in texts]
+    if not all(bases):
+        raise ValueError("Slug cannot be empty")
+    
+    column = getattr(model, field)
+    taken = {
+        row[0] for row in
+        db_session.query(column).filter(column.in_(set(bases))).all()
+    } if bases else set()
+    
+    collided = sorted(taken)
+    if collided:
+        patterns = [column.like(f"{_escape_like(b + separator)}%", escape="\\") for b in collided]
+        taken.update(row[0] for row in db_session.query(column).filter(or_(*patterns)).all())
+    
+    slugs = []
+    for base in bases:
+        slug = next_free_slug(base, taken, separator=separator)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+def _is_slug_conflict(exc: IntegrityError) -> bool:
+    """Tell whether an IntegrityError came from the unique slug constraint."""
+    return "slug" in str(getattr(exc, "orig", exc)).lower()
+
+def commit_with_unique_slug(
+    db_session,
+    instance: Any,
+    text: str,
+    values: Optional[dict] = None,
+    pending: Iterable[Any] = (),
+) -> None:
+    """
+    Assign a unique slug for ``text`` and commit, retrying on slug races.
+    
+    Another request may claim the slug between ``unique_slug`` and the commit;
+    the unique constraint rejects ours and we pick the next free one.
+    
+    Args:
+        db_session: Database session
+        instance: Model instance (e.g. a topic or post) being inserted or renamed
+        text: Text (name or title) to derive the slug from
+        values: Field values to (re)apply on each attempt, since a rollback
+            discards pending changes on an already persisted instance
+        pending: Other new instances to commit alongside (e.g. a post's
+            version row), re-added after a rollback expunges them
+        
+    Raises:
+        IntegrityError: If the slug still conflicts after SLUG_RETRY_ATTEMPTS,
+            or the commit failed for another reason
+    """
+    for attempt in range(SLUG_RETRY_ATTEMPTS):
+        for field, value in (values or {}).items():
+            setattr(instance, field, value)
+        instance.slug = unique_slug(db_session, type(instance), text)
+        db_session.add(instance)
+        db_session.add_all(pending)
+        try:
+            db_session.commit()
+            return
+        except IntegrityError as exc:
+            db_session.rollback()
+            if not _is_slug_conflict(exc) or attempt == SLUG_RETRY_ATTEMPTS - 1:
+                raise
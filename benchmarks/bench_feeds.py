@@ -0,0 +1,189 @@
+"""
+Benchmark sitemap, feed and topic index regeneration: full against single-post.
+
+Seeds synthetic topics and posts (three in four published), loads the feed
+generator once (a full rebuild into an empty directory), then times
+applying one post's change:
+
+- ``publish``: a draft becomes the newest published post
+- ``edit``: an old published post gets a new excerpt
+- ``unpublish``: an old published post goes back to draft, shifting the
+  later pages of its topic
+
+Each single-post run rewrites one sitemap shard, the affected feeds and
+topic pages; the files it wrote are listed.
+
+Then ``--writers`` generators sharing the directory, as API workers do,
+take turns editing posts for ``--rounds`` changes. Each one replays the
+changes the others logged before applying its own; the per-change time,
+loads and replays are reported (loads stay at one per writer).
+
+Usage:
+    python -m benchmarks.bench_feeds --posts 100000
+    python -m benchmarks.bench_feeds --posts 100000 --writers 4 --rounds 40
+    python -m benchmarks.bench_feeds --database-url postgresql://localhost/bench \\
+        --posts 100000 --reset
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.post import Post
+from app.publishing import FeedGenerator
+from benchmarks.common import run_metadata, seed_posts, seed_topics, write_results
+
+
+def _change(engine, scenario: str, post_id) -> None:
+    """Apply one scenario's change to a post directly in the database."""
+    table = Post.__table__
+    values = {
+        "publish": {"status": "published", "published_at": func.now()},
+        "edit": {"excerpt": "Edited excerpt"},
+        "unpublish": {"status": "draft"},
+    }[scenario]
+    with engine.begin() as conn:
+        conn.execute(
+            update(table).where(table.c.id == post_id).values(updated_at=func.now(), **values)
+        )
+
+
+def _alternate(engine, db, root: str, args) -> Dict:
+    """Time edits made in turn by ``args.writers`` generators sharing ``root``."""
+    table = Post.__table__
+    with engine.connect() as conn:
+        post_ids = conn.execute(
+            select(table.c.id).where(table.c.status == "published").limit(args.rounds)
+        ).scalars().all()
+    writers = [FeedGenerator(root, feed_size=args.feed_size, page_size=args.page_size)
+               for _ in range(args.writers)]
+    for writer in writers:
+        writer.load(db)
+        db.rollback()
+    loads = sum(writer.counters["loads"] for writer in writers)
+    durations = []
+    for round_number in range(args.rounds):
+        post_id = post_ids[round_number % len(post_ids)]
+        _change(engine, "edit", post_id)
+        result = writers[round_number % args.writers].apply(db, str(post_id))
+        db.rollback()
+        durations.append(result["duration_seconds"])
+    results = {
+        "writers": args.writers,
+        "rounds": args.rounds,
+        "mean_seconds": round(sum(durations) / len(durations), 4),
+        "max_seconds": max(durations),
+        "loads": sum(writer.counters["loads"] for writer in writers) - loads,
+        "replayed": sum(writer.counters["replayed"] for writer in writers),
+    }
+    print(f"  {args.writers} alternating writers, {args.rounds} edits:"
+          f" mean {results['mean_seconds']:.4f}s, max {results['max_seconds']:.4f}s,"
+          f" {results['loads']} reloads, {results['replayed']} replayed")
+    return results
+
+
+def run(args) -> Dict:
+    """Seed, then time a full load and single-post changes."""
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    topic_ids = seed_topics(engine, args.topics, reset=args.reset)
+    seed_posts(engine, args.posts, topic_ids, reset=args.reset, content_size=args.content_size)
+    print(f"seeded {args.topics} topics and {args.posts} posts"
+          f" in {time.perf_counter() - started:.1f}s")
+
+    table = Post.__table__
+    with engine.connect() as conn:
+        draft = conn.execute(
+            select(table.c.id).where(table.c.status == "draft").limit(1)
+        ).scalar()
+        published = conn.execute(
+            select(table.c.id).where(table.c.status == "published")
+            .order_by(table.c.published_at).limit(2)
+        ).scalars().all()
+    targets = {"publish": draft, "edit": published[0], "unpublish": published[1]}
+
+    root = tempfile.mkdtemp(prefix="bench-feeds-")
+    generator = FeedGenerator(root, feed_size=args.feed_size, page_size=args.page_size)
+    db = sessionmaker(bind=engine)()
+    results: Dict = {}
+    try:
+        print(f"  {'scenario':<10} {'seconds':>9} {'written':>8} {'deleted':>8}")
+        for name in ("full", "publish", "edit", "unpublish"):
+            if name == "full":
+                result = generator.load(db)
+            else:
+                _change(engine, name, targets[name])
+                result = generator.apply(db, str(targets[name]))
+            db.rollback()
+            results[name] = {
+                "duration_seconds": result["duration_seconds"],
+                "written": len(result["written"]),
+                "deleted": len(result["deleted"]),
+            }
+            if name != "full":
+                results[name]["files"] = sorted(result["written"] + result["deleted"])
+            print(f"  {name:<10} {result['duration_seconds']:>9.4f}"
+                  f" {len(result['written']):>8} {len(result['deleted']):>8}")
+            if name != "full":
+                print(f"    {', '.join(results[name]['files'])}")
+        results["stats"] = generator.stats()
+        results["alternating"] = _alternate(engine, db, root, args)
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(root, ignore_errors=True)
+    slowest = max(results[name]["duration_seconds"] for name in ("publish", "edit", "unpublish"))
+    if slowest:
+        results["full_over_single"] = round(results["full"]["duration_seconds"] / slowest, 1)
+        print(f"a full rebuild takes {results['full_over_single']}x the slowest single change")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Default: a fresh SQLite file")
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--content-size", type=int, default=200,
+                        help="Approximate characters per post body (not read by feeds)")
+    parser.add_argument("--feed-size", type=int, default=50, help="Posts per feed")
+    parser.add_argument("--page-size", type=int, default=100, help="Posts per topic page")
+    parser.add_argument("--writers", type=int, default=2,
+                        help="Generators taking turns in the alternating run")
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="Edits made in the alternating run")
+    parser.add_argument("--reset", action="store_true",
+                        help="Replace existing topics and posts in the target database")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        args.reset = True
+    dialect = args.database_url.split(":", 1)[0].split("+", 1)[0]
+
+    print(f"feeds ({dialect}, {args.posts} posts)")
+    results = {
+        "meta": run_metadata(database=dialect, posts=args.posts, topics=args.topics,
+                             feed_size=args.feed_size, page_size=args.page_size,
+                             writers=args.writers, rounds=args.rounds),
+        "results": {"feeds": run(args)},
+    }
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-feeds-{dialect}.json"
+    )
+    write_results(output, results)
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
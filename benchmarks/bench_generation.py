@@ -0,0 +1,156 @@
+"""
+Benchmark the generation queue against a slow fake LLM provider.
+
+Submits ``--jobs`` generation requests at once, a share of them duplicates
+of others, to a queue whose fake provider takes ``--latency`` seconds per
+call. It reports:
+
+- how long ``submit`` takes (what the API request waits for)
+- end-to-end job latency and total wall time
+- provider calls made, with batching and coalescing on and off
+- the same jobs run again against a warm response cache (``--database-url``,
+  a fresh SQLite file by default), which should make no provider calls
+
+Calling the provider once per job, one at a time, would take
+``jobs * latency`` seconds; the wall times show how far concurrency,
+batching and coalescing bring that down within the rate limit.
+
+Usage:
+    python -m benchmarks.bench_generation --jobs 1000 --latency 0.5
+    python -m benchmarks.bench_generation --database-url postgresql://localhost/bench
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.generation import FakeProvider, GenerationQueue, GenerationRequest
+from app.generation.cache import ResponseCache
+from app.models.generation_cache import GenerationCacheEntry
+from app.utils.cache import CacheBackend
+from benchmarks.common import run_metadata, summarize, write_results
+
+
+def run_scenario(
+    args, batch_size: int, coalesce: bool, cache: Optional[CacheBackend] = None
+) -> Dict:
+    """Push every job through a fresh queue and measure it."""
+    provider = FakeProvider(
+        latency=args.latency,
+        requests_per_minute=args.requests_per_minute,
+        max_concurrency=args.concurrency,
+        max_batch_size=batch_size,
+    )
+    queue = GenerationQueue({"fake": provider}, default_provider="fake", cache=cache)
+    rng = random.Random(42)
+    distinct = max(1, int(args.jobs * (1 - args.duplicates)))
+    submit_ms: List[float] = []
+    jobs = []
+    started = time.perf_counter()
+    try:
+        for i in range(args.jobs):
+            prompt = f"Write post {rng.randrange(distinct) if i >= distinct else i}"
+            if not coalesce:
+                # Reason: a unique suffix defeats coalescing without
+                # changing the amount of work per request
+                prompt += f" #{i}"
+            request = GenerationRequest(prompt, params={"max_tokens": args.tokens})
+            call_started = time.perf_counter()
+            job, _ = queue.submit(request, owner=i)
+            submit_ms.append((time.perf_counter() - call_started) * 1000)
+            jobs.append(job)
+        for job in jobs:
+            queue.wait(job.id)
+        elapsed = time.perf_counter() - started
+        stats = queue.stats()
+    finally:
+        queue.stop()
+
+    job_ms = [(job.finished_at - job.created_at).total_seconds() * 1000 for job in jobs]
+    return {
+        "submit": summarize(submit_ms, elapsed),
+        "job": summarize(job_ms, elapsed),
+        "wall_seconds": round(elapsed, 2),
+        "provider_calls": provider.calls,
+        "coalesced": stats["coalesced"],
+        "failed": stats["failed"],
+        "cache": stats["cache"],
+    }
+
+
+def run_cached(args) -> Dict:
+    """Run the batched scenario twice over one response cache; measure the rerun."""
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine, tables=[GenerationCacheEntry.__table__])
+    cache = ResponseCache(sessionmaker(bind=engine))
+    try:
+        cache.clear()
+        run_scenario(args, args.batch_size, True, cache)
+        return run_scenario(args, args.batch_size, True, cache)
+    finally:
+        engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--duplicates", type=float, default=0.2,
+                        help="Share of jobs repeating an earlier prompt")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="Seconds per provider call")
+    parser.add_argument("--tokens", type=int, default=200, help="Words generated per job")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Provider calls in flight at once")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--requests-per-minute", type=float, default=6000)
+    parser.add_argument("--database-url",
+                        help="Response cache database (default: a fresh SQLite file)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    scenarios = {
+        "one_per_call": lambda: run_scenario(args, 1, False),
+        "coalesced": lambda: run_scenario(args, 1, True),
+        "batched_coalesced": lambda: run_scenario(args, args.batch_size, True),
+        "cached_rerun": lambda: run_cached(args),
+    }
+    print(f"generation queue ({args.jobs} jobs, {args.latency}s per call,"
+          f" {args.concurrency} concurrent, {args.duplicates:.0%} duplicates)")
+    print(f"  one call at a time would take {args.jobs * args.latency:,.0f}s")
+    print(f"  {'scenario':<20} {'calls':>6} {'wall s':>7} {'submit p99 ms':>14}"
+          f" {'job p50 ms':>11} {'job p99 ms':>11}")
+    results = {}
+    for name, scenario in scenarios.items():
+        result = results[name] = scenario()
+        print(f"  {name:<20} {result['provider_calls']:>6} {result['wall_seconds']:>7.2f}"
+              f" {result['submit']['p99_ms']:>14.3f} {result['job']['p50_ms']:>11.0f}"
+              f" {result['job']['p99_ms']:>11.0f}")
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-generation.json"
+    )
+    write_results(output, {
+        "meta": run_metadata(
+            jobs=args.jobs, duplicates=args.duplicates, latency=args.latency,
+            concurrency=args.concurrency, batch_size=args.batch_size,
+            requests_per_minute=args.requests_per_minute,
+        ),
+        "results": {"generation": results},
+    })
+    print(f"  cache hit rate on rerun: {results['cached_rerun']['cache']['hit_rate']}")
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Benchmark publishing posts to git: one commit per post against batches.
+
+Writes ``--posts`` Markdown files into a working tree whose origin is a
+local bare repository, then publishes them:
+
+- per post, the way a naive integration would: ``git add``, ``git commit``
+  and ``git push`` for each file in turn
+- through ``GitPublisher``, every post submitted from ``--threads``
+  threads at once, as concurrent publishes would
+
+Reports wall time, posts per second, commits and pushes made, and the
+publisher's batch sizes.
+
+Usage:
+    python -m benchmarks.bench_git_publish --posts 200
+    python -m benchmarks.bench_git_publish --posts 1000 --window-ms 500 --threads 200
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from app.publishing import GitPublisher
+from benchmarks.common import run_metadata, summarize, write_results
+
+AUTHOR = {
+    "GIT_AUTHOR_NAME": "Bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+    "GIT_COMMITTER_NAME": "Bench", "GIT_COMMITTER_EMAIL": "bench@localhost",
+}
+
+
+def _git(cwd: str, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True,
+        env={**os.environ, **AUTHOR},
+    ).stdout.strip()
+
+
+def make_site(workdir: str, name: str, posts: int) -> str:
+    """Create a working tree with ``posts`` files and an empty bare origin."""
+    remote = os.path.join(workdir, f"{name}.git")
+    site = os.path.join(workdir, name)
+    _git(workdir, "init", "--quiet", "--bare", "-b", "main", remote)
+    _git(workdir, "init", "--quiet", "-b", "main", site)
+    _git(site, "remote", "add", "origin", remote)
+    os.makedirs(os.path.join(site, "content", "posts"))
+    for i in range(posts):
+        with open(os.path.join(site, "content", "posts", f"post-{i}.md"), "w") as out:
+            out.write(f"+++\ntitle = \"Post {i}\"\n+++\n\n" + "Body text. " * 200)
+    return site
+
+
+def run_per_post(site: str, posts: int) -> Dict:
+    """add + commit + push once per post."""
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for i in range(posts):
+        call_started = time.perf_counter()
+        path = f"content/posts/post-{i}.md"
+        _git(site, "add", path)
+        _git(site, "commit", "--quiet", "-m", f"Publish post {i}")
+        _git(site, "push", "--quiet", "origin", "main")
+        latencies.append((time.perf_counter() - call_started) * 1000)
+    elapsed = time.perf_counter() - started
+    return {**summarize(latencies, elapsed), "wall_seconds": round(elapsed, 2),
+            "commits": posts, "pushes": posts}
+
+
+def run_batched(site: str, posts: int, threads: int, window: float) -> Dict:
+    """Every post submitted concurrently to one GitPublisher."""
+    publisher = GitPublisher(site, batch_window=window)
+    latencies: List[float] = []
+
+    def publish(i: int) -> None:
+        call_started = time.perf_counter()
+        publisher.publish([f"content/posts/post-{i}.md"], message=f"Publish post {i}")
+        latencies.append((time.perf_counter() - call_started) * 1000)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(publish, range(posts)))
+        elapsed = time.perf_counter() - started
+    finally:
+        publisher.stop()
+    stats = publisher.stats()
+    return {
+        **summarize(latencies, elapsed),
+        "wall_seconds": round(elapsed, 2),
+        "commits": stats["commits"],
+        "pushes": stats["pushes"],
+        "batches": stats["batches"],
+        "mean_batch_events": round(stats["batch_events"]["sum"] / max(1, stats["batches"]), 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=50, help="Concurrent publishers")
+    parser.add_argument("--window-ms", type=float, default=200, help="Batch window")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="bench-git-")
+    results = {}
+    try:
+        print(f"git publish ({args.posts} posts, {args.threads} threads,"
+              f" {args.window_ms:.0f} ms window)")
+        print(f"  {'scenario':<10} {'wall s':>7} {'posts/s':>8} {'commits':>8} {'pushes':>7}"
+              f" {'p50 ms':>8}")
+        for name in ("per_post", "batched"):
+            site = make_site(workdir, name, args.posts)
+            if name == "per_post":
+                result = run_per_post(site, args.posts)
+            else:
+                result = run_batched(site, args.posts, args.threads, args.window_ms / 1000)
+            results[name] = result
+            print(f"  {name:<10} {result['wall_seconds']:>7.2f} {result['rps']:>8.1f}"
+                  f" {result['commits']:>8} {result['pushes']:>7} {result['p50_ms']:>8.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-git-publish.json"
+    )
+    write_results(output, {
+        "meta": run_metadata(posts=args.posts, threads=args.threads, window_ms=args.window_ms),
+        "results": {"git_publish": results},
+    })
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark the Hugo export: full export against incremental ones.
+
+Seeds synthetic topics and posts (three in four published), then times:
+
+- a full export into an empty site
+- a no-op incremental export (nothing changed, so every post is skipped)
+- an incremental export after editing ``--changed`` percent of the posts
+
+The no-op run costs one streamed read of the posts plus a hash per post,
+with no worker processes started and nothing written.
+
+Usage:
+    python -m benchmarks.bench_hugo_export --posts 50000
+    python -m benchmarks.bench_hugo_export --database-url postgresql://localhost/bench \\
+        --posts 50000 --reset --workers 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from sqlalchemy import create_engine, func, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.post import Post
+from app.publishing import HugoExporter
+from benchmarks.common import run_metadata, seed_posts, seed_topics, write_results
+
+
+def run(args) -> Dict:
+    """Seed, then time a full, a no-op and a partial export."""
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    topic_ids = seed_topics(engine, args.topics, reset=args.reset)
+    post_ids = seed_posts(engine, args.posts, topic_ids, reset=args.reset,
+                          content_size=args.content_size)
+    print(f"seeded {args.topics} topics and {args.posts} posts"
+          f" in {time.perf_counter() - started:.1f}s")
+
+    site = tempfile.mkdtemp(prefix="bench-hugo-")
+    exporter = HugoExporter(site, workers=args.workers, batch_size=args.batch_size)
+    db = sessionmaker(bind=engine)()
+    results: Dict = {}
+    try:
+        print(f"  {'scenario':<12} {'seconds':>8} {'rendered':>9} {'skipped':>8} {'deleted':>8}")
+        for name in ("full", "noop", "changed"):
+            if name == "changed":
+                edited = post_ids[::max(1, round(100 / args.changed))]
+                with engine.begin() as conn:
+                    conn.execute(
+                        update(Post.__table__)
+                        .where(Post.__table__.c.id.in_(edited))
+                        .values(content=Post.__table__.c.content + " edited",
+                                updated_at=func.now())
+                    )
+            stats = exporter.export(db).as_dict()
+            db.rollback()
+            results[name] = stats
+            print(f"  {name:<12} {stats['duration_seconds']:>8.2f} {stats['rendered']:>9}"
+                  f" {stats['skipped']:>8} {stats['deleted']:>8}")
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(site, ignore_errors=True)
+    if results["noop"]["duration_seconds"]:
+        results["full_over_noop"] = round(
+            results["full"]["duration_seconds"] / results["noop"]["duration_seconds"], 1
+        )
+        print(f"full export takes {results['full_over_noop']}x the no-op incremental one")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Default: a fresh SQLite file")
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--content-size", type=int, default=2000,
+                        help="Approximate characters per post body")
+    parser.add_argument("--changed", type=float, default=1.0,
+                        help="Percent of posts edited before the last run")
+    parser.add_argument("--workers", type=int, default=0, help="0: one per CPU")
+    parser.add_argument("--batch-size", type=int, default=200, help="Posts per worker task")
+    parser.add_argument("--reset", action="store_true",
+                        help="Replace existing topics and posts in the target database")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+
+    if args.database_url is None:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        args.reset = True
+    dialect = args.database_url.split(":", 1)[0].split("+", 1)[0]
+
+    print(f"hugo export ({dialect}, {args.posts} posts)")
+    results = {
+        "meta": run_metadata(database=dialect, posts=args.posts, topics=args.topics,
+                             content_size=args.content_size, changed_percent=args.changed,
+                             workers=args.workers or os.cpu_count(),
+                             batch_size=args.batch_size),
+        "results": {"hugo_export": run(args)},
+    }
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-hugo-export-{dialect}.json"
+    )
+    write_results(output, results)
+    print(f"results written to {output}")
+    return 1 if any(stats["failed"] for stats in results["results"]["hugo_export"].values()
+                    if isinstance(stats, dict)) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Benchmark image derivative throughput, in images per second per core.
+
+Writes ``--images`` distinct PNGs the size of typical AI-generated art,
+then renders and stores every derivative (the configured widths in WebP
+and AVIF, plus the blurred placeholder) for all of them:
+
+- in the calling process, one image at a time (the baseline a request
+  handler doing the work itself would get)
+- through ``ImagePipeline`` with each ``--workers`` count
+
+Throughput per core should stay near the single-process figure as workers
+are added; the sizes show what pages save by serving derivatives.
+
+Usage:
+    python -m benchmarks.bench_images --images 40 --size 1536x1024
+    python -m benchmarks.bench_images --workers 1 2 4 8 --formats webp
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+from PIL import Image, ImageDraw
+
+from app.images import (
+    IMAGE_DERIVATIVE_FORMATS,
+    IMAGE_DERIVATIVE_WIDTHS,
+    ImagePipeline,
+    LocalStorage,
+    SpooledUpload,
+    render_image,
+    supported_formats,
+)
+from benchmarks.common import run_metadata, summarize, write_results
+
+
+def make_sources(directory: str, count: int, width: int, height: int) -> List[SpooledUpload]:
+    """Write ``count`` distinct, noisy PNGs and describe them as uploads."""
+    rng = random.Random(7)
+    sources = []
+    for i in range(count):
+        image = Image.merge("RGB", [
+            Image.linear_gradient("L").rotate(rng.randrange(360)).resize((width, height)),
+            Image.effect_noise((width, height), 40),
+            Image.radial_gradient("L").resize((width, height)),
+        ])
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = rng.randrange(width), rng.randrange(height)
+            radius = rng.randrange(20, max(21, width // 6))
+            color = tuple(rng.randrange(256) for _ in range(3))
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+        path = os.path.join(directory, f"source-{i}.png")
+        image.save(path, "PNG")
+        with open(path, "rb") as handle:
+            digest = hashlib.sha256(handle.read()).hexdigest()
+        sources.append(SpooledUpload(path, digest, os.path.getsize(path)))
+    return sources
+
+
+def run_inline(sources: Sequence[SpooledUpload], pipeline: ImagePipeline) -> Dict:
+    """Render and store each image in this process, one after another."""
+    latencies: List[float] = []
+    stored = []
+    started = time.perf_counter()
+    for source in sources:
+        call_started = time.perf_counter()
+        rendered = render_image(source.path, pipeline.widths, pipeline.formats)
+        stored.append(pipeline.store(source, rendered))
+        latencies.append((time.perf_counter() - call_started) * 1000)
+    return _result(latencies, time.perf_counter() - started, 1, stored)
+
+
+def run_pool(sources: Sequence[SpooledUpload], pipeline: ImagePipeline) -> Dict:
+    """Render all images at once on the pipeline's process pool."""
+    async def process_all():
+        # Reason: start the workers before timing, as a running API would have
+        await asyncio.gather(*(pipeline.render(source.path) for source in sources[:1]))
+        latencies: List[float] = []
+
+        async def one(source):
+            call_started = time.perf_counter()
+            result = await pipeline.process(source)
+            latencies.append((time.perf_counter() - call_started) * 1000)
+            return result
+
+        started = time.perf_counter()
+        stored = await asyncio.gather(*(one(source) for source in sources))
+        return latencies, time.perf_counter() - started, stored
+
+    latencies, elapsed, stored = asyncio.run(process_all())
+    return _result(latencies, elapsed, pipeline.workers, stored)
+
+
+def _result(latencies: List[float], elapsed: float, cores: int, stored: List[Dict]) -> Dict:
+    sizes: Dict[str, List[int]] = {}
+    for result in stored:
+        for derivative in result["derivatives"]:
+            sizes.setdefault(f"{derivative['format']} {derivative['width']}w", []).append(
+                derivative["size"]
+            )
+    images_per_second = len(latencies) / elapsed if elapsed else 0.0
+    return {
+        "latency": summarize(latencies, elapsed),
+        "wall_seconds": round(elapsed, 2),
+        "images_per_second": round(images_per_second, 2),
+        "images_per_second_per_core": round(images_per_second / cores, 2),
+        "mean_derivative_bytes": {
+            name: round(sum(values) / len(values)) for name, values in sorted(sizes.items())
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=40)
+    parser.add_argument("--size", default="1536x1024", help="Source width x height")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="Pool sizes to try (default: 1 and every usable core)")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(IMAGE_DERIVATIVE_WIDTHS))
+    parser.add_argument("--formats", nargs="+", default=list(IMAGE_DERIVATIVE_FORMATS))
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    args = parser.parse_args(argv)
+
+    width, height = (int(part) for part in args.size.lower().split("x"))
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    workers = args.workers or sorted({1, cores or 1})
+    formats = supported_formats(args.formats)
+    workdir = tempfile.mkdtemp(prefix="bench-images-")
+    try:
+        os.makedirs(os.path.join(workdir, "sources"))
+        sources = make_sources(os.path.join(workdir, "sources"), args.images, width, height)
+        mean_source = sum(source.size for source in sources) / len(sources)
+        print(f"image derivatives ({args.images} PNGs of {width}x{height}, mean "
+              f"{mean_source / 1e6:.1f} MB; widths {args.widths}; formats {formats};"
+              f" {cores} usable cores)")
+        print(f"  {'scenario':<12} {'wall s':>7} {'img/s':>7} {'img/s/core':>11} {'p50 ms':>8}")
+        results = {}
+        for name, count in [("inline", None)] + [(f"pool_{n}", n) for n in workers]:
+            storage = LocalStorage(os.path.join(workdir, name), "/media")
+            pipeline = ImagePipeline(storage, workers=count or 1, widths=args.widths,
+                                     formats=formats)
+            try:
+                if count is None:
+                    result = run_inline(sources, pipeline)
+                else:
+                    result = run_pool(sources, pipeline)
+            finally:
+                pipeline.close()
+            results[name] = result
+            print(f"  {name:<12} {result['wall_seconds']:>7.2f}"
+                  f" {result['images_per_second']:>7.2f}"
+                  f" {result['images_per_second_per_core']:>11.2f}"
+                  f" {result['latency']['p50_ms']:>8.0f}")
+        print("  mean derivative size: " + ", ".join(
+            f"{name} {size / 1e3:.0f} kB"
+            for name, size in results["inline"]["mean_derivative_bytes"].items()
+        ))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-images.json"
+    )
+    write_results(output, {
+        "meta": run_metadata(
+            images=args.images, size=args.size, widths=args.widths, formats=formats,
+            workers=workers, usable_cores=cores, mean_source_bytes=round(mean_source),
+        ),
+        "results": {"images": results},
+    })
+    print(f"results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Benchmark topic list serialization: ORM + Pydantic vs. column rows + orjson.
+
+The old path mirrors what FastAPI does for ``response_model=TopicList``: load
+ORM objects, validate them through the Pydantic schemas, run
+``jsonable_encoder`` and encode with stdlib ``json``. The new path selects
+plain columns, builds the payload dicts directly and encodes them with
+``FastJSONResponse``. Both include the query; the cache is bypassed.
+
+Usage:
+    python -m benchmarks.bench_topic_serialization --sizes 100 1000 10000
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud, schemas
+from app.api.v1.routers.topics import TOPIC_FIELDS
+from app.db.database import Base
+from app.models.topic import Topic
+from app.utils import serialization
+from app.utils.serialization import FastJSONResponse, build_items
+
+
+def orm_pydantic_path(db: Session, limit: int) -> bytes:
+    """The previous path: ORM objects through response_model validation."""
+    topics = crud.topic.get_topics(db, limit=limit)
+    payload = schemas.TopicList(
+        items=topics, total=len(topics), total_strategy="exact", next_cursor=None
+    )
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def column_rows_path(db: Session, limit: int) -> bytes:
+    """The fast path: column rows built straight into the response."""
+    rows = crud.topic_cache.get_topic_rows(db, limit=limit, use_cache=False)
+    return FastJSONResponse({
+        "items": build_items(rows, TOPIC_FIELDS),
+        "total": len(rows),
+        "total_strategy": "exact",
+        "next_cursor": None,
+    }).body
+
+
+def _measure(db: Session, func: Callable, limit: int, repeat: int) -> float:
+    """Median milliseconds of ``func`` over ``repeat`` runs."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(db, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    return statistics.median(timings)
+
+
+def run(sizes: List[int], repeat: int, database_url: str) -> None:
+    """
+    Run the benchmark and print one row per list size.
+
+    Args:
+        sizes: Numbers of topics per list
+        repeat: Timed calls per path and size
+        database_url: Database to seed (an in-memory SQLite by default)
+    """
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine, tables=[Topic.__table__])
+    db = sessionmaker(bind=engine)()
+    encoder = "orjson" if serialization.orjson is not None else "json"
+
+    print(f"{'items':>7} {'orm+pydantic ms':>16} {'rows+' + encoder + ' ms':>16} {'speed-up':>9}")
+    for n in sizes:
+        db.query(Topic).delete()
+        db.bulk_insert_mappings(Topic, [
+            {"name": f"Topic {i}", "slug": f"topic-{i}",
+             "description": f"Description of topic {i}", "position": i}
+            for i in range(n)
+        ])
+        db.commit()
+        assert len(orm_pydantic_path(db, n)) == len(column_rows_path(db, n))
+        old = _measure(db, orm_pydantic_path, n, repeat)
+        new = _measure(db, column_rows_path, n, repeat)
+        print(f"{n:>7} {old:>16.2f} {new:>16.2f} {old / new:>8.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.database_url)
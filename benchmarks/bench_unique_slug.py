@@ -0,0 +1,96 @@
+"""
+Benchmark unique_slug latency as the number of colliding slugs grows.
+
+Seeds ``topic``, ``topic-1`` ... ``topic-N`` and times resolving one more
+"Topic" slug, next to the old one-query-per-candidate loop for comparison.
+
+Usage:
+    python -m benchmarks.bench_unique_slug --collisions 10 100 1000 5000
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.database import Base
+from app.models.topic import Topic
+from app.utils.slugify import slugify, unique_slug
+
+
+def probing_unique_slug(db_session, model, slug: str, separator: str = '-') -> str:
+    """The previous implementation: one SELECT per candidate slug."""
+    slug = slugify(slug, separator=separator)
+    if not db_session.query(model).filter_by(slug=slug).first():
+        return slug
+    i = 1
+    while True:
+        new_slug = f"{slug}{separator}{i}"
+        if not db_session.query(model).filter_by(slug=new_slug).first():
+            return new_slug
+        i += 1
+
+
+def _measure(db: Session, func: Callable, repeat: int) -> dict:
+    """Time ``func`` and count the statements it issues."""
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _count)
+    timings: List[float] = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(db, Topic, "Topic")
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", _count)
+    return {
+        "median_ms": statistics.median(timings),
+        "queries": len(statements) // repeat,
+    }
+
+
+def run(collisions: List[int], repeat: int, database_url: str) -> None:
+    """
+    Run the benchmark and print one row per collision count.
+
+    Args:
+        collisions: Numbers of existing colliding slugs to test
+        repeat: Timed calls per implementation and size
+        database_url: Database to seed (an in-memory SQLite by default)
+    """
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine, tables=[Topic.__table__])
+    db = sessionmaker(bind=engine)()
+
+    print(f"{'collisions':>10} {'set-based ms':>13} {'queries':>8} {'probing ms':>11} {'queries':>8}")
+    for n in collisions:
+        db.query(Topic).delete()
+        db.bulk_insert_mappings(
+            Topic,
+            [{"name": "Topic", "slug": "topic"}]
+            + [{"name": "Topic", "slug": f"topic-{i}"} for i in range(1, n)],
+        )
+        db.commit()
+        new = _measure(db, unique_slug, repeat)
+        # Reason: the probing loop is O(n) round trips, so keep its repeats low at scale
+        old = _measure(db, probing_unique_slug, max(1, repeat // 10) if n > 1000 else repeat)
+        print(
+            f"{n:>10} {new['median_ms']:>13.3f} {new['queries']:>8} "
+            f"{old['median_ms']:>11.3f} {old['queries']:>8}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--collisions", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+    run(args.collisions, args.repeat, args.database_url)
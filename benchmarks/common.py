@@ -0,0 +1,278 @@
+"""
+Shared helpers for the benchmark scripts: seeding, latency summaries and
+JSON result files.
+"""
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.db.database import Base
+from app.models.cache_version import CacheVersion
+from app.models.post import Post
+from app.models.topic import Topic
+from app.utils.ranking import spread_ranks
+
+# Rows written per INSERT while seeding
+SEED_CHUNK_SIZE = 10000
+
+# Pronounceable pseudo-words for seeded text: 20 onsets x 10 vowels x 25
+# codas = 5000 words, drawn with Zipf-like weights (word n has weight 1/n)
+SYNTHETIC_WORDS = [
+    onset + vowel + coda
+    for onset in ("b", "c", "d", "f", "g", "h", "j", "k", "l", "m",
+                  "n", "p", "r", "s", "t", "v", "w", "z", "br", "st")
+    for vowel in ("a", "e", "i", "o", "u", "ai", "ea", "io", "ou", "ee")
+    for coda in ("", "b", "d", "g", "k", "l", "m", "n", "p", "r", "s", "t", "x",
+                 "nd", "nt", "st", "rk", "lm", "sh", "th", "ck", "ng", "rd", "ft", "mp")
+]
+_ZIPF_WEIGHTS = list(itertools.accumulate(1 / n for n in range(1, len(SYNTHETIC_WORDS) + 1)))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms: List[float], elapsed: float, errors: int = 0) -> Dict:
+    """
+    Summarize one benchmark run.
+
+    Args:
+        latencies_ms: Per-request latencies in milliseconds
+        elapsed: Wall-clock seconds the run took
+        errors: Requests that failed or returned an unexpected status
+
+    Returns:
+        dict with requests, errors, rps and p50/p95/p99 latencies
+    """
+    if not latencies_ms:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "rps": len(latencies_ms) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+    }
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    """Poll the health check until the server answers."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def seed_topics(engine: Engine, count: int, reset: bool = False) -> List[str]:
+    """
+    Insert ``count`` synthetic topics directly, bypassing the API.
+
+    Rows get increasing positions and evenly spread ranks, so every list
+    ordering is realistic. Inserts go in chunks of SEED_CHUNK_SIZE rows.
+
+    Args:
+        engine: Engine of the database to seed
+        count: Number of topics
+        reset: Delete existing topics first; without it a non-empty table
+            is an error, so a real database is never wiped by accident
+
+    Returns:
+        IDs of the seeded topics, in position order
+
+    Raises:
+        RuntimeError: If the table already holds topics and ``reset`` is False
+    """
+    Base.metadata.create_all(bind=engine, tables=[Topic.__table__, CacheVersion.__table__])
+    table = Topic.__table__
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(table)).scalar()
+        if existing and not reset:
+            raise RuntimeError(
+                f"topics already holds {existing} rows; pass --reset to replace them"
+            )
+        conn.execute(table.delete())
+        conn.execute(CacheVersion.__table__.delete())
+    
+    ids = [uuid.uuid4() for _ in range(count)]
+    ranks = spread_ranks(count)
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        rows = [
+            {
+                "id": ids[i],
+                "name": f"Bench Topic {i}",
+                "slug": f"bench-topic-{i}",
+                "description": f"Synthetic topic {i} for benchmarks",
+                "position": i + 1,
+                "rank": ranks[i],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(start, min(count, start + SEED_CHUNK_SIZE))
+        ]
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+    return [str(topic_id) for topic_id in ids]
+
+
+
+def seed_posts(
+    engine: Engine,
+    count: int,
+    topic_ids: Sequence[str] = (),
+    reset: bool = False,
+    content_size: int = 2000,
+) -> List[str]:
+    """
+    Insert ``count`` synthetic posts directly, bypassing the API.
+
+    Posts are spread round-robin over ``topic_ids``; three in four are
+    published, an hour apart going back from now, the rest are drafts.
+    Titles and bodies draw from SYNTHETIC_WORDS with Zipf-like frequencies,
+    so full-text queries see realistic selectivity.
+
+    Args:
+        engine: Engine of the database to seed
+        count: Number of posts
+        topic_ids: Topics to attach posts to (none when empty)
+        reset: Delete existing posts first; without it a non-empty table is
+            an error
+        content_size: Approximate length of each post body, in characters
+
+    Returns:
+        IDs of the seeded posts, newest first
+
+    Raises:
+        RuntimeError: If the table already holds posts and ``reset`` is False
+    """
+    Base.metadata.create_all(bind=engine, tables=[Topic.__table__, Post.__table__])
+    table = Post.__table__
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(table)).scalar()
+        if existing and not reset:
+            raise RuntimeError(
+                f"posts already holds {existing} rows; pass --reset to replace them"
+            )
+        conn.execute(table.delete())
+
+    topics = [uuid.UUID(str(topic_id)) for topic_id in topic_ids]
+    ids = [uuid.uuid4() for _ in range(count)]
+    rng = random.Random(42)
+    words_per_post = max(1, content_size // 7)
+    now = datetime.now(timezone.utc)
+    for start in range(0, count, SEED_CHUNK_SIZE):
+        rows = []
+        for i in range(start, min(count, start + SEED_CHUNK_SIZE)):
+            body = " ".join(
+                rng.choices(SYNTHETIC_WORDS, cum_weights=_ZIPF_WEIGHTS, k=words_per_post)
+            )
+            title = " ".join(rng.choices(SYNTHETIC_WORDS, cum_weights=_ZIPF_WEIGHTS, k=4))
+            created = now - timedelta(hours=i)
+            published = i % 4 != 3
+            rows.append({
+                "id": ids[i],
+                "topic_id": topics[i % len(topics)] if topics else None,
+                "title": f"{title.capitalize()} {i}",
+                "slug": f"bench-post-{i}",
+                "excerpt": body[:160],
+                "content": body,
+                "status": "published" if published else "draft",
+                "published_at": created if published else None,
+                "seo_keywords": rng.sample(SYNTHETIC_WORDS[:500], 3),
+                "created_at": created,
+                "updated_at": created,
+            })
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+    return [str(post_id) for post_id in ids]
+
+def _git_commit() -> Optional[str]:
+    """Current commit hash, if run from a git checkout."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**settings) -> Dict:
+    """
+    Describe the environment a benchmark ran in.
+
+    Args:
+        **settings: Benchmark settings to record (scale, concurrency...)
+
+    Returns:
+        dict stored under ``meta`` in result files
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        **settings,
+    }
+
+
+def write_results(path: str, results: Dict) -> None:
+    """Write benchmark results as pretty-printed JSON."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 10.0) -> List[str]:
+    """
+    Compare two result files operation by operation.
+
+    Args:
+        current: Results of this run
+        baseline: Results to compare against
+        threshold: Percent change in rps or p95 reported as a regression
+
+    Returns:
+        Report lines; regressions are prefixed with ``!``
+    """
+    lines = [
+        f"  {'transport':<10} {'operation':<8} {'rps':>9} {'base':>9} {'Δ%':>7}"
+        f" {'p95 ms':>8} {'base':>8} {'Δ%':>7}"
+    ]
+    for transport, operations in current.get("results", {}).items():
+        for operation, result in operations.items():
+            base = baseline.get("results", {}).get(transport, {}).get(operation)
+            if not base or "p95_ms" not in result or "p95_ms" not in base:
+                continue
+            rps_change = (result["rps"] - base["rps"]) / base["rps"] * 100
+            p95_change = (result["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+            regressed = rps_change < -threshold or p95_change > threshold
+            lines.append(
+                f"{'!' if regressed else ' '} {transport:<10} {operation:<8}"
+                f" {result['rps']:>9.1f} {base['rps']:>9.1f} {rps_change:>+7.1f}"
+                f" {result['p95_ms']:>8.2f} {base['p95_ms']:>8.2f} {p95_change:>+7.1f}"
+            )
+    return lines
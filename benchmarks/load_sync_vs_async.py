@@ -0,0 +1,121 @@
+"""
+Load test comparing the sync and async topic endpoints.
+
+Starts the API under uvicorn twice, once per mode (USE_ASYNC_DB off/on),
+seeds topics, then drives GET /api/v1/topics/ and GET /api/v1/topics/{id}
+with many concurrent clients. Prints requests per second and p50/p99 latency
+for each mode.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.load_sync_vs_async \\
+        --concurrency 500 --duration 30
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import percentile, wait_ready
+
+
+async def _seed(base_url: str, count: int) -> List[str]:
+    """Create ``count`` topics and return their IDs."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        ids = []
+        for start in range(0, count, 1000):
+            items = [{"name": f"Load Topic {i}"} for i in range(start, min(count, start + 1000))]
+            response = await client.post(
+                "/api/v1/topics/bulk", json={"mode": "skip-existing", "items": items}
+            )
+            response.raise_for_status()
+            ids.extend(r["id"] for r in response.json()["results"] if r["id"])
+        return ids
+
+
+async def _drive(base_url: str, ids: List[str], concurrency: int, duration: float) -> Dict:
+    """Run ``concurrency`` clients in a closed loop for ``duration`` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                if random.random() < 0.5:
+                    path = "/api/v1/topics/?limit=50&total=none"
+                else:
+                    path = f"/api/v1/topics/{random.choice(ids)}"
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def run_mode(use_async: bool, args: argparse.Namespace) -> Dict:
+    """
+    Start uvicorn in one mode, seed data and measure it.
+
+    Args:
+        use_async: Whether to serve topics from the async handlers
+        args: Parsed command line arguments
+
+    Returns:
+        dict of results for this mode
+    """
+    env = dict(os.environ, USE_ASYNC_DB="true" if use_async else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_ready(base_url))
+        ids = asyncio.run(_seed(base_url, args.topics))
+        return asyncio.run(_drive(base_url, ids, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async topic endpoints under load")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for use_async in (False, True):
+        result = run_mode(use_async, args)
+        print(
+            f"{'async' if use_async else 'sync':>6} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['rps']:>9.1f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
@@ -0,0 +1,5 @@
+-- Composite indexes backing keyset (cursor) pagination on topics.
+-- Each list query orders by <field>, id and filters with (field, id) > (...),
+-- so these let Postgres start the scan at the cursor instead of skipping rows.
+CREATE INDEX IF NOT EXISTS idx_topics_position_id ON public.topics(position, id);
+CREATE INDEX IF NOT EXISTS idx_topics_created_at_id ON public.topics(created_at, id);
@@ -0,0 +1,3 @@
+-- Let unique_slug's "slug LIKE 'base-%'" lookup use an index scan.
+-- The plain btree on slug only serves prefix LIKE under the C collation.
+CREATE INDEX IF NOT EXISTS idx_topics_slug_pattern ON public.topics(slug text_pattern_ops);
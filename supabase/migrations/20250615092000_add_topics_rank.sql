@@ -0,0 +1,21 @@
+-- Fractional ordering key for topics.
+-- Moving a topic writes a rank between its neighbours' ranks, so a move is a
+-- single-row UPDATE instead of renumbering every position. Ranks are compared
+-- bytewise, hence the "C" collation.
+ALTER TABLE public.topics ADD COLUMN IF NOT EXISTS rank TEXT COLLATE "C";
+
+-- Backfill from the current position order. Fixed-width hex keeps the order
+-- and the trailing 'V' keeps keys from ending in '0'.
+WITH ordered AS (
+    SELECT id, row_number() OVER (ORDER BY position, created_at, id) AS rn
+    FROM public.topics
+)
+UPDATE public.topics AS t
+SET rank = lpad(to_hex(ordered.rn), 8, '0') || 'V'
+FROM ordered
+WHERE t.id = ordered.id AND t.rank IS NULL;
+
+ALTER TABLE public.topics ALTER COLUMN rank SET DEFAULT 'V';
+ALTER TABLE public.topics ALTER COLUMN rank SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_topics_rank_id ON public.topics(rank, id);
@@ -0,0 +1,19 @@
+-- Version stamps for in-process caches.
+-- Each API worker caches topics in memory; writers bump the stamp so other
+-- workers notice the change and drop their cached entries.
+CREATE TABLE IF NOT EXISTS public.cache_versions (
+    name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO public.cache_versions (name, version)
+VALUES ('topics', 0)
+ON CONFLICT (name) DO NOTHING;
+
+ALTER TABLE public.cache_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON public.cache_versions
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable update for authenticated users only" ON public.cache_versions
+    FOR UPDATE TO authenticated USING (true) WITH CHECK (true);
@@ -0,0 +1,4 @@
+-- Index behind topic list ETags.
+-- Conditional GETs compute max(updated_at) on every request; with this index
+-- that is a single index probe instead of a table scan.
+CREATE INDEX IF NOT EXISTS idx_topics_updated_at ON public.topics(updated_at);
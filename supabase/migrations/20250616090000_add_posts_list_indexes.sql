@@ -0,0 +1,18 @@
+-- Composite indexes behind the posts list endpoint.
+-- Each list view filters on the leading columns and pages by keyset on
+-- (published_at, id) or (created_at, id), so rows come back in index order
+-- and are never sorted in memory.
+CREATE INDEX IF NOT EXISTS idx_posts_status_published_at_id
+    ON public.posts(status, published_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_topic_status_published_at_id
+    ON public.posts(topic_id, status, published_at, id);
+CREATE INDEX IF NOT EXISTS idx_posts_status_created_at_id
+    ON public.posts(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_posts_topic_created_at_id
+    ON public.posts(topic_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_posts_created_at_id ON public.posts(created_at, id);
+
+-- Covered by the leading columns of the composite indexes above
+DROP INDEX IF EXISTS public.idx_posts_status;
+DROP INDEX IF EXISTS public.idx_posts_topic_id;
+DROP INDEX IF EXISTS public.idx_posts_created_at;
@@ -0,0 +1,33 @@
+-- Full-text search over posts and topics.
+-- A stored generated tsvector column per table keeps the search document in
+-- step with every write, a GIN index answers @@ queries on it, and trigram
+-- indexes on titles back typo-tolerant matching. Weights: A = title/name,
+-- B = SEO keywords, excerpt and topic description, C = post content.
+-- Adding a stored column rewrites the table; run it in a quiet window.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- array_to_string is only STABLE; generated columns need IMMUTABLE expressions
+CREATE OR REPLACE FUNCTION public.immutable_array_to_string(text[])
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT array_to_string($1, ' ') $$;
+
+ALTER TABLE public.posts
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(public.immutable_array_to_string(seo_keywords), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED;
+
+ALTER TABLE public.topics
+    ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON public.posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_topics_search_vector ON public.topics USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_posts_title_trgm ON public.posts USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_topics_name_trgm ON public.topics USING GIN (name gin_trgm_ops);
@@ -0,0 +1,114 @@
+-- Delta-compressed post history.
+-- post_versions used to store the full title, content and excerpt on every
+-- edit, numbered with SELECT MAX(version_number). Now only every 50th version
+-- (POST_VERSION_SNAPSHOT_INTERVAL) and the first are full snapshots; the rows
+-- in between keep a JSON line delta against the version before them (format
+-- in app/utils/delta.py). The API writes versions itself, since it already
+-- holds the previous text to diff against, and keeps the latest number in
+-- posts.current_version.
+
+DROP TRIGGER IF EXISTS create_post_version_trigger ON public.posts;
+DROP FUNCTION IF EXISTS create_post_version();
+
+ALTER TABLE public.posts
+    ADD COLUMN IF NOT EXISTS current_version INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE public.post_versions
+    ADD COLUMN IF NOT EXISTS is_snapshot BOOLEAN NOT NULL DEFAULT true,
+    ADD COLUMN IF NOT EXISTS delta JSONB,
+    ALTER COLUMN title DROP NOT NULL;
+
+-- Covered by the unique (post_id, version_number) constraint
+DROP INDEX IF EXISTS public.idx_post_versions_post_id;
+DROP INDEX IF EXISTS public.idx_post_versions_version_number;
+
+-- Line delta turning old_text into new_text: lines kept at the start, lines
+-- removed, lines inserted, lines kept at the end. Coarser than the diffs the
+-- API computes, but it is the same format and exact for a single edited
+-- region, which is what most consecutive saves are.
+CREATE FUNCTION pg_temp.line_delta(old_text TEXT, new_text TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    old_lines TEXT[] := CASE WHEN coalesce(old_text, '') = '' THEN ARRAY[]::TEXT[]
+                             ELSE string_to_array(old_text, E'\n') END;
+    new_lines TEXT[] := CASE WHEN coalesce(new_text, '') = '' THEN ARRAY[]::TEXT[]
+                             ELSE string_to_array(new_text, E'\n') END;
+    old_count INTEGER := coalesce(array_length(old_lines, 1), 0);
+    new_count INTEGER := coalesce(array_length(new_lines, 1), 0);
+    prefix INTEGER := 0;
+    suffix INTEGER := 0;
+    ops JSONB := '[]'::JSONB;
+BEGIN
+    WHILE prefix < old_count AND prefix < new_count
+          AND old_lines[prefix + 1] = new_lines[prefix + 1] LOOP
+        prefix := prefix + 1;
+    END LOOP;
+    WHILE suffix < old_count - prefix AND suffix < new_count - prefix
+          AND old_lines[old_count - suffix] = new_lines[new_count - suffix] LOOP
+        suffix := suffix + 1;
+    END LOOP;
+
+    IF prefix > 0 THEN
+        ops := ops || to_jsonb(prefix);
+    END IF;
+    IF old_count - prefix - suffix > 0 THEN
+        ops := ops || to_jsonb(-(old_count - prefix - suffix));
+    END IF;
+    IF new_count - prefix - suffix > 0 THEN
+        ops := ops || jsonb_build_array(to_jsonb(new_lines[prefix + 1:new_count - suffix]));
+    END IF;
+    IF suffix > 0 THEN
+        ops := ops || to_jsonb(suffix);
+    END IF;
+    RETURN ops;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- {field: delta} for the fields that changed; a cleared field maps to null
+CREATE FUNCTION pg_temp.field_delta(field TEXT, old_value TEXT, new_value TEXT)
+RETURNS JSONB AS $$
+    SELECT CASE
+        WHEN old_value IS NOT DISTINCT FROM new_value THEN '{}'::JSONB
+        WHEN new_value IS NULL THEN jsonb_build_object(field, NULL::JSONB)
+        ELSE jsonb_build_object(field, pg_temp.line_delta(old_value, new_value))
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Rewrite existing full rows as deltas, keeping every 50th one per post
+WITH ordered AS (
+    SELECT
+        id,
+        row_number() OVER w AS rn,
+        pg_temp.field_delta('title', lag(title) OVER w, title)
+            || pg_temp.field_delta('content', lag(content) OVER w, content)
+            || pg_temp.field_delta('excerpt', lag(excerpt) OVER w, excerpt) AS delta
+    FROM public.post_versions
+    WHERE is_snapshot
+    WINDOW w AS (PARTITION BY post_id ORDER BY version_number)
+)
+UPDATE public.post_versions AS v
+SET is_snapshot = false,
+    delta = ordered.delta,
+    title = NULL,
+    content = NULL,
+    excerpt = NULL
+FROM ordered
+WHERE v.id = ordered.id AND (ordered.rn - 1) % 50 <> 0;
+
+-- Posts never edited under the old trigger get their current text as version 1
+INSERT INTO public.post_versions (post_id, version_number, is_snapshot, title, content, excerpt, updated_by, updated_at)
+SELECT p.id, 1, true, p.title, p.content, p.excerpt, p.created_by, p.updated_at
+FROM public.posts AS p
+WHERE NOT EXISTS (SELECT 1 FROM public.post_versions AS v WHERE v.post_id = p.id);
+
+-- Backfill the counter without touching updated_at
+ALTER TABLE public.posts DISABLE TRIGGER update_posts_updated_at;
+UPDATE public.posts AS p
+SET current_version = latest.version_number
+FROM (
+    SELECT post_id, max(version_number) AS version_number
+    FROM public.post_versions
+    GROUP BY post_id
+) AS latest
+WHERE p.id = latest.post_id;
+ALTER TABLE public.posts ENABLE TRIGGER update_posts_updated_at;
@@ -0,0 +1,33 @@
+-- AI content generation jobs.
+-- The API queues generation in process and records each job here, so its
+-- status can be read from any worker once the queue has forgotten it.
+CREATE TABLE IF NOT EXISTS public.generation_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    post_id UUID NOT NULL REFERENCES public.posts(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CONSTRAINT generation_jobs_status_check
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    provider VARCHAR(50) NOT NULL,
+    model TEXT,
+    -- sha256 of the model, parameters and prompt
+    request_key VARCHAR(64) NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_post_id_created_at
+    ON public.generation_jobs(post_id, created_at);
+
+ALTER TABLE public.generation_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON public.generation_jobs
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable insert for authenticated users only" ON public.generation_jobs
+    FOR INSERT TO authenticated WITH CHECK (true);
+
+CREATE POLICY "Enable update for authenticated users only" ON public.generation_jobs
+    FOR UPDATE TO authenticated USING (true) WITH CHECK (true);
@@ -0,0 +1,29 @@
+-- Cache of generated responses.
+-- Keyed by a hash of the provider, model, sampling parameters and normalized
+-- prompt template plus variables, so re-running an identical request (a
+-- retry after a failed save, regenerating SEO fields for unchanged content)
+-- replays the stored response instead of calling the provider again. The
+-- response is kept as the chunks it was streamed in.
+CREATE TABLE IF NOT EXISTS public.generation_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    chunks JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Eviction deletes expired entries, then the least recently used ones
+CREATE INDEX IF NOT EXISTS idx_generation_cache_last_used_at
+    ON public.generation_cache(last_used_at);
+CREATE INDEX IF NOT EXISTS idx_generation_cache_expires_at
+    ON public.generation_cache(expires_at);
+
+ALTER TABLE public.generation_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable all access for authenticated users only" ON public.generation_cache
+    FOR ALL TO authenticated USING (true) WITH CHECK (true);
+
+ALTER TABLE public.generation_jobs
+    ADD COLUMN IF NOT EXISTS cached BOOLEAN NOT NULL DEFAULT false;
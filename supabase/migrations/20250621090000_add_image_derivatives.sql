@@ -0,0 +1,78 @@
+-- Content-addressed images with web-sized derivatives.
+-- The Images API hashes each upload; images with the same sha256 share one
+-- stored original and one set of derivatives, rendered once.
+ALTER TABLE public.images ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE public.images ADD COLUMN IF NOT EXISTS storage_path TEXT;
+-- Blurred thumbnail as a data: URI, shown while the image loads
+ALTER TABLE public.images ADD COLUMN IF NOT EXISTS placeholder TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_images_content_hash ON public.images(content_hash);
+
+CREATE TABLE IF NOT EXISTS public.image_derivatives (
+    content_hash VARCHAR(64) NOT NULL,
+    -- MIME type, e.g. image/webp or image/avif
+    format VARCHAR(32) NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    storage_path TEXT NOT NULL,
+    url TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    CONSTRAINT image_derivatives_pkey PRIMARY KEY (content_hash, format, width)
+);
+
+ALTER TABLE public.image_derivatives ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON public.image_derivatives
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable insert for authenticated users only" ON public.image_derivatives
+    FOR INSERT TO authenticated WITH CHECK (true);
+
+-- The API records the objects it writes itself; only files uploaded to the
+-- bucket directly still get an images row from the storage trigger
+CREATE OR REPLACE FUNCTION public.handle_new_image()
+RETURNS TRIGGER AS $$
+DECLARE
+    image_url TEXT;
+    file_meta JSONB;
+    image_id UUID;
+BEGIN
+    IF NEW.name LIKE 'originals/%' OR NEW.name LIKE 'derivatives/%' THEN
+        RETURN NEW;
+    END IF;
+
+    SELECT meta INTO file_meta
+    FROM storage.objects
+    WHERE id = NEW.id;
+
+    image_url := public.get_image_url(NEW.name);
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO public.images (
+            url,
+            alt_text,
+            width,
+            height,
+            format,
+            size,
+            created_by
+        ) VALUES (
+            image_url,
+            NULL,
+            (file_meta->>'width')::integer,
+            (file_meta->>'height')::integer,
+            (file_meta->>'mimetype')::text,
+            NEW.metadata->>'size',
+            NEW.owner
+        )
+        RETURNING id INTO image_id;
+
+        UPDATE storage.objects
+        SET metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('image_id', image_id::text)
+        WHERE id = NEW.id;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -0,0 +1,5 @@
+-- Index behind incremental post exports.
+-- GET /posts/export?updated_since= filters on updated_at and streams rows in
+-- (updated_at, id) order; with this index each pull reads only the changed
+-- rows, already sorted, instead of scanning and sorting the whole table.
+CREATE INDEX IF NOT EXISTS idx_posts_updated_at_id ON public.posts(updated_at, id);
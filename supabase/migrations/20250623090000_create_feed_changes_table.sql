@@ -0,0 +1,23 @@
+-- Log of feed and sitemap updates.
+-- Every API worker keeps its own feed indexes; each update claims the next
+-- 'feeds' stamp in cache_versions and records the post or topic it applied
+-- here, so a worker that missed a few updates replays them instead of
+-- reloading every post. Old rows are pruned by the workers.
+CREATE TABLE IF NOT EXISTS public.feed_changes (
+    version BIGINT PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL
+        CONSTRAINT feed_changes_kind_check CHECK (kind IN ('post', 'topic', 'load')),
+    object_id VARCHAR(36),
+    shards INTEGER NOT NULL
+);
+
+ALTER TABLE public.feed_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Enable read access for all users" ON public.feed_changes
+    FOR SELECT USING (true);
+
+CREATE POLICY "Enable insert for authenticated users only" ON public.feed_changes
+    FOR INSERT TO authenticated WITH CHECK (true);
+
+CREATE POLICY "Enable delete for authenticated users only" ON public.feed_changes
+    FOR DELETE TO authenticated USING (true);
@@ -0,0 +1,86 @@
+"""
+Tests for the feed hooks on the post endpoints and the Feeds API.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api.v1.routers.feeds import get_feed_generator
+from app.main import app
+from app.publishing import FeedGenerator
+from app.schemas.topic import TopicCreate
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def feed_generator(tmp_path):
+    """Write feeds to tmp_path for the duration of a test."""
+    generator = FeedGenerator(str(tmp_path), base_url="http://testserver/api/v1/feeds")
+    previous = app.dependency_overrides.get(get_feed_generator)
+    app.dependency_overrides[get_feed_generator] = lambda: generator
+    yield generator
+    app.dependency_overrides[get_feed_generator] = previous
+
+
+def test_post_changes_update_the_feeds(db: Session, feed_generator, tmp_path) -> None:
+    """Test that creating, publishing and deleting posts via the API updates the files."""
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    draft = client.post("/api/v1/posts/", json={"title": "Draft", "topic_id": str(topic.id)})
+    assert draft.status_code == 201
+    # Drafts don't trigger a first load
+    assert not feed_generator.loaded
+
+    live = client.post("/api/v1/posts/", json={"title": "Live", "status": "published"})
+    assert live.status_code == 201
+    assert "/posts/live/" in (tmp_path / "sitemap-1.xml").read_text()
+
+    response = client.post(f"/api/v1/posts/{draft.json()['id']}/publish")
+    assert response.status_code == 200
+    assert "Draft" in (tmp_path / "topics/tech/rss.xml").read_text()
+
+    response = client.put(f"/api/v1/posts/{draft.json()['id']}", json={"status": "archived"})
+    assert response.status_code == 200
+    assert not (tmp_path / "topics/tech/rss.xml").exists()
+
+    assert client.delete(f"/api/v1/posts/{live.json()['id']}").status_code == 204
+    assert "<loc>" not in (tmp_path / "sitemap-1.xml").read_text()
+
+
+def test_topic_rename_updates_the_feeds(db: Session, feed_generator, tmp_path) -> None:
+    """Test that renaming a topic via the API moves its files."""
+    topic = client.post("/api/v1/topics/", json={"name": "Tech"}).json()
+    client.post(
+        "/api/v1/posts/", json={"title": "Live", "status": "published", "topic_id": topic["id"]}
+    )
+    response = client.put(f"/api/v1/topics/{topic['id']}", json={"name": "Science"})
+    assert response.status_code == 200
+    assert (tmp_path / "topics/science/page-1.json").exists()
+    assert not (tmp_path / "topics/tech").exists() or not any((tmp_path / "topics/tech").iterdir())
+
+
+def test_serve_feed_files(db: Session, feed_generator) -> None:
+    """Test that files are served with an ETag and revalidate to 304."""
+    client.post("/api/v1/posts/", json={"title": "Live", "status": "published"})
+
+    response = client.get("/api/v1/feeds/rss.xml")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/rss+xml"
+    assert "Live" in response.text
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    response = client.get("/api/v1/feeds/rss.xml", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get("/api/v1/feeds/sitemap.xml")
+    assert response.headers["content-type"] == "application/xml"
+    assert "http://testserver/api/v1/feeds/sitemap-1.xml" in response.text
+
+
+def test_serve_feed_file_not_found(feed_generator) -> None:
+    """Test that missing files and paths outside the feeds directory are 404s."""
+    assert client.get("/api/v1/feeds/missing.xml").status_code == 404
+    assert client.get("/api/v1/feeds/topics").status_code == 404
+    assert client.get("/api/v1/feeds/..%2F..%2Fetc%2Fpasswd").status_code == 404
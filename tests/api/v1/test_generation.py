@@ -0,0 +1,279 @@
+"""
+Tests for the content generation API endpoints.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.api.v1.routers.generation import get_generation_queue
+from app.db.database import Base, get_db
+from app.generation import FakeProvider, GenerationRequest
+from app.main import app
+from app.models.generation_job import GenerationJob as GenerationJobModel
+from app.schemas.post import PostCreate
+
+client = TestClient(app)
+
+# SQL statement budgets per request
+GENERATE_QUERIES = 3  # post row, topic row, job insert
+JOB_QUERIES = 0       # answered from the queue's memory
+
+
+class GatedProvider(FakeProvider):
+    """FakeProvider whose calls wait until ``gate`` is set (open by default)."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    async def _call(self, requests) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.gate.wait)
+        await super()._call(requests)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Overrides the shared test database with one of its own, served to the API too.
+
+    The queue's hooks run on their own threads while requests and the test
+    run; the shared in-memory SQLite database is a single connection, so on
+    SQLite these tests use a file that gives each thread its own.
+    """
+    url = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:")
+    if url.startswith("sqlite"):
+        url = f"sqlite:///{tmp_path / 'generation.db'}"
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with session_factory() as session:
+            yield session
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = override_get_db
+    session = session_factory()
+    yield session
+    session.close()
+    app.dependency_overrides[get_db] = previous
+    engine.dispose()
+
+
+@pytest.fixture
+def generation_queue(db: Session):
+    """Serve the API from a queue over a fake provider and the test database."""
+    provider = GatedProvider(max_batch_size=1)
+    queue = crud.generation_job.build_generation_queue(
+        sessionmaker(bind=db.get_bind()), {"fake": provider}, default_provider="fake"
+    )
+    queue.provider_instance = provider
+    app.dependency_overrides[get_generation_queue] = lambda: queue
+    yield queue
+    del app.dependency_overrides[get_generation_queue]
+    provider.gate.set()
+    queue.stop()
+
+
+@pytest.fixture
+def test_post(db: Session, test_topic: Dict) -> Dict:
+    """Create a post with a topic, excerpt and keywords to prompt from."""
+    post = crud.post.create_post(db, PostCreate(
+        title="Async queues in practice",
+        excerpt="How to keep slow calls off the request path.",
+        content="Old body",
+        topic_id=test_topic["id"],
+        seo_keywords=["asyncio", "queues"],
+    ))
+    return {"id": str(post.id)}
+
+
+def test_generate_post_content(
+    db: Session, test_post: Dict, generation_queue, max_queries
+) -> None:
+    """Test that generation is queued, finishes and saves a new version."""
+    generation_queue.provider_instance.latency = 0.05
+    with max_queries(GENERATE_QUERIES):
+        response = client.post(
+            f"/api/v1/posts/{test_post['id']}/generate", json={"max_tokens": 50}
+        )
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] in ("queued", "running")
+    assert data["post_id"] == test_post["id"]
+    assert data["provider"] == "fake"
+    assert data["coalesced"] is False
+
+    job = generation_queue.wait(data["id"], timeout=5)
+    assert job.status == "succeeded"
+    prompt = job.request.prompt
+    assert "Async queues in practice" in prompt and "Test Topic" in prompt
+    assert "asyncio, queues" in prompt
+
+    with max_queries(JOB_QUERIES):
+        response = client.get(f"/api/v1/generation/jobs/{data['id']}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["attempts"] == 1
+
+    post = client.get(f"/api/v1/posts/{test_post['id']}").json()
+    assert post["content"] == FakeProvider.text_for(job.request)
+    assert post["current_version"] == 2
+
+    db.expire_all()
+    stored = db.get(GenerationJobModel, uuid.UUID(data["id"]))
+    assert stored.status == "succeeded"
+    assert stored.request_key == job.request.key
+    assert stored.finished_at is not None
+
+
+def test_generate_coalesces_duplicates(test_post: Dict, generation_queue) -> None:
+    """Test that asking twice while a job is pending returns the same job."""
+    generation_queue.provider_instance.gate.clear()
+    url = f"/api/v1/posts/{test_post['id']}/generate"
+    first = client.post(url, json={"instructions": "Keep it short"}).json()
+    second = client.post(url, json={"instructions": "Keep it short"}).json()
+    generation_queue.provider_instance.gate.set()
+
+    assert second["id"] == first["id"]
+    assert second["coalesced"] is True
+    generation_queue.wait(first["id"], timeout=5)
+    assert generation_queue.provider_instance.calls == 1
+
+
+def test_job_joining_a_running_call_is_stored(
+    db: Session, test_post: Dict, test_topic: Dict, generation_queue
+) -> None:
+    """Test that a job coalesced onto a call already running is still persisted."""
+    other = crud.post.create_post(db, PostCreate(
+        title="Async queues in practice",
+        excerpt="How to keep slow calls off the request path.",
+        content="Old body",
+        topic_id=test_topic["id"],
+        seo_keywords=["asyncio", "queues"],
+    ))
+    running = threading.Event()
+    on_status = generation_queue.on_status
+
+    def record_running(job) -> None:
+        on_status(job)
+        if job.status == "running":
+            running.set()
+
+    generation_queue.on_status = record_running
+    generation_queue.provider_instance.gate.clear()
+    first = client.post(f"/api/v1/posts/{test_post['id']}/generate", json={}).json()
+    assert running.wait(timeout=5)
+
+    second = client.post(f"/api/v1/posts/{other.id}/generate", json={}).json()
+    generation_queue.provider_instance.gate.set()
+    assert second["coalesced"] is True and second["status"] == "running"
+    for job_id in (first["id"], second["id"]):
+        assert generation_queue.wait(job_id, timeout=5).status == "succeeded"
+        db.expire_all()
+        stored = crud.generation_job.get_job(db, job_id)
+        assert stored is not None and stored.status == "succeeded"
+    assert generation_queue.provider_instance.calls == 1
+
+
+def test_generate_from_cache(test_post: Dict, generation_queue, caplog) -> None:
+    """Test that repeating a finished request is answered from the cache."""
+    caplog.set_level(logging.ERROR, logger="app.generation.queue")
+    url = f"/api/v1/posts/{test_post['id']}/generate"
+    first = client.post(url, json={"max_tokens": 30}).json()
+    generation_queue.wait(first["id"], timeout=5)
+
+    second = client.post(url, json={"max_tokens": 30}).json()
+    job = generation_queue.wait(second["id"], timeout=5)
+    assert job.cached and job.status == "succeeded"
+    assert client.get(f"/api/v1/generation/jobs/{second['id']}").json()["cached"] is True
+    assert generation_queue.provider_instance.calls == 1
+
+    third = client.post(url, json={"max_tokens": 30, "use_cache": False}).json()
+    assert not generation_queue.wait(third["id"], timeout=5).cached
+    fourth = client.post(url, json={"max_tokens": 30}, headers={"Cache-Control": "no-cache"})
+    assert not generation_queue.wait(fourth.json()["id"], timeout=5).cached
+    assert generation_queue.provider_instance.calls == 3
+    # Reason: the queue logs cache errors and carries on; a broken cache must fail here
+    assert not [r for r in caplog.records if "Generation cache" in r.getMessage()]
+
+
+def test_generate_errors(test_post: Dict, generation_queue) -> None:
+    """Test unknown posts, unknown providers and invalid parameters."""
+    response = client.post(f"/api/v1/posts/{uuid.uuid4()}/generate", json={})
+    assert response.status_code == 404
+
+    url = f"/api/v1/posts/{test_post['id']}/generate"
+    response = client.post(url, json={"provider": "nope"})
+    assert response.status_code == 400
+
+    response = client.post(url, json={"temperature": 5})
+    assert response.status_code == 422
+
+
+def test_read_stored_job(db: Session, test_post: Dict, generation_queue) -> None:
+    """Test that jobs no longer held in memory are read from the database."""
+    job_id = uuid.uuid4()
+    db.add(GenerationJobModel(
+        id=job_id,
+        post_id=uuid.UUID(test_post["id"]),
+        status="failed",
+        provider="openai",
+        request_key=GenerationRequest("prompt").key,
+        attempts=4,
+        error="Provider returned 503",
+    ))
+    db.commit()
+
+    response = client.get(f"/api/v1/generation/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "Provider returned 503"
+
+    response = client.get(f"/api/v1/generation/jobs/{job_id}/stream")
+    assert response.text.startswith("event: status\n")
+
+    response = client.get(f"/api/v1/generation/jobs/{uuid.uuid4()}")
+    assert response.status_code == 404
+    response = client.get("/api/v1/generation/jobs/not-a-uuid/stream")
+    assert response.status_code == 404
+
+
+def test_stream_job(test_post: Dict, generation_queue) -> None:
+    """Test that the event stream carries the statuses and generated text."""
+    job_id = client.post(
+        f"/api/v1/posts/{test_post['id']}/generate", json={"max_tokens": 40}
+    ).json()["id"]
+
+    response = client.get(f"/api/v1/generation/jobs/{job_id}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(block.split("\ndata: ", 1)[1])
+        for block in response.text.strip().split("\n\n")
+    ]
+    statuses = [event["status"] for event in events if event["type"] == "status"]
+    text = "".join(event["text"] for event in events if event["type"] == "token")
+
+    assert statuses == ["queued", "running", "succeeded"]
+    assert text == FakeProvider.text_for(generation_queue.get(job_id).request)
+
+
+def test_generation_health(generation_queue) -> None:
+    """Test the generation queue counters endpoint."""
+    response = client.get("/api/health/generation")
+    assert response.status_code == 200
+    assert {"submitted", "coalesced", "retries", "pending"} <= set(response.json())
@@ -0,0 +1,132 @@
+"""
+Tests for the Images API endpoints.
+"""
+import io
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api.v1.routers import images as images_router
+from app.images import ImagePipeline, LocalStorage
+from app.main import app
+from app.models.image import Image as ImageModel
+from app.models.image import ImageDerivative as ImageDerivativeModel
+from app.schemas.post import PostCreate
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def image_pipeline(tmp_path):
+    """Serve the API from a one-worker pipeline storing under tmp_path."""
+    pipeline = ImagePipeline(
+        LocalStorage(str(tmp_path), "/media"), workers=1, widths=(320, 640), formats=("webp",)
+    )
+    pipeline.root = tmp_path
+    app.dependency_overrides[images_router.get_image_pipeline] = lambda: pipeline
+    yield pipeline
+    del app.dependency_overrides[images_router.get_image_pipeline]
+    pipeline.close()
+
+
+@pytest.fixture
+def test_post(db: Session) -> Dict:
+    """Create a post to attach images to."""
+    return {"id": str(crud.post.create_post(db, PostCreate(title="Images")).id)}
+
+
+def _png(width: int = 1000, height: int = 500, color=(200, 40, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _upload(data: bytes, content_type: str = "image/png", **params):
+    return client.post(
+        "/api/v1/images", data=data, params=params, headers={"Content-Type": content_type}
+    )
+
+
+def _count(db: Session, model) -> int:
+    return db.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_upload_image(db: Session, test_post: Dict, image_pipeline) -> None:
+    """Test that an upload is stored with its derivatives and placeholder."""
+    response = _upload(_png(), post_id=test_post["id"], alt_text="Red", is_featured=True)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["post_id"] == test_post["id"]
+    assert (data["width"], data["height"], data["format"]) == (1000, 500, "image/png")
+    assert data["size"] == len(_png()) and data["is_featured"] is True
+    assert data["deduplicated"] is False
+    assert data["placeholder"].startswith("data:image/webp;base64,")
+    assert [(d["width"], d["height"], d["format"]) for d in data["derivatives"]] == [
+        (640, 320, "image/webp"), (320, 160, "image/webp"),
+    ]
+    for derivative in data["derivatives"]:
+        stored = image_pipeline.root / derivative["url"][len("/media/"):]
+        assert stored.stat().st_size == derivative["size"]
+    assert (image_pipeline.root / data["url"][len("/media/"):]).read_bytes() == _png()
+
+    response = client.get(f"/api/v1/images/{data['id']}")
+    assert response.status_code == 200
+    assert response.json()["derivatives"] == data["derivatives"]
+    listed = client.get(f"/api/v1/posts/{test_post['id']}/images").json()
+    assert [image["id"] for image in listed] == [data["id"]]
+
+
+def test_upload_deduplicates_content(db: Session, test_post: Dict, image_pipeline) -> None:
+    """Test that identical files are stored and rendered once."""
+    first = _upload(_png(), post_id=test_post["id"]).json()
+    derivatives = _count(db, ImageDerivativeModel)
+
+    again = _upload(_png(), post_id=test_post["id"])
+    assert again.status_code == 200
+    assert again.json()["id"] == first["id"] and again.json()["deduplicated"] is True
+
+    other_post = crud.post.create_post(db, PostCreate(title="Other"))
+    shared = _upload(_png(), post_id=str(other_post.id))
+    assert shared.status_code == 201
+    data = shared.json()
+    assert data["id"] != first["id"] and data["deduplicated"] is True
+    assert data["url"] == first["url"]
+    assert data["derivatives"] == first["derivatives"]
+    assert _count(db, ImageModel) == 2
+    assert _count(db, ImageDerivativeModel) == derivatives
+
+    different = _upload(_png(color=(0, 0, 255)), post_id=test_post["id"]).json()
+    assert different["deduplicated"] is False and different["url"] != first["url"]
+
+
+def test_featured_image_is_unique(db: Session, test_post: Dict, image_pipeline) -> None:
+    """Test that featuring an image unfeatures the post's previous one."""
+    first = _upload(_png(), post_id=test_post["id"], is_featured=True).json()
+    _upload(_png(color=(0, 255, 0)), post_id=test_post["id"], is_featured=True)
+
+    listed = client.get(f"/api/v1/posts/{test_post['id']}/images").json()
+    featured = [image["id"] for image in listed if image["is_featured"]]
+    assert len(featured) == 1 and featured[0] != first["id"]
+
+
+def test_upload_errors(test_post: Dict, image_pipeline, monkeypatch) -> None:
+    """Test that bad uploads are refused with the right status."""
+    assert _upload(_png(), content_type="text/plain").status_code == 415
+    assert _upload(b"not an image").status_code == 422
+    assert _upload(_png(), post_id="00000000-0000-0000-0000-000000000000").status_code == 404
+
+    monkeypatch.setattr(images_router, "IMAGE_MAX_UPLOAD_BYTES", 100)
+    assert _upload(_png()).status_code == 413
+
+
+def test_read_missing_image() -> None:
+    """Test that unknown images and posts give 404s."""
+    assert client.get("/api/v1/images/not-a-uuid").status_code == 404
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/api/v1/images/{missing}").status_code == 404
+    assert client.get(f"/api/v1/posts/{missing}/images").status_code == 404
@@ -0,0 +1,280 @@
+"""
+Tests for the posts API endpoints.
+"""
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.models.post import Post as PostModel
+from app.utils.pagination import encode_cursor
+
+client = TestClient(app)
+
+# SQL statement budgets per request
+LIST_QUERIES = 1     # one indexed page, whatever the filters
+GET_QUERIES = 1
+CREATE_QUERIES = 5   # topic check, slug lookup, insert, version insert, refresh
+UPDATE_QUERIES = 6   # row, topic check, slug lookup, update, version insert, refresh
+PUBLISH_QUERIES = 3  # row, update, refresh (no new version)
+DELETE_QUERIES = 3   # row, versions, delete
+EXPORT_QUERIES = 1
+VERSION_QUERIES = 2  # post row, version chain
+
+BASE_TIME = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def test_posts(db: Session, test_topic: Dict) -> List[Dict]:
+    """Create ten posts: even ones published a day apart, odd ones drafts."""
+    posts = []
+    for i in range(10):
+        published = i % 2 == 0
+        post = PostModel(
+            title=f"Post {i}",
+            slug=f"post-{i}",
+            content=f"Body of post {i}",
+            topic_id=uuid.UUID(test_topic["id"]) if i < 6 else None,
+            status="published" if published else "draft",
+            published_at=BASE_TIME + timedelta(days=i) if published else None,
+            created_at=BASE_TIME + timedelta(hours=i),
+        )
+        db.add(post)
+        posts.append(post)
+    db.commit()
+    return [{"id": str(p.id), "slug": p.slug, "status": p.status} for p in posts]
+
+def _walk(url: str) -> List[Dict]:
+    """Follow next_cursor until the last page and return every item."""
+    items, cursor = [], None
+    while True:
+        page_url = url + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(page_url)
+        assert response.status_code == 200
+        data = response.json()
+        items.extend(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return items
+
+def test_create_post(test_topic: Dict, max_queries) -> None:
+    """Test creating a post in a topic."""
+    post_data = {
+        "title": "Hello World",
+        "topic_id": test_topic["id"],
+        "content": "# Hello",
+        "seo_keywords": ["hello", "world"],
+    }
+    with max_queries(CREATE_QUERIES):
+        response = client.post("/api/v1/posts/", json=post_data)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["slug"] == "hello-world"
+    assert data["status"] == "draft"
+    assert data["published_at"] is None
+    assert data["topic_id"] == test_topic["id"]
+    assert data["content"] == "# Hello"
+    assert data["seo_keywords"] == ["hello", "world"]
+
+def test_create_post_suffixes_taken_slug() -> None:
+    """Test that a second post with the same title gets a suffixed slug."""
+    first = client.post("/api/v1/posts/", json={"title": "Same Title"}).json()
+    second = client.post("/api/v1/posts/", json={"title": "Same Title"}).json()
+    assert first["slug"] == "same-title"
+    assert second["slug"] == "same-title-1"
+
+def test_create_published_post_stamps_published_at() -> None:
+    """Test that creating a published post sets published_at."""
+    response = client.post("/api/v1/posts/", json={"title": "Live", "status": "published"})
+    assert response.status_code == 201
+    assert response.json()["published_at"] is not None
+
+def test_create_post_unknown_topic() -> None:
+    """Test creating a post for a topic that doesn't exist."""
+    response = client.post(
+        "/api/v1/posts/", json={"title": "Orphan", "topic_id": str(uuid.uuid4())}
+    )
+    assert response.status_code == 404
+
+def test_create_post_invalid_status() -> None:
+    """Test that unknown statuses are rejected."""
+    response = client.post("/api/v1/posts/", json={"title": "Bad", "status": "live"})
+    assert response.status_code == 422
+
+def test_read_post(test_posts: List[Dict], max_queries) -> None:
+    """Test reading a post by ID, content included."""
+    with max_queries(GET_QUERIES):
+        response = client.get(f"/api/v1/posts/{test_posts[0]['id']}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == test_posts[0]["id"]
+    assert data["content"] == "Body of post 0"
+
+def test_read_post_not_found() -> None:
+    """Test reading a non-existent or malformed post ID."""
+    assert client.get(f"/api/v1/posts/{uuid.uuid4()}").status_code == 404
+    assert client.get("/api/v1/posts/not-a-uuid").status_code == 404
+
+def test_update_post(test_posts: List[Dict], test_topic: Dict, max_queries) -> None:
+    """Test updating a post's title regenerates its slug."""
+    update = {"title": "Renamed Post", "topic_id": test_topic["id"]}
+    with max_queries(UPDATE_QUERIES):
+        response = client.put(f"/api/v1/posts/{test_posts[1]['id']}", json=update)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["title"] == "Renamed Post"
+    assert data["slug"] == "renamed-post"
+    assert data["content"] == "Body of post 1"
+
+def test_publish_post(test_posts: List[Dict], max_queries) -> None:
+    """Test publishing a draft stamps published_at once."""
+    with max_queries(PUBLISH_QUERIES):
+        response = client.post(f"/api/v1/posts/{test_posts[1]['id']}/publish")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "published"
+    assert data["published_at"] is not None
+
+    again = client.post(f"/api/v1/posts/{test_posts[1]['id']}/publish").json()
+    assert again["published_at"] == data["published_at"]
+
+def test_delete_post(test_posts: List[Dict], max_queries) -> None:
+    """Test deleting a post."""
+    with max_queries(DELETE_QUERIES):
+        response = client.delete(f"/api/v1/posts/{test_posts[0]['id']}")
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/posts/{test_posts[0]['id']}").status_code == 404
+    assert client.delete(f"/api/v1/posts/{test_posts[0]['id']}").status_code == 404
+
+def test_list_posts_omits_content(test_posts: List[Dict], max_queries) -> None:
+    """Test that list items leave out content unless asked for."""
+    with max_queries(LIST_QUERIES):
+        response = client.get("/api/v1/posts/")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 10
+    assert all("content" not in item for item in items)
+
+    items = client.get("/api/v1/posts/?include_content=true").json()["items"]
+    assert {item["content"] for item in items} == {f"Body of post {i}" for i in range(10)}
+
+def test_list_posts_default_order(test_posts: List[Dict]) -> None:
+    """Test that posts are listed newest first by created_at."""
+    items = client.get("/api/v1/posts/").json()["items"]
+    assert [item["slug"] for item in items] == [f"post-{i}" for i in reversed(range(10))]
+
+def test_list_posts_filters(test_posts: List[Dict], test_topic: Dict, max_queries) -> None:
+    """Test filtering by status, topic and published_at range."""
+    with max_queries(LIST_QUERIES):
+        response = client.get("/api/v1/posts/?status=published")
+    assert {item["slug"] for item in response.json()["items"]} == {
+        "post-0", "post-2", "post-4", "post-6", "post-8"
+    }
+
+    response = client.get(f"/api/v1/posts/?topic_id={test_topic['id']}&status=draft")
+    assert {item["slug"] for item in response.json()["items"]} == {"post-1", "post-3", "post-5"}
+
+    after = (BASE_TIME + timedelta(days=2)).isoformat()
+    before = (BASE_TIME + timedelta(days=8)).isoformat()
+    response = client.get(
+        "/api/v1/posts/",
+        params={"published_after": after, "published_before": before},
+    )
+    assert {item["slug"] for item in response.json()["items"]} == {"post-2", "post-4", "post-6"}
+
+def test_list_posts_keyset_pagination(test_posts: List[Dict], max_queries) -> None:
+    """Test that following cursors visits every post exactly once, in order."""
+    with max_queries(LIST_QUERIES):
+        first = client.get("/api/v1/posts/?limit=3").json()
+    assert len(first["items"]) == 3
+    assert first["next_cursor"]
+
+    items = _walk("/api/v1/posts/?limit=3&order=asc")
+    assert [item["slug"] for item in items] == [f"post-{i}" for i in range(10)]
+
+def test_list_posts_by_published_at(test_posts: List[Dict]) -> None:
+    """Test paging by published_at skips posts that were never published."""
+    items = _walk("/api/v1/posts/?order_by=published_at&limit=2")
+    assert [item["slug"] for item in items] == ["post-8", "post-6", "post-4", "post-2", "post-0"]
+
+def test_list_posts_invalid_params() -> None:
+    """Test that bad filters and cursors are rejected."""
+    assert client.get("/api/v1/posts/?status=live").status_code == 400
+    assert client.get("/api/v1/posts/?topic_id=nope").status_code == 400
+    assert client.get("/api/v1/posts/?order=sideways").status_code == 400
+    assert client.get("/api/v1/posts/?cursor=garbage").status_code == 400
+
+@pytest.mark.parametrize("value, last_id", [
+    ("2025-01-01T00:00:00", "not-a-uuid"),
+    (["2025-01-01T00:00:00"], str(uuid.uuid4())),
+    ("not-a-date", str(uuid.uuid4())),
+    (1735689600, str(uuid.uuid4())),
+])
+def test_list_posts_cursor_bad_key(value, last_id: str, max_queries) -> None:
+    """Test that a cursor whose ID or sort key doesn't fit the ordering is rejected."""
+    cursor = encode_cursor("created_at", "desc", value, last_id)
+    with max_queries(0):
+        response = client.get("/api/v1/posts/", params={"cursor": cursor})
+    assert response.status_code == 400
+
+def test_list_posts_cursor_order_mismatch(test_posts: List[Dict]) -> None:
+    """Test that a cursor can't be reused with a different ordering."""
+    cursor = client.get("/api/v1/posts/?limit=2").json()["next_cursor"]
+    response = client.get(f"/api/v1/posts/?order_by=published_at&cursor={cursor}")
+    assert response.status_code == 400
+
+def test_export_posts(test_posts: List[Dict], max_queries) -> None:
+    """Test streaming posts as NDJSON without their content."""
+    with max_queries(EXPORT_QUERIES):
+        response = client.get("/api/v1/posts/export?columns=id,slug,seo_keywords")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 10
+    assert set(rows[0]) == {"id", "slug", "seo_keywords"}
+
+def test_post_versions(max_queries) -> None:
+    """Test listing, reading and diffing the versions saved by edits."""
+    post = client.post("/api/v1/posts/", json={"title": "Draft", "content": "One\nTwo"}).json()
+    assert post["current_version"] == 1
+    url = f"/api/v1/posts/{post['id']}"
+    client.put(url, json={"content": "One\nTwo\nThree"})
+    updated = client.put(url, json={"title": "Final", "excerpt": "Short"}).json()
+    assert updated["current_version"] == 3
+
+    with max_queries(VERSION_QUERIES):
+        response = client.get(f"{url}/versions?limit=2")
+    data = response.json()
+    assert [item["version_number"] for item in data["items"]] == [3, 2]
+    assert data["next_before"] == 2
+    older = client.get(f"{url}/versions?limit=2&before=2").json()
+    assert [item["version_number"] for item in older["items"]] == [1]
+    assert older["next_before"] is None
+
+    with max_queries(VERSION_QUERIES):
+        response = client.get(f"{url}/versions/2")
+    assert response.status_code == 200
+    version = response.json()
+    assert (version["title"], version["content"], version["excerpt"]) == (
+        "Draft", "One\nTwo\nThree", None
+    )
+    assert client.get(f"{url}/versions/4").status_code == 404
+
+    with max_queries(VERSION_QUERIES):
+        response = client.get(f"{url}/versions/diff?from=1")
+    diff = response.json()
+    assert (diff["from_version"], diff["to_version"]) == (1, 3)
+    assert set(diff["changes"]) == {"title", "content", "excerpt"}
+    assert "+Three" in diff["changes"]["content"].splitlines()
+    assert client.get(f"{url}/versions/diff?from=1&to=9").status_code == 404
+
+def test_post_versions_unknown_post() -> None:
+    """Test version endpoints for a post that doesn't exist."""
+    missing = f"/api/v1/posts/{uuid.uuid4()}"
+    assert client.get(f"{missing}/versions").status_code == 404
+    assert client.get(f"{missing}/versions/1").status_code == 404
+    assert client.get(f"{missing}/versions/diff?from=1").status_code == 404
@@ -0,0 +1,145 @@
+"""
+Tests for the search API endpoint.
+"""
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.crud import search
+from app.main import app
+from app.models.post import Post as PostModel
+from app.models.topic import Topic as TopicModel
+
+client = TestClient(app)
+
+# Index sync (max updated_at and count per table), then the changed rows of
+# each table on the first search after a write
+COLD_SEARCH_QUERIES = 3
+WARM_SEARCH_QUERIES = 1
+
+
+@pytest.fixture
+def corpus(db: Session) -> Dict[str, str]:
+    """Create a small set of topics and posts to search."""
+    topic = TopicModel(name="Python Programming", slug="python-programming",
+                       description="Guides about snakes, code and tooling")
+    db.add(topic)
+    db.flush()
+    posts = [
+        PostModel(title="Getting started with Python", slug="getting-started",
+                  excerpt="A first look", content="Install Python and write your first script.",
+                  status="published", topic_id=topic.id, seo_keywords=["beginner"]),
+        PostModel(title="Rust ownership", slug="rust-ownership",
+                  content="Rust has ownership and borrowing, which Python does not.",
+                  status="draft"),
+        PostModel(title="Baking bread", slug="baking-bread",
+                  content="Flour, water, salt and patience.", status="published"),
+    ]
+    db.add_all(posts)
+    db.commit()
+    return {"topic": str(topic.id), **{p.slug: str(p.id) for p in posts}}
+
+
+def _search(**params):
+    response = client.get("/api/v1/search/", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_ranks_and_highlights(corpus: Dict[str, str], max_queries) -> None:
+    """Test that title matches rank first and snippets mark the words."""
+    with max_queries(COLD_SEARCH_QUERIES):
+        data = _search(q="python")
+    assert data["match"] == "fulltext"
+    ids = [item["id"] for item in data["items"]]
+    assert ids[0] in (corpus["getting-started"], corpus["topic"])
+    assert set(ids) == {corpus["getting-started"], corpus["rust-ownership"], corpus["topic"]}
+    assert all("<mark>" in (item["snippet"] or "") for item in data["items"]
+               if item["id"] != corpus["topic"])
+    assert data["next_offset"] is None
+
+    with max_queries(WARM_SEARCH_QUERIES):
+        _search(q="python")
+
+
+def test_search_covers_keywords_and_topics(corpus: Dict[str, str]) -> None:
+    """Test that SEO keywords and topic descriptions are searched."""
+    assert [i["id"] for i in _search(q="beginners")["items"]] == [corpus["getting-started"]]
+    hits = _search(q="snakes")["items"]
+    assert [(i["type"], i["id"]) for i in hits] == [("topic", corpus["topic"])]
+
+
+def test_search_filters(corpus: Dict[str, str]) -> None:
+    """Test the type and status filters and query operators."""
+    assert {i["type"] for i in _search(q="python", type="post")["items"]} == {"post"}
+    assert {i["type"] for i in _search(q="python", type="topic")["items"]} == {"topic"}
+    published = _search(q="python", type="post", status="published")["items"]
+    assert [i["id"] for i in published] == [corpus["getting-started"]]
+    assert [i["id"] for i in _search(q="python -rust", type="post")["items"]] == [
+        corpus["getting-started"]
+    ]
+
+
+def test_search_pagination(corpus: Dict[str, str]) -> None:
+    """Test that offset paging visits every hit once."""
+    first = _search(q="python", limit=2)
+    assert len(first["items"]) == 2
+    assert first["next_offset"] == 2
+    second = _search(q="python", limit=2, offset=2)
+    assert len(second["items"]) == 1
+    assert second["next_offset"] is None
+    seen = [i["id"] for i in first["items"] + second["items"]]
+    assert len(set(seen)) == 3
+
+
+def test_search_fuzzy_fallback(corpus: Dict[str, str]) -> None:
+    """Test that a misspelled title word still finds the post."""
+    data = _search(q="bakin")
+    assert data["match"] == "fuzzy"
+    assert [i["id"] for i in data["items"]] == [corpus["baking-bread"]]
+    assert _search(q="bakin", fuzzy=False)["items"] == []
+
+
+def test_search_sees_writes(corpus: Dict[str, str]) -> None:
+    """Test that creates, updates and deletes show up in the next search."""
+    assert _search(q="sourdough")["match"] == "fuzzy"
+    client.put(f"/api/v1/posts/{corpus['baking-bread']}", json={"content": "Sourdough starter"})
+    assert [i["id"] for i in _search(q="sourdough")["items"]] == [corpus["baking-bread"]]
+
+    client.delete(f"/api/v1/posts/{corpus['baking-bread']}")
+    data = _search(q="sourdough", fuzzy=False)
+    assert data["items"] == []
+
+
+def test_search_escapes_markup(db: Session) -> None:
+    """Test that markup in a post body is escaped in snippets, leaving only <mark> tags."""
+    db.add(PostModel(
+        title="Script tags", slug="script-tags", status="published",
+        content='Beware <script>alert("xss")</script> & keep <b>python</b> safe.',
+    ))
+    db.commit()
+    snippet = _search(q="python")["items"][0]["snippet"]
+    assert "<script>" not in snippet and "<b>" not in snippet
+    assert "&lt;script&gt;" in snippet and "&amp;" in snippet
+    assert "&lt;b&gt;<mark>python</mark>&lt;/b&gt;" in snippet
+
+    data = _search(q="scrip")
+    assert data["match"] == "fuzzy"
+    assert "&lt;script&gt;" in data["items"][0]["snippet"]
+
+
+def test_headline_markers_become_marks() -> None:
+    """Test that Postgres snippets are escaped before their match markers are marked up."""
+    raw = f"<i>{search._MATCH_START}Python{search._MATCH_STOP}</i> & more"
+    assert search._escape_snippet(raw) == "&lt;i&gt;<mark>Python</mark>&lt;/i&gt; &amp; more"
+    assert search._escape_snippet(None) is None
+
+
+def test_search_invalid_params() -> None:
+    """Test that bad parameters are rejected."""
+    assert client.get("/api/v1/search/?q=x&type=image").status_code == 400
+    assert client.get("/api/v1/search/?q=x&status=live").status_code == 400
+    assert client.get("/api/v1/search/?q=").status_code == 422
+    assert client.get("/api/v1/search/").status_code == 422
@@ -1,10 +1,11 @@
 """
 Tests for the topics API endpoints.
 """
+import json
 import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Dict
 
-import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
@@ -14,14 +15,27 @@ from app.schemas.topic import TopicCreate, TopicUpdate
 
 client = TestClient(app)
 
-def test_create_topic(db: Session) -> None:
+# SQL statement budgets per request, counted with a cold topic cache. Reads
+# may first compare the cache version stamp; writes bump it afterwards.
+GET_QUERIES = 2      # version check, row
+LIST_QUERIES = 3     # version check, ETag stamp (max updated_at + count), page
+CREATE_QUERIES = 5   # max rank, slug lookup, insert, version bump, refresh
+UPDATE_QUERIES = 5   # row, slug lookup, update, version bump, refresh
+DELETE_QUERIES = 4   # row, has-posts check, delete, version bump
+REORDER_QUERIES = 4  # existence check, ranks, one set-based update, version bump; any N
+MOVE_QUERIES = 5     # topics, shift/update, version bump, refresh
+BULK_QUERIES = 6     # slug lookups (2), max rank, insert, read-back, version bump
+EXPORT_QUERIES = 1
+
+def test_create_topic(db: Session, max_queries) -> None:
     """Test creating a new topic."""
     topic_data = {
         "name": "Test Topic",
         "description": "A test topic",
         "position": 1
     }
-    response = client.post("/api/v1/topics/", json=topic_data)
+    with max_queries(CREATE_QUERIES):
+        response = client.post("/api/v1/topics/", json=topic_data)
     assert response.status_code == 201
     data = response.json()
     assert data["name"] == topic_data["name"]
@@ -32,40 +46,44 @@ def test_create_topic(db: Session) -> None:
     assert "created_at" in data
     assert "updated_at" in data
 
-def test_read_topic(db: Session, test_topic: Dict) -> None:
+def test_read_topic(db: Session, test_topic: Dict, max_queries) -> None:
     """Test reading a topic by ID."""
-    response = client.get(f"/api/v1/topics/{test_topic['id']}")
+    with max_queries(GET_QUERIES):
+        response = client.get(f"/api/v1/topics/{test_topic['id']}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == test_topic["id"]
     assert data["name"] == test_topic["name"]
     assert data["slug"] == test_topic["slug"]
 
-def test_read_topic_not_found() -> None:
+def test_read_topic_not_found(max_queries) -> None:
     """Test reading a non-existent topic."""
     non_existent_id = str(uuid.uuid4())
-    response = client.get(f"/api/v1/topics/{non_existent_id}")
+    with max_queries(GET_QUERIES):
+        response = client.get(f"/api/v1/topics/{non_existent_id}")
     assert response.status_code == 404
 
-def test_list_topics(db: Session, test_topic: Dict) -> None:
+def test_list_topics(db: Session, test_topic: Dict, max_queries) -> None:
     """Test listing topics."""
-    response = client.get("/api/v1/topics/")
+    with max_queries(LIST_QUERIES):
+        response = client.get("/api/v1/topics/")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data["items"], list)
     assert len(data["items"]) > 0
     assert any(topic["id"] == test_topic["id"] for topic in data["items"])
 
-def test_update_topic(db: Session, test_topic: Dict) -> None:
+def test_update_topic(db: Session, test_topic: Dict, max_queries) -> None:
     """Test updating a topic."""
     update_data = {
         "name": "Updated Topic Name",
         "description": "Updated description"
     }
-    response = client.put(
-        f"/api/v1/topics/{test_topic['id']}",
-        json=update_data
-    )
+    with max_queries(UPDATE_QUERIES):
+        response = client.put(
+            f"/api/v1/topics/{test_topic['id']}",
+            json=update_data
+        )
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == update_data["name"]
@@ -73,7 +91,7 @@ def test_update_topic(db: Session, test_topic: Dict) -> None:
     assert data["id"] == test_topic["id"]
     assert data["slug"] != test_topic["slug"]  # Slug should be updated
 
-def test_delete_topic(db: Session, test_topic: Dict) -> None:
+def test_delete_topic(db: Session, test_topic: Dict, max_queries) -> None:
     """Test deleting a topic."""
     # First create a topic to delete
     topic_data = {
@@ -85,14 +103,26 @@ def test_delete_topic(db: Session, test_topic: Dict) -> None:
     topic_id = create_response.json()["id"]
     
     # Now delete it
-    delete_response = client.delete(f"/api/v1/topics/{topic_id}")
+    with max_queries(DELETE_QUERIES):
+        delete_response = client.delete(f"/api/v1/topics/{topic_id}")
     assert delete_response.status_code == 204
     
     # Verify it's gone
     get_response = client.get(f"/api/v1/topics/{topic_id}")
     assert get_response.status_code == 404
 
-def test_reorder_topics(db: Session, test_topics: list) -> None:
+def test_delete_topic_with_posts(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test that a topic with posts can't be deleted."""
+    from app.models.post import Post as PostModel
+    
+    db.add(PostModel(title="Post", slug="post", topic_id=uuid.UUID(test_topic["id"])))
+    db.commit()
+    with max_queries(DELETE_QUERIES):
+        response = client.delete(f"/api/v1/topics/{test_topic['id']}")
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/topics/{test_topic['id']}").status_code == 200
+
+def test_reorder_topics(db: Session, test_topics: list, max_queries) -> None:
     """Test reordering topics."""
     # Get current order
     response = client.get("/api/v1/topics/")
@@ -103,7 +133,8 @@ def test_reorder_topics(db: Session, test_topics: list) -> None:
     new_order = list(reversed(original_order))
     
     # Reorder
-    response = client.post("/api/v1/topics/reorder/", json=new_order)
+    with max_queries(REORDER_QUERIES):
+        response = client.post("/api/v1/topics/reorder/", json=new_order)
     assert response.status_code == 200
     
     # Verify new order
@@ -111,3 +142,221 @@ def test_reorder_topics(db: Session, test_topics: list) -> None:
     assert response.status_code == 200
     updated_order = [t["id"] for t in response.json()["items"]]
     assert updated_order == new_order
+
+def test_reorder_query_count_is_constant(db: Session, max_queries) -> None:
+    """Test that reordering issues the same statements for 3 or 300 topics."""
+    for count in (3, 300):
+        created = client.post(
+            "/api/v1/topics/bulk",
+            json={"items": [{"name": f"Reorder {count} {i}"} for i in range(count)]},
+        ).json()
+        ids = [r["id"] for r in created["results"]]
+        with max_queries(REORDER_QUERIES):
+            response = client.post("/api/v1/topics/reorder/", json=list(reversed(ids)))
+        assert response.status_code == 200
+
+def test_create_topic_duplicate_name_gets_suffix(
+    db: Session, test_topic: Dict, max_queries
+) -> None:
+    """Test that creating a topic with a taken name suffixes its slug."""
+    with max_queries(CREATE_QUERIES):
+        response = client.post("/api/v1/topics/", json={"name": test_topic["name"]})
+    assert response.status_code == 201
+    assert response.json()["slug"] == f"{test_topic['slug']}-1"
+
+def test_create_topic_name_without_slug(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test that names with nothing to slugify are rejected like in bulk creates."""
+    with max_queries(0):
+        response = client.post("/api/v1/topics/", json={"name": "!!!"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Name does not produce a valid slug"
+
+    response = client.put(f"/api/v1/topics/{test_topic['id']}", json={"name": "???"})
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/topics/{test_topic['id']}").json()["slug"] == test_topic["slug"]
+
+def test_reorder_topics_missing_id(db: Session, test_topics: list, max_queries) -> None:
+    """Test that reordering with an unknown ID is rejected."""
+    missing_id = str(uuid.uuid4())
+    with max_queries(1):
+        response = client.post(
+            "/api/v1/topics/reorder/", json=[test_topics[0]["id"], missing_id]
+        )
+    assert response.status_code == 404
+    assert missing_id in response.json()["detail"]
+
+def test_reorder_topics_duplicate_ids(db: Session, test_topics: list, max_queries) -> None:
+    """Test that reordering with a repeated ID is rejected."""
+    topic_id = test_topics[0]["id"]
+    with max_queries(0):
+        response = client.post("/api/v1/topics/reorder/", json=[topic_id, topic_id])
+    assert response.status_code == 400
+
+def _topic_order() -> list:
+    return [t["id"] for t in client.get("/api/v1/topics/").json()["items"]]
+
+def test_move_topic_after(db: Session, test_topics: list, max_queries) -> None:
+    """Test moving a topic down, after another topic."""
+    ids = [t["id"] for t in test_topics]
+    with max_queries(MOVE_QUERIES):
+        response = client.post(
+            f"/api/v1/topics/{ids[0]}/move", json={"after_id": ids[2]}
+        )
+    assert response.status_code == 200
+    assert _topic_order() == [ids[1], ids[2], ids[0], ids[3], ids[4]]
+
+def test_move_topic_before(db: Session, test_topics: list, max_queries) -> None:
+    """Test moving a topic up, before another topic."""
+    ids = [t["id"] for t in test_topics]
+    with max_queries(MOVE_QUERIES):
+        response = client.post(
+            f"/api/v1/topics/{ids[4]}/move", json={"before_id": ids[1]}
+        )
+    assert response.status_code == 200
+    assert _topic_order() == [ids[0], ids[4], ids[1], ids[2], ids[3]]
+
+def test_move_topic_invalid(db: Session, test_topics: list, max_queries) -> None:
+    """Test move requests without a valid neighbour."""
+    topic_id = test_topics[0]["id"]
+    with max_queries(0):
+        assert client.post(f"/api/v1/topics/{topic_id}/move", json={}).status_code == 400
+    response = client.post(
+        f"/api/v1/topics/{topic_id}/move", json={"after_id": topic_id}
+    )
+    assert response.status_code == 400
+    response = client.post(
+        f"/api/v1/topics/{topic_id}/move", json={"after_id": str(uuid.uuid4())}
+    )
+    assert response.status_code == 404
+
+def test_create_topics_are_ranked_in_order(db: Session) -> None:
+    """Test that new topics are ranked after existing ones."""
+    created = [
+        client.post("/api/v1/topics/", json={"name": f"Ranked {i}"}).json()
+        for i in range(3)
+    ]
+    ranks = [t["rank"] for t in created]
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == 3
+    data = client.get("/api/v1/topics/", params={"order_by": "rank"}).json()
+    assert [t["id"] for t in data["items"]] == [t["id"] for t in created]
+
+def test_move_topic_rank_mode(
+    db: Session, test_topics: list, monkeypatch, max_queries
+) -> None:
+    """Test moving a topic when the router runs in rank order mode."""
+    from app.api.v1.routers import topics as topics_router
+
+    monkeypatch.setattr(topics_router, "TOPIC_ORDER_MODE", "rank")
+    ids = [t["id"] for t in test_topics]
+    client.post("/api/v1/topics/reorder/", json=ids)
+    with max_queries(MOVE_QUERIES):
+        response = client.post(f"/api/v1/topics/{ids[4]}/move", json={"after_id": ids[0]})
+    assert response.status_code == 200
+    order = client.get("/api/v1/topics/", params={"order_by": "rank"}).json()["items"]
+    assert [t["id"] for t in order] == [ids[0], ids[4], ids[1], ids[2], ids[3]]
+
+def test_update_topic_invalid_rank(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test that malformed ranks are rejected."""
+    with max_queries(0):
+        response = client.put(f"/api/v1/topics/{test_topic['id']}", json={"rank": "a0"})
+    assert response.status_code == 422
+
+def test_bulk_create_topics_insert(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test bulk insert suffixes taken slugs, including within the batch."""
+    payload = {
+        "items": [
+            {"name": "Bulk One", "description": "first"},
+            {"name": test_topic["name"]},
+            {"name": "Bulk One"},
+        ]
+    }
+    with max_queries(BULK_QUERIES):
+        response = client.post("/api/v1/topics/bulk", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert [r["slug"] for r in data["results"]] == [
+        "bulk-one", f"{test_topic['slug']}-1", "bulk-one-1"
+    ]
+    topic = client.get(f"/api/v1/topics/{data['results'][0]['id']}").json()
+    assert topic["description"] == "first"
+
+def test_bulk_create_topics_skip_existing(
+    db: Session, test_topic: Dict, max_queries
+) -> None:
+    """Test skip-existing leaves existing topics alone."""
+    payload = {
+        "mode": "skip-existing",
+        "items": [{"name": test_topic["name"]}, {"name": "Brand New"}],
+    }
+    with max_queries(BULK_QUERIES):
+        data = client.post("/api/v1/topics/bulk", json=payload).json()
+    assert [r["status"] for r in data["results"]] == ["skipped", "created"]
+    assert data["results"][0]["id"] == test_topic["id"]
+
+def test_bulk_create_topics_upsert(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test upsert updates existing topics and reports duplicates."""
+    payload = {
+        "mode": "upsert",
+        "items": [
+            {"name": test_topic["name"], "description": "Upserted", "position": 7},
+            {"name": "Upsert New"},
+            {"name": "Upsert New"},
+        ],
+    }
+    with max_queries(BULK_QUERIES):
+        data = client.post("/api/v1/topics/bulk", json=payload).json()
+    assert [r["status"] for r in data["results"]] == ["updated", "created", "error"]
+    assert data["results"][0]["id"] == test_topic["id"]
+    topic = client.get(f"/api/v1/topics/{test_topic['id']}").json()
+    assert topic["description"] == "Upserted"
+    assert topic["position"] == 7
+
+def test_bulk_create_topics_invalid(db: Session) -> None:
+    """Test bulk requests with bad modes, empty lists and unsluggable names."""
+    assert client.post(
+        "/api/v1/topics/bulk", json={"mode": "replace", "items": [{"name": "x"}]}
+    ).status_code == 422
+    assert client.post("/api/v1/topics/bulk", json={"items": []}).status_code == 422
+    data = client.post("/api/v1/topics/bulk", json={"items": [{"name": "!!!"}]}).json()
+    assert data["failed"] == 1
+    assert data["results"][0]["status"] == "error"
+
+def test_export_topics_ndjson(db: Session, test_topics: list, max_queries) -> None:
+    """Test streaming every topic as NDJSON."""
+    with max_queries(EXPORT_QUERIES):
+        response = client.get("/api/v1/topics/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["id"] for r in rows) == sorted(t["id"] for t in test_topics)
+    assert set(rows[0]) >= {"id", "name", "slug", "rank", "updated_at"}
+
+def test_export_topics_csv_columns(db: Session, test_topics: list) -> None:
+    """Test CSV export with a column selection."""
+    response = client.get("/api/v1/topics/export?format=csv&columns=name,slug")
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "name,slug"
+    assert len(lines) == 1 + len(test_topics)
+    assert "Test Topic 1,test-topic-1" in lines
+
+def test_export_topics_updated_since(db: Session, test_topics: list) -> None:
+    """Test that updated_since only exports rows changed after the cutoff."""
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+    db.query(TopicModel).filter(TopicModel.id == uuid.UUID(test_topics[0]["id"])).update(
+        {"updated_at": cutoff + timedelta(minutes=1)}, synchronize_session=False
+    )
+    db.commit()
+    response = client.get(
+        "/api/v1/topics/export", params={"updated_since": cutoff.isoformat(), "columns": "id"}
+    )
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [
+        test_topics[0]["id"]
+    ]
+
+def test_export_topics_invalid_params(db: Session) -> None:
+    """Test that unknown formats and columns are rejected."""
+    assert client.get("/api/v1/topics/export?format=xml").status_code == 400
+    assert client.get("/api/v1/topics/export?columns=name,password").status_code == 400
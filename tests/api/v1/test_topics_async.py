@@ -0,0 +1,206 @@
+"""
+Tests for the async topics API endpoints.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud
+from app.api.v1.routers import topics, topics_async
+from app.api.v1.routers.feeds import get_feed_generator
+from app.db import routing
+from app.db.database import Base, get_async_db, to_async_url
+from app.models.topic import Topic
+from app.publishing import FeedGenerator
+from app.schemas.post import PostCreate
+
+async_engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+AsyncTestingSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def override_get_async_db():
+    """Override the get_async_db dependency for testing."""
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
+async def _reset_tables() -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def _run_sync(fn, *args):
+    """Run a sync CRUD function on a fresh async session, as the handlers do."""
+    async def _run():
+        async with AsyncTestingSessionLocal() as db:
+            return await db.run_sync(fn, *args)
+    return asyncio.get_event_loop().run_until_complete(_run())
+
+
+# Async routes first, as app.main mounts them when USE_ASYNC_DB is set
+async_app = FastAPI()
+async_app.include_router(topics_async.router, prefix="/api/v1/topics")
+async_app.include_router(topics.router, prefix="/api/v1/topics")
+async_app.dependency_overrides[get_async_db] = override_get_async_db
+async_app.dependency_overrides[get_feed_generator] = lambda: None
+
+
+@pytest.fixture(scope="module", autouse=True)
+def dispose_async_engine():
+    """Close the aiosqlite connection (and its thread) after these tests."""
+    yield
+    asyncio.get_event_loop().run_until_complete(async_engine.dispose())
+
+
+@pytest.fixture
+def async_client():
+    """Test client for an app serving topics from the async handlers."""
+    with TestClient(async_app) as client:
+        asyncio.get_event_loop().run_until_complete(_reset_tables())
+        yield client
+
+
+def test_to_async_url() -> None:
+    """Test mapping sync URLs onto async drivers."""
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert to_async_url("postgresql+asyncpg://h/db") == "postgresql+asyncpg://h/db"
+
+
+def test_async_topic_crud(async_client: TestClient) -> None:
+    """Test create, read, update and delete through the async handlers."""
+    response = async_client.post("/api/v1/topics/", json={"name": "Async Topic"})
+    assert response.status_code == 201
+    topic = response.json()
+    assert topic["slug"] == "async-topic"
+
+    response = async_client.get(f"/api/v1/topics/{topic['id']}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Async Topic"
+
+    response = async_client.put(
+        f"/api/v1/topics/{topic['id']}", json={"name": "Renamed Async"}
+    )
+    assert response.status_code == 200
+    assert response.json()["slug"] == "renamed-async"
+
+    assert async_client.delete(f"/api/v1/topics/{topic['id']}").status_code == 204
+    assert async_client.get(f"/api/v1/topics/{topic['id']}").status_code == 404
+
+
+def test_async_list_topics_cursor(async_client: TestClient) -> None:
+    """Test keyset pagination and totals through the async list handler."""
+    for i in range(5):
+        async_client.post("/api/v1/topics/", json={"name": f"Async {i}", "position": i})
+
+    data = async_client.get("/api/v1/topics/", params={"limit": 3}).json()
+    assert data["total"] == 5
+    assert len(data["items"]) == 3
+    rest = async_client.get(
+        "/api/v1/topics/", params={"limit": 3, "cursor": data["next_cursor"]}
+    ).json()
+    assert [t["name"] for t in data["items"] + rest["items"]] == [
+        f"Async {i}" for i in range(5)
+    ]
+    assert rest["next_cursor"] is None
+
+
+def test_async_create_topic_name_without_slug(async_client: TestClient) -> None:
+    """Test that the async handler rejects names with nothing to slugify."""
+    response = async_client.post("/api/v1/topics/", json={"name": "!!!"})
+    assert response.status_code == 400
+
+
+def test_async_read_topic_not_found(async_client: TestClient) -> None:
+    """Test reading a missing topic through the async handler."""
+    response = async_client.get(f"/api/v1/topics/{uuid.uuid4()}")
+    assert response.status_code == 404
+    assert async_client.get("/api/v1/topics/not-a-uuid").status_code == 404
+
+
+def test_async_reads_revalidate_by_etag(async_client: TestClient) -> None:
+    """Test that the async list and get handlers send ETags and answer 304s."""
+    topic = async_client.post("/api/v1/topics/", json={"name": "Cached"}).json()
+
+    for path in ("/api/v1/topics/", f"/api/v1/topics/{topic['id']}"):
+        response = async_client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        response = async_client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+
+def test_async_reads_use_replicas(async_client: TestClient, tmp_path, monkeypatch) -> None:
+    """Test that the async read handlers are routed to a replica."""
+    monkeypatch.setattr(crud.topic.topic_cache, "enabled", False)
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+
+    async def _seed_replica() -> None:
+        async with replica.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(Topic.__table__.insert().values(
+                id=uuid.uuid4(), name="Replica", slug="replica"
+            ))
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(_seed_replica())
+    monkeypatch.setattr(
+        routing, "_async_replica_router", routing.AsyncReplicaRouter([replica])
+    )
+    try:
+        async_client.post("/api/v1/topics/", json={"name": "Primary"})
+        names = [t["name"] for t in async_client.get("/api/v1/topics/").json()["items"]]
+        assert names == ["Replica"]
+        response = async_client.get(
+            "/api/v1/topics/", headers={routing.READ_YOUR_WRITES_HEADER: "1"}
+        )
+        assert [t["name"] for t in response.json()["items"]] == ["Primary"]
+    finally:
+        loop.run_until_complete(replica.dispose())
+
+
+def test_async_create_schedules_rebalance(async_client: TestClient, monkeypatch) -> None:
+    """Test that a create with an overlong rank respaces ranks after the response."""
+    calls = []
+    rebalance = crud.topic_order.rebalance_topic_ranks
+    monkeypatch.setattr(crud.topic_order, "needs_rebalance", lambda topic: True)
+    monkeypatch.setattr(
+        crud.topic_order, "rebalance_topic_ranks", lambda db: calls.append(rebalance(db))
+    )
+    assert async_client.post("/api/v1/topics/", json={"name": "Ranked"}).status_code == 201
+    assert len(calls) == 1
+
+
+def test_async_rename_updates_the_feeds(async_client: TestClient, tmp_path) -> None:
+    """Test that renaming a topic through the async handler moves its feed files."""
+    generator = FeedGenerator(str(tmp_path))
+    async_app.dependency_overrides[get_feed_generator] = lambda: generator
+    try:
+        topic = async_client.post("/api/v1/topics/", json={"name": "Tech"}).json()
+        _run_sync(crud.post.create_post, PostCreate(
+            title="Tech Post", status="published", published_at=datetime(2025, 1, 1),
+            topic_id=topic["id"],
+        ))
+        _run_sync(generator.load)
+        assert (tmp_path / "topics/tech/rss.xml").exists()
+
+        response = async_client.put(f"/api/v1/topics/{topic['id']}", json={"name": "Science"})
+        assert response.status_code == 200
+        assert not (tmp_path / "topics/tech/rss.xml").exists()
+        assert (tmp_path / "topics/science/rss.xml").exists()
+    finally:
+        async_app.dependency_overrides[get_feed_generator] = lambda: None
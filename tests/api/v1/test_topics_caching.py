@@ -0,0 +1,76 @@
+"""
+Tests for ETags, conditional requests and the fast list encoding of topics.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.utils import http_cache
+
+client = TestClient(app)
+
+# SQL statement budgets per request, counted with a cold topic cache. Reads
+# may first compare the cache version stamp.
+GET_QUERIES = 2      # version check, row
+LIST_QUERIES = 3     # version check, ETag stamp (max updated_at + count), page
+
+def test_read_topic_not_modified(db: Session, test_topic: Dict, max_queries) -> None:
+    """Test that a matching If-None-Match on a topic returns 304."""
+    url = f"/api/v1/topics/{test_topic['id']}"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+    assert "max-age" in first.headers["cache-control"]
+
+    with max_queries(GET_QUERIES):
+        second = client.get(url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    by_date = client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert by_date.status_code == 304
+
+    client.put(url, json={"description": "Changed"})
+    third = client.get(url, headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+def test_list_topics_not_modified(db: Session, test_topics: list, max_queries) -> None:
+    """Test list ETags change with writes and with the query string."""
+    first = client.get("/api/v1/topics/?limit=2")
+    etag = first.headers["etag"]
+
+    # Reason: a 304 is decided from the ETag stamp alone; no page is loaded
+    with max_queries(LIST_QUERIES - 1):
+        not_modified = client.get("/api/v1/topics/?limit=2", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert client.get("/api/v1/topics/?limit=3", headers={"If-None-Match": etag}).status_code == 200
+
+    client.delete(f"/api/v1/topics/{test_topics[-1]['id']}")
+    after_delete = client.get("/api/v1/topics/?limit=2", headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert after_delete.json()["total"] == 4
+
+def test_list_topics_revalidate_by_date_after_delete(db: Session, test_topics: list) -> None:
+    """Test that a list is never revalidated by date, which a delete doesn't move."""
+    first = client.get("/api/v1/topics/")
+    assert "last-modified" not in first.headers
+    since = http_cache.format_http_date(datetime.now(timezone.utc) + timedelta(minutes=1))
+
+    client.delete(f"/api/v1/topics/{test_topics[-1]['id']}")
+    response = client.get("/api/v1/topics/", headers={"If-Modified-Since": since})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == len(test_topics) - 1
+
+def test_list_items_match_topic_schema(db: Session, test_topics: list) -> None:
+    """Test the fast list path keeps the wire format of schemas.Topic."""
+    items = client.get("/api/v1/topics/").json()["items"]
+    for item in items:
+        detail = client.get(f"/api/v1/topics/{item['id']}").json()
+        assert list(item) == list(detail)
+        assert item == detail
@@ -0,0 +1,132 @@
+"""
+Tests for cursor pagination and totals on the topics list endpoint.
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.utils.pagination import encode_cursor
+
+client = TestClient(app)
+
+# SQL statement budgets per request, counted with a cold topic cache. Reads
+# may first compare the cache version stamp.
+LIST_QUERIES = 3     # version check, ETag stamp (max updated_at + count), page
+
+def test_list_topics_cursor_pagination(db: Session, test_topics: list, max_queries) -> None:
+    """Test walking the topic list page by page with a cursor."""
+    seen = []
+    response = client.get("/api/v1/topics/", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    seen.extend(t["id"] for t in data["items"])
+    while data["next_cursor"]:
+        with max_queries(LIST_QUERIES):
+            response = client.get(
+                "/api/v1/topics/", params={"limit": 2, "cursor": data["next_cursor"]}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(t["id"] for t in data["items"])
+    assert seen == [t["id"] for t in test_topics]
+
+def test_list_topics_cursor_desc_created_at(db: Session, test_topics: list) -> None:
+    """Test cursor pagination on created_at in descending order."""
+    params = {"limit": 3, "order_by": "created_at", "order": "desc"}
+    first = client.get("/api/v1/topics/", params=params).json()
+    assert len(first["items"]) == 3
+    second = client.get(
+        "/api/v1/topics/", params={**params, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(second["items"]) == 2
+    assert second["next_cursor"] is None
+    ids = [t["id"] for t in first["items"] + second["items"]]
+    assert len(set(ids)) == 5
+
+def test_list_topics_invalid_cursor(max_queries) -> None:
+    """Test that a malformed cursor is rejected."""
+    with max_queries(0):
+        response = client.get("/api/v1/topics/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("order_by, value, last_id", [
+    ("position", 1, "not-a-uuid"),
+    ("position", [1], str(uuid.uuid4())),
+    ("position", "1", str(uuid.uuid4())),
+    ("created_at", "yesterday", str(uuid.uuid4())),
+    ("created_at", 5, str(uuid.uuid4())),
+    ("name", None, str(uuid.uuid4())),
+])
+def test_list_topics_cursor_bad_key(order_by: str, value, last_id: str, max_queries) -> None:
+    """Test that a cursor whose ID or sort key doesn't fit the ordering is rejected."""
+    cursor = encode_cursor(order_by, "asc", value, last_id)
+    with max_queries(0):
+        response = client.get(
+            "/api/v1/topics/", params={"order_by": order_by, "cursor": cursor}
+        )
+    assert response.status_code == 400
+
+def test_list_topics_cursor_ordering_mismatch(db: Session, test_topics: list) -> None:
+    """Test that a cursor can't be reused with a different ordering."""
+    data = client.get("/api/v1/topics/", params={"limit": 2}).json()
+    response = client.get(
+        "/api/v1/topics/",
+        params={"limit": 2, "order": "desc", "cursor": data["next_cursor"]},
+    )
+    assert response.status_code == 400
+
+def test_list_topics_cursor_with_skip(db: Session, test_topics: list) -> None:
+    """Test that skip and cursor can't be combined."""
+    data = client.get("/api/v1/topics/", params={"limit": 2}).json()
+    response = client.get(
+        "/api/v1/topics/", params={"skip": 1, "cursor": data["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+def test_list_topics_total_strategies(db: Session, test_topics: list, max_queries) -> None:
+    """Test the exact, none and estimated total strategies."""
+    with max_queries(LIST_QUERIES):
+        data = client.get("/api/v1/topics/").json()
+    assert data["total"] == 5
+    assert data["total_strategy"] == "exact"
+
+    with max_queries(LIST_QUERIES):
+        data = client.get("/api/v1/topics/", params={"total": "none"}).json()
+    assert data["total"] is None
+    assert data["total_strategy"] == "none"
+    assert len(data["items"]) == 5
+
+    # SQLite has no planner statistics, so this falls back to an exact count
+    with max_queries(LIST_QUERIES + 1):
+        data = client.get("/api/v1/topics/", params={"total": "estimated"}).json()
+    assert data["total"] == 5
+    assert data["total_strategy"] == "exact"
+
+def test_list_topics_cached_total_invalidation(
+    db: Session, test_topics: list, max_queries
+) -> None:
+    """Test that the cached total is refreshed by creates and deletes."""
+    data = client.get("/api/v1/topics/", params={"total": "cached"}).json()
+    assert data["total"] == 5
+    assert data["total_strategy"] == "cached"
+
+    created = client.post("/api/v1/topics/", json={"name": "Cached Count Topic"})
+    assert created.status_code == 201
+    data = client.get("/api/v1/topics/", params={"total": "cached"}).json()
+    assert data["total"] == 6
+    # Reason: the count is cached now, so a repeat needs no COUNT(*)
+    with max_queries(LIST_QUERIES):
+        client.get("/api/v1/topics/", params={"total": "cached", "limit": 1})
+
+    client.delete(f"/api/v1/topics/{created.json()['id']}")
+    data = client.get("/api/v1/topics/", params={"total": "cached"}).json()
+    assert data["total"] == 5
+
+def test_list_topics_invalid_total_strategy(max_queries) -> None:
+    """Test that an unknown total strategy is rejected."""
+    with max_queries(0):
+        response = client.get("/api/v1/topics/", params={"total": "guess"})
+    assert response.status_code == 400
@@ -2,13 +2,18 @@
 Test configuration and fixtures.
 """
 import os
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import crud
+from app.api.v1.routers.feeds import get_feed_generator
 from app.db.database import Base, get_db
+from app.db.query_stats import track_queries
 from app.main import app
 
 # Use a test database URL from environment or fall back to SQLite in-memory
@@ -41,6 +46,9 @@ def override_get_db():
 # Override the get_db dependency in the app
 app.dependency_overrides[get_db] = override_get_db
 
+# Feed files are only written by the tests that ask for a generator
+app.dependency_overrides[get_feed_generator] = lambda: None
+
 @pytest.fixture(scope="session")
 def db():
     """Database session fixture."""
@@ -50,6 +58,42 @@ def db():
     finally:
         db.close()
 
+@pytest.fixture(autouse=True)
+def clean_tables(db):
+    """Remove all rows after each test so tests don't leak state."""
+    yield
+    db.rollback()
+    for table in reversed(Base.metadata.sorted_tables):
+        db.execute(table.delete())
+    db.commit()
+    crud.topic.invalidate_topic_count()
+    crud.topic.topic_cache.invalidate()
+    crud.search.reset_search_index()
+
+@pytest.fixture
+def max_queries():
+    """
+    Assert an upper bound on the SQL statements run inside a block.
+    
+    Usage::
+    
+        with max_queries(2):
+            client.get("/api/v1/topics/")
+    
+    Exceeding the bound fails the test with a numbered dump of every
+    statement, so N+1 loops are easy to spot.
+    """
+    @contextmanager
+    def guard(limit: int):
+        with track_queries(capture=True) as stats:
+            yield stats
+        if stats.count > limit:
+            pytest.fail(
+                f"Expected at most {limit} SQL statements, got {stats.count}:\n{stats.dump()}",
+                pytrace=False,
+            )
+    return guard
+
 @pytest.fixture(scope="function")
 def client():
     """Test client fixture."""
@@ -0,0 +1,52 @@
+"""
+Tests for the post list queries.
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud import post as post_crud
+
+TOPIC_ID = uuid.uuid4()
+
+# Filter/order combinations issued by the posts list endpoint
+LIST_VIEWS = [
+    {},
+    {"order": "asc"},
+    {"status": "draft"},
+    {"status": "published", "order_by": "published_at"},
+    {"status": "published", "order_by": "published_at", "published_after": datetime(2025, 1, 1)},
+    {"topic_id": TOPIC_ID},
+    {"topic_id": TOPIC_ID, "status": "draft"},
+    {"topic_id": TOPIC_ID, "status": "published", "order_by": "published_at"},
+    {"after": ("2025-01-01T00:00:00", str(uuid.uuid4()))},
+]
+
+
+def _query_plan(db: Session, statement) -> str:
+    """Return SQLite's EXPLAIN QUERY PLAN output for a statement."""
+    compiled = statement.compile(db.get_bind())
+    params = tuple(
+        str(value) if isinstance(value, uuid.UUID) else value
+        for value in (compiled.construct_params()[name] for name in compiled.positiontup)
+    )
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("view", LIST_VIEWS)
+def test_list_views_never_sort_in_memory(db: Session, view) -> None:
+    """Test that every list view reads an index in order instead of sorting."""
+    if db.get_bind().dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific")
+    plan = _query_plan(db, post_crud.posts_statement(**view))
+    assert "USING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_list_columns_leave_out_content() -> None:
+    """Test that list pages don't select the post body unless asked."""
+    assert "content" not in post_crud.posts_statement().selected_columns
+    assert "content" in post_crud.posts_statement(include_content=True).selected_columns
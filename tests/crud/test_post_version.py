@@ -0,0 +1,135 @@
+"""
+Tests for delta-compressed post versions.
+"""
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud import post as post_crud
+from app.crud import post_version as version_crud
+from app.models.post_version import PostVersion
+from app.schemas.post import PostCreate, PostUpdate
+
+INTERVAL = 5
+
+
+@pytest.fixture
+def small_interval(monkeypatch):
+    """Take a snapshot every INTERVAL versions so tests cross several."""
+    monkeypatch.setattr(version_crud, "POST_VERSION_SNAPSHOT_INTERVAL", INTERVAL)
+
+
+def _body(revision: int) -> str:
+    """Long body where each revision rewrites one paragraph."""
+    return "\n\n".join(
+        f"Paragraph {i}, revision {revision if i == revision % 40 else 0}" for i in range(40)
+    )
+
+
+def _edit(db: Session, db_post, **values):
+    return post_crud.update_post(db, db_post, PostUpdate(**values))
+
+
+def test_versions_round_trip(db: Session, small_interval) -> None:
+    """Test that every version rebuilds exactly, across snapshot boundaries."""
+    db_post = post_crud.create_post(db, PostCreate(title="Draft", content=_body(0)))
+    expected = {1: ("Draft", _body(0), None)}
+    for revision in range(1, 23):
+        title = f"Draft {revision // 10}"
+        excerpt = None if revision % 7 == 0 else f"Excerpt {revision}"
+        db_post = _edit(db, db_post, title=title, content=_body(revision), excerpt=excerpt)
+        expected[db_post.current_version] = (title, _body(revision), excerpt)
+
+    assert db_post.current_version == 23
+    for number, (title, content, excerpt) in expected.items():
+        version = version_crud.get_version(db, db_post.id, number)
+        assert (version["title"], version["content"], version["excerpt"]) == (
+            title, content, excerpt
+        )
+    assert version_crud.get_version(db, db_post.id, 24) is None
+
+
+def test_snapshots_every_interval(db: Session, small_interval) -> None:
+    """Test that only every INTERVAL-th version stores full texts."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content=_body(0)))
+    for revision in range(1, 12):
+        db_post = _edit(db, db_post, content=_body(revision))
+
+    rows = db.query(PostVersion).filter_by(post_id=db_post.id).order_by(
+        PostVersion.version_number
+    ).all()
+    assert [row.version_number for row in rows if row.is_snapshot] == [1, 6, 11]
+    delta_row = rows[1]
+    assert delta_row.content is None
+    assert set(delta_row.delta) == {"content"}
+    assert len(str(delta_row.delta)) < len(_body(1)) / 10
+
+
+def test_rewrite_is_stored_as_snapshot(db: Session) -> None:
+    """Test that a delta bigger than the texts is stored as a snapshot instead."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content="a\nb\nc"))
+    db_post = _edit(db, db_post, content="x" * 100)
+    latest = db.query(PostVersion).filter_by(post_id=db_post.id, version_number=2).one()
+    assert latest.is_snapshot
+    assert latest.content == "x" * 100
+
+
+def test_unchanged_texts_add_no_version(db: Session) -> None:
+    """Test that saves touching only other fields don't add versions."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content="Body"))
+    db_post = post_crud.publish_post(db, db_post)
+    db_post = _edit(db, db_post, seo_title="SEO")
+    assert db_post.current_version == 1
+
+
+def test_diff_versions_across_chains(db: Session, small_interval) -> None:
+    """Test diffing versions rebuilt from different snapshots."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content=_body(0)))
+    for revision in range(1, 13):
+        db_post = _edit(db, db_post, content=_body(revision))
+
+    diff = version_crud.diff_versions(db, db_post.id, 2, 12)
+    assert set(diff["changes"]) == {"content"}
+    assert "-Paragraph 1, revision 1" in diff["changes"]["content"].splitlines()
+    assert "+Paragraph 11, revision 11" in diff["changes"]["content"].splitlines()
+    assert version_crud.diff_versions(db, db_post.id, 12, 12)["changes"] == {}
+    assert version_crud.diff_versions(db, db_post.id, 1, 99) is None
+
+
+def test_get_version_reads_one_chain(db: Session, small_interval, max_queries) -> None:
+    """Test that rebuilding a version takes a single query."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content=_body(0)))
+    for revision in range(1, 20):
+        db_post = _edit(db, db_post, content=_body(revision))
+    post_id = db_post.id
+    db.expire_all()
+
+    with max_queries(1):
+        version = version_crud.get_version(db, post_id, 19)
+    assert version["content"] == _body(18)
+
+
+def test_locked_load_sees_concurrent_save(db: Session) -> None:
+    """Test that a post loaded for update numbers and diffs from the latest save."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content="Body"))
+    other = sessionmaker(bind=db.get_bind())()
+    try:
+        stale = other.get(type(db_post), db_post.id)
+        assert stale.current_version == 1
+        _edit(db, db_post, content="Body\nMine")
+
+        locked = post_crud.get_post(other, str(db_post.id), for_update=True)
+        assert locked is stale and locked.current_version == 2
+        saved = post_crud.update_post(other, locked, PostUpdate(content="Body\nMine\nTheirs"))
+        assert saved.current_version == 3
+    finally:
+        other.close()
+    assert version_crud.get_version(db, db_post.id, 2)["content"] == "Body\nMine"
+    assert version_crud.get_version(db, db_post.id, 3)["content"] == "Body\nMine\nTheirs"
+
+
+def test_delete_post_deletes_versions(db: Session) -> None:
+    """Test that a post's history goes with it."""
+    db_post = post_crud.create_post(db, PostCreate(title="Post", content="Body"))
+    db_post = _edit(db, db_post, content="Body\nMore")
+    post_crud.delete_post(db, db_post)
+    assert db.query(PostVersion).count() == 0
@@ -0,0 +1,83 @@
+"""
+Tests for cached topic reads.
+"""
+import uuid
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud import topic_cache
+from app.main import app
+from app.models.topic import Topic
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def check_version_every_read(monkeypatch):
+    """Compare the shared version stamp on every cached read."""
+    monkeypatch.setattr(crud.topic.topic_cache, "check_interval", 0)
+
+
+def _rename_directly(db: Session, topic_id: str, name: str) -> None:
+    """Change a topic without going through the CRUD layer."""
+    db.query(Topic).filter(Topic.id == uuid.UUID(topic_id)).update(
+        {"name": name}, synchronize_session=False
+    )
+    db.commit()
+
+
+def test_reads_are_served_from_cache(db: Session, test_topic: Dict) -> None:
+    """Test that a repeated read hits the cache instead of the database."""
+    first = topic_cache.get_topic(db, test_topic["id"])
+    _rename_directly(db, test_topic["id"], "Changed Behind The Cache")
+    second = topic_cache.get_topic(db, test_topic["id"])
+
+    assert first.name == second.name == test_topic["name"]
+    assert crud.topic.topic_cache.stats()["hits"] >= 1
+    assert topic_cache.get_topic(db, test_topic["id"], use_cache=False).name == (
+        "Changed Behind The Cache"
+    )
+
+
+def test_writes_invalidate_cached_pages(db: Session, test_topics: list) -> None:
+    """Test that API writes are visible to the next cached list read."""
+    assert len(client.get("/api/v1/topics/").json()["items"]) == 5
+    client.post("/api/v1/topics/", json={"name": "Sixth"})
+    assert len(client.get("/api/v1/topics/").json()["items"]) == 6
+
+    client.put(f"/api/v1/topics/{test_topics[0]['id']}", json={"name": "Renamed"})
+    assert client.get(f"/api/v1/topics/{test_topics[0]['id']}").json()["name"] == "Renamed"
+
+    client.delete(f"/api/v1/topics/{test_topics[1]['id']}")
+    assert len(client.get("/api/v1/topics/").json()["items"]) == 5
+
+
+def test_version_bump_from_another_worker(
+    db: Session, test_topic: Dict, check_version_every_read
+) -> None:
+    """Test that a version bump made elsewhere clears this process's entries."""
+    topic_cache.get_topic_by_slug(db, test_topic["slug"])
+    _rename_directly(db, test_topic["id"], "Changed By Another Worker")
+    assert topic_cache.get_topic_by_slug(db, test_topic["slug"]).name == test_topic["name"]
+
+    crud.cache_version.bump_cache_version(db, crud.topic.TOPIC_CACHE_NAME)
+    assert topic_cache.get_topic_by_slug(db, test_topic["slug"]).name == (
+        "Changed By Another Worker"
+    )
+
+
+def test_no_cache_header_bypasses_cache(db: Session, test_topic: Dict) -> None:
+    """Test that Cache-Control: no-cache reads straight from the database."""
+    client.get(f"/api/v1/topics/{test_topic['id']}")
+    _rename_directly(db, test_topic["id"], "Fresh Name")
+
+    cached = client.get(f"/api/v1/topics/{test_topic['id']}")
+    fresh = client.get(
+        f"/api/v1/topics/{test_topic['id']}", headers={"Cache-Control": "no-cache"}
+    )
+    assert cached.json()["name"] == test_topic["name"]
+    assert fresh.json()["name"] == "Fresh Name"
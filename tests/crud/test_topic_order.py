@@ -0,0 +1,81 @@
+"""
+Tests for topic ordering CRUD operations.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import topic_order
+from app.models.topic import Topic
+
+
+def _ids_by_rank(db: Session) -> list:
+    return [str(t.id) for t in db.query(Topic).order_by(Topic.rank, Topic.id).all()]
+
+
+def test_reorder_sets_ranks(db: Session, test_topics: list) -> None:
+    """Test that a full reorder also writes matching ranks."""
+    ids = [t["id"] for t in reversed(test_topics)]
+    assert topic_order.reorder_topics(db, ids)
+    db.expire_all()
+    assert _ids_by_rank(db) == ids
+
+
+def test_partial_reorder_keeps_unlisted_topics(db: Session, test_topics: list) -> None:
+    """Test that a partial reorder swaps only the listed topics' rank slots."""
+    ids = [t["id"] for t in test_topics]
+    topic_order.reorder_topics(db, ids)
+    db.expire_all()
+    assert topic_order.reorder_topics(db, [ids[3], ids[1]])
+    db.expire_all()
+    assert _ids_by_rank(db) == [ids[0], ids[3], ids[2], ids[1], ids[4]]
+
+
+def test_partial_reorder_with_tied_ranks(db: Session, test_topics: list) -> None:
+    """Test that a partial reorder over tied ranks respaces them in place."""
+    # Fixture topics all share the default rank
+    ids = _ids_by_rank(db)
+    assert topic_order.reorder_topics(db, [ids[3], ids[1]])
+    db.expire_all()
+    assert _ids_by_rank(db) == [ids[0], ids[3], ids[2], ids[1], ids[4]]
+
+
+def test_move_by_rank_updates_one_row(db: Session, test_topics: list) -> None:
+    """Test that a rank-mode move writes only the moved topic."""
+    ids = [t["id"] for t in test_topics]
+    topic_order.reorder_topics(db, ids)
+    db.expire_all()
+    topics = {str(t.id): t for t in db.query(Topic).all()}
+
+    updates = []
+
+    def _capture(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE TOPICS"):
+            updates.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        topic_order.move_topic(
+            db, topics[ids[0]], after=topics[ids[3]], mode="rank"
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    assert len(updates) == 1
+    assert _ids_by_rank(db) == [ids[1], ids[2], ids[3], ids[0], ids[4]]
+
+
+def test_move_by_rank_rebalances_tied_ranks(db: Session, test_topics: list) -> None:
+    """Test that a move between equal ranks rebalances first."""
+    # Fixture topics all share the default rank
+    topics = db.query(Topic).order_by(Topic.rank, Topic.id).all()
+    ids = [str(t.id) for t in topics]
+    moved = topic_order.move_topic(db, topics[4], before=topics[1], mode="rank")
+    assert len(moved.rank) <= 2
+    assert _ids_by_rank(db) == [ids[0], ids[4], ids[1], ids[2], ids[3]]
+
+
+def test_needs_rebalance() -> None:
+    """Test the rank length threshold."""
+    assert not topic_order.needs_rebalance(Topic(rank="V"))
+    assert topic_order.needs_rebalance(Topic(rank="z" * 40))
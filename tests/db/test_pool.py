@@ -0,0 +1,80 @@
+"""
+Tests for connection pool configuration and metrics.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from app.db import pool
+from app.main import app
+
+PG_URL = "postgresql://u:p@localhost/db"
+
+
+@pytest.fixture(autouse=True)
+def reset_pool_metrics():
+    """Start each test with empty pool counters."""
+    pool.pool_metrics.reset()
+    yield
+    pool.pool_metrics.reset()
+
+
+def test_engine_options_from_settings(monkeypatch) -> None:
+    """Test that pool settings are passed to create_engine."""
+    monkeypatch.setattr(pool, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(pool, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(pool, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    options = pool.engine_options(PG_URL)
+    assert options["poolclass"] is pool.InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_engine_options_external_pooler(monkeypatch) -> None:
+    """Test that an external pooler disables app pooling and prepared statements."""
+    monkeypatch.setattr(pool, "DB_EXTERNAL_POOLER", True)
+    assert pool.engine_options(PG_URL)["poolclass"] is NullPool
+    options = pool.async_engine_options("postgresql+asyncpg://u:p@localhost/db")
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+
+
+def test_engine_options_sqlite() -> None:
+    """Test that SQLite keeps its default pool."""
+    assert "poolclass" not in pool.engine_options("sqlite:///./app.db")
+
+
+def test_instrumented_pool_records_waits_and_failures() -> None:
+    """Test checkout wait and failure metrics."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=pool.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        connect_args={"check_same_thread": False},
+    )
+    first = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    status = pool.pool_status(engine)
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["checkout_failures"] == 1
+    assert status["wait_seconds"]["count"] == 1
+    first.close()
+    engine.dispose()
+
+
+def test_db_pool_health_endpoint() -> None:
+    """Test the pool metrics endpoint."""
+    response = TestClient(app).get("/api/health/db-pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert "checkout_failures" in data
+    assert "+Inf" in data["wait_seconds"]["buckets"]
@@ -0,0 +1,95 @@
+"""
+Tests for read-replica routing.
+"""
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.db import routing
+from app.db.database import Base
+from app.main import app
+from app.models.topic import Topic
+
+
+def _replica_engine(path, name: str):
+    """Create a SQLite file standing in for a replica, holding one topic."""
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Topic(name=name, slug=name.lower().replace(" ", "-")))
+    db.commit()
+    db.close()
+    return engine
+
+
+def _names(response) -> list:
+    return [t["name"] for t in response.json()["items"]]
+
+
+@pytest.fixture(autouse=True)
+def no_topic_cache(monkeypatch):
+    """Disable the topic cache so each read shows which database served it."""
+    monkeypatch.setattr(crud.topic.topic_cache, "enabled", False)
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    """Route reads to two SQLite replicas."""
+    engines = [
+        _replica_engine(tmp_path / "replica1.db", "Replica One"),
+        _replica_engine(tmp_path / "replica2.db", "Replica Two"),
+    ]
+    monkeypatch.setattr(routing, "replica_router", routing.ReplicaRouter(engines))
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+
+def test_reads_round_robin_over_replicas(db: Session, test_topic: Dict, replicas) -> None:
+    """Test that list reads alternate between replicas, not the primary."""
+    client = TestClient(app)
+    first = _names(client.get("/api/v1/topics/"))
+    second = _names(client.get("/api/v1/topics/"))
+    assert sorted([first, second]) == [["Replica One"], ["Replica Two"]]
+
+
+def test_read_your_writes_header(db: Session, test_topic: Dict, replicas) -> None:
+    """Test that the header forces reads to the primary."""
+    response = TestClient(app).get(
+        "/api/v1/topics/", headers={routing.READ_YOUR_WRITES_HEADER: "1"}
+    )
+    assert _names(response) == [test_topic["name"]]
+
+
+def test_read_your_writes_after_write(db: Session, replicas) -> None:
+    """Test that a client reads from the primary right after writing."""
+    client = TestClient(app)
+    created = client.post("/api/v1/topics/", json={"name": "Fresh Write"})
+    assert routing.READ_YOUR_WRITES_COOKIE in created.cookies
+    response = client.get(f"/api/v1/topics/{created.json()['id']}")
+    assert response.status_code == 200
+
+
+def test_failover_to_primary(db: Session, test_topic: Dict, tmp_path, monkeypatch) -> None:
+    """Test that an unreachable replica is skipped in favour of the primary."""
+    broken = create_engine(f"sqlite:///{tmp_path}/missing/dir/replica.db")
+    router = routing.ReplicaRouter([broken])
+    monkeypatch.setattr(routing, "replica_router", router)
+    response = TestClient(app).get("/api/v1/topics/")
+    assert _names(response) == [test_topic["name"]]
+    assert router._down_until[0] > 0
+    broken.dispose()
+
+
+def test_no_replicas_uses_primary(db: Session, test_topic: Dict) -> None:
+    """Test that reads use the primary when no replica is configured."""
+    assert routing.replica_router.engines == []
+    response = TestClient(app).get("/api/v1/topics/")
+    assert _names(response) == [test_topic["name"]]
+    assert routing.READ_YOUR_WRITES_COOKIE not in response.cookies
@@ -0,0 +1,101 @@
+"""
+Tests for the generated response cache and request keys.
+"""
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.generation import GenerationRequest
+from app.generation.cache import ResponseCache, cache_key
+from app.models.generation_cache import GenerationCacheEntry
+from app.utils.cache import MISSING
+
+TEMPLATE = "Write about {subject}.\n\nTone: {tone}\n"
+
+
+def _cache(db: Session, **options) -> ResponseCache:
+    return ResponseCache(sessionmaker(bind=db.get_bind()), **options)
+
+
+def test_key_ignores_layout() -> None:
+    """Test that prompts differing only in whitespace share a key."""
+    first = GenerationRequest.from_template(TEMPLATE, {"subject": "queues", "tone": "dry"})
+    second = GenerationRequest.from_template(
+        "Write about  {subject}.\r\n\r\nTone:\t{tone}   ", {"tone": " dry", "subject": "queues "}
+    )
+    assert first.key == second.key
+    assert GenerationRequest("a  b\n").key == GenerationRequest(" a b").key
+
+
+def test_key_covers_model_params_and_variables() -> None:
+    """Test that anything changing the output changes the key."""
+    base = GenerationRequest.from_template(
+        TEMPLATE, {"subject": "queues", "tone": "dry"}, params={"temperature": 0.7}
+    )
+    others = [
+        GenerationRequest.from_template(
+            TEMPLATE, {"subject": "caches", "tone": "dry"}, params={"temperature": 0.7}
+        ),
+        GenerationRequest.from_template(
+            TEMPLATE, {"subject": "queues", "tone": "dry"}, params={"temperature": 0.2}
+        ),
+        GenerationRequest.from_template(
+            TEMPLATE, {"subject": "queues", "tone": "dry"}, model="other",
+            params={"temperature": 0.7},
+        ),
+    ]
+    assert len({base.key} | {request.key for request in others}) == 4
+    assert cache_key("fake", base.key) != cache_key("openai", base.key)
+
+
+def test_round_trip_and_hit_rate(db: Session) -> None:
+    """Test that chunks come back as stored and lookups are counted."""
+    cache = _cache(db)
+    assert cache.get("a" * 64) is MISSING
+
+    cache.set("a" * 64, ["Hello", " world"])
+    assert cache.get("a" * 64) == ["Hello", " world"]
+    assert cache.get("a" * 64) == ["Hello", " world"]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 1, 1)
+    assert stats["hit_rate"] == round(2 / 3, 4)
+    row = db.get(GenerationCacheEntry, "a" * 64)
+    assert row.hits == 2 and row.size_bytes == 11
+
+
+def test_expired_entries_miss(db: Session) -> None:
+    """Test that entries past their TTL are dropped on read."""
+    cache = _cache(db, ttl=0.01)
+    cache.set("k", ["text"])
+    time.sleep(0.05)
+
+    assert cache.get("k") is MISSING
+    assert cache.stats()["expirations"] == 1
+    assert db.get(GenerationCacheEntry, "k") is None
+
+
+def test_size_eviction_drops_least_recently_used(db: Session) -> None:
+    """Test that eviction keeps the total size under max_bytes, LRU first."""
+    cache = _cache(db, max_bytes=250, evict_every=1000)
+    for name in ("old", "used", "new"):
+        cache.set(name, ["x" * 100])
+        time.sleep(0.01)
+    cache.get("used")
+
+    assert cache.evict() == 1
+    keys = set(db.execute(select(GenerationCacheEntry.key)).scalars())
+    assert keys == {"used", "new"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_runs_every_n_writes(db: Session) -> None:
+    """Test that writes trigger eviction passes on their own."""
+    cache = _cache(db, max_bytes=30, evict_every=2)
+    for i in range(4):
+        cache.set(f"k{i}", ["x" * 10])
+        time.sleep(0.01)
+
+    keys = set(db.execute(select(GenerationCacheEntry.key)).scalars())
+    assert keys == {"k1", "k2", "k3"}
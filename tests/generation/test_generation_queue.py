@@ -0,0 +1,222 @@
+"""
+Tests for the in-process generation queue.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.generation import (
+    FakeProvider, GenerationError, GenerationQueue, GenerationRequest, QueueFullError, RateLimiter
+)
+from app.utils.cache import LRUCache
+
+
+@pytest.fixture
+def make_queue():
+    """Build queues around fake providers and stop them after the test."""
+    queues = []
+
+    def make(provider=None, **options):
+        options.setdefault("retry_base", 0.01)
+        queue = GenerationQueue({"fake": provider or FakeProvider()}, default_provider="fake",
+                                **options)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.stop()
+
+
+def _request(prompt: str = "Write about queues", **params) -> GenerationRequest:
+    return GenerationRequest(prompt, params={"max_tokens": 30, **params})
+
+
+def test_job_succeeds(make_queue) -> None:
+    """Test that a job runs in the background and hooks see every status."""
+    statuses, results = [], []
+    queue = make_queue(
+        on_status=lambda job: statuses.append(job.status),
+        on_result=lambda job, text: results.append((job.owner, text)),
+    )
+    request = _request()
+    job, coalesced = queue.submit(request, owner="post-1")
+
+    assert not coalesced
+    assert queue.wait(job.id, timeout=5).status == "succeeded"
+    assert job.text == FakeProvider.text_for(request)
+    assert job.attempts == 1 and job.finished_at is not None
+    assert statuses == ["queued", "running", "succeeded"]
+    assert results == [("post-1", job.text)]
+
+
+def test_duplicate_requests_coalesce(make_queue) -> None:
+    """Test that identical pending requests share one provider call."""
+    provider = FakeProvider(latency=0.1, max_batch_size=1)
+    queue = make_queue(provider)
+    request = _request()
+
+    first, _ = queue.submit(request, owner="post-1")
+    again, again_coalesced = queue.submit(_request(), owner="post-1")
+    other, other_coalesced = queue.submit(_request(), owner="post-2")
+
+    assert again is first and again_coalesced
+    assert other is not first and other_coalesced
+    assert queue.wait(other.id, timeout=5).text == queue.wait(first.id, timeout=5).text
+    assert provider.calls == 1
+    # Once finished, the same request runs again
+    fresh, coalesced = queue.submit(request, owner="post-1")
+    assert fresh is not first and not coalesced
+
+
+def test_retryable_errors_are_retried(make_queue) -> None:
+    """Test that retryable failures back off and try again."""
+    provider = FakeProvider(fail_first=2)
+    queue = make_queue(provider, max_attempts=3)
+    job, _ = queue.submit(_request())
+
+    assert queue.wait(job.id, timeout=5).status == "succeeded"
+    assert job.attempts == 3
+    assert queue.stats()["retries"] == 2
+
+
+def test_retries_give_up(make_queue) -> None:
+    """Test that a request failing every attempt ends failed."""
+    queue = make_queue(FakeProvider(fail_first=10), max_attempts=2)
+    job, _ = queue.submit(_request())
+
+    assert queue.wait(job.id, timeout=5).status == "failed"
+    assert job.attempts == 2
+    assert "after 2 attempts" in job.error
+    assert job.text is None
+
+
+def test_permanent_errors_fail_at_once(make_queue) -> None:
+    """Test that non-retryable provider errors are not retried."""
+    class Broken(FakeProvider):
+        async def stream(self, request):
+            raise GenerationError("Bad request")
+            yield  # pragma: no cover
+
+    queue = make_queue(Broken(max_batch_size=1))
+    job, _ = queue.submit(_request())
+
+    assert queue.wait(job.id, timeout=5).status == "failed"
+    assert job.error == "Bad request" and job.attempts == 1
+
+
+def test_result_hook_failure_fails_job(make_queue) -> None:
+    """Test that a job whose output can't be applied is marked failed."""
+    def on_result(job, text):
+        raise LookupError("Post gone")
+
+    queue = make_queue(on_result=on_result)
+    job, _ = queue.submit(_request())
+
+    assert queue.wait(job.id, timeout=5).status == "failed"
+    assert job.error == "Post gone"
+
+
+def test_requests_are_batched(make_queue) -> None:
+    """Test that compatible requests queued together share provider calls."""
+    provider = FakeProvider(latency=0.05, max_concurrency=1, max_batch_size=4)
+    queue = make_queue(provider, batch_window=0.05)
+    jobs = [queue.submit(_request(f"Post {i}"))[0] for i in range(8)]
+    # A different temperature can't join the others' batches
+    odd, _ = queue.submit(_request("Post 0", temperature=0.2))
+
+    for job in jobs + [odd]:
+        assert queue.wait(job.id, timeout=5).status == "succeeded"
+        assert job.text == FakeProvider.text_for(job.request)
+    assert sum(provider.batch_sizes) == 9
+    assert max(provider.batch_sizes) == 4
+    assert provider.calls < 9
+
+
+def test_queue_full(make_queue) -> None:
+    """Test that submit refuses work beyond max_queued pending requests."""
+    queue = make_queue(FakeProvider(latency=0.2), max_queued=2)
+    queue.submit(_request("a"))
+    queue.submit(_request("b"))
+    with pytest.raises(QueueFullError):
+        queue.submit(_request("c"))
+    # Coalescing with a pending request needs no room
+    queue.submit(_request("a"), owner="post-9")
+
+
+def test_unknown_provider(make_queue) -> None:
+    """Test that unknown providers are rejected at submit time."""
+    with pytest.raises(KeyError):
+        make_queue().submit(_request(), provider="nope")
+
+
+def test_events_stream_tokens(make_queue) -> None:
+    """Test that subscribers get the status changes and streamed text."""
+    queue = make_queue(FakeProvider(token_delay=0.001, max_batch_size=1))
+    job, _ = queue.submit(_request())
+
+    async def collect():
+        return [event async for event in job.events()]
+
+    events = asyncio.run(collect())
+    statuses = [event["status"] for event in events if event["type"] == "status"]
+    text = "".join(event["text"] for event in events if event["type"] == "token")
+
+    assert statuses == ["queued", "running", "succeeded"]
+    assert text == FakeProvider.text_for(job.request)
+    # Late subscribers get the same replay
+    assert asyncio.run(collect()) == events
+
+
+def test_cached_responses_replay(make_queue) -> None:
+    """Test that a repeated request streams the cached chunks without a call."""
+    provider = FakeProvider(max_batch_size=1)
+    cache = LRUCache(ttl=60)
+    queue = make_queue(provider, cache=cache)
+    first, _ = queue.submit(_request())
+    queue.wait(first.id, timeout=5)
+
+    again, coalesced = queue.submit(_request(), owner="post-2")
+    assert queue.wait(again.id, timeout=5).status == "succeeded"
+    assert not coalesced
+    assert again.cached and not first.cached
+    assert again.attempts == 0
+    assert again.text == first.text
+    assert provider.calls == 1
+
+    async def tokens():
+        return [event["text"] async for event in again.events() if event["type"] == "token"]
+
+    # Replayed in the chunks it was streamed in, not as one block
+    replayed = asyncio.run(tokens())
+    assert len(replayed) > 1 and "".join(replayed) == first.text
+    assert queue.stats()["cache"]["hits"] == 1
+
+
+def test_cache_bypass(make_queue) -> None:
+    """Test that use_cache=False calls the provider and refreshes the cache."""
+    provider = FakeProvider(max_batch_size=1)
+    queue = make_queue(provider, cache=LRUCache(ttl=60))
+    queue.wait(queue.submit(_request())[0].id, timeout=5)
+
+    fresh, _ = queue.submit(_request(), use_cache=False)
+    assert queue.wait(fresh.id, timeout=5).status == "succeeded"
+    assert not fresh.cached
+    assert provider.calls == 2
+    assert queue.stats()["cache_bypassed"] == 1
+
+
+def test_rate_limiter_spaces_calls() -> None:
+    """Test that the token bucket holds calls to its rate after a burst."""
+    limiter = RateLimiter(rate=50, burst=2)
+
+    async def take(count):
+        for _ in range(count):
+            await limiter.acquire()
+
+    started = time.monotonic()
+    asyncio.run(take(7))
+    # Two calls ride the burst; the other five wait 1/50 s each
+    assert time.monotonic() - started >= 0.09
+    assert limiter.waited == pytest.approx(0.1, abs=0.02)
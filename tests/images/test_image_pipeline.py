@@ -0,0 +1,141 @@
+"""
+Tests for image derivative rendering, storage and upload spooling.
+"""
+import asyncio
+import base64
+import hashlib
+import io
+
+import pytest
+from PIL import Image
+
+from app.images import (
+    ImagePipeline,
+    ImageTooLargeError,
+    InvalidImageError,
+    LocalStorage,
+    StorageError,
+    render_image,
+    spool_upload,
+    supported_formats,
+    target_widths,
+)
+
+
+def _png(tmp_path, width=800, height=600, mode="RGB", name="source.png", **save_options):
+    """Write a gradient image and return its path."""
+    image = Image.linear_gradient("L").resize((width, height)).convert(mode)
+    path = tmp_path / name
+    image.save(path, **save_options)
+    return str(path)
+
+
+async def _chunks(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def test_target_widths_never_upscale() -> None:
+    """Test that derivatives stop at the original's width."""
+    assert target_widths(2000, (320, 640, 1280)) == [1280, 640, 320]
+    assert target_widths(800, (320, 640, 1280)) == [800, 640, 320]
+    assert target_widths(200, (320, 640)) == [200]
+
+
+def test_render_image(tmp_path) -> None:
+    """Test that every width and format is encoded at the right size."""
+    rendered = render_image(_png(tmp_path), widths=(320, 640, 1280), formats=("webp", "avif"))
+
+    assert (rendered.format, rendered.width, rendered.height) == ("PNG", 800, 600)
+    formats = supported_formats(("webp", "avif"))
+    expected = [(width, name) for width in (800, 640, 320) for name in formats]
+    assert [(d.width, d.format) for d in rendered.derivatives] == expected
+    for derivative in rendered.derivatives:
+        with Image.open(io.BytesIO(derivative.data)) as decoded:
+            assert decoded.size == (derivative.width, derivative.height)
+            assert decoded.format.lower() == derivative.format
+    assert rendered.derivatives[-1].height == 240
+
+    prefix = "data:image/webp;base64,"
+    assert rendered.placeholder.startswith(prefix)
+    placeholder = Image.open(io.BytesIO(base64.b64decode(rendered.placeholder[len(prefix):])))
+    assert placeholder.size == (16, 12)
+
+
+def test_render_applies_exif_orientation(tmp_path) -> None:
+    """Test that rotated camera images come out upright."""
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees clockwise
+    path = _png(tmp_path, 400, 300, name="photo.jpg", exif=exif)
+
+    rendered = render_image(path, widths=(320,), formats=("webp",))
+    assert (rendered.format, rendered.width, rendered.height) == ("JPEG", 300, 400)
+    assert (rendered.derivatives[0].width, rendered.derivatives[0].height) == (300, 400)
+
+
+def test_render_rejects_bad_input(tmp_path) -> None:
+    """Test that non-images and oversized images are refused."""
+    junk = tmp_path / "junk.png"
+    junk.write_bytes(b"not an image")
+    with pytest.raises(InvalidImageError):
+        render_image(str(junk))
+    with pytest.raises(InvalidImageError, match="pixels"):
+        render_image(_png(tmp_path), max_pixels=1000)
+
+
+def test_spool_upload_hashes_and_limits(tmp_path) -> None:
+    """Test that uploads are hashed as they are written and capped in size."""
+    data = bytes(range(256)) * 40
+
+    upload = asyncio.run(spool_upload(_chunks(data), directory=str(tmp_path)))
+    with upload:
+        assert upload.content_hash == hashlib.sha256(data).hexdigest()
+        assert upload.size == len(data)
+        with open(upload.path, "rb") as spooled:
+            assert spooled.read() == data
+    assert list(tmp_path.iterdir()) == []
+
+    with pytest.raises(ImageTooLargeError):
+        asyncio.run(spool_upload(_chunks(data), max_bytes=5000, directory=str(tmp_path)))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_local_storage(tmp_path) -> None:
+    """Test that files are written atomically and paths can't escape the root."""
+    storage = LocalStorage(str(tmp_path), "/media/")
+    storage.put("a/b.txt", io.BytesIO(b"hello"), "text/plain")
+
+    assert (tmp_path / "a" / "b.txt").read_bytes() == b"hello"
+    assert storage.exists("a/b.txt") and not storage.exists("a/c.txt")
+    assert storage.url("a/b.txt") == "/media/a/b.txt"
+    with pytest.raises(StorageError):
+        storage.put("../outside.txt", io.BytesIO(b"x"), "text/plain")
+
+
+def test_pipeline_stores_original_and_derivatives(tmp_path) -> None:
+    """Test that a worker process renders the upload and everything is stored."""
+    storage = LocalStorage(str(tmp_path / "media"), "/media")
+    pipeline = ImagePipeline(storage, workers=1, widths=(320,), formats=("webp",))
+    data = open(_png(tmp_path), "rb").read()
+
+    async def process():
+        with await spool_upload(_chunks(data), directory=str(tmp_path)) as upload:
+            return await pipeline.process(upload)
+
+    try:
+        result = asyncio.run(process())
+    finally:
+        pipeline.close()
+
+    image = result["image"]
+    content_hash = hashlib.sha256(data).hexdigest()
+    assert image["content_hash"] == content_hash
+    assert image["storage_path"] == f"originals/{content_hash[:2]}/{content_hash}.png"
+    assert (image["format"], image["width"], image["height"]) == ("image/png", 800, 600)
+    assert (tmp_path / "media" / image["storage_path"]).read_bytes() == data
+    [derivative] = result["derivatives"]
+    assert (derivative["format"], derivative["width"], derivative["height"]) == (
+        "image/webp", 320, 240
+    )
+    assert (tmp_path / "media" / derivative["storage_path"]).stat().st_size == derivative["size"]
+    assert derivative["url"] == f"/media/{derivative['storage_path']}"
@@ -0,0 +1,253 @@
+"""
+Tests for incrementally maintained sitemaps, feeds and topic indexes.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.publishing import FeedEntry, FeedGenerator, FeedIndex
+from app.schemas.post import PostCreate, PostUpdate
+from app.schemas.topic import TopicCreate, TopicUpdate
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def generator(tmp_path) -> FeedGenerator:
+    """Write to tmp_path with tiny feeds, pages and sitemap shards."""
+    return FeedGenerator(
+        str(tmp_path), site_url="https://blog.example", base_url="https://api.example/feeds",
+        title="Blog", feed_size=2, page_size=2, shard_target=100, max_urls=100,
+    )
+
+
+def _published(db: Session, title: str, day: int, **values):
+    return crud.post.create_post(db, PostCreate(
+        title=title, status="published", published_at=START + timedelta(days=day), **values
+    ))
+
+
+def _page(root, slug: str, number: int) -> list:
+    data = json.loads((root / "topics" / slug / f"page-{number}.json").read_text())
+    return [post["title"] for post in data["posts"]]
+
+
+def test_feed_index_orders_and_pages() -> None:
+    """Test that the index keeps topic order and counts pages from the oldest."""
+    index = FeedIndex(shard_count=3)
+    entries = [
+        FeedEntry({"id": str(i), "slug": f"p{i}", "title": f"P{i}", "excerpt": None,
+                   "published_at": START + timedelta(days=i), "updated_at": None,
+                   "topic_id": "t"})
+        for i in range(5)
+    ]
+    index.load(entries[:4])
+    assert [entry.id for entry in index.latest(2, "t")] == ["3", "2"]
+    assert [entry.id for entry in index.page("t", 2, 3)] == ["3"]
+    assert index.put(entries[4]) is None
+    assert index.is_recent(entries[4], 1, "t") and not index.is_recent(entries[2], 2, "t")
+    assert index.remove("0") is entries[0] and index.remove("0") is None
+    assert sum(len(shard) for shard in index.shards) == len(index) == 4
+
+
+def test_load_writes_every_file(db: Session, generator: FeedGenerator, tmp_path) -> None:
+    """Test that a load writes the sitemap, feeds and topic pages, and drops stray files."""
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    for day in range(3):
+        _published(db, f"Tech {day}", day, topic_id=str(topic.id))
+    _published(db, "Loose", 5)
+    crud.post.create_post(db, PostCreate(title="Draft"))
+    (tmp_path / "stale.xml").write_text("old")
+
+    result = generator.load(db)
+
+    assert sorted(result["written"]) == [
+        "atom.xml", "rss.xml", "sitemap-1.xml", "sitemap.xml",
+        "topics/tech/atom.xml", "topics/tech/index.json", "topics/tech/page-1.json",
+        "topics/tech/page-2.json", "topics/tech/rss.xml",
+    ]
+    assert result["deleted"] == ["stale.xml"]
+    sitemap = (tmp_path / "sitemap-1.xml").read_text()
+    assert sitemap.count("<loc>") == 4 and "https://blog.example/posts/loose/" in sitemap
+    assert "draft" not in sitemap
+    assert "https://api.example/feeds/sitemap-1.xml" in (tmp_path / "sitemap.xml").read_text()
+    rss = (tmp_path / "rss.xml").read_text()
+    assert rss.index("Loose") < rss.index("Tech 2") and "Tech 1" not in rss
+    assert _page(tmp_path, "tech", 1) == ["Tech 1", "Tech 0"]
+    assert _page(tmp_path, "tech", 2) == ["Tech 2"]
+    index = json.loads((tmp_path / "topics/tech/index.json").read_text())
+    assert (index["posts"], index["pages"]) == (3, 2)
+
+    # A second load over the same tree rewrites nothing
+    assert FeedGenerator(**_settings(generator)).load(db)["written"] == []
+
+
+def _settings(generator: FeedGenerator) -> dict:
+    return {
+        "root": generator.root, "site_url": generator.site_url, "base_url": generator.base_url,
+        "title": generator.title, "feed_size": generator.feed_size,
+        "page_size": generator.page_size, "shard_target": generator.shard_target,
+        "max_urls": generator.max_urls,
+    }
+
+
+def test_publish_rewrites_only_affected_files(db: Session, tmp_path) -> None:
+    """Test that one new post touches its shard, the feeds and its topic's last page."""
+    generator = FeedGenerator(str(tmp_path), feed_size=2, page_size=2, shard_target=2)
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    first = _published(db, "Tech 0", 0, topic_id=str(topic.id))
+    for day in range(1, 5):
+        _published(db, f"Tech {day}", day, topic_id=str(topic.id))
+    generator.load(db)
+    assert generator.stats()["sitemap_shards"] == 3
+
+    post = _published(db, "Tech 9", 9, topic_id=str(topic.id))
+    result = generator.apply(db, str(post.id))
+
+    shard = f"sitemap-{generator.index.shard_of(str(post.id)) + 1}.xml"
+    # Reason: sitemap.xml only changes if the shard's lastmod moved to a new second
+    assert set(result["written"]) - {"sitemap.xml"} == {
+        shard, "atom.xml", "rss.xml", "topics/tech/atom.xml",
+        "topics/tech/rss.xml", "topics/tech/index.json", "topics/tech/page-3.json",
+    }
+    assert _page(tmp_path, "tech", 3) == ["Tech 9", "Tech 4"]
+
+    # An edit that keeps the post's place rewrites its page, not the later ones
+    crud.post.update_post(db, post, PostUpdate(excerpt="Changed"))
+    assert "topics/tech/page-3.json" in generator.apply(db, str(post.id))["written"]
+    crud.post.update_post(db, first, PostUpdate(excerpt="Changed"))
+    written = generator.apply(db, str(first.id))["written"]
+    assert "topics/tech/page-1.json" in written
+    assert not {"topics/tech/page-2.json", "rss.xml"} & set(written)
+
+    # Nothing changed: nothing is written
+    assert generator.apply(db, str(first.id))["written"] == []
+
+
+def test_unpublish_and_delete_remove_the_post(
+    db: Session, generator: FeedGenerator, tmp_path
+) -> None:
+    """Test that unpublished and deleted posts leave the sitemap, feeds and pages."""
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    posts = [_published(db, f"Tech {day}", day, topic_id=str(topic.id)) for day in range(3)]
+    generator.load(db)
+
+    crud.post.update_post(db, posts[0], PostUpdate(status="draft"))
+    result = generator.apply(db, str(posts[0].id))
+    assert "topics/tech/page-2.json" in result["deleted"]
+    assert _page(tmp_path, "tech", 1) == ["Tech 2", "Tech 1"]
+    assert "tech-0" not in (tmp_path / "sitemap-1.xml").read_text()
+
+    for post in posts[1:]:
+        post_id = str(post.id)
+        crud.post.delete_post(db, post)
+        generator.apply(db, post_id)
+    assert not (tmp_path / "topics").exists() or not any((tmp_path / "topics").rglob("*.*"))
+    assert "<item>" not in (tmp_path / "rss.xml").read_text()
+    assert generator.stats()["posts"] == 0
+
+
+def test_topic_rename_moves_its_files(db: Session, generator: FeedGenerator, tmp_path) -> None:
+    """Test that a new topic slug writes the topic's files under it and removes the old ones."""
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    _published(db, "Tech 0", 0, topic_id=str(topic.id))
+    generator.load(db)
+
+    crud.topic.update_topic(db, topic, TopicUpdate(name="Science"))
+    result = generator.apply_topic(db, str(topic.id))
+
+    assert "topics/tech/page-1.json" in result["deleted"]
+    assert "topics/science/page-1.json" in result["written"]
+    assert not (tmp_path / "topics" / "tech" / "rss.xml").exists()
+    assert "Blog: Science" in (tmp_path / "topics/science/rss.xml").read_text()
+
+
+def test_generators_sharing_a_root_keep_each_others_changes(
+    db: Session, generator: FeedGenerator, tmp_path
+) -> None:
+    """Test that a process replays another one's logged changes before its own."""
+    other = FeedGenerator(**_settings(generator))
+    _published(db, "One", 0)
+    generator.load(db)
+    other.load(db)
+
+    two = _published(db, "Two", 1)
+    other.apply(db, str(two.id))
+    three = _published(db, "Three", 2)
+    result = generator.apply(db, str(three.id))
+
+    assert generator.stats()["loads"] == 1 and generator.stats()["replayed"] == 1
+    assert "sitemap-1.xml" in result["written"]
+    rss = (tmp_path / "rss.xml").read_text()
+    assert "Two" in rss and "Three" in rss
+    sitemap = (tmp_path / "sitemap-1.xml").read_text()
+    assert "/posts/two/" in sitemap and "/posts/three/" in sitemap
+
+    # Alternating writers never reload, and both end up with the same indexes
+    for day in range(3, 8):
+        post = _published(db, f"Post {day}", day)
+        (generator if day % 2 else other).apply(db, str(post.id))
+    assert generator.stats()["loads"] == other.stats()["loads"] == 1
+    assert len(generator.index) == 8 and len(other.index) == 7
+    assert (tmp_path / "sitemap-1.xml").read_text().count("<loc>") == 8
+
+
+def test_generator_reloads_once_the_log_is_pruned(
+    db: Session, generator: FeedGenerator, tmp_path, monkeypatch
+) -> None:
+    """Test that changes missed beyond the kept log force a full load."""
+    monkeypatch.setattr("app.publishing.feeds.FEED_CHANGE_LOG_SIZE", 2)
+    other = FeedGenerator(**_settings(generator))
+    _published(db, "One", 0)
+    generator.load(db)
+    other.load(db)
+    for day in range(1, 5):
+        other.apply(db, str(_published(db, f"Post {day}", day).id))
+
+    generator.apply(db, str(_published(db, "Last", 5).id))
+
+    assert generator.stats()["loads"] == 2 and generator.stats()["replayed"] == 0
+    assert (tmp_path / "sitemap-1.xml").read_text().count("<loc>") == 6
+
+
+def test_generator_adopts_another_writers_shards(db: Session, tmp_path) -> None:
+    """Test that a replaying process takes on the shard count another one logged."""
+    settings = {"shard_target": 2, "max_urls": 10}
+    generator = FeedGenerator(str(tmp_path), **settings)
+    _published(db, "Post 0", 0)
+    generator.load(db)
+    for day in range(1, 4):
+        generator.apply(db, str(_published(db, f"Post {day}", day).id))
+    other = FeedGenerator(str(tmp_path), **settings)
+    other.load(db)
+    assert (generator.stats()["sitemap_shards"], other.stats()["sitemap_shards"]) == (1, 2)
+
+    generator.apply(db, str(_published(db, "Post 4", 4).id))
+
+    assert generator.stats()["loads"] == 1
+    assert generator.stats()["sitemap_shards"] == 2
+    files = sorted(path.name for path in tmp_path.glob("sitemap-*.xml"))
+    assert len(files) == generator.stats()["sitemap_shards"]
+    assert sum((tmp_path / name).read_text().count("<loc>") for name in files) == 5
+
+
+def test_full_shard_is_split(db: Session, tmp_path) -> None:
+    """Test that no sitemap shard ever holds more than max_urls posts."""
+    generator = FeedGenerator(str(tmp_path), shard_target=2, max_urls=2)
+    _published(db, "Post 0", 0)
+    generator.load(db)
+    assert generator.stats()["sitemap_shards"] == 1
+
+    for day in range(1, 8):
+        post = _published(db, f"Post {day}", day)
+        generator.apply(db, str(post.id))
+        assert max(len(shard) for shard in generator.index.shards) <= 2
+
+    files = sorted(path.name for path in tmp_path.glob("sitemap-*.xml"))
+    assert len(files) == generator.stats()["sitemap_shards"] >= 4
+    total = sum((tmp_path / name).read_text().count("<loc>") for name in files)
+    assert total == 8
+    assert (tmp_path / "sitemap.xml").read_text().count("<sitemap>") == len(files)
@@ -0,0 +1,190 @@
+"""
+Tests for batched git commits and pushes, against a local bare repository.
+"""
+import os
+import subprocess
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.publishing import GitError, GitPublisher, get_git_publisher
+
+client = TestClient(app)
+
+AUTHOR = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def _git(cwd, *args) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True,
+        env={**os.environ, **AUTHOR},
+    ).stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """An empty bare repository standing in for the hosting remote."""
+    path = tmp_path / "remote.git"
+    _git(tmp_path, "init", "--quiet", "--bare", "-b", "main", str(path))
+    return path
+
+
+@pytest.fixture
+def site(tmp_path, remote):
+    """A working tree with the bare repository as its origin."""
+    path = tmp_path / "site"
+    _git(tmp_path, "init", "--quiet", "-b", "main", str(path))
+    _git(path, "remote", "add", "origin", str(remote))
+    return path
+
+
+def _write(root, path: str, text: str) -> str:
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)
+    return path
+
+
+def _remote_files(remote) -> dict:
+    names = _git(remote, "ls-tree", "-r", "--name-only", "main").split("\n")
+    return {name: _git(remote, "show", f"main:{name}") for name in names if name}
+
+
+def test_publish_commits_and_pushes(site, remote) -> None:
+    """Test that written and deleted paths land on the remote in one commit each."""
+    publisher = GitPublisher(str(site), batch_window=0)
+    try:
+        _write(site, "content/posts/a.md", "A")
+        _write(site, "content/posts/b.md", "B")
+        first = publisher.publish(["content/posts/a.md", "content/posts/b.md"], message="Add")
+        assert _git(remote, "rev-parse", "main") == first
+        assert _remote_files(remote) == {"content/posts/a.md": "A", "content/posts/b.md": "B"}
+
+        (site / "content/posts/a.md").unlink()
+        _write(site, "content/posts/b.md", "B2")
+        second = publisher.publish(["content/posts/b.md"], ["content/posts/a.md"], "Edit")
+        assert _git(remote, "rev-parse", "main^") == first
+        assert _git(remote, "log", "-1", "--format=%s", "main") == "Edit"
+        assert _remote_files(remote) == {"content/posts/b.md": "B2"}
+        assert _git(site, "status", "--porcelain") == ""
+
+        # Nothing changed: no new commit
+        assert publisher.publish(["content/posts/b.md"]) == second
+        stats = publisher.stats()
+        assert (stats["commits"], stats["pushes"], stats["failed_batches"]) == (2, 3, 0)
+    finally:
+        publisher.stop()
+
+
+def test_concurrent_events_share_a_commit(site, remote) -> None:
+    """Test that events arriving within the window become one commit and one push."""
+    publisher = GitPublisher(str(site), batch_window=0.5)
+    futures = []
+    lock = threading.Lock()
+
+    def publish(i: int) -> None:
+        path = _write(site, f"content/posts/{i}.md", str(i))
+        future = publisher.submit([path], message=f"Publish {i}")
+        with lock:
+            futures.append(future)
+
+    try:
+        threads = [threading.Thread(target=publish, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        commits = {future.result(timeout=30) for future in futures}
+    finally:
+        publisher.stop()
+
+    assert len(commits) == 1
+    assert _git(remote, "rev-list", "--count", "main") == "1"
+    assert len(_remote_files(remote)) == 8
+    assert _git(remote, "log", "-1", "--format=%s", "main") == "Publish 8 changes"
+    stats = publisher.stats()
+    assert (stats["events"], stats["batches"], stats["pushes"]) == (8, 1, 1)
+    assert stats["batch_events"]["sum"] == 8 and stats["batch_files"]["sum"] == 8
+    assert stats["latency_seconds"]["count"] == 8
+
+
+def test_batches_close_at_max_files(site, remote) -> None:
+    """Test that a batch is committed early once it touches max_batch_files paths."""
+    publisher = GitPublisher(str(site), batch_window=30, max_batch_files=2)
+    try:
+        paths = [_write(site, f"{i}.md", str(i)) for i in range(4)]
+        futures = [publisher.submit([path]) for path in paths]
+        assert len({future.result(timeout=30) for future in futures}) == 2
+    finally:
+        publisher.stop()
+    assert _git(remote, "rev-list", "--count", "main") == "2"
+
+
+def test_rejected_push_is_rebuilt_on_the_remote_tip(tmp_path, site, remote) -> None:
+    """Test that a non-fast-forward push fetches, rebuilds and pushes again."""
+    publisher = GitPublisher(str(site), batch_window=0)
+    other = tmp_path / "other"
+    try:
+        publisher.publish([_write(site, "a.md", "A")])
+        _git(tmp_path, "clone", "--quiet", str(remote), str(other))
+        _write(other, "theirs.md", "Theirs")
+        _git(other, "add", "theirs.md")
+        _git(other, "commit", "--quiet", "-m", "Theirs")
+        _git(other, "push", "--quiet", "origin", "main")
+
+        commit = publisher.publish([_write(site, "ours.md", "Ours")], message="Ours")
+    finally:
+        publisher.stop()
+
+    assert _git(remote, "rev-parse", "main") == commit
+    assert _git(remote, "log", "-1", "--format=%s", "main^") == "Theirs"
+    assert _remote_files(remote) == {"a.md": "A", "theirs.md": "Theirs", "ours.md": "Ours"}
+    assert publisher.stats()["push_retries"] == 1
+
+
+def test_failed_push_fails_the_batch(site, tmp_path) -> None:
+    """Test that a push error reaches every caller of the batch."""
+    _git(site, "remote", "set-url", "origin", str(tmp_path / "missing.git"))
+    publisher = GitPublisher(str(site), batch_window=0)
+    try:
+        with pytest.raises(GitError):
+            publisher.publish([_write(site, "a.md", "A")], timeout=30)
+        with pytest.raises(ValueError):
+            publisher.submit(["../outside.md"])
+    finally:
+        publisher.stop()
+    assert publisher.stats()["failed_batches"] == 1
+
+
+def test_publisher_metrics_and_health(site, remote) -> None:
+    """Test that the configured publisher is exported on /api/metrics and its health route."""
+    publisher = GitPublisher(str(site), batch_window=0)
+    app.dependency_overrides[get_git_publisher] = lambda: publisher
+    try:
+        publisher.publish([_write(site, "a.md", "A")], timeout=30)
+        body = client.get("/api/metrics").text
+        health = client.get("/api/health/git-publisher").json()
+    finally:
+        del app.dependency_overrides[get_git_publisher]
+        publisher.stop()
+
+    assert "# TYPE git_publish_commits_total counter" in body
+    assert "git_publish_commits_total 1" in body
+    assert "git_publish_pushes_total 1" in body
+    assert 'git_publish_batch_events_bucket{le="1"} 1' in body
+    assert "git_publish_batch_files_sum 1" in body
+    assert "git_publish_latency_seconds_count 1" in body
+    assert (health["commits"], health["pending"]) == (1, 0)
+    assert health["last_commit"] == _git(remote, "rev-parse", "main")
+
+
+def test_publisher_unconfigured() -> None:
+    """Test that without GIT_PUBLISH_REPO nothing is exported and the health route is 404."""
+    assert get_git_publisher() is None
+    assert "git_publish_" not in client.get("/api/metrics").text
+    assert client.get("/api/health/git-publisher").status_code == 404
@@ -0,0 +1,135 @@
+"""
+Tests for the incremental Hugo export.
+"""
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.publishing import MANIFEST_NAME, HugoExporter, render_post, write_posts
+from app.schemas.post import PostCreate, PostUpdate
+from app.schemas.topic import TopicCreate, TopicUpdate
+
+
+@pytest.fixture
+def exporter(tmp_path) -> HugoExporter:
+    """Export to tmp_path with one worker and small batches."""
+    return HugoExporter(str(tmp_path), workers=1, batch_size=2, chunk_size=2)
+
+
+def _published(db: Session, title: str, **values):
+    return crud.post.create_post(
+        db, PostCreate(title=title, status="published", content=f"Body of {title}", **values)
+    )
+
+
+def _files(root) -> dict:
+    return {path.name: path.read_text() for path in (root / "content" / "posts").glob("*.md")}
+
+
+def test_render_post_front_matter() -> None:
+    """Test that posts become Markdown with escaped TOML front matter."""
+    post = {
+        "id": "1", "slug": "hello", "title": 'Say "hi"\n', "excerpt": "Short",
+        "content": "# Hello\n\nText\n", "status": "published",
+        "published_at": datetime(2025, 6, 1, 12, 0), "created_at": datetime(2025, 5, 1),
+        "updated_at": datetime(2025, 6, 2), "seo_title": None, "seo_description": None,
+        "seo_keywords": ["ai", "blog"], "topic_name": "Tech",
+        "images": [{"url": "/media/a.png", "alt_text": None, "content_hash": "a",
+                    "is_featured": True}],
+    }
+    assert render_post(post) == "\n".join([
+        "+++",
+        'title = "Say \\"hi\\"\\n"',
+        'slug = "hello"',
+        "date = 2025-06-01T12:00:00Z",
+        "lastmod = 2025-06-02T00:00:00Z",
+        "draft = false",
+        'summary = "Short"',
+        'description = "Short"',
+        'keywords = ["ai", "blog"]',
+        'categories = ["Tech"]',
+        'images = ["/media/a.png"]',
+        "+++",
+        "",
+        "# Hello",
+        "",
+        "Text",
+        "",
+    ])
+
+
+def test_write_posts_reports_bad_slugs(tmp_path) -> None:
+    """Test that a post with an unsafe slug fails alone."""
+    good = {"id": "1", "slug": "good", "title": "Good", "excerpt": None, "content": None,
+            "status": "published", "published_at": None, "created_at": datetime(2025, 1, 1),
+            "updated_at": None, "seo_title": None, "seo_description": None,
+            "seo_keywords": None, "topic_name": None, "images": []}
+    results = write_posts(str(tmp_path), [{**good, "id": "2", "slug": "../escape"}, good])
+    assert results[0][0] == "2" and results[0][2].startswith("ValueError")
+    assert results[1] == ("1", "content/posts/good.md", None)
+    assert [path.name for path in tmp_path.rglob("*.md")] == ["good.md"]
+
+
+def test_export_is_incremental(db: Session, exporter: HugoExporter, tmp_path) -> None:
+    """Test that only new or changed posts are rendered again."""
+    topic = crud.topic.create_topic(db, TopicCreate(name="Tech"))
+    first = _published(db, "First", topic_id=str(topic.id))
+    _published(db, "Second")
+    _published(db, "Third")
+    crud.post.create_post(db, PostCreate(title="Draft"))
+
+    stats = exporter.export(db)
+    assert (stats.posts, stats.rendered, stats.skipped, stats.failed) == (3, 3, 0, 0)
+    files = _files(tmp_path)
+    assert sorted(files) == ["first.md", "second.md", "third.md"]
+    assert 'categories = ["Tech"]' in files["first.md"]
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["posts"][str(first.id)]["path"] == "content/posts/first.md"
+
+    stats = exporter.export(db)
+    assert (stats.rendered, stats.skipped, stats.deleted) == (0, 3, 0)
+
+    crud.post.update_post(db, first, PostUpdate(content="Edited"))
+    stats = exporter.export(db)
+    assert (stats.rendered, stats.skipped) == (1, 2)
+    assert _files(tmp_path)["first.md"].endswith("\nEdited\n")
+
+    crud.topic.update_topic(db, topic, TopicUpdate(name="Science"))
+    stats = exporter.export(db)
+    assert (stats.rendered, stats.skipped) == (1, 2)
+    assert 'categories = ["Science"]' in _files(tmp_path)["first.md"]
+
+    assert exporter.export(db, full=True).rendered == 3
+
+
+def test_export_deletes_orphans(db: Session, exporter: HugoExporter, tmp_path) -> None:
+    """Test that files of removed, unpublished and renamed posts are deleted."""
+    removed = _published(db, "Removed")
+    unpublished = _published(db, "Unpublished")
+    renamed = _published(db, "Renamed")
+    _published(db, "Kept")
+    (tmp_path / "content" / "posts").mkdir(parents=True)
+    (tmp_path / "content" / "posts" / "handwritten.md").write_text("Not ours")
+    exporter.export(db)
+
+    crud.post.delete_post(db, removed)
+    crud.post.update_post(db, unpublished, PostUpdate(status="draft"))
+    crud.post.update_post(db, renamed, PostUpdate(title="New name"))
+    stats = exporter.export(db)
+
+    assert (stats.posts, stats.rendered, stats.skipped, stats.deleted) == (2, 1, 1, 3)
+    assert sorted(_files(tmp_path)) == ["handwritten.md", "kept.md", "new-name.md"]
+
+
+def test_export_rerenders_missing_files(db: Session, exporter: HugoExporter, tmp_path) -> None:
+    """Test that a file deleted by hand is written again even though unchanged."""
+    _published(db, "Lost")
+    exporter.export(db)
+    (tmp_path / "content" / "posts" / "lost.md").unlink()
+
+    stats = exporter.export(db)
+    assert (stats.rendered, stats.skipped) == (1, 0)
+    assert "lost.md" in _files(tmp_path)
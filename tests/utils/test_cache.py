@@ -0,0 +1,64 @@
+"""
+Tests for the in-process cache primitives.
+"""
+import time
+
+from app.utils.cache import MISSING, LRUCache, VersionedCache
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Test that the oldest untouched entry is evicted past max_size."""
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_lru_expires_entries() -> None:
+    """Test that entries older than the TTL are treated as misses."""
+    cache = LRUCache(max_size=10, ttl=0.01)
+    cache.set("a", None)
+    assert cache.get("a") is None
+    time.sleep(0.02)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_versioned_cache_drops_entries_on_new_version() -> None:
+    """Test that a moved version stamp clears local entries."""
+    cache = VersionedCache(LRUCache(), check_interval=0)
+    version = {"value": 1}
+    cache.ensure_fresh(lambda: version["value"])
+    cache.set("a", 1)
+
+    cache.ensure_fresh(lambda: version["value"])
+    assert cache.get("a") == 1
+
+    version["value"] = 2
+    cache.ensure_fresh(lambda: version["value"])
+    assert cache.get("a") is MISSING
+
+
+def test_versioned_cache_checks_at_most_every_interval() -> None:
+    """Test that version checks are rate limited."""
+    cache = VersionedCache(LRUCache(), check_interval=60)
+    calls = []
+    cache.ensure_fresh(lambda: calls.append(1))
+    cache.ensure_fresh(lambda: calls.append(1))
+    assert len(calls) == 1
+
+
+def test_disabled_cache_always_loads() -> None:
+    """Test that a disabled cache neither serves nor stores values."""
+    cache = VersionedCache(LRUCache())
+    cache.enabled = False
+    assert cache.get_or_load("a", lambda: 1) == 1
+    assert cache.get_or_load("a", lambda: 2) == 2
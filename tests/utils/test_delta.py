@@ -0,0 +1,67 @@
+"""
+Tests for line-based text deltas.
+"""
+import random
+
+import pytest
+
+from app.utils.delta import apply_delta, make_delta, split_lines, unified_diff
+
+
+def test_split_lines_matches_string_to_array() -> None:
+    """Test that empty and missing texts have no lines, like Postgres' string_to_array."""
+    assert split_lines(None) == []
+    assert split_lines("") == []
+    assert split_lines("a\n") == ["a", ""]
+
+
+def test_small_edit_is_small() -> None:
+    """Test that changing one line of a long text stores only that line."""
+    old = "\n".join(f"Paragraph {i}" for i in range(500))
+    new = old.replace("Paragraph 250", "Paragraph 250, revised")
+    delta = make_delta(old, new)
+    assert delta == [250, -1, ["Paragraph 250, revised"], 249]
+    assert apply_delta(old, delta) == new
+
+
+def test_random_edits_round_trip() -> None:
+    """Test that applying a delta always yields the target text."""
+    rng = random.Random(42)
+    text = "\n".join(f"line {i}" for i in range(50))
+    for _ in range(300):
+        lines = split_lines(text)
+        i = rng.randint(0, len(lines))
+        choice = rng.random()
+        if choice < 0.4:
+            lines.insert(i, f"new {rng.random():.6f}")
+        elif choice < 0.7 and lines:
+            del lines[min(i, len(lines) - 1)]
+        elif lines:
+            lines[min(i, len(lines) - 1)] += " edited"
+        new = "\n".join(lines)
+        assert apply_delta(text, make_delta(text, new)) == new
+        text = new
+
+
+def test_none_and_empty() -> None:
+    """Test deltas from and to empty texts."""
+    assert make_delta(None, None) == []
+    assert apply_delta(None, make_delta(None, "a\nb")) == "a\nb"
+    assert apply_delta("a\nb", make_delta("a\nb", "")) == ""
+
+
+def test_apply_delta_rejects_wrong_base() -> None:
+    """Test that a delta replayed over another text fails loudly."""
+    delta = make_delta("a\nb\nc", "a\nc")
+    with pytest.raises(ValueError):
+        apply_delta("a\nb", delta)
+    with pytest.raises(ValueError):
+        apply_delta("a\nb\nc\nd", delta)
+
+
+def test_unified_diff() -> None:
+    """Test rendering a change as a unified diff."""
+    diff = unified_diff("a\nb", "a\nc", "content@1", "content@2")
+    assert diff.splitlines()[:2] == ["--- content@1", "+++ content@2"]
+    assert "-b" in diff.splitlines() and "+c" in diff.splitlines()
+    assert unified_diff("same", "same", "x", "y") == ""
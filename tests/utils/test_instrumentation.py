@@ -0,0 +1,88 @@
+"""
+Tests for request instrumentation, SQL counting and profiling.
+"""
+import os
+from typing import Dict
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import track_queries
+from app.main import app
+from app.models.topic import Topic
+from app.utils import instrumentation, profiling
+
+client = TestClient(app)
+
+
+def test_track_queries_counts_statements(db: Session, test_topics: list) -> None:
+    """Test that statements inside the block are counted and captured."""
+    with track_queries(capture=True) as stats:
+        db.query(Topic).all()
+        db.query(Topic).count()
+    assert stats.count == 2
+    assert all("topics" in statement for statement, _ in stats.statements)
+
+    db.query(Topic).all()
+    assert stats.count == 2
+
+
+def test_server_timing_header(db: Session, test_topic: Dict) -> None:
+    """Test that responses report total and SQL time."""
+    response = client.get(
+        f"/api/v1/topics/{test_topic['id']}", headers={"Cache-Control": "no-cache"}
+    )
+    timing = response.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert 'desc="1 queries"' in timing
+
+
+def test_metrics_endpoint(db: Session, test_topic: Dict) -> None:
+    """Test the Prometheus endpoint labels requests by route template."""
+    instrumentation.request_metrics.reset()
+    client.get(f"/api/v1/topics/{test_topic['id']}")
+    client.get("/api/v1/does-not-exist")
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/topics/{topic_id}",status="200"} 1'
+        in body
+    )
+    assert 'route="unmatched",status="404"' in body
+    assert "db_queries_per_request_bucket" in body
+    assert "db_pool_checkouts_total" in body
+    assert "topic_cache_hits_total" in body
+
+
+def test_header_triggered_profile(db: Session, tmp_path, monkeypatch) -> None:
+    """Test that the X-Profile header writes a collapsed-stack profile."""
+    monkeypatch.setattr(instrumentation, "PROFILE_HEADER_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+    client.get("/api/v1/topics/", headers={"X-Profile": "1"})
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    assert files[0].endswith("-GET-api_v1_topics.collapsed")
+
+
+def test_profile_header_ignored_by_default(db: Session, tmp_path, monkeypatch) -> None:
+    """Test that clients cannot trigger profiles unless enabled."""
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    client.get("/api/v1/topics/", headers={"X-Profile": "1"})
+    assert os.listdir(tmp_path) == []
+
+
+def test_nested_tracking_and_dump(db: Session, test_topic: Dict) -> None:
+    """Test that nested blocks both count and the dump lists each statement."""
+    with track_queries(capture=True) as outer:
+        with track_queries() as inner:
+            db.query(Topic).filter(Topic.slug == test_topic["slug"]).all()
+    assert inner.count == outer.count == 1
+
+    dump = outer.dump()
+    assert dump.startswith("  1. SELECT")
+    assert "parameters: ('test-topic'" in dump
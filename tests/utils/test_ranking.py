@@ -0,0 +1,58 @@
+"""
+Tests for fractional ranking keys.
+"""
+import random
+
+import pytest
+
+from app.utils.ranking import is_valid_rank, rank_between, spread_ranks
+
+
+def test_rank_between_bounds() -> None:
+    """Test generating ranks at the start, middle and end of a list."""
+    first = rank_between(None, None)
+    assert is_valid_rank(first)
+    assert rank_between(None, first) < first
+    assert rank_between(first, None) > first
+    middle = rank_between("a", "b")
+    assert "a" < middle < "b"
+
+
+def test_rank_between_random_inserts() -> None:
+    """Test that random inserts always land strictly between neighbours."""
+    rng = random.Random(42)
+    keys = [rank_between(None, None)]
+    for _ in range(2000):
+        i = rng.randint(0, len(keys))
+        low = keys[i - 1] if i > 0 else None
+        high = keys[i] if i < len(keys) else None
+        key = rank_between(low, high)
+        assert (low is None or low < key) and (high is None or key < high)
+        assert is_valid_rank(key)
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+
+
+def test_rank_between_out_of_order() -> None:
+    """Test that equal or reversed bounds are rejected."""
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+def test_spread_ranks() -> None:
+    """Test that rebalanced ranks are short, distinct and ordered."""
+    ranks = spread_ranks(1000)
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == 1000
+    assert all(is_valid_rank(r) and len(r) <= 2 for r in ranks)
+    assert spread_ranks(0) == []
+
+
+def test_is_valid_rank() -> None:
+    """Test rank validation."""
+    assert is_valid_rank("V")
+    assert not is_valid_rank("")
+    assert not is_valid_rank("a0")
+    assert not is_valid_rank("a-b")
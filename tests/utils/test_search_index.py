@@ -0,0 +1,110 @@
+"""
+Tests for the in-memory full-text index.
+"""
+from app.utils.search_index import (
+    WEIGHT_A, WEIGHT_C, InvertedIndex, analyze, highlight, parse_query, trigrams,
+    word_similarity,
+)
+
+
+def _index() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add(("post", "1"), [("Learning Python", WEIGHT_A), ("Python is fun", WEIGHT_C)],
+              title="Learning Python", payload={"n": 1})
+    index.add(("post", "2"), [("Rust basics", WEIGHT_A), ("Unlike Python, Rust", WEIGHT_C)],
+              title="Rust basics", payload={"n": 2})
+    index.add(("topic", "3"), [("Cooking", WEIGHT_A)], title="Cooking", payload={"n": 3})
+    return index
+
+
+def test_analyze_stems_and_drops_stopwords() -> None:
+    """Test that inflections share a term and stopwords are dropped."""
+    assert analyze("The posts are Walking") == ["post", "walk"]
+    assert analyze("stories") == ["story"]
+    assert analyze(None) == []
+
+
+def test_parse_query() -> None:
+    """Test web-search style groups, alternatives and exclusions."""
+    groups, excluded = parse_query('python OR rust "hello tutorials" -videos')
+    assert groups == [{"python", "rust"}, {"hello"}, {"tutorial"}]
+    assert excluded == {"video"}
+
+
+def test_search_ranks_title_matches_first() -> None:
+    """Test that a title match outranks a body match."""
+    hits, has_more = _index().search("python", limit=10)
+    assert [key for _, key in hits] == [("post", "1"), ("post", "2")]
+    assert hits[0][0] > hits[1][0]
+    assert not has_more
+
+
+def test_search_and_or_not() -> None:
+    """Test that words are ANDed, OR widens and -word excludes."""
+    index = _index()
+    assert [k for _, k in index.search("python rust", limit=10)[0]] == [("post", "2")]
+    assert len(index.search("cooking OR rust", limit=10)[0]) == 2
+    assert [k for _, k in index.search("python -rust", limit=10)[0]] == [("post", "1")]
+    assert index.search("the", limit=10) == ([], False)
+
+
+def test_search_pages_and_filters() -> None:
+    """Test offset/limit paging and the predicate."""
+    index = _index()
+    first, has_more = index.search("python", limit=1)
+    second, last = index.search("python", limit=1, offset=1)
+    assert has_more and not last
+    assert first[0][1] != second[0][1]
+    only_ones, _ = index.search("python", limit=10, predicate=lambda key, p: p["n"] == 1)
+    assert [k for _, k in only_ones] == [("post", "1")]
+
+
+def test_remove_and_replace() -> None:
+    """Test that removed documents stop matching and re-adding replaces terms."""
+    index = _index()
+    index.add(("post", "1"), [("Go", WEIGHT_A)], title="Go", payload={})
+    assert [k for _, k in index.search("python", limit=10)[0]] == [("post", "2")]
+    index.remove(("post", "2"))
+    assert index.search("python", limit=10)[0] == []
+    assert index.kind_counts["post"] == 1
+    index.clear("post")
+    assert len(index) == 1
+
+
+def test_fuzzy_tolerates_typos() -> None:
+    """Test trigram title matching with a misspelled word."""
+    hits = _index().fuzzy("pythn", limit=10)
+    assert [key for _, key in hits] == [("post", "1")]
+
+
+def test_fuzzy_forgets_removed_titles() -> None:
+    """Test that replaced and removed titles no longer match fuzzily."""
+    index = _index()
+    index.add(("post", "1"), [("Go", WEIGHT_A)], title="Go", payload={})
+    assert index.fuzzy("pythn", limit=10) == []
+    assert [key for _, key in index.fuzzy("cookin", limit=10)] == [("topic", "3")]
+    index.remove(("topic", "3"))
+    assert index.fuzzy("cookin", limit=10) == []
+
+
+def test_word_similarity_matches_pg_trgm() -> None:
+    """Test the documented pg_trgm example: word_similarity('word', 'two words') = 0.8."""
+    best = max(word_similarity(set(trigrams("word")), trigrams(w)) for w in ("two", "words"))
+    assert round(best, 2) == 0.8
+
+
+def test_highlight_marks_densest_passage() -> None:
+    """Test that the snippet is cut around the matches."""
+    text = " ".join(["filler"] * 50) + " Python posts rock " + " ".join(["tail"] * 50)
+    snippet = highlight(text, {"python", "post"}, words=6)
+    assert snippet.startswith("filler") or snippet.startswith("<mark>")
+    assert "<mark>Python</mark> <mark>posts</mark>" in snippet
+    assert highlight(None, {"python"}) is None
+
+
+def test_highlight_escapes_text() -> None:
+    """Test that markup in the source is escaped and only matches are marked."""
+    snippet = highlight('Look <img src=x onerror="y"> python & more', {"python"})
+    assert snippet == (
+        "Look &lt;img src=x onerror=&quot;y&quot;&gt; <mark>python</mark> &amp; more"
+    )
@@ -0,0 +1,80 @@
+"""
+Tests for the slug utilities.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import topic as topic_crud
+from app.utils import slugify as slugify_utils
+from app.models.topic import Topic
+from app.schemas.topic import TopicCreate
+from app.utils.slugify import next_free_slug, slugify, unique_slug
+
+
+def _add_topics(db: Session, slugs) -> None:
+    db.add_all(Topic(name=s, slug=s) for s in slugs)
+    db.commit()
+
+
+def test_slugify() -> None:
+    """Test basic slug generation."""
+    assert slugify("Hello World! How are you?") == "hello-world-how-are-you"
+    assert slugify("") == ""
+
+
+def test_next_free_slug() -> None:
+    """Test picking the lowest free suffix in memory."""
+    assert next_free_slug("news", []) == "news"
+    assert next_free_slug("news", ["news", "news-1", "news-2"]) == "news-3"
+    assert next_free_slug("news", ["news", "news-2"]) == "news-1"
+    # Unrelated slugs sharing the prefix don't count as suffixes
+    assert next_free_slug("news", ["news", "news-feed", "news-01"]) == "news-1"
+
+
+def test_unique_slug_single_query(db: Session) -> None:
+    """Test that collisions are resolved with one query, however many exist."""
+    _add_topics(db, ["topic"] + [f"topic-{i}" for i in range(1, 200)])
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        assert unique_slug(db, Topic, "Topic") == "topic-200"
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert len(statements) == 1
+
+
+def test_unique_slug_escapes_like_wildcards(db: Session) -> None:
+    """Test that '_' in a slug is not treated as a LIKE wildcard."""
+    _add_topics(db, ["a_b", "axb-1"])
+    assert unique_slug(db, Topic, "a_b") == "a_b-1"
+
+
+def test_unique_slug_empty() -> None:
+    """Test that an empty slug is rejected."""
+    with pytest.raises(ValueError):
+        unique_slug(None, Topic, "")
+
+
+def test_create_topic_retries_on_slug_race(db: Session, monkeypatch) -> None:
+    """Test that a slug taken by a concurrent writer is retried."""
+    _add_topics(db, ["race"])
+    calls = []
+    real_unique_slug = slugify_utils.unique_slug
+
+    def stale_unique_slug(session, model, slug, *args, **kwargs):
+        # First call behaves as if another request had not committed yet
+        calls.append(slug)
+        if len(calls) == 1:
+            return "race"
+        return real_unique_slug(session, model, slug, *args, **kwargs)
+
+    monkeypatch.setattr(slugify_utils, "unique_slug", stale_unique_slug)
+    created = topic_crud.create_topic(db, TopicCreate(name="Race"))
+    assert created.slug == "race-1"
+    assert len(calls) == 2